@@ -18,6 +18,13 @@ class MessageStatus(Enum):
     ERROR = "error"
 
 
+class JobStatus(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
 SUCCESS = "success"
 WARNING = "warning"
 DANGER = "danger"
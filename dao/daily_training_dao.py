@@ -1,10 +1,12 @@
 from typing import List, Optional, TypedDict
 from extensions import db
-from models.models import User
+from dao.user_dao import UsersDAO
+from dao.user_expressions_dao import UserExpressionsDAO
+from models.models import User, UserExpression
 from repository.exceptions import UserNotFoundException
 
 
-from sqlalchemy.orm import Session, attributes
+from sqlalchemy.orm import Session
 
 
 class DailyTrainingLearnListItemDict(TypedDict):
@@ -25,10 +27,11 @@ class DailyTrainingDict(TypedDict):
 class DailyTrainingDAO:
     def __init__(self, user_id: str, session: Session | None = None) -> None:
         self.session: Session = session or db.session
+        self.user_id = user_id
         self.user = self._get_user(user_id)
 
     def _get_user(self, user_id: str) -> User:
-        user = self.session.query(User).filter(User.id == user_id).first()
+        user = UsersDAO(self.session).get_by_id(user_id)
 
         if not user:
             raise UserNotFoundException("User not found")
@@ -40,8 +43,19 @@ class DailyTrainingDAO:
         return dt_dict
 
     def put(self, dt_dict: DailyTrainingDict, commit: bool = True) -> None:
-        self.user.properties["challenges"]["dailyTraining"] = dt_dict
-        attributes.flag_modified(self.user, "properties")
-        self.session.add(self.user)
+        UsersDAO(self.session).put_property(
+            self.user, ["challenges", "dailyTraining"], dt_dict
+        )
         if commit:
             self.session.commit()
+
+    def get_learn_list_candidates(
+        self, amount: int, learn_list_ids: List[str]
+    ) -> List[UserExpression]:
+        """
+        Get the newest expressions to add to the learn list, the learn list
+        is a part of the user properties, so its ids are sent to the query.
+        """
+        return UserExpressionsDAO(self.user_id, self.session).get(
+            exclude=learn_list_ids, limit=amount
+        )
@@ -0,0 +1,121 @@
+from datetime import timedelta
+from typing import Any
+from uuid import UUID
+
+from constants import JobStatus
+from extensions import db
+from helpers.time_helpers import get_current_utc_time, string_to_datetime
+from models.models import Job
+
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+MAX_ATTEMPTS = 3
+# the delay before the first retry, doubled with every next one
+RETRY_DELAY = timedelta(seconds=30)
+# a running job not finished in time is considered abandoned
+# by a stopped worker and is taken again
+RUNNING_TIMEOUT = timedelta(minutes=10)
+
+
+class JobsDAO:
+    def __init__(self, session: Session | None = None):
+        self.session: Session = session or db.session
+
+    def enqueue(
+        self,
+        user_id: str,
+        type_: str,
+        payload: dict[str, Any],
+        commit: bool = True,
+    ) -> Job:
+        now = get_current_utc_time()
+        job = Job(
+            user_id=user_id,
+            type=type_,
+            payload=payload,
+            status=JobStatus.PENDING.value,
+            attempts=0,
+            run_after=now,
+            added=now,
+            updated=now,
+        )
+        self.session.add(job)
+        if commit:
+            self.session.commit()
+        return job
+
+    def get(self, user_id: str, job_id: str) -> Job | None:
+        try:
+            UUID(str(job_id))
+        except ValueError:
+            return None
+        return (
+            self.session.query(Job)
+            .filter(Job.id == job_id, Job.user_id == user_id)
+            .first()
+        )
+
+    def claim(self) -> Job | None:
+        """
+        Take the next due job and mark it as running. The rows locked
+        by the other workers are skipped, so a job goes to one worker.
+        """
+        now = string_to_datetime(get_current_utc_time())
+        job = (
+            self.session.query(Job)
+            .filter(
+                or_(
+                    and_(
+                        Job.status == JobStatus.PENDING.value,
+                        Job.run_after <= now,
+                    ),
+                    and_(
+                        Job.status == JobStatus.RUNNING.value,
+                        Job.updated < now - RUNNING_TIMEOUT,
+                    ),
+                )
+            )
+            .order_by(Job.run_after)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .first()
+        )
+        if job is None:
+            self.session.commit()
+            return None
+
+        job.status = JobStatus.RUNNING.value
+        job.attempts += 1
+        job.updated = now
+        self.session.flush()
+        # not expired by the commit, the handler reads the job
+        # without starting a transaction
+        self.session.expunge(job)
+        self.session.commit()
+        return job
+
+    def complete(self, job: Job, result: dict[str, Any] | None) -> None:
+        # the claimed job is detached
+        self.session.add(job)
+        job.status = JobStatus.DONE.value
+        job.result = result
+        job.error = None
+        job.updated = get_current_utc_time()
+        self.session.commit()
+
+    def fail(
+        self, job: Job, error: str, max_attempts: int = MAX_ATTEMPTS
+    ) -> None:
+        """Retry the job later, it's failed after max_attempts"""
+        # the claimed job is detached
+        self.session.add(job)
+        now = string_to_datetime(get_current_utc_time())
+        if job.attempts < max_attempts:
+            job.status = JobStatus.PENDING.value
+            job.run_after = now + RETRY_DELAY * 2 ** (job.attempts - 1)
+        else:
+            job.status = JobStatus.FAILED.value
+        job.error = error
+        job.updated = now
+        self.session.commit()
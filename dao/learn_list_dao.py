@@ -0,0 +1,226 @@
+from bisect import bisect_left
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+from dao.daily_training_dao import (
+    DailyTrainingDAO,
+    DailyTrainingDict,
+    DailyTrainingLearnListItemDict,
+)
+from dao.user_dao import UsersDAO
+from dao.user_expressions_dao import UserExpressionsDAO
+from helpers.time_helpers import string_to_datetime
+from models.models import LearnListItem, UserExpression
+
+
+from sqlalchemy.orm import Session
+
+SORT_KEY_STEP = 1024.0
+KNOWLEDGE_LEVEL_PRECISION = Decimal("0.00001")
+SETTINGS_KEYS = (
+    "learnListSize",
+    "practiceCountThreshold",
+    "knowledgeLevelThreshold",
+)
+
+
+class LearnListDAO(DailyTrainingDAO):
+    """
+    Daily training storage where the learn list lives in the
+    "learn_list_items" table and only the settings stay in users.properties.
+
+    The interface is the same as DailyTrainingDAO has: "put" receives the
+    whole daily training dict, but writes only the rows that were changed.
+    Items order is kept with a "sort_key", so moving an item updates
+    the item row only.
+    """
+
+    def __init__(self, user_id: str, session: Session | None = None) -> None:
+        super().__init__(user_id, session)
+        self._items: Optional[Dict[str, LearnListItem]] = None
+
+    def get(self) -> DailyTrainingDict:
+        self._items = self._get_items()
+        settings = super().get()
+        return {
+            "learnListSize": settings["learnListSize"],
+            "practiceCountThreshold": settings["practiceCountThreshold"],
+            "knowledgeLevelThreshold": settings["knowledgeLevelThreshold"],
+            "learning_list": [
+                self._serialize_item(item) for item in self._items.values()
+            ],
+        }
+
+    def put(self, dt_dict: DailyTrainingDict, commit: bool = True) -> None:
+        self._put_settings(dt_dict)
+        self._put_items(dt_dict["learning_list"])
+        if commit:
+            self.session.commit()
+
+    def get_learn_list_candidates(
+        self, amount: int, learn_list_ids: List[str]
+    ) -> List[UserExpression]:
+        # the learn list is in DB, so candidates are found with one
+        # indexed query instead of sending all the learn list ids
+        return UserExpressionsDAO(
+            self.user_id, self.session
+        ).get_learn_list_candidates(amount)
+
+    def _get_items(self) -> Dict[str, LearnListItem]:
+        items = (
+            self.session.query(LearnListItem)
+            .filter(LearnListItem.user_id == self.user_id)
+            .order_by(LearnListItem.sort_key)
+            .all()
+        )
+        return {str(item.expression_id): item for item in items}
+
+    def _put_settings(self, dt_dict: DailyTrainingDict) -> None:
+        stored_settings = self.user.properties["challenges"]["dailyTraining"]
+        settings = {key: dt_dict[key] for key in SETTINGS_KEYS}
+
+        if stored_settings == settings:
+            return
+
+        UsersDAO(self.session).put_property(
+            self.user, ["challenges", "dailyTraining"], settings
+        )
+
+    def _put_items(
+        self, learn_list: List[DailyTrainingLearnListItemDict]
+    ) -> None:
+        if self._items is None:
+            self._items = self._get_items()
+
+        expression_ids = [item["expressionId"] for item in learn_list]
+
+        for expression_id in self._items.keys() - set(expression_ids):
+            self.session.delete(self._items[expression_id])
+
+        items = {}
+        for item_dict, sort_key in zip(
+            learn_list, self._get_sort_keys(expression_ids)
+        ):
+            expression_id = item_dict["expressionId"]
+            if not (item := self._items.get(expression_id)):
+                item = LearnListItem(
+                    user_id=self.user_id, expression_id=expression_id
+                )
+                self.session.add(item)
+            self._update_item(item, item_dict, sort_key)
+            items[expression_id] = item
+
+        self._items = items
+
+    def _get_sort_keys(self, expression_ids: List[str]) -> List[float]:
+        """
+        Keep sort keys of the longest subsequence of items that are still
+        in order, and put the rest of items between their neighbours.
+        """
+        current_keys = [
+            self._items[id_].sort_key if id_ in self._items else None
+            for id_ in expression_ids
+        ]
+        kept = self._get_longest_increasing_subsequence(current_keys)
+
+        next_kept_keys: List[Optional[float]] = [None] * len(current_keys)
+        next_kept_key = None
+        for i in reversed(range(len(current_keys))):
+            next_kept_keys[i] = next_kept_key
+            if i in kept:
+                next_kept_key = current_keys[i]
+
+        sort_keys: List[float] = []
+        for i, key in enumerate(current_keys):
+            if i not in kept:
+                key = self._get_key_between(
+                    sort_keys[-1] if sort_keys else None, next_kept_keys[i]
+                )
+            if key is None:
+                # no room left between neighbours, renumber the whole list
+                return [
+                    SORT_KEY_STEP * (n + 1) for n in range(len(current_keys))
+                ]
+            sort_keys.append(key)
+
+        return sort_keys
+
+    @staticmethod
+    def _get_key_between(
+        lower: Optional[float], upper: Optional[float]
+    ) -> Optional[float]:
+        if lower is None and upper is None:
+            return SORT_KEY_STEP
+        if lower is None:
+            return upper - SORT_KEY_STEP
+        if upper is None:
+            return lower + SORT_KEY_STEP
+
+        key = (lower + upper) / 2
+        return key if lower < key < upper else None
+
+    @staticmethod
+    def _get_longest_increasing_subsequence(
+        keys: List[Optional[float]],
+    ) -> set[int]:
+        tails: List[float] = []
+        tail_indexes: List[int] = []
+        previous: Dict[int, Optional[int]] = {}
+
+        for i, key in enumerate(keys):
+            if key is None:
+                continue
+            pos = bisect_left(tails, key)
+            previous[i] = tail_indexes[pos - 1] if pos else None
+            if pos == len(tails):
+                tails.append(key)
+                tail_indexes.append(i)
+            else:
+                tails[pos] = key
+                tail_indexes[pos] = i
+
+        indexes = set()
+        index = tail_indexes[-1] if tail_indexes else None
+        while index is not None:
+            indexes.add(index)
+            index = previous[index]
+
+        return indexes
+
+    @staticmethod
+    def _update_item(
+        item: LearnListItem,
+        item_dict: DailyTrainingLearnListItemDict,
+        sort_key: float,
+    ) -> None:
+        last_practice_time = item_dict.get("lastPracticeTime")
+        values = {
+            "sort_key": sort_key,
+            "position": int(item_dict["position"]),
+            "practice_count": int(item_dict["practiceCount"]),
+            "knowledge_level": Decimal(
+                str(item_dict["knowledgeLevel"])
+            ).quantize(KNOWLEDGE_LEVEL_PRECISION),
+            "last_practice_time": string_to_datetime(last_practice_time)
+            if last_practice_time is not None
+            else None,
+        }
+
+        # assign changed values only, so untouched rows are not updated
+        for attr, value in values.items():
+            if getattr(item, attr) != value:
+                setattr(item, attr, value)
+
+    @staticmethod
+    def _serialize_item(item: LearnListItem) -> DailyTrainingLearnListItemDict:
+        return {
+            "expressionId": str(item.expression_id),
+            "position": item.position,
+            "practiceCount": item.practice_count,
+            "knowledgeLevel": float(item.knowledge_level),
+            "lastPracticeTime": item.last_practice_time.strftime(
+                "%Y-%m-%d %H:%M:%S"
+            )
+            if item.last_practice_time is not None
+            else None,
+        }
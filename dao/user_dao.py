@@ -1,8 +1,14 @@
+from typing import Any
+
 from extensions import db
+from helpers.jsonb_helper import jsonb_set
+from helpers.request_scope import request_scoped
+from helpers.user_role_cache import user_role_cache
 from models.models import User
 from repository.exceptions import UserAlreadyExistsException
 
 
+from sqlalchemy import update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
@@ -12,6 +18,14 @@ class UsersDAO:
         self.session: Session = session or db.session
 
     def get_by_id(self, user_id: str) -> User | None:
+        if self.session is db.session:
+            # the user is loaded once per request by all the DAOs
+            return request_scoped(
+                (User, str(user_id)), lambda: self._get_by_id(user_id)
+            )
+        return self._get_by_id(user_id)
+
+    def _get_by_id(self, user_id: str) -> User | None:
         return self.session.query(User).filter(User.id == user_id).first()
 
     def get_by_email(self, email: str) -> User | None:
@@ -24,3 +38,23 @@ class UsersDAO:
                 self.session.commit()
         except IntegrityError:
             raise UserAlreadyExistsException
+        if user.id is not None:
+            user_role_cache.invalidate(str(user.id))
+
+    def put_property(self, user: User, path: list[str], value: Any) -> None:
+        """
+        Set the value by the path in the user properties. Only the value
+        is sent to the db, the rest of the document is updated in place.
+        """
+        *parents, key = path
+        properties = user.properties
+        for parent in parents:
+            properties = properties[parent]
+        properties[key] = value
+
+        self.session.execute(
+            update(User)
+            .where(User.id == user.id)
+            .values(properties=jsonb_set(User.properties, path, value))
+            .execution_options(synchronize_session=False)
+        )
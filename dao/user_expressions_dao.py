@@ -1,15 +1,41 @@
 from extensions import db
+from helpers.search_helper import get_prefix_query, to_tsquery
 from helpers.time_helpers import get_current_utc_time
-from models.models import Expression, ExpressionContext, UserExpression
+from models.models import (
+    Expression,
+    ExpressionContext,
+    LearnListItem,
+    UserExpression,
+)
 from repository.exceptions import UserExpressionNotFoundException
 
 
-from sqlalchemy import func
-from sqlalchemy.orm import Session
+from datetime import datetime
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Query, Session, joinedload, selectinload
 from sqlalchemy.orm.exc import StaleDataError
 
 
-from typing import List, Optional
+from typing import List, Literal, Optional
+
+LoadProfile = Literal["list", "challenge", "detail"]
+
+# relationships each kind of caller touches, loaded with the user
+# expressions instead of one lazy load per row:
+# "list" - the expression text only,
+# "challenge" - the expression and its context sentences,
+# "detail" - the expression with its tags and context sentences
+LOAD_PROFILES = {
+    "list": (joinedload(UserExpression.expression),),
+    "challenge": (
+        joinedload(UserExpression.expression).selectinload(Expression.context),
+    ),
+    "detail": (
+        joinedload(UserExpression.expression).selectinload(Expression.tags),
+        joinedload(UserExpression.expression).selectinload(Expression.context),
+    ),
+}
 
 
 class UserExpressionsDAO:
@@ -18,10 +44,13 @@ class UserExpressionsDAO:
         self.user_id = user_id
 
     def get_trained_expressions(
-        self, limit: int | None = None, excludes: list[str] | None = None
+        self,
+        limit: int | None = None,
+        excludes: list[str] | None = None,
+        profile: Optional[LoadProfile] = None,
     ) -> List[UserExpression]:
         query = (
-            self.session.query(UserExpression)
+            self._query(profile)
             .filter(
                 UserExpression.user_id == self.user_id,
                 UserExpression.last_practice_time.is_not(None),
@@ -85,6 +114,7 @@ class UserExpressionsDAO:
         include: Optional[List[str]] = None,
         exclude: Optional[List[str]] = None,
         limit: Optional[int] = None,
+        profile: Optional[LoadProfile] = None,
     ) -> List[UserExpression]:
 
         if exclude and include:
@@ -93,15 +123,72 @@ class UserExpressionsDAO:
             )
 
         if exclude:
-            return self._get_exclude(exclude, limit)
+            return self._get_exclude(exclude, limit, profile)
         elif include:
-            return self._get_include(include)
+            return self._get_include(include, profile)
         else:
-            return self._get_all()
+            return self._get_all(profile)
 
-    def get_by_id(self, expression_id: str) -> Optional[UserExpression]:
-        expr = (
+    def get_learn_list_candidates(self, limit: int) -> List[UserExpression]:
+        """
+        Get the newest not practiced expressions which are not in the
+        learn list, checking the learn list table with an anti-join.
+        """
+        in_learn_list = (
+            self.session.query(LearnListItem)
+            .filter(
+                LearnListItem.user_id == UserExpression.user_id,
+                LearnListItem.expression_id == UserExpression.expression_id,
+            )
+            .exists()
+        )
+        return (
             self.session.query(UserExpression)
+            .filter(
+                UserExpression.user_id == self.user_id,
+                UserExpression.practice_count == 0,
+                ~in_learn_list,
+            )
+            .order_by(UserExpression.added.desc())
+            .limit(limit)
+            .all()
+        )
+
+    def get_page(
+        self,
+        limit: int,
+        after: Optional[tuple[datetime, str]] = None,
+        profile: Optional[LoadProfile] = "list",
+    ) -> List[UserExpression]:
+        """
+        Get user expressions ordered by (added, expression_id) descending,
+        starting after the given (added, expression_id) key, so a page
+        is read from the index at the same cost however deep it is.
+        """
+        query = self._query(profile).filter(
+            UserExpression.user_id == self.user_id
+        )
+
+        if after is not None:
+            query = query.filter(
+                tuple_(UserExpression.added, UserExpression.expression_id)
+                < tuple_(*after)
+            )
+
+        return (
+            query.order_by(
+                UserExpression.added.desc(),
+                UserExpression.expression_id.desc(),
+            )
+            .limit(limit)
+            .all()
+        )
+
+    def get_by_id(
+        self, expression_id: str, profile: Optional[LoadProfile] = None
+    ) -> Optional[UserExpression]:
+        expr = (
+            self._query(profile)
             .filter(
                 UserExpression.user_id == self.user_id,
                 UserExpression.expression_id == expression_id,
@@ -114,8 +201,13 @@ class UserExpressionsDAO:
     def post(self, user_expression: UserExpression) -> None:
         self._commit(user_expression)
 
-    def put(self, user_expression: UserExpression) -> None:
+    def put(
+        self, user_expression: UserExpression, commit: bool = True
+    ) -> None:
         user_expression.updated = get_current_utc_time()
+        if not commit:
+            self.session.add(user_expression)
+            return
         try:
             self._commit(user_expression)
         except StaleDataError:
@@ -129,15 +221,32 @@ class UserExpressionsDAO:
         self.session.add(user_expression)
         self.session.commit()
 
-    def search(self, pattern: str) -> List[UserExpression]:
+    def search(
+        self,
+        pattern: str,
+        profile: Optional[LoadProfile] = None,
+        limit: Optional[int] = None,
+    ) -> List[UserExpression]:
+        """
+        Search user expressions by prefixes of the pattern words in
+        expression, definition and example, the best matches first.
+        """
+        if not (prefix_query := get_prefix_query(pattern)):
+            return []
+
+        ts_query = to_tsquery(prefix_query)
         return (
-            self.session.query(UserExpression)
+            self._query(profile)
             .join(Expression)
             .filter(
                 UserExpression.user_id == self.user_id,
-                Expression.expression.match(pattern),
+                Expression.search_vector.op("@@")(ts_query),
             )
-            .order_by(UserExpression.added.desc())
+            .order_by(
+                func.ts_rank(Expression.search_vector, ts_query).desc(),
+                UserExpression.added.desc(),
+            )
+            .limit(limit)
             .all()
         )
 
@@ -148,13 +257,24 @@ class UserExpressionsDAO:
             .count()
         )
 
-    def bulk_update(self, user_expressions: list[UserExpression]):
+    def bulk_update(
+        self, user_expressions: list[UserExpression], commit: bool = True
+    ):
         self.session.bulk_save_objects(user_expressions)
-        self.session.commit()
+        if commit:
+            self.session.commit()
+
+    def _query(self, profile: Optional[LoadProfile]) -> Query:
+        query = self.session.query(UserExpression)
+        if profile is not None:
+            query = query.options(*LOAD_PROFILES[profile])
+        return query
 
-    def _get_include(self, include: List[str]) -> List[UserExpression]:
+    def _get_include(
+        self, include: List[str], profile: Optional[LoadProfile] = None
+    ) -> List[UserExpression]:
         return (
-            self.session.query(UserExpression)
+            self._query(profile)
             .filter(
                 UserExpression.user_id == self.user_id,
                 UserExpression.expression_id.in_(include),
@@ -164,10 +284,13 @@ class UserExpressionsDAO:
         )
 
     def _get_exclude(
-        self, exclude: List[str], limit: Optional[int] = None
+        self,
+        exclude: List[str],
+        limit: Optional[int] = None,
+        profile: Optional[LoadProfile] = None,
     ) -> List[UserExpression]:
         return (
-            self.session.query(UserExpression)
+            self._query(profile)
             .filter(
                 UserExpression.user_id == self.user_id,
                 UserExpression.practice_count == 0,
@@ -178,9 +301,11 @@ class UserExpressionsDAO:
             .all()
         )
 
-    def _get_all(self) -> List[UserExpression]:
+    def _get_all(
+        self, profile: Optional[LoadProfile] = None
+    ) -> List[UserExpression]:
         return (
-            self.session.query(UserExpression)
+            self._query(profile)
             .filter(UserExpression.user_id == self.user_id)
             .order_by(UserExpression.added.desc())
             .all()
@@ -21,6 +21,12 @@ class ChallengeSolutionDict(TypedDict):
     example: str
 
 
+class ChallengeAnswerDict(TypedDict):
+    expression_id: str
+    answer: str
+    hint: bool
+
+
 class ExerciseExpressionsListItem(TypedDict):
     expression_id: str
     expression: str
@@ -1,4 +1,5 @@
 from exercises.common import (
+    ChallengeAnswerDict,
     ChallengeDict,
     get_challenge_object,
     ChallengeSolutionDict,
@@ -6,6 +7,7 @@ from exercises.common import (
     is_answer_correct,
     ExerciseExpressionsListItem,
 )
+from exercises.exceptions import ExpressionNotFoundException
 from repository.training_expressions_repo import (
     TrainingRepoABC,
     UpdateTrainedExpression,
@@ -38,6 +40,58 @@ class DailyTraining:
 
         return get_challenge_solution_object(correct, answer)
 
+    def get_challenges(self, amount: int) -> list[ChallengeDict]:
+        return [
+            get_challenge_object(expression)
+            for expression in self.repo.get_next(amount)
+        ]
+
+    def submit_challenges(
+        self, answers: list[ChallengeAnswerDict]
+    ) -> list[ChallengeSolutionDict]:
+        """
+        Submit answers of a few challenges at once, all the trained
+        expressions are updated in a single transaction.
+        """
+        user_expressions = {
+            str(user_expression.expression_id): user_expression
+            for user_expression in self.repo.get_by_ids(
+                list({answer["expression_id"] for answer in answers})
+            )
+        }
+
+        solutions = []
+        update_data: list[UpdateTrainedExpression] = []
+        for answer in answers:
+            if not (
+                user_expression := user_expressions.get(
+                    answer["expression_id"]
+                )
+            ):
+                raise ExpressionNotFoundException(
+                    f"Expression {answer['expression_id']} not found"
+                )
+            correct = user_expression.expression
+
+            if not answer["hint"]:
+                update_data.append(
+                    {
+                        "user_expression": user_expression,
+                        "is_trained_successfully": is_answer_correct(
+                            correct.expression, answer["answer"]
+                        ),
+                    }
+                )
+
+            solutions.append(
+                get_challenge_solution_object(correct, answer["answer"])
+            )
+
+        if update_data:
+            self.repo.update_expressions(update_data)
+
+        return solutions
+
     def get_learn_list_expressions(self) -> list[ExerciseExpressionsListItem]:
         expressions = self.repo.get_list()
         expressions.sort(key=lambda item: item["practice_count"], reverse=True)
@@ -68,6 +122,9 @@ class DailyTraining:
     def is_expression_in_learn_list(self, expression_id: str) -> bool:
         return self.repo.is_expression_in_learn_list(expression_id)
 
+    def get_learn_list_expression_ids(self) -> set[str]:
+        return self.repo.get_learn_list_expression_ids()
+
     @property
     def dt_data(self):
         return self.repo.daily_training_data
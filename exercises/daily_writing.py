@@ -1,5 +1,9 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import cached_property
 from typing import TypedDict
+
+from constants import JobStatus
+from dao.jobs_dao import JobsDAO
+from helpers.ff_helper import is_feature_flag_enabled
 from repository.training_expressions_repo import (
     TrainingRepoABC,
     UpdateTrainedExpression,
@@ -12,10 +16,12 @@ from services.assistant import (
     GeneralJudgementResponse,
     VeniceAssistant,
 )
+from services.llm_executor import get_llm_executor
 from models.models import UserExpression
 
 
 MAX_EXPRESSIONS_TO_TRAIN = 10
+GRADING_JOB = "daily_writing.grading"
 
 
 class WritingTrainingExpression(TypedDict):
@@ -50,9 +56,32 @@ class DailyWriting:
         user_id: str,
         training_repo: type[TrainingRepoABC],
         assistant: type[VeniceAssistant],
+        combined_judgement: bool | None = None,
+        jobs_dao: type[JobsDAO] = JobsDAO,
+        background_grading: bool | None = None,
     ) -> None:
-        self.repo = training_repo(user_id)
+        self.user_id = user_id
+        self._training_repo = training_repo
         self.assistant = assistant()
+        self.jobs_dao = jobs_dao()
+        # detect and judge the expressions in one model call
+        self.combined_judgement = (
+            is_feature_flag_enabled("DAILY_WRITING_COMBINED_JUDGEMENT")
+            if combined_judgement is None
+            else combined_judgement
+        )
+        # the writing is stored at once and graded by the job worker
+        self.background_grading = (
+            is_feature_flag_enabled("DAILY_WRITING_BACKGROUND_GRADING")
+            if background_grading is None
+            else background_grading
+        )
+
+    @cached_property
+    def repo(self) -> TrainingRepoABC:
+        # created on the first use, it reads the db,
+        # the job worker makes the model calls before
+        return self._training_repo(self.user_id)
 
     def get_challenge(self) -> DailyWritingData:
         return {
@@ -76,28 +105,27 @@ class DailyWriting:
     ) -> DailyWritingData:
 
         expressions_to_train = self.repo.get_by_ids(expressions_to_train_ids)
-        expressions_to_detect = self._build_expressions_to_detect_message(
-            expressions_to_train
+        general_judgement, judgments = self._get_judgements(
+            text, self._build_expression_usage_request(expressions_to_train)
+        )
+        return self._save_judgements(
+            text, expressions_to_train, general_judgement, judgments
         )
-        (
-            general_judgement,
-            detected_expression_ids,
-        ) = self._get_general_judgement(text, expressions_to_detect)
-
-        judgments = []
-
-        if detected_expression_ids.expressions:
-            judgments = self._get_expression_usage_judgement(
-                text,
-                self._build_expression_usage_request(
-                    expressions_to_train, detected_expression_ids.expressions
-                ),
-            )
 
+    def _save_judgements(
+        self,
+        text: str,
+        expressions_to_train: list[UserExpression],
+        general_judgement: GeneralJudgementResponse,
+        judgments: list[ExpressionUsageResponse],
+        commit: bool = True,
+    ) -> DailyWritingData:
+        if judgments:
             self.repo.update_expressions(
                 self._get_trined_expressions_to_update(
                     expressions_to_train, judgments
-                )
+                ),
+                commit=commit,
             )
 
         data: DailyWritingData = {
@@ -141,35 +169,119 @@ class DailyWriting:
 
         return data
 
-    def _get_general_judgement(
+    def enqueue_writing(
+        self, text: str, expressions_to_train_ids: list[str]
+    ) -> str:
+        """
+        Store the writing in the grading job, return the job id.
+        The job worker submits it, the result is the job result.
+        """
+        job = self.jobs_dao.enqueue(
+            self.user_id,
+            GRADING_JOB,
+            {
+                "text": text,
+                "expressionsIds": expressions_to_train_ids,
+                # the worker judges the writing before it reads the db
+                "expressions": [
+                    {**request, "id": str(request["id"])}
+                    for request in self._build_expression_usage_request(
+                        self.repo.get_by_ids(expressions_to_train_ids)
+                    )
+                ],
+            },
+        )
+        return str(job.id)
+
+    def grade_writing(
         self,
         text: str,
-        expressions_to_detect: list[ExpressionDetectionRequest],
-    ):
-        with ThreadPoolExecutor() as executor:
-            future_general_judgement = executor.submit(
-                self.assistant.get_general_judgement, text
+        expressions_to_train_ids: list[str],
+        expressions: list[ExpressionUsageRequest],
+    ) -> DailyWritingData:
+        """
+        Submit the writing of the grading job, it's called by the job worker.
+        The writing is judged before the db is read. Nothing is committed
+        here, the changes are committed with the job result, so a retried
+        job doesn't apply them twice.
+        """
+        general_judgement, judgments = self._get_judgements(text, expressions)
+        return self._save_judgements(
+            text,
+            self.repo.get_by_ids(expressions_to_train_ids),
+            general_judgement,
+            judgments,
+            commit=False,
+        )
+
+    def get_graded_writing(
+        self, job_id: str
+    ) -> tuple[dict, DailyWritingData] | None:
+        """
+        The grading job and the data to show: the result of the done job,
+        the challenge with the writing not graded yet otherwise
+        """
+        job = self.jobs_dao.get(self.user_id, job_id)
+        if job is None:
+            return None
+        if job.status == JobStatus.DONE.value:
+            return job.serialize(), job.result
+
+        data = self.get_challenge()
+        data["lastWriting"] = {
+            "userText": job.payload["text"],
+            "comment": None,
+        }
+        return job.serialize(), data
+
+    def _get_judgements(
+        self, text: str, expressions: list[ExpressionUsageRequest]
+    ) -> tuple[GeneralJudgementResponse, list[ExpressionUsageResponse]]:
+        if self.combined_judgement:
+            general_judgement, judgments = get_llm_executor().gather(
+                self.assistant.aget_general_judgement(text),
+                self.assistant.ajudge_expressions_usage(text, expressions),
             )
-            future_detected_expression_ids = executor.submit(
-                self.assistant.detect_phrases_usage,
+            return general_judgement, judgments
+
+        (
+            general_judgement,
+            detected_expression_ids,
+        ) = self._get_general_judgement(
+            text,
+            self._build_expressions_to_detect_message(expressions),
+        )
+        judgments = []
+        if detected_expression_ids.expressions:
+            judgments = self._get_expression_usage_judgement(
                 text,
-                expressions_to_detect,
+                [
+                    expression
+                    for expression in expressions
+                    if str(expression["id"])
+                    in detected_expression_ids.expressions
+                ],
             )
-            general_judgement = future_general_judgement.result()
-            detected_expression_ids = future_detected_expression_ids.result()
+        return general_judgement, judgments
 
+    def _get_general_judgement(
+        self,
+        text: str,
+        expressions_to_detect: list[ExpressionDetectionRequest],
+    ):
+        general_judgement, detected_expression_ids = get_llm_executor().gather(
+            self.assistant.aget_general_judgement(text),
+            self.assistant.adetect_phrases_usage(text, expressions_to_detect),
+        )
         return general_judgement, detected_expression_ids
 
     @staticmethod
     def _build_expressions_to_detect_message(
-        user_expressions: list[UserExpression],
+        expressions: list[ExpressionUsageRequest],
     ) -> list[ExpressionDetectionRequest]:
         return [
-            {
-                "id": user_expr.expression_id,
-                "expression": user_expr.expression.expression,
-            }
-            for user_expr in user_expressions
+            {"id": expression["id"], "expression": expression["expression"]}
+            for expression in expressions
         ]
 
     def _get_expression_usage_judgement(
@@ -177,22 +289,18 @@ class DailyWriting:
         text: str,
         expressions_usage_requests: list[ExpressionUsageRequest],
     ) -> list[ExpressionUsageResponse]:
-        with ThreadPoolExecutor() as executor:
-            futures = [
-                executor.submit(
-                    self.assistant.get_expression_usage_judgement,
-                    text,
-                    expression_usage_request,
+        return get_llm_executor().gather(
+            *(
+                self.assistant.aget_expression_usage_judgement(
+                    text, expression_usage_request
                 )
                 for expression_usage_request in expressions_usage_requests
-            ]
-            judgments = [future.result() for future in as_completed(futures)]
-        return judgments
+            ),
+        )
 
+    @staticmethod
     def _build_expression_usage_request(
-        self,
         user_expressions: list[UserExpression],
-        expressions_ids: list[str],
     ) -> list[ExpressionUsageRequest]:
         return [
             {
@@ -201,7 +309,6 @@ class DailyWriting:
                 "meaning": user_expr.expression.definition,
             }
             for user_expr in user_expressions
-            if str(user_expr.expression_id) in expressions_ids
         ]
 
     def _get_trined_expressions_to_update(
@@ -214,12 +321,13 @@ class DailyWriting:
         }
         expressions_to_update = []
         for expr in expressions_to_train:
-            if expr.expression_id in trained_expressions_data:
+            # the ids of the judgements of a job are strings
+            if str(expr.expression_id) in trained_expressions_data:
                 expressions_to_update.append(
                     {
                         "user_expression": expr,
                         "is_trained_successfully": trained_expressions_data[
-                            expr.expression_id
+                            str(expr.expression_id)
                         ],
                     }
                 )
@@ -1,28 +1,37 @@
-from typing import TypedDict
+from concurrent.futures import Future
+from typing import Any, Iterator, TypedDict
 from uuid import uuid4
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from helpers.ff_helper import is_feature_flag_enabled
 from helpers.time_helpers import get_current_utc_time
+from helpers.token_helper import estimate_messages_tokens
 from repository.dialogue_training_repo import DialogueTrainingRepo
 from dao.user_expressions_dao import UserExpressionsDAO
-from models.models import Dialogue, UserExpression
+from models.models import Dialogue, DialogueMessage, UserExpression
 from services.assistant import (
     ExpressionDetectionResponse,
+    ExpressionUsageRequest,
     ExpressionUsageResponse,
     GeneralJudgementResponse,
     VeniceAssistant,
 )
+from services.llm_executor import get_llm_executor
 from exercises.common import calculate_knowledge_level
 
 
 DEFAULT_SETTINGS = {"maxExpressionsToTrain": 10}
-DEFAULT_DIALOGUE = [
-    {
-        "id": 1,
-        "role": "assistant",
-        "text": "Hello! What are we going to talk about?",
-    },
-]
+DEFAULT_GREETING = "Hello! What are we going to talk about?"
+# messages shown on the dialogue page at once
+MESSAGES_PAGE_SIZE = 50
+# only the last messages are sent to complete the dialogue,
+# the earlier ones get there as the dialogue summary
+PROMPT_MESSAGES_COUNT = 20
+# estimated tokens of the history sent to complete the dialogue, above it
+# the earlier messages are condensed into the summary,
+# can be changed with the "historyTokenBudget" dialogue setting
+HISTORY_TOKEN_BUDGET = 1500
+# the last messages that are not summarized
+SUMMARY_KEEP_MESSAGES_COUNT = 6
 DEFAULT_PROPERTIES = {
     "trainedExpressionsCount": 0,
 }
@@ -34,13 +43,19 @@ class DialogueListItemDict(TypedDict):
     description: str
 
 
+# ("token", part of the answer), ("comment", statement problems)
+# or ("expressions", dialogue expressions)
+DialogueEvent = tuple[str, Any]
+
+
 class DialogueDict(TypedDict):
     id: str
     title: str
     description: str
     settings: dict
-    dialogues: list[dict]
+    dialogue: list[dict]
     expressions: list[dict]
+    previousPageBefore: int | None
 
 
 class DialogueTraining:
@@ -50,11 +65,18 @@ class DialogueTraining:
         dialogue_repo: DialogueTrainingRepo = DialogueTrainingRepo,
         user_expr_repo: UserExpressionsDAO = UserExpressionsDAO,
         assistant: VeniceAssistant = VeniceAssistant,
+        combined_judgement: bool | None = None,
     ):
         self.user_id = user_id
         self.dialogue_repo = dialogue_repo(user_id)
         self.user_expr_repo = user_expr_repo(user_id)
         self.assistant = assistant()
+        # detect and judge the expressions in one model call
+        self.combined_judgement = (
+            is_feature_flag_enabled("DIALOGUE_TRAINING_COMBINED_JUDGEMENT")
+            if combined_judgement is None
+            else combined_judgement
+        )
 
     def get_dialogues(self):
         """Return a list of dialogues for the user"""
@@ -76,7 +98,7 @@ class DialogueTraining:
         """Create a new dialogue and return the dialogue id"""
         id_ = str(uuid4())
         expressions = self.user_expr_repo.get_trained_expressions(
-            int(DEFAULT_SETTINGS["maxExpressionsToTrain"])
+            int(DEFAULT_SETTINGS["maxExpressionsToTrain"]), profile="list"
         )
         expressions_list = [
             {
@@ -93,11 +115,11 @@ class DialogueTraining:
             title=title,
             properties=DEFAULT_PROPERTIES,
             settings=DEFAULT_SETTINGS,
-            dialogues=DEFAULT_DIALOGUE,
             expressions=expressions_list,
             added=get_current_utc_time(),
             updated=get_current_utc_time(),
         )
+        dialogue.add_message(DEFAULT_GREETING, "assistant")
 
         if description:
             dialogue.description = description
@@ -110,38 +132,140 @@ class DialogueTraining:
         """Delete a dialogue by id"""
         self.dialogue_repo.delete(dialogue_id)
 
-    def get_dialogue(self, dialogue_id: str) -> dict:
-        """Return a dialogue by id"""
-        dialogue = self.dialogue_repo.get(dialogue_id)
-        return {
-            "id": dialogue.id,
-            "title": dialogue.title,
-            "description": dialogue.description,
-            "settings": dialogue.settings,
-            "dialogue": dialogue.dialogues,
-            "expressions": dialogue.expressions,
-        }
+    def get_dialogue(
+        self, dialogue_id: str, before: int | None = None
+    ) -> DialogueDict:
+        """
+        Return a dialogue by id with a page of its messages,
+        the last ones or the ones sent before the "before" message id
+        """
+        return self._serialize_dialogue(
+            self.dialogue_repo.get(dialogue_id), before
+        )
 
     def submit_dialogue_statement(
         self, dialogue_id: str, statement: str
-    ) -> dict:
+    ) -> DialogueDict:
         """Submit a statement to the dialogue and return the updated dialogue"""
         dialogue = self.dialogue_repo.get(dialogue_id)
+        last_messages = self._get_history(dialogue_id, dialogue)
         (
             dialogue_completion_response,
             general_judgement,
-            detected_expression_ids,
+            judgments,
         ) = self._get_statement_dedicated_assistant_response(
-            self._build_dialogue_complete_message(dialogue, statement),
+            self._build_dialogue_complete_message(
+                dialogue, last_messages, statement
+            ),
             statement,
-            self._build_expressions_to_detect_message(dialogue),
+            dialogue,
         )
-        if detected_expression_ids.expressions:
+        dialogue = self._save_statement(
+            dialogue,
+            statement,
+            dialogue_completion_response,
+            general_judgement,
+            judgments,
+        )
+
+        return self._serialize_dialogue(dialogue)
+
+    def stream_dialogue_statement(
+        self, dialogue_id: str, statement: str
+    ) -> Iterator[DialogueEvent]:
+        """
+        Submit a statement to the dialogue, the answer is yielded
+        by parts while the statement is judged, then the comment
+        on the statement and the updated dialogue expressions
+        """
+        dialogue = self.dialogue_repo.get(dialogue_id)
+        last_messages = self._get_history(dialogue_id, dialogue)
+        # started before the answer, an overloaded executor
+        # rejects the statement before the stream begins
+        judgements = self._submit_judgements(statement, dialogue)
+        messages = self._build_dialogue_complete_message(
+            dialogue, last_messages, statement
+        )
+        # saved before the stream, the statement is kept
+        # when the client leaves before the answer ends
+        statement_message = dialogue.add_message(statement, "user")
+        dialogue.updated = get_current_utc_time()
+        self.dialogue_repo.update(dialogue)
+        return self._stream_statement(
+            dialogue, statement_message, messages, judgements
+        )
+
+    def _stream_statement(
+        self,
+        dialogue: Dialogue,
+        statement_message: DialogueMessage,
+        messages: list[dict],
+        judgements: Future,
+    ) -> Iterator[DialogueEvent]:
+        answer = []
+        for token in self.assistant.stream_dialogue(messages):
+            answer.append(token)
+            yield "token", token
+
+        general_judgement, usage = judgements.result()
+        comment = self._get_comment(general_judgement)
+        yield "comment", comment
+
+        if self.combined_judgement:
+            judgments = usage
+        elif usage.expressions:
             judgments = self._get_expression_usage_judgement(
-                statement,
-                detected_expression_ids,
-                dialogue,
+                statement_message.text, usage, dialogue
             )
+        else:
+            judgments = []
+        dialogue = self._apply_judgements(dialogue, judgments)
+        statement_message.comment = comment
+        self.dialogue_repo.update_message(statement_message)
+        dialogue.add_message("".join(answer), "assistant")
+        dialogue.updated = get_current_utc_time()
+        self.dialogue_repo.update(dialogue)
+        yield "expressions", dialogue.expressions
+
+    def _submit_judgements(self, statement: str, dialogue: Dialogue) -> Future:
+        """
+        General judgement with the usage judgements of the combined mode
+        or the detected expressions
+        """
+        if self.combined_judgement:
+            usage = self.assistant.ajudge_expressions_usage(
+                statement, self._build_expression_usage_request(dialogue)
+            )
+        else:
+            usage = self.assistant.adetect_phrases_usage(
+                statement, self._build_expressions_to_detect_message(dialogue)
+            )
+        return get_llm_executor().submit(
+            self.assistant.aget_general_judgement(statement), usage
+        )
+
+    def _save_statement(
+        self,
+        dialogue: Dialogue,
+        statement: str,
+        dialogue_completion_response: str,
+        general_judgement: GeneralJudgementResponse,
+        judgments: list[ExpressionUsageResponse],
+    ) -> Dialogue:
+        dialogue = self._apply_judgements(dialogue, judgments)
+        dialogue = self._update_dialogue_messages(
+            dialogue,
+            statement,
+            dialogue_completion_response,
+            general_judgement,
+        )
+        self.dialogue_repo.update(dialogue)
+        return dialogue
+
+    def _apply_judgements(
+        self, dialogue: Dialogue, judgments: list[ExpressionUsageResponse]
+    ) -> Dialogue:
+        if judgments:
             user_expressions_to_update = self._user_expressions_to_update(
                 judgments
             )
@@ -153,31 +277,99 @@ class DialogueTraining:
                 judgments,
                 user_expressions_to_update,
             )
-        dialogue = self._enrich_dialogue_expressions(dialogue)
-        dialogue = self._update_dialogue_messages(
-            dialogue,
-            statement,
-            dialogue_completion_response,
-            general_judgement,
-        )
-        self.dialogue_repo.update(dialogue)
+        return self._enrich_dialogue_expressions(dialogue)
 
+    def _serialize_dialogue(
+        self, dialogue: Dialogue, before: int | None = None
+    ) -> DialogueDict:
+        messages = self.dialogue_repo.get_messages(
+            str(dialogue.id), before=before, limit=MESSAGES_PAGE_SIZE
+        )
         return {
             "id": dialogue.id,
             "title": dialogue.title,
             "description": dialogue.description,
-            "dialogue": dialogue.dialogues,
+            "settings": dialogue.settings,
+            "dialogue": [message.serialize() for message in messages],
             "expressions": dialogue.expressions,
+            "previousPageBefore": messages[0].seq
+            if messages and messages[0].seq > 1
+            else None,
         }
 
+    def _get_history(
+        self, dialogue_id: str, dialogue: Dialogue
+    ) -> list[DialogueMessage]:
+        """
+        Return the last messages that are not in the dialogue summary.
+        When they don't fit the budget or the window, the earlier ones
+        are condensed into the summary first.
+        """
+        summary_seq = dialogue.properties.get("summarySeq", 0)
+        # all the messages not summarized yet, there can be more than
+        # the window in the dialogues started before the summary
+        messages = self.dialogue_repo.get_messages(
+            dialogue_id, after=summary_seq
+        )
+        budget = int(
+            dialogue.settings.get("historyTokenBudget", HISTORY_TOKEN_BUDGET)
+        )
+        if (
+            len(messages) < PROMPT_MESSAGES_COUNT
+            and estimate_messages_tokens(
+                self._build_history_messages(dialogue, messages)
+            )
+            <= budget
+        ):
+            return messages
+
+        split = max(0, len(messages) - SUMMARY_KEEP_MESSAGES_COUNT)
+        # the kept messages are summarized too while they alone
+        # don't fit the budget, the last one is always kept
+        while (
+            split < len(messages) - 1
+            and estimate_messages_tokens(
+                self._to_chat_messages(messages[split:])
+            )
+            > budget
+        ):
+            split += 1
+
+        if to_summarize := messages[:split]:
+            summary = self.assistant.summarize_dialogue(
+                dialogue.properties.get("summary"),
+                self._to_chat_messages(to_summarize),
+            )
+            dialogue.set_summary(summary, to_summarize[-1].seq)
+        return messages[split:]
+
     @staticmethod
+    def _to_chat_messages(messages: list[DialogueMessage]) -> list[dict]:
+        return [
+            {"role": message.role, "content": message.text}
+            for message in messages
+        ]
+
+    def _build_history_messages(
+        self, dialogue: Dialogue, messages: list[DialogueMessage]
+    ) -> list[dict]:
+        history = []
+        if summary := dialogue.properties.get("summary"):
+            history.append(
+                {
+                    "role": "system",
+                    "content": f"Summary of the conversation so far: {summary}",
+                }
+            )
+        return history + self._to_chat_messages(messages)
+
     def _build_dialogue_complete_message(
-        dialogue: Dialogue, statement: str
+        self,
+        dialogue: Dialogue,
+        last_messages: list[DialogueMessage],
+        statement: str,
     ) -> list[dict]:
-        messages = [
-            {"role": message["role"], "content": message["text"]}
-            for message in dialogue.dialogues
-        ]
+        messages = self._build_history_messages(dialogue, last_messages)
         messages.append({"role": "user", "content": statement})
         return messages
 
@@ -189,30 +381,56 @@ class DialogueTraining:
         ]
         return expressions_to_detect
 
+    @staticmethod
+    def _build_expression_usage_request(
+        dialogue: Dialogue,
+    ) -> list[ExpressionUsageRequest]:
+        return [
+            {
+                "id": expr["id"],
+                "expression": expr["expression"],
+                "meaning": expr["definition"],
+            }
+            for expr in dialogue.expressions
+        ]
+
     def _get_statement_dedicated_assistant_response(
         self,
         messages: list[dict],
         statement: str,
-        expressions_to_detect: list[dict],
-    ) -> tuple[str, GeneralJudgementResponse, ExpressionDetectionResponse]:
-        with ThreadPoolExecutor() as executor:
-            future_assistant_message = executor.submit(
-                self.assistant.complete_dialogue, messages
-            )
-            future_general_judgement = executor.submit(
-                self.assistant.get_general_judgement, statement
-            )
-            future_detected_expression_ids = executor.submit(
-                self.assistant.detect_phrases_usage,
-                statement,
-                expressions_to_detect,
+        dialogue: Dialogue,
+    ) -> tuple[str, GeneralJudgementResponse, list[ExpressionUsageResponse]]:
+        if self.combined_judgement:
+            (
+                assistant_message,
+                general_judgement,
+                judgments,
+            ) = get_llm_executor().gather(
+                self.assistant.acomplete_dialogue(messages),
+                self.assistant.aget_general_judgement(statement),
+                self.assistant.ajudge_expressions_usage(
+                    statement, self._build_expression_usage_request(dialogue)
+                ),
             )
+            return assistant_message, general_judgement, judgments
 
-            assistant_message = future_assistant_message.result()
-            general_judgement = future_general_judgement.result()
-            detected_expression_ids = future_detected_expression_ids.result()
-
-        return assistant_message, general_judgement, detected_expression_ids
+        (
+            assistant_message,
+            general_judgement,
+            detected_expression_ids,
+        ) = get_llm_executor().gather(
+            self.assistant.acomplete_dialogue(messages),
+            self.assistant.aget_general_judgement(statement),
+            self.assistant.adetect_phrases_usage(
+                statement, self._build_expressions_to_detect_message(dialogue)
+            ),
+        )
+        judgments = []
+        if detected_expression_ids.expressions:
+            judgments = self._get_expression_usage_judgement(
+                statement, detected_expression_ids, dialogue
+            )
+        return assistant_message, general_judgement, judgments
 
     def _get_expression_usage_judgement(
         self,
@@ -220,10 +438,9 @@ class DialogueTraining:
         detected_expression_ids: ExpressionDetectionResponse,
         dialogue: Dialogue,
     ) -> list[ExpressionUsageResponse]:
-        with ThreadPoolExecutor() as executor:
-            futures = [
-                executor.submit(
-                    self.assistant.get_expression_usage_judgement,
+        return get_llm_executor().gather(
+            *(
+                self.assistant.aget_expression_usage_judgement(
                     statement,
                     {
                         "id": expression_id,
@@ -236,9 +453,8 @@ class DialogueTraining:
                     },
                 )
                 for expression_id in detected_expression_ids.expressions
-            ]
-            judgments = [future.result() for future in as_completed(futures)]
-        return judgments
+            ),
+        )
 
     def _user_expressions_to_update(
         self, judgments: list[ExpressionUsageResponse]
@@ -295,7 +511,9 @@ class DialogueTraining:
             ]
             user_expressions_to_add = (
                 self.user_expr_repo.get_trained_expressions(
-                    limit=dif, excludes=existing_expression_ids
+                    limit=dif,
+                    excludes=existing_expression_ids,
+                    profile="list",
                 )
             )
             dialogue.add_expressions(
@@ -315,7 +533,19 @@ class DialogueTraining:
         dialogue_completion_response: str,
         general_judgement: GeneralJudgementResponse,
     ) -> Dialogue:
-        comment = [
+        dialogue.add_message(
+            statement, "user", comment=self._get_comment(general_judgement)
+        )
+        dialogue.add_message(dialogue_completion_response, "assistant")
+        dialogue.updated = get_current_utc_time()
+
+        return dialogue
+
+    @staticmethod
+    def _get_comment(
+        general_judgement: GeneralJudgementResponse,
+    ) -> list[dict]:
+        return [
             {
                 "problem": item.problem,
                 "explanation": item.explanation,
@@ -324,8 +554,3 @@ class DialogueTraining:
             for item in general_judgement.problems
             if item.problem not in ("None", "")
         ]
-        dialogue.add_message(statement, "user", comment=comment)
-        dialogue.add_message(dialogue_completion_response, "assistant")
-        dialogue.updated = get_current_utc_time()
-
-        return dialogue
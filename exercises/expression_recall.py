@@ -22,7 +22,11 @@ class ExpressionRecall:
     def get_challenge(self) -> Optional[ChallengeDict]:
         """return an expression with the latest 'last_practice_time'"""
 
-        if not (user_exprs := self.repo.get_trained_expressions(limit=1)):
+        if not (
+            user_exprs := self.repo.get_trained_expressions(
+                limit=1, profile="challenge"
+            )
+        ):
             return
 
         user_expr = user_exprs[0]
@@ -62,7 +66,7 @@ class ExpressionRecall:
         """returns list of expressions that are needed to be recalled,
         sorted by last practice time in ascending order"""
 
-        user_exprs = self.repo.get_trained_expressions()
+        user_exprs = self.repo.get_trained_expressions(profile="list")
         return [
             get_exercise_expressions_list_item(
                 user_expr.expression_id,
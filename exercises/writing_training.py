@@ -1,18 +1,21 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import TypedDict
 from uuid import uuid4
 
 from exercises.common import calculate_knowledge_level
+from helpers.ff_helper import is_feature_flag_enabled
 from repository.writings_repo import WritingsRepo
+from dao.jobs_dao import JobsDAO
 from dao.user_expressions_dao import UserExpressionsDAO
 from helpers.time_helpers import get_current_utc_time
 from models.models import UserExpression, Writings
 from services.assistant import (
     ExpressionDetectionResponse,
+    ExpressionUsageRequest,
     ExpressionUsageResponse,
     GeneralJudgementResponse,
     VeniceAssistant,
 )
+from services.llm_executor import get_llm_executor
 
 
 class WritingChallenge(TypedDict):
@@ -24,6 +27,7 @@ DEFAULT_PROPERTIES = {
     "maxExpressionsToTrain": 10,
     "maxWritingsToStore": 10,
 }
+GRADING_JOB = "writing_training.grading"
 
 
 class WritingTraining:
@@ -33,11 +37,27 @@ class WritingTraining:
         writings_repo: type[WritingsRepo] = WritingsRepo,
         user_expr_repo: type[UserExpressionsDAO] = UserExpressionsDAO,
         assistant: type[VeniceAssistant] = VeniceAssistant,
+        combined_judgement: bool | None = None,
+        jobs_dao: type[JobsDAO] = JobsDAO,
+        background_grading: bool | None = None,
     ):
         self.user_id = user_id
         self.writings_repo: WritingsRepo = writings_repo(self.user_id)
         self.user_expr_repo: UserExpressionsDAO = user_expr_repo(self.user_id)
         self.assistant: VeniceAssistant = assistant()
+        self.jobs_dao: JobsDAO = jobs_dao()
+        # detect and judge the expressions in one model call
+        self.combined_judgement = (
+            is_feature_flag_enabled("WRITING_TRAINING_COMBINED_JUDGEMENT")
+            if combined_judgement is None
+            else combined_judgement
+        )
+        # the writing is stored at once and graded by the job worker
+        self.background_grading = (
+            is_feature_flag_enabled("WRITING_TRAINING_BACKGROUND_GRADING")
+            if background_grading is None
+            else background_grading
+        )
 
     # for now we store only one writing training per user
     def get_writings(self) -> WritingChallenge:
@@ -47,19 +67,11 @@ class WritingTraining:
     def submit_writing(self, text: str) -> WritingChallenge:
         writings = self.writings_repo.get()
 
-        (
-            general_judgement,
-            detected_expression_ids,
-        ) = self._get_general_judgement(
-            text, self._build_expressions_to_detect_message(writings)
+        general_judgement, judgments = self._get_judgements(
+            text, writings.expressions
         )
 
-        if detected_expression_ids.expressions:
-            judgments = self._get_expression_usage_judgement(
-                text,
-                detected_expression_ids,
-                writings,
-            )
+        if judgments:
             user_expressions_to_update = self._user_expressions_to_update(
                 judgments
             )
@@ -81,13 +93,106 @@ class WritingTraining:
 
         return self._generate_writing_challenge(writings)
 
+    def enqueue_writing(self, text: str) -> str:
+        """Store the writing without a comment, return the grading job id"""
+        writings = self.writings_repo.get()
+        writings.add_message(text)
+        message = writings.writings[-1]
+        writings.updated = get_current_utc_time()
+        # the message gets its id when it's stored,
+        # it's committed with the job
+        self.writings_repo.add(writings, commit=False)
+        job = self.jobs_dao.enqueue(
+            self.user_id,
+            GRADING_JOB,
+            {
+                "messageId": message["id"],
+                "text": text,
+                # the writing is judged against the expressions shown
+                # when it was written, not the ones of the grading time
+                "expressions": [
+                    {
+                        "id": expr["id"],
+                        "expression": expr["expression"],
+                        "definition": expr["definition"],
+                    }
+                    for expr in writings.expressions
+                ],
+            },
+        )
+        return str(job.id)
+
+    def grade_writing(
+        self, message_id: int, text: str, expressions: list[dict]
+    ) -> None:
+        """
+        Grade the stored writing, it's called by the job worker.
+        The writing is judged before the db is read. Nothing is committed
+        here, the changes are committed with the job, so a retried job
+        doesn't apply them twice.
+        """
+        general_judgement, judgments = self._get_judgements(text, expressions)
+
+        writings = self.writings_repo.get()
+        message = next(
+            (
+                message
+                for message in writings.writings
+                if message["id"] == message_id
+            ),
+            None,
+        )
+        if message is None or message.get("comment") is not None:
+            # removed or graded already
+            return
+
+        if judgments:
+            user_expressions_to_update = self._user_expressions_to_update(
+                judgments
+            )
+            writings = self._update_dialogue_expressions_status(
+                writings,
+                # the expressions replaced since the submit are not updated
+                [
+                    judgement
+                    for judgement in judgments
+                    if writings.get_expression(judgement.id)
+                ],
+            )
+            self._update_user_expressions(
+                judgments,
+                user_expressions_to_update,
+                commit=False,
+            )
+
+        writings = self._enrich_expressions(writings)
+        writings.updated = get_current_utc_time()
+        self.writings_repo.add(writings, commit=False)
+        self.writings_repo.set_message_comment(
+            writings,
+            message_id,
+            self._get_comment(general_judgement),
+            commit=False,
+        )
+
     def _update_dialogue_messages(
         self,
         writings: Writings,
         text: str,
         general_judgement: GeneralJudgementResponse,
     ) -> Writings:
-        comment = [
+        writings.add_message(
+            text, comment=self._get_comment(general_judgement)
+        )
+        writings.updated = get_current_utc_time()
+
+        return writings
+
+    @staticmethod
+    def _get_comment(
+        general_judgement: GeneralJudgementResponse,
+    ) -> list[dict]:
+        return [
             {
                 "problem": item.problem,
                 "explanation": item.explanation,
@@ -96,15 +201,12 @@ class WritingTraining:
             for item in general_judgement.problems
             if item.problem not in ("None", "")
         ]
-        writings.add_message(text, comment=comment)
-        writings.updated = get_current_utc_time()
-
-        return writings
 
     def _update_user_expressions(
         self,
         judgments: list[ExpressionUsageResponse],
         user_expressions_to_update: list[UserExpression],
+        commit: bool = True,
     ):
         for judgement in judgments:
             for user_expression in user_expressions_to_update:
@@ -118,7 +220,7 @@ class WritingTraining:
                     )
                     user_expression.practice_count += 1
                     user_expression.last_practice_time = get_current_utc_time()
-                    self.user_expr_repo.put(user_expression)
+                    self.user_expr_repo.put(user_expression, commit=commit)
 
     @staticmethod
     def _update_dialogue_expressions_status(
@@ -145,54 +247,85 @@ class WritingTraining:
         )
         return user_expressions_to_update
 
+    def _get_judgements(
+        self, text: str, expressions: list[dict]
+    ) -> tuple[GeneralJudgementResponse, list[ExpressionUsageResponse]]:
+        if self.combined_judgement:
+            general_judgement, judgments = get_llm_executor().gather(
+                self.assistant.aget_general_judgement(text),
+                self.assistant.ajudge_expressions_usage(
+                    text, self._build_expression_usage_request(expressions)
+                ),
+            )
+            return general_judgement, judgments
+
+        (
+            general_judgement,
+            detected_expression_ids,
+        ) = self._get_general_judgement(
+            text, self._build_expressions_to_detect_message(expressions)
+        )
+        judgments = []
+        if detected_expression_ids.expressions:
+            judgments = self._get_expression_usage_judgement(
+                text, detected_expression_ids, expressions
+            )
+        return general_judgement, judgments
+
+    @staticmethod
+    def _build_expression_usage_request(
+        expressions: list[dict],
+    ) -> list[ExpressionUsageRequest]:
+        return [
+            {
+                "id": expr["id"],
+                "expression": expr["expression"],
+                "meaning": expr["definition"],
+            }
+            for expr in expressions
+        ]
+
     def _get_expression_usage_judgement(
         self,
         text: str,
         detected_expression_ids: ExpressionDetectionResponse,
-        writings: Writings,
+        expressions: list[dict],
     ) -> list[ExpressionUsageResponse]:
-        with ThreadPoolExecutor() as executor:
-            futures = [
-                executor.submit(
-                    self.assistant.get_expression_usage_judgement,
+        expressions_by_id = {expr["id"]: expr for expr in expressions}
+        return get_llm_executor().gather(
+            *(
+                self.assistant.aget_expression_usage_judgement(
                     text,
                     {
                         "id": expression_id,
-                        "expression": writings.get_expression(expression_id)[
+                        "expression": expressions_by_id[expression_id][
                             "expression"
                         ],
-                        "meaning": writings.get_expression(expression_id)[
+                        "meaning": expressions_by_id[expression_id][
                             "definition"
                         ],
                     },
                 )
                 for expression_id in detected_expression_ids.expressions
-            ]
-            judgments = [future.result() for future in as_completed(futures)]
-        return judgments
+            ),
+        )
 
     def _get_general_judgement(
         self, text: str, expressions_to_detect: list[dict]
     ):
-        with ThreadPoolExecutor() as executor:
-            future_general_judgement = executor.submit(
-                self.assistant.get_general_judgement, text
-            )
-            future_detected_expression_ids = executor.submit(
-                self.assistant.detect_phrases_usage,
-                text,
-                expressions_to_detect,
-            )
-            general_judgement = future_general_judgement.result()
-            detected_expression_ids = future_detected_expression_ids.result()
-
+        general_judgement, detected_expression_ids = get_llm_executor().gather(
+            self.assistant.aget_general_judgement(text),
+            self.assistant.adetect_phrases_usage(text, expressions_to_detect),
+        )
         return general_judgement, detected_expression_ids
 
     @staticmethod
-    def _build_expressions_to_detect_message(writings: Writings) -> list[dict]:
+    def _build_expressions_to_detect_message(
+        expressions: list[dict],
+    ) -> list[dict]:
         expressions_to_detect = [
             {"id": expr["id"], "expression": expr["expression"]}
-            for expr in writings.expressions
+            for expr in expressions
         ]
         return expressions_to_detect
 
@@ -221,7 +354,9 @@ class WritingTraining:
             ]
             user_expressions_to_add = (
                 self.user_expr_repo.get_trained_expressions(
-                    limit=dif, excludes=existing_expression_ids
+                    limit=dif,
+                    excludes=existing_expression_ids,
+                    profile="list",
                 )
             )
             writings.add_expressions(
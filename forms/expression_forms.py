@@ -71,3 +71,7 @@ class PostExpressionForm(FlaskForm):
     @property
     def all_fields(self):
         return list(self._fields.values())
+
+
+class AddExistingExpressionForm(FlaskForm):
+    """Only the csrf token, the expression id is in the url"""
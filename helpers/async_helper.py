@@ -0,0 +1,22 @@
+import asyncio
+import threading
+
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Process-wide event loop running in a background thread,
+    services.llm_executor runs the model calls of all the requests on it.
+    """
+    global _loop
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="async-loop", daemon=True
+                ).start()
+                _loop = loop
+    return _loop
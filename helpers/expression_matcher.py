@@ -0,0 +1,377 @@
+import re
+from collections import deque
+from typing import Iterable, NamedTuple
+
+# words standing for any words of the text, e.g. "get on somebody's nerves"
+SLOT_WORDS = {
+    "somebody",
+    "someone",
+    "something",
+    "sb",
+    "sth",
+    "smb",
+    "smth",
+    "one's",
+    "somebody's",
+    "someone's",
+    "sb's",
+    "smb's",
+}
+# text words a slot can take
+MAX_SLOT_LENGTH = 3
+# words that can be missing or changed in a correct usage,
+# so they don't make a miss
+STOP_WORDS = {
+    "a",
+    "an",
+    "the",
+    "be",
+    "have",
+    "do",
+    "one",
+    "oneself",
+    "yourself",
+}
+IRREGULAR_FORMS = {
+    "am": "be",
+    "is": "be",
+    "are": "be",
+    "was": "be",
+    "were": "be",
+    "been": "be",
+    "being": "be",
+    "has": "have",
+    "had": "have",
+    "does": "do",
+    "did": "do",
+    "done": "do",
+    "went": "go",
+    "gone": "go",
+    "got": "get",
+    "gotten": "get",
+    "made": "make",
+    "took": "take",
+    "taken": "take",
+    "gave": "give",
+    "given": "give",
+    "came": "come",
+    "saw": "see",
+    "seen": "see",
+    "said": "say",
+    "told": "tell",
+    "thought": "think",
+    "brought": "bring",
+    "bought": "buy",
+    "caught": "catch",
+    "kept": "keep",
+    "left": "leave",
+    "felt": "feel",
+    "found": "find",
+    "held": "hold",
+    "knew": "know",
+    "known": "know",
+    "ran": "run",
+    "lost": "lose",
+    "flew": "fly",
+    "flown": "fly",
+    "sang": "sing",
+    "sung": "sing",
+    "spilt": "spill",
+    "began": "begin",
+    "begun": "begin",
+    "drank": "drink",
+    "drunk": "drink",
+    "drove": "drive",
+    "driven": "drive",
+    "ate": "eat",
+    "eaten": "eat",
+    "forgot": "forget",
+    "forgotten": "forget",
+    "grew": "grow",
+    "grown": "grow",
+    "hid": "hide",
+    "hidden": "hide",
+    "meant": "mean",
+    "met": "meet",
+    "paid": "pay",
+    "sold": "sell",
+    "sent": "send",
+    "spent": "spend",
+    "shook": "shake",
+    "shaken": "shake",
+    "slept": "sleep",
+    "spoken": "speak",
+    "stood": "stand",
+    "understood": "understand",
+    "stole": "steal",
+    "stolen": "steal",
+    "stuck": "stick",
+    "swam": "swim",
+    "swum": "swim",
+    "threw": "throw",
+    "thrown": "throw",
+    "tore": "tear",
+    "torn": "tear",
+    "woke": "wake",
+    "woken": "wake",
+    "wore": "wear",
+    "worn": "wear",
+    "won": "win",
+    "wrote": "write",
+    "written": "write",
+    "blew": "blow",
+    "blown": "blow",
+    "built": "build",
+    "drew": "draw",
+    "drawn": "draw",
+    "fought": "fight",
+    "froze": "freeze",
+    "frozen": "freeze",
+    "heard": "hear",
+    "hung": "hang",
+    "led": "lead",
+    "lent": "lend",
+    "sank": "sink",
+    "sunk": "sink",
+    "sat": "sit",
+    "taught": "teach",
+    "wept": "weep",
+    "broke": "break",
+    "broken": "break",
+    "fell": "fall",
+    "fallen": "fall",
+    "put": "put",
+    "set": "set",
+    "let": "let",
+    "cut": "cut",
+    "men": "man",
+    "women": "woman",
+    "children": "child",
+    "feet": "foot",
+    "teeth": "tooth",
+}
+# words ending with "s" that are not plurals, "news" is not "new"
+UNINFLECTED_WORDS = {
+    "news",
+    "series",
+    "species",
+    "means",
+    "always",
+    "perhaps",
+    "whereas",
+    "sometimes",
+    "afterwards",
+    "towards",
+    "besides",
+    "physics",
+    "politics",
+    "economics",
+    "mathematics",
+    "goods",
+    "clothes",
+    "glasses",
+    "lens",
+    "gas",
+    "yes",
+    "this",
+    "his",
+    "its",
+}
+SUFFIX_RULES = (
+    ("ies", "y"),
+    ("ied", "y"),
+    ("ing", ""),
+    ("ed", ""),
+    ("es", ""),
+    ("s", ""),
+)
+VOWELS = set("aeiou")
+# an expression word is in the text when a text word starts the same,
+# e.g. an irregular form missing in IRREGULAR_FORMS, then a model decides
+PREFIX_LENGTH = 3
+
+
+class MatchResult(NamedTuple):
+    # ids of the expressions used in the text for sure
+    hits: list[str]
+    # ids of the expressions that may be used, a model has to decide
+    ambiguous: list[str]
+    # ids of the expressions not used in the text for sure
+    misses: list[str]
+
+
+def tokenize(text: str) -> list[str]:
+    return re.findall(r"[a-z]+(?:'[a-z]+)?", text.lower())
+
+
+def stem(word: str) -> str:
+    """
+    Crude english stem, the same for the inflected forms of a word,
+    e.g. "tries", "tried", "trying" -> "try"
+    """
+    if word.endswith("'s"):
+        word = word[:-2]
+    if word in UNINFLECTED_WORDS:
+        return word
+    word = IRREGULAR_FORMS.get(word, word)
+    for suffix, replacement in SUFFIX_RULES:
+        if (
+            word.endswith(suffix)
+            and len(word) - len(suffix) >= 2
+            # "bus", "class" are not plurals
+            and not (suffix == "s" and word[-2] in ("s", "u"))
+        ):
+            word = word[: -len(suffix)] + replacement
+            break
+    # "running" -> "runn" -> "run"
+    if (
+        len(word) > 3
+        and word[-1] == word[-2]
+        and word[-1] not in VOWELS | {"l", "s"}
+    ):
+        word = word[:-1]
+    # "make", "making" -> "mak"
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]
+    return word
+
+
+class _Automaton:
+    """Aho–Corasick automaton over sequences of stems"""
+
+    def __init__(self, patterns: list[tuple[str, ...]]) -> None:
+        self.patterns = patterns
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[int]] = [[]]
+        for index, pattern in enumerate(patterns):
+            self._add(index, pattern)
+        self._build_fail()
+
+    def _add(self, index: int, pattern: tuple[str, ...]) -> None:
+        state = 0
+        for token in pattern:
+            if token not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][token] = len(self._goto) - 1
+            state = self._goto[state][token]
+        self._output[state].append(index)
+
+    def _build_fail(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(token, 0)
+                if self._fail[next_state] == next_state:
+                    self._fail[next_state] = 0
+                self._output[next_state] += self._output[
+                    self._fail[next_state]
+                ]
+
+    def find(self, tokens: Iterable[str]) -> list[tuple[int, int]]:
+        """(start position, pattern index) of all the occurrences"""
+        found = []
+        state = 0
+        for position, token in enumerate(tokens):
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            for index in self._output[state]:
+                found.append((position - len(self.patterns[index]) + 1, index))
+        return found
+
+
+class ExpressionMatcher:
+    """
+    Finds the expressions in a text without a model: an expression is
+    a hit when all its words are found in a row in any inflected form
+    (slots like "somebody" take 1 to MAX_SLOT_LENGTH words), a miss when
+    none of its words is in the text, not even by the first letters,
+    ambiguous otherwise. A form the stemming doesn't know must not make
+    a miss, so the partial matches are left to a model.
+    """
+
+    def __init__(self, expressions: dict[str, str]) -> None:
+        # the literal parts between the slots of every expression
+        self._segments: dict[str, list[tuple[str, ...]]] = {
+            expression_id: self._split(expression)
+            for expression_id, expression in expressions.items()
+        }
+        patterns = sorted(
+            {
+                segment
+                for segments in self._segments.values()
+                for segment in segments
+            }
+        )
+        self._pattern_indexes = {
+            pattern: index for index, pattern in enumerate(patterns)
+        }
+        self._automaton = _Automaton(patterns)
+
+    def match(self, text: str) -> MatchResult:
+        stems = [stem(token) for token in tokenize(text)]
+        text_stems = set(stems)
+        text_prefixes = {token[:PREFIX_LENGTH] for token in stems}
+        occurrences: dict[int, list[int]] = {}
+        for start, index in self._automaton.find(stems):
+            occurrences.setdefault(index, []).append(start)
+
+        result = MatchResult([], [], [])
+        for expression_id, segments in self._segments.items():
+            if not segments:
+                result.ambiguous.append(expression_id)
+            elif self._is_found(segments, occurrences):
+                result.hits.append(expression_id)
+            elif not any(
+                token in text_stems or token[:PREFIX_LENGTH] in text_prefixes
+                for segment in segments
+                for token in segment
+                if token not in STOP_WORDS
+            ):
+                result.misses.append(expression_id)
+            else:
+                result.ambiguous.append(expression_id)
+        return result
+
+    def _is_found(
+        self,
+        segments: list[tuple[str, ...]],
+        occurrences: dict[int, list[int]],
+    ) -> bool:
+        # positions the next segment can start at, any for the first one
+        ends: set[int] | None = None
+        for segment in segments:
+            starts = occurrences.get(self._pattern_indexes[segment], [])
+            if ends is not None:
+                starts = [
+                    start
+                    for start in starts
+                    if any(1 <= start - end <= MAX_SLOT_LENGTH for end in ends)
+                ]
+            if not starts:
+                return False
+            ends = {start + len(segment) for start in starts}
+        return True
+
+    @staticmethod
+    def _split(expression: str) -> list[tuple[str, ...]]:
+        segments: list[tuple[str, ...]] = []
+        segment: list[str] = []
+        for token in tokenize(expression):
+            if token in SLOT_WORDS:
+                if segment:
+                    segments.append(tuple(segment))
+                segment = []
+            else:
+                segment.append(stem(token))
+        if segment:
+            segments.append(tuple(segment))
+        return segments
@@ -0,0 +1,21 @@
+from typing import Any
+
+from sqlalchemy import Text, cast, func
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def jsonb_append(column: Any, items: list) -> ColumnElement:
+    """
+    Append the items to the jsonb array stored in the column,
+    e.g. UPDATE dialogues SET dialogues = dialogues || '[{...}]'
+    """
+    return column.op("||")(cast(items, JSONB))
+
+
+def jsonb_set(column: Any, path: list[str], value: Any) -> ColumnElement:
+    """
+    Replace the value by the path in the jsonb document stored in the column,
+    e.g. UPDATE users SET properties = jsonb_set(properties, '{a,b}', '1')
+    """
+    return func.jsonb_set(column, cast(path, ARRAY(Text)), cast(value, JSONB))
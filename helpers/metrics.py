@@ -0,0 +1,25 @@
+import threading
+from collections import Counter
+
+_lock = threading.Lock()
+_counters: Counter[str] = Counter()
+
+
+def increment(name: str, value: int = 1) -> None:
+    with _lock:
+        _counters[name] += value
+
+
+def get_count(name: str) -> int:
+    with _lock:
+        return _counters[name]
+
+
+def get_counters() -> dict[str, int]:
+    with _lock:
+        return dict(_counters)
+
+
+def reset_counters() -> None:
+    with _lock:
+        _counters.clear()
@@ -0,0 +1,23 @@
+from typing import Callable, Hashable, TypeVar
+
+from flask import g, has_request_context
+
+T = TypeVar("T")
+
+
+def request_scoped(key: Hashable, factory: Callable[[], T]) -> T:
+    """
+    Get the object stored under the key for the current request, it is
+    created with the factory on the first call. Out of a request
+    the factory is called every time.
+    """
+    if not has_request_context():
+        return factory()
+
+    if "request_scope" not in g:
+        g.request_scope = {}
+
+    if key not in g.request_scope:
+        g.request_scope[key] = factory()
+
+    return g.request_scope[key]
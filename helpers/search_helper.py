@@ -0,0 +1,22 @@
+import re
+
+from sqlalchemy import func
+from sqlalchemy.sql.elements import ColumnElement
+
+# must be the same as the one expressions.search_vector is built with
+SEARCH_CONFIG = "english"
+# the most results of the expressions and the user expressions search
+SEARCH_LIMIT = 100
+
+
+def get_prefix_query(pattern: str) -> str | None:
+    """
+    Make a tsquery matching all the pattern words as prefixes,
+    e.g. "show of ha" -> "show:* & of:* & ha:*"
+    """
+    words = re.findall(r"\w+", pattern.lower())
+    return " & ".join(f"{word}:*" for word in words) or None
+
+
+def to_tsquery(prefix_query: str) -> ColumnElement:
+    return func.to_tsquery(SEARCH_CONFIG, prefix_query)
@@ -1,12 +1,16 @@
 from flask import session
 
+from helpers.user_role_cache import user_role_cache
 from models.models import User
 
 
 def start_session(user: User) -> None:
+    user_role_cache.invalidate(str(user.id))
     session["user_id"] = str(user.id)
     session["user"] = user.email
 
 
 def clear_session() -> None:
+    if user_id := session.get("user_id"):
+        user_role_cache.invalidate(user_id)
     session.clear()
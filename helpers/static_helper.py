@@ -0,0 +1,102 @@
+import hashlib
+import mimetypes
+import os
+
+from flask import Flask, Response, current_app, request, send_from_directory
+from werkzeug.security import safe_join
+
+VERSION_ARG = "v"
+VERSIONED_MAX_AGE = 365 * 24 * 60 * 60
+GZIP_SUFFIX = ".gz"
+
+# file path -> (modification time, content hash)
+_file_hashes: dict[str, tuple[float, str]] = {}
+
+
+def init_static(app: Flask) -> None:
+    """
+    Static files urls get the file content hash, e.g.
+    /static/js/utils.js?v=1a2b3c4d5e6f, and the files requested with the
+    current hash are cached by browsers for a year.
+    Precompressed ".gz" files (see scripts/compress_static.py) are served
+    to the clients that accept gzip.
+    """
+    app.url_defaults(add_static_file_hash)
+    app.view_functions["static"] = send_static_file
+
+
+def get_static_file_hash(filename: str) -> str | None:
+    if not (path := safe_join(current_app.static_folder, filename)):
+        return None
+
+    try:
+        modified = os.path.getmtime(path)
+    except OSError:
+        return None
+
+    cached = _file_hashes.get(path)
+    if cached and cached[0] == modified:
+        return cached[1]
+
+    with open(path, "rb") as file:
+        file_hash = hashlib.md5(
+            file.read(), usedforsecurity=False
+        ).hexdigest()[:12]
+    _file_hashes[path] = (modified, file_hash)
+
+    return file_hash
+
+
+def add_static_file_hash(endpoint: str, values: dict) -> None:
+    if endpoint != "static" or VERSION_ARG in values:
+        return
+
+    if file_hash := get_static_file_hash(values.get("filename", "")):
+        values[VERSION_ARG] = file_hash
+
+
+def send_static_file(filename: str) -> Response:
+    static_folder = current_app.static_folder
+    file_hash = request.args.get(VERSION_ARG)
+    is_versioned = bool(file_hash) and file_hash == get_static_file_hash(
+        filename
+    )
+    max_age = VERSIONED_MAX_AGE if is_versioned else None
+
+    if "gzip" in request.accept_encodings and _is_compressed_fresh(
+        static_folder, filename
+    ):
+        response = send_from_directory(
+            static_folder,
+            filename + GZIP_SUFFIX,
+            mimetype=mimetypes.guess_type(filename)[0],
+            max_age=max_age,
+        )
+        response.content_encoding = "gzip"
+    else:
+        response = send_from_directory(
+            static_folder, filename, max_age=max_age
+        )
+
+    response.vary.add("Accept-Encoding")
+    if is_versioned:
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+
+    return response
+
+
+def _is_compressed_fresh(static_folder: str, filename: str) -> bool:
+    """
+    The ".gz" file exists and is not older than the original one, a stale
+    one would be cached by browsers under the hash of the new content
+    """
+    path = safe_join(static_folder, filename)
+    compressed_path = safe_join(static_folder, filename + GZIP_SUFFIX)
+    if not (path and compressed_path):
+        return False
+
+    try:
+        return os.path.getmtime(compressed_path) >= os.path.getmtime(path)
+    except OSError:
+        return False
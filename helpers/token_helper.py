@@ -0,0 +1,19 @@
+from typing import Any
+
+# a rough estimate for english text, the real number depends on the model
+# tokenizer, but it's enough to keep a prompt within a budget
+CHARS_PER_TOKEN = 4
+# role and separators every chat message is wrapped with
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def estimate_messages_tokens(messages: list[dict[str, Any]]) -> int:
+    """Estimate tokens of chat messages like {"role": ..., "content": ...}"""
+    return sum(
+        estimate_tokens(str(message["content"])) + MESSAGE_OVERHEAD_TOKENS
+        for message in messages
+    )
@@ -0,0 +1,52 @@
+import threading
+import time
+from collections import OrderedDict
+
+from helpers import metrics
+
+HITS_METRIC = "user_role_cache.hits"
+MISSES_METRIC = "user_role_cache.misses"
+
+
+class UserRoleCache:
+    """
+    Process-local LRU of users roles with a short TTL, so the requests
+    do not query the users table just to check the role.
+    Entries must be invalidated when a user role or password is changed.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 60.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._roles: OrderedDict[str, tuple[str, float]] = OrderedDict()
+
+    def get(self, user_id: str) -> str | None:
+        with self._lock:
+            role, expires_at = self._roles.get(user_id, (None, 0.0))
+            if role is not None and expires_at > time.monotonic():
+                self._roles.move_to_end(user_id)
+            else:
+                role = None
+                self._roles.pop(user_id, None)
+
+        metrics.increment(MISSES_METRIC if role is None else HITS_METRIC)
+        return role
+
+    def set(self, user_id: str, role: str) -> None:
+        with self._lock:
+            self._roles[user_id] = (role, time.monotonic() + self.ttl)
+            self._roles.move_to_end(user_id)
+            while len(self._roles) > self.max_size:
+                self._roles.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._roles.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._roles.clear()
+
+
+user_role_cache = UserRoleCache()
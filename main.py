@@ -1,3 +1,4 @@
+from http import HTTPStatus
 import logging
 import os
 
@@ -9,6 +10,7 @@ from flask import (
     session,
     g,
 )
+from flask_wtf.csrf import generate_csrf
 
 from scripts import snapshot_db
 from routes.login import login_bp
@@ -22,9 +24,13 @@ from routes.sentence_training import sentence_training_bp
 from routes.writing_training import writing_training_bp
 from routes.daily_writing import daily_writing_bp
 from routes.daily_sentence_training import daily_sentence_training_bp
+from routes.jobs import jobs_bp
 from extensions import db
 from env_manager import load_env
 from dao.user_dao import UsersDAO
+from helpers.static_helper import init_static
+from helpers.user_role_cache import user_role_cache
+from services.llm_executor import LLMOverloadedError
 import filters
 
 logging.basicConfig(
@@ -59,6 +65,7 @@ def init_app():
     app = Flask(__name__)
     set_up_configs(app)
     db.init_app(app)
+    init_static(app)
     return app
 
 
@@ -67,6 +74,17 @@ def set_globals(user_id: str, user_role: str) -> None:
     g.user_role = user_role
 
 
+def get_user_role(user_id: str) -> str | None:
+    if user_role := user_role_cache.get(user_id):
+        return user_role
+
+    if not (user := UsersDAO().get_by_id(user_id)):
+        return None
+
+    user_role_cache.set(user_id, user.role)
+    return user.role
+
+
 app = init_app()
 
 app.register_blueprint(login_bp)
@@ -80,6 +98,7 @@ app.register_blueprint(dialogue_training_bp)
 app.register_blueprint(writing_training_bp)
 app.register_blueprint(daily_writing_bp)
 app.register_blueprint(daily_sentence_training_bp)
+app.register_blueprint(jobs_bp)
 
 app.jinja_env.filters["date_filter"] = filters.date_filter
 app.jinja_env.filters[
@@ -88,28 +107,34 @@ app.jinja_env.filters[
 app.jinja_env.filters["expression_sentence"] = filters.expression_sentence
 app.jinja_env.filters["string_array"] = filters.string_array
 app.jinja_env.filters["escape_double_quotas"] = filters.escape_double_quotas
+# the token for the forms built without a FlaskForm, e.g. in js
+app.jinja_env.globals["csrf_token"] = generate_csrf
 
 
 @app.before_request
 def before_request():
-    path = request.path
-
-    if path in [
+    if request.endpoint == "static" or request.path in [
         "/login",
         "/login/sign-on",
         "/login/logout",
-        "/static/css/login-style.css",
-        "/static/img/login-background.png",
-        "static/js/expression_input.js",
     ]:
         return
 
     user_id = session.get("user_id")
 
-    if not (user_id and (user := UsersDAO().get_by_id(user_id))):
+    if not (user_id and (user_role := get_user_role(user_id))):
         return redirect(url_for("login.login"))
 
-    set_globals(user_id, user.role)
+    set_globals(user_id, user_role)
+
+
+@app.errorhandler(LLMOverloadedError)
+def llm_overloaded(error):
+    return (
+        str(error),
+        HTTPStatus.SERVICE_UNAVAILABLE.value,
+        {"Retry-After": "5"},
+    )
 
 
 if __name__ == "__main__":
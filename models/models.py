@@ -2,10 +2,10 @@ from uuid import uuid4
 from typing import List, TypedDict
 from typing_extensions import NotRequired
 
-from sqlalchemy.dialects.postgresql import UUID, JSON
-from sqlalchemy.orm import relationship, Mapped, attributes
-from sqlalchemy import ForeignKey
-from sqlalchemy.schema import CheckConstraint
+from sqlalchemy.dialects.postgresql import UUID, JSON, JSONB, TSVECTOR
+from sqlalchemy.orm import relationship, Mapped, attributes, deferred
+from sqlalchemy import FetchedValue, ForeignKey
+from sqlalchemy.schema import CheckConstraint, ForeignKeyConstraint
 
 from extensions import db
 
@@ -49,7 +49,7 @@ class User(db.Model):
     email = db.Column(db.String(50), unique=True, nullable=False)
     role = db.Column(db.String(15), nullable=False)
     password_hash = db.Column(db.String(70), nullable=False)
-    properties = db.Column(JSON, nullable=False, default={})
+    properties = db.Column(JSONB, nullable=False, default={})
     added = db.Column(db.DateTime, nullable=False)
     updated = db.Column(db.DateTime, nullable=False)
     last_login = db.Column(db.DateTime, nullable=False)
@@ -75,10 +75,18 @@ class Expression(db.Model):
     expression = db.Column(db.Text, nullable=False)
     definition = db.Column(db.Text)
     example = db.Column(db.Text)
-    translations = db.Column(JSON, nullable=False, default={})
+    translations = db.Column(JSONB, nullable=False, default={})
     added = db.Column(db.DateTime, nullable=False)
     updated = db.Column(db.DateTime, nullable=False)
     properties = db.Column(JSON, nullable=False, default={})
+    # filled by the "expressions_search_vector_trigger" trigger
+    search_vector = deferred(
+        db.Column(
+            TSVECTOR,
+            server_default=FetchedValue(),
+            server_onupdate=FetchedValue(),
+        )
+    )
 
     users: Mapped[List["UserExpression"]] = relationship(
         back_populates="expression"
@@ -129,6 +137,39 @@ class UserExpression(db.Model):
         return f"user_id: {self.user_id}; expression_id: {self.expression_id}; active: {self.active}"
 
 
+class LearnListItem(db.Model):
+    __tablename__ = "learn_list_items"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["user_id", "expression_id"],
+            ["user_expression.user_id", "user_expression.expression_id"],
+            ondelete="CASCADE",
+        ),
+    )
+
+    user_id = db.Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    expression_id = db.Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        nullable=False,
+    )
+    # defines the order of items in the learn list,
+    # "position" is the training progress of the item itself
+    sort_key = db.Column(db.Float, nullable=False)
+    position = db.Column(db.Integer, nullable=False, default=0)
+    practice_count = db.Column(db.Integer, nullable=False, default=0)
+    knowledge_level = db.Column(db.Numeric(8, 5), nullable=False, default=0)
+    last_practice_time = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f"user_id: {self.user_id}; expression_id: {self.expression_id}; sort_key: {self.sort_key}"
+
+
 class Tag(db.Model):
     __tablename__ = "tags"
     __table_args__ = (
@@ -181,15 +222,20 @@ class Dialogue(db.Model):
     )
     title = db.Column(db.Text, nullable=False)
     description = db.Column(db.Text)
-    properties = db.Column(JSON, nullable=False, default={})
+    properties = db.Column(JSONB, nullable=False, default={})
     settings = db.Column(JSON, nullable=False)
-    dialogues = db.Column(JSON, nullable=False, default=[])
-    expressions = db.Column(JSON, nullable=False, default=[])
+    expressions = db.Column(JSONB, nullable=False, default=[])
+    # seq of the last message in "dialogue_messages"
+    messages_count = db.Column(db.Integer, nullable=False, default=0)
     added = db.Column(db.DateTime, nullable=False)
     updated = db.Column(db.DateTime, nullable=False)
 
     user: Mapped["User"] = relationship(back_populates="dialogues")
 
+    # messages added since the dialogue was loaded,
+    # DialogueTrainingRepo inserts them on create and update
+    new_messages = None
+
     def __repr__(self):
         return f"{self.id} - {self.title}"
 
@@ -232,17 +278,19 @@ class Dialogue(db.Model):
 
     def add_message(
         self, message: str, role: str, comment: list[dict] | None = None
-    ) -> None:
-        message_to_add = {
-            "id": len(self.dialogues) + 1,
-            "role": role,
-            "text": message,
-        }
-        if comment is not None:
-            message_to_add["comment"] = comment
-
-        self.dialogues.append(message_to_add)
-        attributes.flag_modified(self, "dialogues")
+    ) -> "DialogueMessage":
+        # the stored dialogue gets the final seq from DialogueTrainingRepo
+        self.messages_count = (self.messages_count or 0) + 1
+        message_to_add = DialogueMessage(
+            dialogue_id=self.id,
+            user_id=self.user_id,
+            seq=self.messages_count,
+            role=role,
+            text=message,
+            comment=comment,
+        )
+        self.new_messages = (self.new_messages or []) + [message_to_add]
+        return message_to_add
 
     def get_dialogue_expression(self, expression_id: str) -> dict | None:
         for expression in self.expressions:
@@ -254,6 +302,39 @@ class Dialogue(db.Model):
         self.properties["trainedExpressionsCount"] += 1
         attributes.flag_modified(self, "properties")
 
+    def set_summary(self, summary: str, seq: int) -> None:
+        """Store the summary of the messages up to the "seq" one"""
+        self.properties["summary"] = summary
+        self.properties["summarySeq"] = seq
+        attributes.flag_modified(self, "properties")
+
+
+class DialogueMessage(db.Model):
+    __tablename__ = "dialogue_messages"
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["dialogue_id", "user_id"],
+            ["dialogues.id", "dialogues.user_id"],
+            ondelete="CASCADE",
+        ),
+    )
+
+    dialogue_id = db.Column(UUID(as_uuid=True), primary_key=True)
+    seq = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(UUID(as_uuid=True), nullable=False)
+    role = db.Column(db.String(20), nullable=False)
+    text = db.Column(db.Text, nullable=False)
+    comment = db.Column(JSONB(none_as_null=True))
+
+    def __repr__(self):
+        return f"{self.dialogue_id} - {self.seq}: {self.role}"
+
+    def serialize(self) -> dict:
+        message = {"id": self.seq, "role": self.role, "text": self.text}
+        if self.comment is not None:
+            message["comment"] = self.comment
+        return message
+
 
 class Writings(db.Model):
     __tablename__ = "writings"
@@ -263,13 +344,17 @@ class Writings(db.Model):
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
     )
     properties = db.Column(JSON, nullable=False)
-    writings = db.Column(JSON, nullable=False, default=[])
-    expressions = db.Column(JSON, nullable=False, default=[])
+    writings = db.Column(JSONB, nullable=False, default=[])
+    expressions = db.Column(JSONB, nullable=False, default=[])
     added = db.Column(db.DateTime, nullable=False)
     updated = db.Column(db.DateTime, nullable=False)
 
     user: Mapped["User"] = relationship(back_populates="writings")
 
+    # messages added since the writings were loaded, WritingsRepo
+    # appends them to the stored ones instead of rewriting the whole column
+    new_messages = None
+
     def add_expressions(self, expressions: list[Expression]) -> None:
         for expression in expressions:
             self.expressions.append(
@@ -316,6 +401,7 @@ class Writings(db.Model):
     def add_message(
         self, message: str, comment: list[dict] | None = None
     ) -> None:
+        # the stored writings get the final id from WritingsRepo
         message_to_add = {
             "id": len(self.writings) + 1,
             "text": message,
@@ -324,4 +410,29 @@ class Writings(db.Model):
             message_to_add["comment"] = comment
 
         self.writings.append(message_to_add)
-        attributes.flag_modified(self, "writings")
+        self.new_messages = (self.new_messages or []) + [message_to_add]
+
+
+class Job(db.Model):
+    __tablename__ = "jobs"
+
+    id = db.Column(UUID(as_uuid=True), primary_key=True, default=uuid4)
+    user_id = db.Column(
+        UUID(as_uuid=True), ForeignKey("users.id"), nullable=False
+    )
+    type = db.Column(db.String(50), nullable=False)
+    payload = db.Column(JSONB, nullable=False, default={})
+    status = db.Column(db.String(20), nullable=False)
+    result = db.Column(JSONB(none_as_null=True))
+    error = db.Column(db.Text)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    # a pending job is not taken before, a failed one is retried later
+    run_after = db.Column(db.DateTime, nullable=False)
+    added = db.Column(db.DateTime, nullable=False)
+    updated = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"{self.type} - {self.id}: {self.status}"
+
+    def serialize(self) -> dict:
+        return {"id": str(self.id), "type": self.type, "status": self.status}
@@ -1,6 +1,7 @@
 from extensions import db
-from models.models import Dialogue
-from sqlalchemy.orm import Session
+from models.models import Dialogue, DialogueMessage
+from sqlalchemy import update
+from sqlalchemy.orm import Session, attributes
 
 
 class DialogueTrainingRepo:
@@ -30,17 +31,80 @@ class DialogueTrainingRepo:
             .all()
         )
 
+    def get_messages(
+        self,
+        dialogue_id: str,
+        before: int | None = None,
+        limit: int | None = None,
+        after: int | None = None,
+    ) -> list[DialogueMessage]:
+        """
+        Return the last "limit" messages of the dialogue with seq less
+        than "before" and greater than "after", ordered from the oldest one.
+        """
+        query = self.session.query(DialogueMessage).filter(
+            DialogueMessage.dialogue_id == dialogue_id,
+            DialogueMessage.user_id == self.user_id,
+        )
+        if before is not None:
+            query = query.filter(DialogueMessage.seq < before)
+        if after is not None:
+            query = query.filter(DialogueMessage.seq > after)
+        messages = (
+            query.order_by(DialogueMessage.seq.desc()).limit(limit).all()
+        )
+        return messages[::-1]
+
     def create(self, dialogue: Dialogue):
         self.session.add(dialogue)
+        self._add_new_messages(dialogue)
         self.session.commit()
 
     def update(self, dialogue: Dialogue) -> None:
         self.session.add(dialogue)
+        if dialogue.new_messages:
+            self._take_seqs(dialogue)
+        self._add_new_messages(dialogue)
+        self.session.commit()
+
+    def update_message(self, message: DialogueMessage) -> None:
+        """Save the changes of a stored message, e.g. its comment"""
+        self.session.add(message)
         self.session.commit()
-        pass
 
     def delete(self, dialogue_id: str) -> None:
         self.session.query(Dialogue).filter(
             Dialogue.id == dialogue_id
         ).delete()
         self.session.commit()
+
+    def _take_seqs(self, dialogue: Dialogue) -> None:
+        """
+        Number the new messages after the last stored one. The counter is
+        increased in the db, the row lock makes the concurrent turns
+        of the dialogue, e.g. a double submit, get different seqs.
+        """
+        with self.session.no_autoflush:
+            last_seq = self.session.execute(
+                update(Dialogue)
+                .where(
+                    Dialogue.id == dialogue.id,
+                    Dialogue.user_id == dialogue.user_id,
+                )
+                .values(
+                    messages_count=Dialogue.messages_count
+                    + len(dialogue.new_messages)
+                )
+                .returning(Dialogue.messages_count)
+                .execution_options(synchronize_session=False)
+            ).scalar_one()
+        # replaces the count increased in memory, it's not written again
+        attributes.set_committed_value(dialogue, "messages_count", last_seq)
+        first_seq = last_seq - len(dialogue.new_messages) + 1
+        for seq, message in enumerate(dialogue.new_messages, first_seq):
+            message.seq = seq
+
+    def _add_new_messages(self, dialogue: Dialogue) -> None:
+        # messages are only inserted, the stored ones are never rewritten
+        self.session.add_all(dialogue.new_messages or [])
+        dialogue.new_messages = None
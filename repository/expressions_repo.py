@@ -1,8 +1,17 @@
-from typing import List
+from typing import List, Optional
+from helpers.search_helper import get_prefix_query, to_tsquery
 from models.models import Expression
 from extensions import db
+from sqlalchemy import Engine, func, text
 from sqlalchemy.orm import Session, attributes
 
+SIMILAR_LIMIT = 5
+# pg_trgm "%" operator default threshold is 0.3, so the index is still used
+MIN_SIMILARITY = 0.4
+
+# whether pg_trgm extension is installed, it's checked once per engine
+_trgm_installed: dict[Engine, bool] = {}
+
 
 class ExpressionsRepo:
     def __init__(self):
@@ -22,16 +31,70 @@ class ExpressionsRepo:
             .first()
         )
 
-    def search(self, pattern: str) -> List[Expression]:
+    def search(
+        self, pattern: str, limit: Optional[int] = None
+    ) -> List[Expression]:
+        """
+        Search expressions by prefixes of the pattern words in expression,
+        definition and example, the best matches first.
+        """
+        if not (prefix_query := get_prefix_query(pattern)):
+            return []
+
+        ts_query = to_tsquery(prefix_query)
+        return (
+            self.session.query(Expression)
+            .filter(Expression.search_vector.op("@@")(ts_query))
+            .order_by(
+                func.ts_rank(Expression.search_vector, ts_query).desc(),
+                Expression.added.desc(),
+            )
+            .limit(limit)
+            .all()
+        )
+
+    def get_similar(
+        self,
+        pattern: str,
+        limit: int = SIMILAR_LIMIT,
+        min_similarity: float = MIN_SIMILARITY,
+    ) -> List[Expression]:
+        """
+        Get expressions looking like the pattern, typos included,
+        the most similar first. Falls back to the prefix search
+        where pg_trgm extension is not installed.
+        """
+        if not (pattern := pattern.strip().lower()):
+            return []
+
+        if not self._is_trgm_installed():
+            return self.search(pattern, limit)
+
+        expression = func.lower(Expression.expression)
+        similarity = func.similarity(expression, pattern)
         return (
             self.session.query(Expression)
             .filter(
-                Expression.expression.match(pattern),
+                expression.op("%")(pattern),
+                similarity >= min_similarity,
             )
-            .order_by(Expression.added.desc())
+            .order_by(similarity.desc(), Expression.added.desc())
+            .limit(limit)
             .all()
         )
 
+    def _is_trgm_installed(self) -> bool:
+        engine = self.session.get_bind()
+        if engine not in _trgm_installed:
+            _trgm_installed[engine] = bool(
+                self.session.execute(
+                    text(
+                        "SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'"
+                    )
+                ).scalar()
+            )
+        return _trgm_installed[engine]
+
     def update(self, expression: Expression) -> None:
         attributes.flag_modified(expression, "properties")
         self.session.add(expression)
@@ -0,0 +1,183 @@
+import random
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
+
+if TYPE_CHECKING:
+    from dao.daily_training_dao import DailyTrainingLearnListItemDict
+    from repository.training_expressions_repo import (
+        DailyTrainingLearnListItem,
+    )
+
+
+class _Node:
+    __slots__ = ("item", "priority", "size", "left", "right", "parent")
+
+    def __init__(self, item: "DailyTrainingLearnListItem") -> None:
+        self.item = item
+        self.priority = random.random()
+        self.size = 1
+        self.left: Optional["_Node"] = None
+        self.right: Optional["_Node"] = None
+        self.parent: Optional["_Node"] = None
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node else 0
+
+
+def _update(node: _Node) -> _Node:
+    node.size = 1 + _size(node.left) + _size(node.right)
+    if node.left:
+        node.left.parent = node
+    if node.right:
+        node.right.parent = node
+    return node
+
+
+def _split(
+    node: Optional[_Node], amount: int
+) -> tuple[Optional[_Node], Optional[_Node]]:
+    """Split the tree into the first "amount" nodes and the rest."""
+    if node is None:
+        return None, None
+    if _size(node.left) >= amount:
+        left, node.left = _split(node.left, amount)
+        if left:
+            left.parent = None
+        return left, _update(node)
+    node.right, right = _split(node.right, amount - _size(node.left) - 1)
+    if right:
+        right.parent = None
+    return _update(node), right
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None or right is None:
+        return left or right
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _update(left)
+    right.left = _merge(left, right.left)
+    return _update(right)
+
+
+class TreeLearnList:
+    """
+    Learn list stored in an implicit treap: a randomized balanced tree
+    ordered by the items index, so inserting, popping and finding the
+    index of an item take O(log n) instead of O(n) of a python list.
+
+    Has the same interface as DailyTrainingLearnList and can be used
+    instead of it in DailyTrainingData.
+    """
+
+    def __init__(self, learn_list: list["DailyTrainingLearnListItem"]):
+        self._root: Optional[_Node] = None
+        self._index: dict[str, _Node] = {}
+        self._build(learn_list)
+
+    def __len__(self):
+        return _size(self._root)
+
+    def __iter__(self) -> Iterator["DailyTrainingLearnListItem"]:
+        stack: list[_Node] = []
+        node = self._root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.item
+            node = node.right
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._index
+
+    def insert(self, item: "DailyTrainingLearnListItem") -> None:
+        item.position = max(0, item.position) and min(len(self), item.position)
+        node = _Node(item)
+        left, right = _split(self._root, item.position)
+        self._set_root(_merge(_merge(left, node), right))
+        self._index[item.expression_id] = node
+
+    def get_first_items_ids(self, amount: int) -> list[str]:
+        ids: list[str] = []
+        for item in self:
+            if len(ids) >= amount:
+                break
+            ids.append(item.expression_id)
+        return ids
+
+    def pop_item_by_id(
+        self, item_id: str
+    ) -> Optional["DailyTrainingLearnListItem"]:
+        if not (node := self._index.pop(item_id, None)):
+            return None
+        left, right = _split(self._root, self._get_node_index(node))
+        _, right = _split(right, 1)
+        self._set_root(_merge(left, right))
+        return node.item
+
+    def pop_items_where(
+        self, predicate: Callable[["DailyTrainingLearnListItem"], bool]
+    ) -> list["DailyTrainingLearnListItem"]:
+        popped, kept = [], []
+        for item in self:
+            (popped if predicate(item) else kept).append(item)
+        if popped:
+            # rebuilding is O(n), cheaper than popping items one by one
+            self._index.clear()
+            self._build(kept)
+        return popped
+
+    def get_item_by_id(
+        self, item_id: str
+    ) -> Optional["DailyTrainingLearnListItem"]:
+        node = self._index.get(item_id)
+        return node.item if node else None
+
+    def serialize(self) -> list["DailyTrainingLearnListItemDict"]:
+        return [item.serialize() for item in self]
+
+    def get_item_ids(self) -> list[str]:
+        return [item.expression_id for item in self]
+
+    def get_item_ids_set(self) -> set[str]:
+        return set(self._index)
+
+    def get_as_dict_by_item_id(
+        self,
+    ) -> dict[str, "DailyTrainingLearnListItem"]:
+        return {id_: node.item for id_, node in self._index.items()}
+
+    def _build(self, learn_list: list["DailyTrainingLearnListItem"]) -> None:
+        # builds the tree in O(n), keeping the rightmost path on the stack
+        stack: list[_Node] = []
+        for item in learn_list:
+            node = _Node(item)
+            self._index[item.expression_id] = node
+            last = None
+            while stack and stack[-1].priority < node.priority:
+                last = _update(stack.pop())
+            node.left = last
+            if stack:
+                stack[-1].right = node
+            stack.append(node)
+
+        root = None
+        while stack:
+            root = _update(stack.pop())
+        self._set_root(root)
+
+    def _set_root(self, root: Optional[_Node]) -> None:
+        if root:
+            root.parent = None
+        self._root = root
+
+    @staticmethod
+    def _get_node_index(node: _Node) -> int:
+        index = _size(node.left)
+        while node.parent:
+            if node is node.parent.right:
+                index += _size(node.parent.left) + 1
+            node = node.parent
+        return index
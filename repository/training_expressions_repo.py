@@ -1,18 +1,23 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import TypedDict
+from typing import Callable, TypedDict
 from dao.daily_training_dao import (
     DailyTrainingDict,
     DailyTrainingLearnListItemDict,
     DailyTrainingDAO,
 )
+from dao.learn_list_dao import LearnListDAO
 from dao.user_expressions_dao import UserExpressionsDAO
 from exercises.common import TrainingExpressionData
 from extensions import db
+from helpers import metrics
+from helpers.ff_helper import is_feature_flag_enabled
+from helpers.request_scope import request_scoped
 from models.models import UserExpression
 from sqlalchemy.orm import Session
 from repository.exceptions import UserExpressionNotFoundException
+from repository.learn_list_tree import TreeLearnList
 from exercises.common import (
     calculate_knowledge_level,
     ExerciseExpressionsListItem,
@@ -21,6 +26,9 @@ from exercises.common import (
 from helpers.time_helpers import get_current_utc_time, string_to_datetime
 
 
+SKIPPED_WRITES_METRIC = "daily_training.skipped_writes"
+
+
 class UpdateTrainedExpression(TypedDict):
     user_expression: UserExpression
     is_trained_successfully: bool
@@ -49,7 +57,9 @@ class TrainingRepoABC(ABC):
         pass
 
     @abstractmethod
-    def update_expressions(self, data: list[UpdateTrainedExpression]) -> None:
+    def update_expressions(
+        self, data: list[UpdateTrainedExpression], commit: bool = True
+    ) -> None:
         """Update expressions training data according to was it trained successfully."""
         pass
 
@@ -88,6 +98,11 @@ class TrainingRepoABC(ABC):
         """Check if an expression is in the learn list."""
         pass
 
+    @abstractmethod
+    def get_learn_list_expression_ids(self) -> set[str]:
+        """Get IDs of the expressions that are in the learn list."""
+        pass
+
 
 @dataclass
 class DailyTrainingLearnListItem:
@@ -122,6 +137,12 @@ class DailyTrainingLearnListItem:
 @dataclass
 class DailyTrainingLearnList:
     learn_list: list[DailyTrainingLearnListItem]
+    # expression id -> position in "learn_list", kept in sync on insert and pop
+    _index: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._index = {}
+        self._reindex()
 
     def __len__(self):
         return len(self.learn_list)
@@ -129,9 +150,13 @@ class DailyTrainingLearnList:
     def __iter__(self):
         return iter(self.learn_list)
 
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._index
+
     def insert(self, item: DailyTrainingLearnListItem) -> None:
         item.position = max(0, item.position) and min(len(self), item.position)
         self.learn_list.insert(item.position, item)
+        self._reindex(item.position)
 
     def get_first_items_ids(self, amount: int) -> list[str]:
         return [item.expression_id for item in self.learn_list[:amount]]
@@ -139,17 +164,28 @@ class DailyTrainingLearnList:
     def pop_item_by_id(
         self, item_id: str
     ) -> DailyTrainingLearnListItem | None:
-        for i, item in enumerate(self.learn_list):
-            if item.expression_id == item_id:
-                return self.learn_list.pop(i)
+        if (position := self._index.pop(item_id, None)) is None:
+            return None
+        item = self.learn_list.pop(position)
+        self._reindex(position)
+        return item
+
+    def pop_items_where(
+        self, predicate: Callable[[DailyTrainingLearnListItem], bool]
+    ) -> list[DailyTrainingLearnListItem]:
+        popped = [item for item in self.learn_list if predicate(item)]
+        if popped:
+            self.learn_list = [
+                item for item in self.learn_list if not predicate(item)
+            ]
+            self._reindex()
+        return popped
 
     def get_item_by_id(
         self, item_id: str
     ) -> DailyTrainingLearnListItem | None:
-        for item in self.learn_list:
-            if item.expression_id == item_id:
-                return item
-        return None
+        position = self._index.get(item_id)
+        return None if position is None else self.learn_list[position]
 
     def serialize(self) -> list[DailyTrainingLearnListItemDict]:
         return [item.serialize() for item in self.learn_list]
@@ -157,20 +193,39 @@ class DailyTrainingLearnList:
     def get_item_ids(self) -> list[str]:
         return [item.expression_id for item in self.learn_list]
 
+    def get_item_ids_set(self) -> set[str]:
+        return set(self._index)
+
     def get_as_dict_by_item_id(self) -> dict[str, DailyTrainingLearnListItem]:
         return {item.expression_id: item for item in self.learn_list}
 
+    def _reindex(self, start: int = 0) -> None:
+        """Update the positions of the items shifted from "start" on"""
+        if start == 0:
+            # cleared in place, the views of the ids stay valid
+            self._index.clear()
+        for position in range(start, len(self.learn_list)):
+            self._index[self.learn_list[position].expression_id] = position
+
+
+LearnList = DailyTrainingLearnList | TreeLearnList
+
 
 class DailyTrainingData:
-    def __init__(self, dt_data: DailyTrainingDict) -> None:
+    def __init__(
+        self,
+        dt_data: DailyTrainingDict,
+        llist_class: type[LearnList] = DailyTrainingLearnList,
+    ) -> None:
+        self.llist_class = llist_class
         self.llist = self._init_llist(dt_data)
         self.max_llist_size = dt_data["learnListSize"]
         self.practice_count_threshold = dt_data["practiceCountThreshold"]
         self.knowledge_level_threshold = dt_data["knowledgeLevelThreshold"]
+        # increased on every change, to know if the data has to be stored
+        self.version = 0
 
-    def _init_llist(
-        self, dt_data: DailyTrainingDict
-    ) -> DailyTrainingLearnList:
+    def _init_llist(self, dt_data: DailyTrainingDict) -> LearnList:
         llist = [
             DailyTrainingLearnListItem(
                 expression_id=item["expressionId"],
@@ -181,7 +236,7 @@ class DailyTrainingData:
             )
             for item in dt_data["learning_list"]
         ]
-        return DailyTrainingLearnList(llist)
+        return self.llist_class(llist)
 
     def get_next_expression_ids_to_train(self, amount: int) -> list[str]:
         return self.llist.get_first_items_ids(amount)
@@ -189,13 +244,47 @@ class DailyTrainingData:
     def pop_item_by_id(
         self, item_id: str
     ) -> DailyTrainingLearnListItem | None:
-        return self.llist.pop_item_by_id(item_id)
+        if item := self.llist.pop_item_by_id(item_id):
+            self.version += 1
+        return item
+
+    def pop_items_where(
+        self, predicate: Callable[[DailyTrainingLearnListItem], bool]
+    ) -> list[DailyTrainingLearnListItem]:
+        if items := self.llist.pop_items_where(predicate):
+            self.version += 1
+        return items
 
     def get_llist_size(self) -> int:
         return len(self.llist)
 
     def insert_item(self, item: DailyTrainingLearnListItem) -> None:
         self.llist.insert(item)
+        self.version += 1
+
+    def update_settings(
+        self,
+        max_llist_size: int,
+        knowledge_level_threshold: float,
+        practice_count_threshold: int,
+    ) -> None:
+        settings = (
+            max_llist_size,
+            knowledge_level_threshold,
+            practice_count_threshold,
+        )
+        if settings == (
+            self.max_llist_size,
+            self.knowledge_level_threshold,
+            self.practice_count_threshold,
+        ):
+            return
+        (
+            self.max_llist_size,
+            self.knowledge_level_threshold,
+            self.practice_count_threshold,
+        ) = settings
+        self.version += 1
 
     def serialize(self) -> DailyTrainingDict:
         return {
@@ -208,12 +297,18 @@ class DailyTrainingData:
     def get_llist_expressions_ids(self) -> list[str]:
         return self.llist.get_item_ids()
 
+    def get_llist_expressions_ids_set(self) -> set[str]:
+        return self.llist.get_item_ids_set()
+
+    def has_item(self, item_id: str) -> bool:
+        return item_id in self.llist
+
     def get_as_dict_by_id(self) -> dict[str, DailyTrainingLearnListItem]:
         return self.llist.get_as_dict_by_item_id()
 
     def add_item(self, item_id: str) -> None:
         item = DailyTrainingLearnListItem.new_from_expression_id(item_id)
-        self.llist.insert(item)
+        self.insert_item(item)
 
     def get_training_data(
         self, expression_id: str
@@ -226,18 +321,28 @@ class DailyTrainingRepo(TrainingRepoABC):
         self,
         user_id: str,
         session: Session = db.session,
-        daily_training_dao: type[DailyTrainingDAO] = DailyTrainingDAO,
+        daily_training_dao: type[DailyTrainingDAO] = LearnListDAO,
         user_expressions_dao: type[UserExpressionsDAO] = UserExpressionsDAO,
+        llist_class: type[LearnList] | None = None,
     ):
         self.user_id = user_id
         self.session: Session = session
-        self.daily_training_dao: type[DailyTrainingDAO] = daily_training_dao
-        self.user_expressions_dao: type[
-            UserExpressionsDAO
-        ] = user_expressions_dao
+        self.daily_training_dao: DailyTrainingDAO = daily_training_dao(
+            self.user_id, self.session
+        )
+        self.user_expressions_dao: UserExpressionsDAO = user_expressions_dao(
+            self.user_id, self.session
+        )
+        if llist_class is None:
+            llist_class = (
+                TreeLearnList
+                if is_feature_flag_enabled("LEARN_LIST_TREE")
+                else DailyTrainingLearnList
+            )
         self.daily_training_data = DailyTrainingData(
-            self.daily_training_dao(self.user_id, self.session).get()
+            self.daily_training_dao.get(), llist_class
         )
+        self._stored_version = self.daily_training_data.version
 
     def get_next(self, amount: int) -> list[TrainingExpressionData]:
         # TODO: deal with expressions that can be deleted or deactivated.
@@ -246,9 +351,9 @@ class DailyTrainingRepo(TrainingRepoABC):
         if user_expression_ids := self.daily_training_data.get_next_expression_ids_to_train(
             amount
         ):
-            user_expressions = self.user_expressions_dao(
-                self.user_id, self.session
-            ).get(include=user_expression_ids)
+            user_expressions = self.user_expressions_dao.get(
+                include=user_expression_ids, profile="challenge"
+            )
             return self._format_training_expressions_data(user_expressions)
         return []
 
@@ -273,9 +378,9 @@ class DailyTrainingRepo(TrainingRepoABC):
 
     def get_list(self) -> list[ExerciseExpressionsListItem]:
         if ids := self.daily_training_data.get_llist_expressions_ids():
-            user_expressions = self.user_expressions_dao(
-                self.user_id, self.session
-            ).get(include=ids)
+            user_expressions = self.user_expressions_dao.get(
+                include=ids, profile="list"
+            )
             learn_list = self.daily_training_data.get_as_dict_by_id()
             return [
                 get_exercise_expressions_list_item(
@@ -300,10 +405,7 @@ class DailyTrainingRepo(TrainingRepoABC):
 
     def add(self, expression_id: str):
 
-        if (
-            expression_id
-            in self.daily_training_data.get_llist_expressions_ids()
-        ):
+        if self.daily_training_data.has_item(expression_id):
             return
 
         try:
@@ -323,7 +425,9 @@ class DailyTrainingRepo(TrainingRepoABC):
         self.daily_training_data.pop_item_by_id(expression_id)
         self._refresh_llist()
 
-    def update_expressions(self, data: list[UpdateTrainedExpression]) -> None:
+    def update_expressions(
+        self, data: list[UpdateTrainedExpression], commit: bool = True
+    ) -> None:
         for item in data:
             self._update_item_training_data(
                 str(item["user_expression"].expression_id),
@@ -336,10 +440,11 @@ class DailyTrainingRepo(TrainingRepoABC):
 
         try:
             self._refresh_llist(commit=False)
-            self.user_expressions_dao(self.user_id, self.session).bulk_update(
-                updated_user_expressions
+            self.user_expressions_dao.bulk_update(
+                updated_user_expressions, commit=False
             )
-            self.session.commit()
+            if commit:
+                self.session.commit()
         except Exception:
             self.session.rollback()
             raise
@@ -348,28 +453,22 @@ class DailyTrainingRepo(TrainingRepoABC):
         self._refresh_llist()
 
     def get_by_ids(self, expression_ids: list[str]) -> list[UserExpression]:
-        return self.user_expressions_dao(self.user_id, self.session).get(
-            include=expression_ids
+        return self.user_expressions_dao.get(
+            include=expression_ids, profile="challenge"
         )
 
     def update_settings(self, settings: DailyTrainingSettings) -> None:
-        self.daily_training_data.max_llist_size = settings[
-            "max_learn_list_size"
-        ]
-        self.daily_training_data.knowledge_level_threshold = settings[
-            "knowledge_level_threshold"
-        ]
-        self.daily_training_data.practice_count_threshold = settings[
-            "practice_count_threshold"
-        ]
+        self.daily_training_data.update_settings(
+            max_llist_size=settings["max_learn_list_size"],
+            knowledge_level_threshold=settings["knowledge_level_threshold"],
+            practice_count_threshold=settings["practice_count_threshold"],
+        )
         self._refresh_llist()
 
     def _get_user_expression_by_id(
         self, expression_id: str
     ) -> list[UserExpression] | None:
-        return self.user_expressions_dao(self.user_id, self.session).get(
-            include=[expression_id]
-        )
+        return self.user_expressions_dao.get(include=[expression_id])
 
     def _update_item_training_data(
         self, user_expression_id: str, success: bool
@@ -408,29 +507,24 @@ class DailyTrainingRepo(TrainingRepoABC):
         return updated_expressions
 
     def _refresh_llist(self, commit: bool = True):
-        # TODO: add "updated" flag to not update daily training data if nothing changed
         self._remove_fully_trained_expressions()
         self._add_new_expressions_if_vacancies()
+        if self.daily_training_data.version == self._stored_version:
+            metrics.increment(SKIPPED_WRITES_METRIC)
+            return
         self._store_daily_training_data(commit)
 
     def count_learn_list_items(self) -> int:
         return self.daily_training_data.get_llist_size()
 
     def is_expression_in_learn_list(self, expression_id: str) -> bool:
-        return (
-            expression_id
-            in self.daily_training_data.get_llist_expressions_ids()
-        )
+        return self.daily_training_data.has_item(expression_id)
 
-    def _remove_fully_trained_expressions(self):
-        item_ids_to_remove = [
-            item.expression_id
-            for item in self.daily_training_data.llist
-            if self._should_be_removed(item)
-        ]
+    def get_learn_list_expression_ids(self) -> set[str]:
+        return self.daily_training_data.get_llist_expressions_ids_set()
 
-        for id_ in item_ids_to_remove:
-            self.daily_training_data.pop_item_by_id(id_)
+    def _remove_fully_trained_expressions(self):
+        self.daily_training_data.pop_items_where(self._should_be_removed)
 
     def _should_be_removed(self, item: DailyTrainingLearnListItem) -> bool:
         return (
@@ -446,20 +540,28 @@ class DailyTrainingRepo(TrainingRepoABC):
             - self.daily_training_data.get_llist_size()
         )
         if vacancies > 0:
-            llist_expr_ids = (
-                self.daily_training_data.get_llist_expressions_ids()
-            )
             ids_to_add = [
                 str(expr.expression_id)
-                for expr in self.user_expressions_dao(
-                    self.user_id, self.session
-                ).get(exclude=llist_expr_ids, limit=vacancies)
+                for expr in self._get_learn_list_candidates(vacancies)
             ]
 
             for id_ in reversed(ids_to_add):
                 self.daily_training_data.add_item(id_)
 
+    def _get_learn_list_candidates(self, amount: int) -> list[UserExpression]:
+        return self.daily_training_dao.get_learn_list_candidates(
+            amount, self.daily_training_data.get_llist_expressions_ids()
+        )
+
     def _store_daily_training_data(self, commit: bool = True):
-        self.daily_training_dao(self.user_id, self.session).put(
+        self.daily_training_dao.put(
             self.daily_training_data.serialize(), commit=commit
         )
+        self._stored_version = self.daily_training_data.version
+
+
+def get_request_repo(user_id: str) -> DailyTrainingRepo:
+    """The daily training repo shared by everything in the request"""
+    return request_scoped(
+        (DailyTrainingRepo, user_id), lambda: DailyTrainingRepo(user_id)
+    )
@@ -1,5 +1,7 @@
 from extensions import db
+from helpers.jsonb_helper import jsonb_append, jsonb_set
 from models.models import Writings
+from sqlalchemy import inspect, select
 from sqlalchemy.orm import Session
 
 
@@ -8,9 +10,72 @@ class WritingsRepo:
         self.session: Session = db.session
         self.user_id = user_id
 
-    def add(self, writings: Writings) -> None:
+    def add(self, writings: Writings, commit: bool = True) -> None:
+        if writings.new_messages and inspect(writings).persistent:
+            self._take_ids(writings)
+            # the stored writings are not rewritten, new ones are appended
+            writings.writings = jsonb_append(
+                Writings.writings, writings.new_messages
+            )
+        writings.new_messages = None
         self.session.add(writings)
-        self.session.commit()
+        if commit:
+            self.session.commit()
+
+    def set_message_comment(
+        self,
+        writings: Writings,
+        message_id: int,
+        comment: list[dict],
+        commit: bool = True,
+    ) -> None:
+        """
+        Set the comment of the stored message in place,
+        the messages appended meanwhile by other requests are kept
+        """
+        index = next(
+            (
+                i
+                for i, message in enumerate(self._lock(writings))
+                if message["id"] == message_id
+            ),
+            None,
+        )
+        # the message can be removed meanwhile
+        if index is not None:
+            self.session.query(Writings).filter(
+                Writings.id == writings.id
+            ).update(
+                {
+                    Writings.writings: jsonb_set(
+                        Writings.writings, [str(index), "comment"], comment
+                    )
+                },
+                synchronize_session=False,
+            )
+        if commit:
+            self.session.commit()
+
+    def _take_ids(self, writings: Writings) -> None:
+        """Number the new messages after the last stored one"""
+        last_id = max(
+            (message["id"] for message in self._lock(writings)), default=0
+        )
+        for id_, message in enumerate(writings.new_messages, last_id + 1):
+            message["id"] = id_
+
+    def _lock(self, writings: Writings) -> list[dict]:
+        """
+        The stored messages, the row is locked till the end
+        of the transaction, so the concurrent requests
+        don't change the messages meanwhile
+        """
+        with self.session.no_autoflush:
+            return self.session.execute(
+                select(Writings.writings)
+                .where(Writings.id == writings.id)
+                .with_for_update()
+            ).scalar_one()
 
     def get(self) -> Writings | None:
         return (
@@ -2,6 +2,7 @@ import json
 
 from flask import Blueprint, render_template, request, redirect, url_for
 
+from helpers import metrics
 from helpers.rbac_helper import role_required
 from constants import Role
 from services.expression_service import ExpressionService
@@ -9,6 +10,7 @@ from forms.expression_forms import PostExpressionForm
 from forms.expression_sentence import ExpressionSentenceForm
 from services.tags_service import TagsService
 from services.expression_context_service import ExpressionContextService
+from services.llm_cache import get_llm_cache
 from constants import GrammarTag
 
 admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
@@ -44,6 +46,18 @@ def expressions():
     )
 
 
+@admin_bp.route("/llm-cache", methods=["GET"])
+def llm_cache():
+    role_required([Role.SUPER_ADMIN.value, Role.ADMIN.value])
+    cache = get_llm_cache()
+    return render_template(
+        "admin/llm_cache.html",
+        stats=cache.get_stats() if cache else None,
+        # e.g. the daily training writes skipped as nothing changed
+        counters=dict(sorted(metrics.get_counters().items())),
+    )
+
+
 # TO IMPROVE: add pagination
 @admin_bp.route("/expressions/<expression_id>", methods=["GET", "POST"])
 def expression(expression_id: str):
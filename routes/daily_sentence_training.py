@@ -11,7 +11,7 @@ from flask import (
 from constants import Role
 from helpers.rbac_helper import role_required
 from exercises.sentence_training_v2 import SentenceTraining
-from repository.training_expressions_repo import DailyTrainingRepo
+from repository.training_expressions_repo import get_request_repo
 
 daily_sentence_training_bp = Blueprint(
     "daily_sentence_training", __name__, url_prefix="/daily-sentence-training"
@@ -19,7 +19,7 @@ daily_sentence_training_bp = Blueprint(
 
 
 def _init_sentence_training(user_id: str):
-    return SentenceTraining(DailyTrainingRepo(user_id))
+    return SentenceTraining(get_request_repo(user_id))
 
 
 @daily_sentence_training_bp.route("/", methods=["GET", "POST"])
@@ -1,5 +1,8 @@
+from http import HTTPStatus
+
 from flask import (
     Blueprint,
+    abort,
     render_template,
     request,
     flash,
@@ -12,17 +15,21 @@ from constants import MessageStatus, Role
 from exercises.daily_training_v2 import (
     LearnListItemNotFoundExpression,
 )
+from exercises.exceptions import ExpressionNotFoundException
 from forms.daily_training_forms import DailyTrainingSettingsForm
 from helpers.rbac_helper import role_required
 
 exercise_bp = Blueprint("exercise", __name__, url_prefix="/exercise")
 
+BATCH_SIZE = 10
+MAX_BATCH_SIZE = 50
+
 
 def _init_daily_training(user_id: str):
     from exercises.daily_training_v3 import DailyTraining
-    from repository.training_expressions_repo import DailyTrainingRepo
+    from repository.training_expressions_repo import get_request_repo
 
-    return DailyTraining(DailyTrainingRepo(user_id))
+    return DailyTraining(get_request_repo(user_id))
 
 
 @exercise_bp.route("/daily-training", methods=["GET", "POST"])
@@ -60,6 +67,66 @@ def daily_training_challenge():
     )
 
 
+@exercise_bp.route("/daily-training/batch", methods=["GET", "POST"])
+def daily_training_batch():
+    role_required(
+        [
+            Role.SUPER_ADMIN.value,
+            Role.ADMIN.value,
+            Role.SELF_EDUCATED.value,
+        ]
+    )
+
+    dt = _init_daily_training(g.user_id)
+
+    if request.method == "GET":
+        amount = request.args.get("amount", BATCH_SIZE, type=int)
+        challenges = dt.get_challenges(max(1, min(amount, MAX_BATCH_SIZE)))
+
+        if not challenges:
+            flash("Nosing to test")
+            return redirect(url_for("user.index"))
+
+        return render_template(
+            "exercises/daily_training_batch_challenge.html",
+            challenges=challenges,
+        )
+
+    expression_ids = request.form.getlist("expression_id")
+    answer_texts = request.form.getlist("answer")
+    hints = request.form.getlist("hint")
+    # every answer has its expression and hint fields
+    if (
+        not 0 < len(expression_ids) <= MAX_BATCH_SIZE
+        or len(answer_texts) != len(expression_ids)
+        or len(hints) != len(expression_ids)
+    ):
+        abort(HTTPStatus.BAD_REQUEST.value)
+
+    answers = [
+        {
+            "expression_id": expression_id,
+            "answer": answer,
+            "hint": hint == "true",
+        }
+        for expression_id, answer, hint in zip(
+            expression_ids, answer_texts, hints
+        )
+    ]
+
+    try:
+        solutions = dt.submit_challenges(answers)
+    except ExpressionNotFoundException:
+        flash(
+            "Some of the expressions are not found", MessageStatus.ERROR.value
+        )
+        return redirect(url_for("exercise.daily_training_batch"))
+
+    return render_template(
+        "exercises/daily_training_batch_solution.html", solutions=solutions
+    )
+
+
 @exercise_bp.route("/daily-training-expressions", methods=["GET"])
 def daily_training_expressions():
     role_required(
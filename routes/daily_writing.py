@@ -1,4 +1,14 @@
-from flask import Blueprint, render_template, request, g
+from http import HTTPStatus
+
+from flask import (
+    Blueprint,
+    abort,
+    redirect,
+    render_template,
+    request,
+    g,
+    url_for,
+)
 
 from helpers.rbac_helper import role_required
 from constants import Role
@@ -28,6 +38,13 @@ def daily_writing():
     dw = _init_daily_writing(g.user_id)
 
     if request.method == "POST":
+        if dw.background_grading:
+            job_id = dw.enqueue_writing(
+                request.form["input"], request.form.getlist("expression_ids")
+            )
+            return redirect(
+                url_for("daily_writing.graded_writing", job_id=job_id)
+            )
         data = dw.submit_writing(
             request.form["input"], request.form.getlist("expression_ids")
         )
@@ -35,3 +52,24 @@ def daily_writing():
 
     data = dw.get_challenge()
     return render_template("exercises/daily_writing.html", data=data)
+
+
+@daily_writing_bp.route("/jobs/<job_id>", methods=["GET"])
+def graded_writing(job_id):
+    role_required(
+        [
+            Role.SUPER_ADMIN.value,
+            Role.ADMIN.value,
+            Role.SELF_EDUCATED.value,
+        ]
+    )
+
+    if not (
+        graded_writing := _init_daily_writing(g.user_id).get_graded_writing(
+            job_id
+        )
+    ):
+        abort(HTTPStatus.NOT_FOUND.value)
+
+    job, data = graded_writing
+    return render_template("exercises/daily_writing.html", data=data, job=job)
@@ -1,9 +1,25 @@
-from flask import Blueprint, render_template, request, g, redirect, url_for
+import json
+import logging
+from typing import Iterator
+
+from flask import (
+    Blueprint,
+    Response,
+    render_template,
+    request,
+    g,
+    redirect,
+    stream_with_context,
+    url_for,
+)
 
 from forms.dialogue_train_forms import DialogueCreateForm
+from helpers.ff_helper import is_feature_flag_enabled
 from helpers.rbac_helper import role_required
 from constants import Role
-from exercises.dialogue_training import DialogueTraining
+from exercises.dialogue_training import DialogueEvent, DialogueTraining
+
+logger = logging.getLogger(__name__)
 
 dialogue_training_bp = Blueprint(
     "dialogue_training", __name__, url_prefix="/exercise"
@@ -65,13 +81,60 @@ def dialogue_new():
     "/dialogues/<dialogue_id>", methods=["GET", "POST"]
 )
 def dialogue(dialogue_id):
-    dialogue = DialogueTraining(g.user_id).get_dialogue(dialogue_id)
     if request.method == "GET":
+        dialogue = DialogueTraining(g.user_id).get_dialogue(
+            dialogue_id, before=request.args.get("before", type=int)
+        )
         return render_template(
-            "exercises/dialogue_training.html", data=dialogue
+            "exercises/dialogue_training.html",
+            data=dialogue,
+            streaming=is_feature_flag_enabled("DIALOGUE_STREAMING"),
         )
 
     dialogue = DialogueTraining(g.user_id).submit_dialogue_statement(
         dialogue_id, request.form["input"]
     )
-    return render_template("exercises/dialogue_training.html", data=dialogue)
+    return render_template(
+        "exercises/dialogue_training.html",
+        data=dialogue,
+        streaming=is_feature_flag_enabled("DIALOGUE_STREAMING"),
+    )
+
+
+@dialogue_training_bp.route(
+    "/dialogues/<dialogue_id>/stream", methods=["POST"]
+)
+def dialogue_stream(dialogue_id):
+    """
+    Server-sent events of the submitted statement: "token" events
+    of the answer, "comment" and "expressions" when it's judged
+    and "done" or "error" at the end
+    """
+    role_required(
+        [
+            Role.SUPER_ADMIN.value,
+            Role.ADMIN.value,
+            Role.SELF_EDUCATED.value,
+        ]
+    )
+    events = DialogueTraining(g.user_id).stream_dialogue_statement(
+        dialogue_id, request.form["input"]
+    )
+    return Response(
+        stream_with_context(_to_server_sent_events(events)),
+        mimetype="text/event-stream",
+        # proxies must not buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _to_server_sent_events(events: Iterator[DialogueEvent]) -> Iterator[str]:
+    try:
+        for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    except Exception:
+        # the status is sent already, the error is reported as an event
+        logger.exception("Dialogue stream failed")
+        yield "event: error\ndata: null\n\n"
+        return
+    yield "event: done\ndata: null\n\n"
@@ -1,5 +1,10 @@
+from http import HTTPStatus
+
 from flask import (
     Blueprint,
+    abort,
+    flash,
+    jsonify,
     render_template,
     request,
     redirect,
@@ -7,27 +12,36 @@ from flask import (
     g,
 )
 
-from forms.expression_forms import PostExpressionForm
+from forms.expression_forms import (
+    AddExistingExpressionForm,
+    PostExpressionForm,
+)
 from helpers.ff_helper import is_feature_flag_enabled
+from services.exceptions import (
+    ExpressionNotFoundException,
+    InvalidPageCursorException,
+)
 from services.user_expression_service import UserExpressionService
 from services.tags_service import TagsService
 from exercises.daily_training_v2 import DailyTraining
-from constants import GrammarTag, Role
+from constants import GrammarTag, MessageStatus, Role
 from helpers.rbac_helper import role_required
 
 expressions_bp = Blueprint(
     "expressions", __name__, url_prefix="/user/expressions"
 )
 
+PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
 
 def _init_daily_training(user_id: str):
     from exercises.daily_training_v3 import DailyTraining
-    from repository.training_expressions_repo import DailyTrainingRepo
+    from repository.training_expressions_repo import get_request_repo
 
-    return DailyTraining(DailyTrainingRepo(user_id))
+    return DailyTraining(get_request_repo(user_id))
 
 
-# TO IMPROVE: add pagination
 @expressions_bp.route("", methods=["GET", "POST"])
 def user_expressions():
     role_required(
@@ -42,10 +56,17 @@ def user_expressions():
     ue_sv = UserExpressionService(g.user_id)
 
     if request.method == "GET":
-        exprs = ue_sv.get_all()
+        page_size = request.args.get("page_size", PAGE_SIZE, type=int)
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+        try:
+            page = ue_sv.get_page(page_size, request.args.get("cursor"))
+        except InvalidPageCursorException:
+            abort(HTTPStatus.BAD_REQUEST.value)
         return render_template(
             "expressions/list.html",
-            exprs=exprs,
+            exprs=page["expressions"],
+            next_cursor=page["nextCursor"],
+            page_size=page_size,
             query_expression=query_expression,
         )
 
@@ -104,7 +125,66 @@ def post_expression(expression):
 
         return redirect(url_for("expressions.user_expressions"))
 
-    return render_template("expressions/post.html", form=form)
+    return render_template(
+        "expressions/post.html",
+        form=form,
+        similar=UserExpressionService(g.user_id).get_similar_expressions(
+            form.expression.data or expression
+        ),
+    )
+
+
+@expressions_bp.route("/similar", methods=["GET"])
+def similar_expressions():
+    role_required(
+        [
+            Role.SUPER_ADMIN.value,
+            Role.ADMIN.value,
+            Role.SELF_EDUCATED.value,
+        ]
+    )
+
+    exprs = UserExpressionService(g.user_id).get_similar_expressions(
+        request.args.get("query", "")
+    )
+    return jsonify(
+        [
+            {
+                **expr,
+                "url": url_for(
+                    (
+                        "expressions.user_expression"
+                        if expr["isAdded"]
+                        else "expressions.add_existing_expression"
+                    ),
+                    expression_id=expr["expressionId"],
+                ),
+            }
+            for expr in exprs
+        ]
+    )
+
+
+@expressions_bp.route("<string:expression_id>/add", methods=["POST"])
+def add_existing_expression(expression_id: str):
+    role_required(
+        [
+            Role.SUPER_ADMIN.value,
+            Role.ADMIN.value,
+            Role.SELF_EDUCATED.value,
+        ]
+    )
+
+    if not AddExistingExpressionForm().validate_on_submit():
+        abort(HTTPStatus.BAD_REQUEST.value)
+
+    try:
+        UserExpressionService(g.user_id).add_existing_expression(expression_id)
+    except ExpressionNotFoundException:
+        abort(HTTPStatus.NOT_FOUND.value)
+
+    flash("expression is added", MessageStatus.SUCCESS.value)
+    return redirect(url_for("expressions.user_expressions"))
 
 
 @expressions_bp.route("<string:expression_id>", methods=["GET"])
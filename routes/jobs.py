@@ -0,0 +1,24 @@
+from http import HTTPStatus
+
+from flask import Blueprint, abort, g, jsonify
+
+from helpers.rbac_helper import role_required
+from constants import Role
+from dao.jobs_dao import JobsDAO
+
+jobs_bp = Blueprint("jobs", __name__, url_prefix="/jobs")
+
+
+@jobs_bp.route("/<job_id>", methods=["GET"])
+def job(job_id):
+    """Status of the background job, the pages poll it"""
+    role_required(
+        [
+            Role.SUPER_ADMIN.value,
+            Role.ADMIN.value,
+            Role.SELF_EDUCATED.value,
+        ]
+    )
+    if not (job := JobsDAO().get(g.user_id, job_id)):
+        abort(HTTPStatus.NOT_FOUND.value)
+    return jsonify(job.serialize())
@@ -13,9 +13,9 @@ user_bp = Blueprint("user", __name__, url_prefix="/")
 
 def _init_daily_training(user_id: str):
     from exercises.daily_training_v3 import DailyTraining
-    from repository.training_expressions_repo import DailyTrainingRepo
+    from repository.training_expressions_repo import get_request_repo
 
-    return DailyTraining(DailyTrainingRepo(user_id))
+    return DailyTraining(get_request_repo(user_id))
 
 
 @user_bp.route("")
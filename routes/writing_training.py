@@ -23,10 +23,17 @@ def writing_training():
 
     if request.method == "POST":
         input_data = request.form["input"]
+        if writing_training.background_grading:
+            job_id = writing_training.enqueue_writing(input_data)
+            return redirect(
+                url_for("writing_training.writing_training", job=job_id)
+            )
         writing_training.submit_writing(input_data)
         return redirect(url_for("writing_training.writing_training"))
 
     return render_template(
         "exercises/writing_training.html",
         data=data,
+        # the page is reloaded when the writing is graded
+        job_id=request.args.get("job"),
     )
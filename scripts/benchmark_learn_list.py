@@ -0,0 +1,79 @@
+"""
+Compares learn list implementations on the operations daily training does.
+
+python -m scripts.benchmark_learn_list
+"""
+import random
+import timeit
+
+from repository.learn_list_tree import TreeLearnList
+from repository.training_expressions_repo import (
+    DailyTrainingLearnList,
+    DailyTrainingLearnListItem,
+)
+
+SIZES = (50, 1_000, 10_000)
+REPEATS = 5
+OPERATIONS = 1_000
+LEARN_LIST_CLASSES = (DailyTrainingLearnList, TreeLearnList)
+
+
+def get_items(amount: int) -> list[DailyTrainingLearnListItem]:
+    return [
+        DailyTrainingLearnListItem(
+            expression_id=str(i),
+            position=0,
+            practice_count=i % 100,
+            knowledge_level=(i % 100) / 100,
+            last_practice_time=None,
+        )
+        for i in range(amount)
+    ]
+
+
+def move_items(llist, size: int, rnd: random.Random) -> None:
+    # submit of a training: the item is popped and inserted back
+    # at its new position
+    for _ in range(OPERATIONS):
+        item = llist.pop_item_by_id(str(rnd.randrange(size)))
+        item.position = rnd.randrange(size)
+        llist.insert(item)
+
+
+def take_first(llist, size: int, rnd: random.Random) -> None:
+    for _ in range(OPERATIONS):
+        llist.get_first_items_ids(10)
+
+
+def remove_trained(llist, size: int, rnd: random.Random) -> None:
+    llist.pop_items_where(lambda item: item.knowledge_level >= 0.9)
+
+
+def run(operation, llist_class, size: int) -> float:
+    def setup():
+        nonlocal llist
+        llist = llist_class(get_items(size))
+
+    llist = None
+    rnd = random.Random(size)
+    timer = timeit.Timer(lambda: operation(llist, size, rnd), setup=setup)
+    return min(timer.repeat(repeat=REPEATS, number=1))
+
+
+def main():
+    print(f"{'operation':<16}{'size':>8}", end="")
+    for llist_class in LEARN_LIST_CLASSES:
+        print(f"{llist_class.__name__:>26}", end="")
+    print()
+
+    for operation in (move_items, take_first, remove_trained):
+        for size in SIZES:
+            print(f"{operation.__name__:<16}{size:>8}", end="")
+            for llist_class in LEARN_LIST_CLASSES:
+                seconds = run(operation, llist_class, size)
+                print(f"{seconds * 1000:>23.3f} ms", end="")
+            print()
+
+
+if __name__ == "__main__":
+    main()
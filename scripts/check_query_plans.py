@@ -0,0 +1,315 @@
+"""
+Runs the DAO queries against a seeded DB, explains every executed statement
+and fails if any of them reads a big table with a sequential scan.
+
+python -m scripts.check_query_plans -e test
+"""
+import argparse
+import json
+import sys
+from typing import Callable, Iterator
+
+from dotenv import dotenv_values
+from flask import Flask
+from sqlalchemy import event, text
+
+from dao.learn_list_dao import LearnListDAO
+from dao.user_expressions_dao import UserExpressionsDAO
+from extensions import db
+from repository.dialogue_training_repo import DialogueTrainingRepo
+from repository.expression_context_repo import ExpressionContextRepo
+from repository.writings_repo import WritingsRepo
+from scripts.common.constants import Env, ENV_MAPPING
+
+CHOICES = [Env.DEV.value, Env.TEST.value]
+SEED_MARK = "queryPlanCheck"
+USERS = 100
+EXPRESSIONS_PER_USER = 200
+ROWS_PER_PARENT = 100
+MIN_ROWS = 10_000
+
+USER_ID_SQL = "md5('query-plan-check-user-' || u)::uuid"
+EXPRESSION_ID_SQL = "md5('query-plan-check-expression-' || e)::uuid"
+
+SEED_SQL = f"""
+    INSERT INTO users (
+        id, first, last, email, role, password_hash, properties,
+        added, updated, last_login
+    )
+    SELECT
+        {USER_ID_SQL}, 'Query', 'Plan', 'query-plan-check-' || u || '@test.mail',
+        'self-educated', '',
+        '{{"{SEED_MARK}": true, "nativeLang": "uk", "challenges": {{"dailyTraining": {{"learnListSize": 50, "practiceCountThreshold": 50, "knowledgeLevelThreshold": 0.9}}}}}}',
+        now(), now(), now()
+    FROM generate_series(1, :users) u
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO expressions (
+        id, expression, definition, example, translations,
+        added, updated, properties
+    )
+    SELECT
+        {EXPRESSION_ID_SQL}, 'expression ' || e, 'definition ' || e,
+        'example ' || e, '{{}}', now(), now(), '{{"{SEED_MARK}": true}}'
+    FROM generate_series(1, :expressions) e
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO user_expression (
+        user_id, expression_id, last_practice_time, practice_count,
+        added, updated, properties
+    )
+    SELECT
+        {USER_ID_SQL}, {EXPRESSION_ID_SQL},
+        CASE WHEN e % 2 = 0 THEN now() - e * interval '1 minute' END,
+        e % 3, now() - e * interval '1 minute', now(), '{{}}'
+    FROM generate_series(1, :users) u, generate_series(1, :expressions) e
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO learn_list_items (user_id, expression_id, sort_key)
+    SELECT {USER_ID_SQL}, {EXPRESSION_ID_SQL}, e * 1024
+    FROM generate_series(1, :users) u, generate_series(1, :rows) e
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO expression_context (
+        id, expression_id, sentence, template, added, updated
+    )
+    SELECT
+        md5('query-plan-check-context-' || e || '-' || c)::uuid,
+        {EXPRESSION_ID_SQL}, 'sentence ' || c, '{{}}', now(), now()
+    FROM generate_series(1, :expressions) e, generate_series(1, :rows) c
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO dialogues (id, user_id, title, settings, added, updated)
+    SELECT
+        md5('query-plan-check-dialogue-' || u || '-' || d)::uuid,
+        {USER_ID_SQL}, 'dialogue ' || d, '{{}}', now(), now()
+    FROM generate_series(1, :users) u, generate_series(1, :rows) d
+    ON CONFLICT DO NOTHING;
+
+    INSERT INTO writings (id, user_id, properties, added, updated)
+    SELECT
+        md5('query-plan-check-writings-' || u || '-' || w)::uuid,
+        {USER_ID_SQL}, '{{}}', now(), now()
+    FROM generate_series(1, :users) u, generate_series(1, :rows) w
+    ON CONFLICT DO NOTHING;
+"""
+
+CLEAN_SQL = f"""
+    DELETE FROM users WHERE properties->>'{SEED_MARK}' = 'true';
+    DELETE FROM expressions WHERE properties->>'{SEED_MARK}' = 'true';
+"""
+
+# (name, call) pairs, every call gets a seeded user id and expression id
+QUERIES: list[tuple[str, Callable[[str, str], object]]] = [
+    (
+        "UserExpressionsDAO.get",
+        lambda user_id, _: UserExpressionsDAO(user_id).get(profile="list"),
+    ),
+    (
+        "UserExpressionsDAO.get include",
+        lambda user_id, expr_id: UserExpressionsDAO(user_id).get(
+            include=[expr_id], profile="challenge"
+        ),
+    ),
+    (
+        "UserExpressionsDAO.get exclude",
+        lambda user_id, expr_id: UserExpressionsDAO(user_id).get(
+            exclude=[expr_id], limit=10
+        ),
+    ),
+    (
+        "UserExpressionsDAO.get_by_id",
+        lambda user_id, expr_id: UserExpressionsDAO(user_id).get_by_id(
+            expr_id, profile="detail"
+        ),
+    ),
+    (
+        "UserExpressionsDAO.get_page",
+        lambda user_id, _: UserExpressionsDAO(user_id).get_page(50),
+    ),
+    (
+        "UserExpressionsDAO.get_learn_list_candidates",
+        lambda user_id, _: UserExpressionsDAO(
+            user_id
+        ).get_learn_list_candidates(10),
+    ),
+    (
+        "UserExpressionsDAO.get_trained_expressions",
+        lambda user_id, _: UserExpressionsDAO(user_id).get_trained_expressions(
+            limit=10, profile="list"
+        ),
+    ),
+    (
+        "UserExpressionsDAO.count_trained_expressions",
+        lambda user_id, _: UserExpressionsDAO(
+            user_id
+        ).count_trained_expressions(),
+    ),
+    (
+        "UserExpressionsDAO.search",
+        lambda user_id, _: UserExpressionsDAO(user_id).search(
+            "expression", profile="list"
+        ),
+    ),
+    ("LearnListDAO.get", lambda user_id, _: LearnListDAO(user_id).get()),
+    (
+        "DialogueTrainingRepo.get",
+        lambda user_id, _: DialogueTrainingRepo(user_id).get(),
+    ),
+    ("WritingsRepo.get", lambda user_id, _: WritingsRepo(user_id).get()),
+    (
+        "ExpressionContextRepo.get",
+        lambda _, expr_id: ExpressionContextRepo(expr_id).get(),
+    ),
+]
+
+
+def get_app(configs) -> Flask:
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = (
+        f"postgresql://{configs['LL_DB_USER']}:{configs['LL_DB_USER_PSW']}"
+        f"@{configs['LL_DB_HOST']}:{configs['LL_DB_PORT']}"
+        f"/{configs['LL_DB_NAME']}"
+    )
+    db.init_app(app)
+    return app
+
+
+def seed() -> None:
+    db.session.execute(
+        text(SEED_SQL),
+        {
+            "users": USERS,
+            "expressions": EXPRESSIONS_PER_USER,
+            "rows": ROWS_PER_PARENT,
+        },
+    )
+    db.session.commit()
+    db.session.execute(text("ANALYZE"))
+
+
+def clean() -> None:
+    db.session.execute(text(CLEAN_SQL))
+    db.session.commit()
+
+
+def get_statements(call: Callable[[], object]) -> list[tuple[str, object]]:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, *args):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        call()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+        db.session.rollback()
+
+    return statements
+
+
+def get_plan_nodes(plan: dict) -> Iterator[dict]:
+    yield plan
+    for sub_plan in plan.get("Plans", []):
+        yield from get_plan_nodes(sub_plan)
+
+
+def get_seq_scans(
+    statement: str, parameters: object, min_rows: int
+) -> list[str]:
+    connection = db.engine.raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+
+            relations = {
+                node["Relation Name"]
+                for node in get_plan_nodes(plan[0]["Plan"])
+                if node["Node Type"] == "Seq Scan"
+            }
+            big_relations = []
+            for relation in sorted(relations):
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE relname = %s",
+                    (relation,),
+                )
+                if cursor.fetchone()[0] >= min_rows:
+                    big_relations.append(relation)
+    finally:
+        connection.close()
+
+    return big_relations
+
+
+def check_queries(min_rows: int) -> bool:
+    user_id, expression_id = db.session.execute(
+        text(
+            f"SELECT {USER_ID_SQL}, {EXPRESSION_ID_SQL} "
+            "FROM (SELECT 1 AS u, 2 AS e) ids"
+        )
+    ).one()
+    user_id, expression_id = str(user_id), str(expression_id)
+
+    succeed = True
+    for name, query in QUERIES:
+        failures = []
+        for statement, parameters in get_statements(
+            lambda: query(user_id, expression_id)
+        ):
+            if seq_scans := get_seq_scans(statement, parameters, min_rows):
+                failures.append(
+                    f"seq scan on {', '.join(seq_scans)}: "
+                    f"{' '.join(statement.split())}"
+                )
+
+        succeed = succeed and not failures
+        print(f"{'FAIL' if failures else 'ok':<5}{name}")
+        for failure in failures:
+            print(f"    {failure}")
+
+    return succeed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Script to check DAO queries do not scan big tables"
+    )
+    parser.add_argument(
+        "-e",
+        "--env",
+        required=True,
+        choices=CHOICES,
+        help=f'Env name to check queries on. One of: {", ".join(CHOICES)}',
+    )
+    parser.add_argument(
+        "--min-rows",
+        type=int,
+        default=MIN_ROWS,
+        help="Tables with at least this number of rows must not be scanned",
+    )
+    parser.add_argument(
+        "--keep-data",
+        action="store_true",
+        help="Do not delete seeded data after the check",
+    )
+    args = parser.parse_args()
+    configs = dotenv_values(ENV_MAPPING[args.env])
+
+    with get_app(configs).app_context():
+        print("seed data ...")
+        seed()
+        try:
+            succeed = check_queries(args.min_rows)
+        finally:
+            if not args.keep_data:
+                clean()
+
+    sys.exit(0 if succeed else 1)
+
+
+if __name__ == "__main__":
+    main()
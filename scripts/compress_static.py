@@ -0,0 +1,39 @@
+"""
+Writes gzip compressed copies of static js and css files next to them,
+they are served instead of the originals to the clients accepting gzip.
+
+python -m scripts.compress_static
+"""
+import gzip
+import os
+
+STATIC_DIRS = ("static/js", "static/css")
+EXTENSIONS = (".js", ".css")
+
+
+def compress_file(path: str) -> bool:
+    compressed_path = path + ".gz"
+    if os.path.exists(compressed_path) and os.path.getmtime(
+        compressed_path
+    ) >= os.path.getmtime(path):
+        return False
+
+    with open(path, "rb") as file:
+        content = file.read()
+    # mtime=0 keeps the compressed file the same for the same content
+    with open(compressed_path, "wb") as file:
+        file.write(gzip.compress(content, compresslevel=9, mtime=0))
+
+    return True
+
+
+def main():
+    for static_dir in STATIC_DIRS:
+        for name in sorted(os.listdir(static_dir)):
+            path = os.path.join(static_dir, name)
+            if name.endswith(EXTENSIONS) and compress_file(path):
+                print(f"compressed {path}")
+
+
+if __name__ == "__main__":
+    main()
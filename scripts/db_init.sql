@@ -4,7 +4,7 @@ CREATE TABLE IF NOT EXISTS expressions (
     expression    TEXT NOT NULL,
     definition    TEXT,
     example       TEXT,
-    translations  json NOT NULL,
+    translations  jsonb NOT NULL,
     added         TIMESTAMP NOT NULL,
     updated       TIMESTAMP NOT NULL,
     properties    json NOT NULL DEFAULT '{}'
@@ -45,7 +45,7 @@ CREATE TABLE IF NOT EXISTS users (
     email            VARCHAR(50) NOT NULL UNIQUE,
     role             VARCHAR(15) NOT NULL,
     password_hash    VARCHAR(70) NOT NULL,
-    properties       json NOT NULL,
+    properties       jsonb NOT NULL,
     added            TIMESTAMP NOT NULL,
     updated          TIMESTAMP NOT NULL,
     last_login       TIMESTAMP NOT NULL
@@ -85,10 +85,10 @@ CREATE TABLE IF NOT EXISTS dialogues (
     user_id        uuid NOT NULL,
     title          TEXT NOT NULL,
     description    TEXT,
-    properties     json NOT NULL DEFAULT '{}',
+    properties     jsonb NOT NULL DEFAULT '{}',
     settings       json NOT NULL,
-    dialogues      json NOT NULL DEFAULT '[]',
-    expressions    json NOT NULL DEFAULT '[]',
+    expressions    jsonb NOT NULL DEFAULT '[]',
+    messages_count INT NOT NULL DEFAULT 0,
     added          TIMESTAMP NOT NULL,
     updated        TIMESTAMP NOT NULL,
 
@@ -100,8 +100,8 @@ CREATE TABLE IF NOT EXISTS writings (
     id             uuid NOT NULL,
     user_id        uuid NOT NULL,
     properties     json NOT NULL,
-    writings       json NOT NULL DEFAULT '[]',
-    expressions    json NOT NULL DEFAULT '[]',
+    writings       jsonb NOT NULL DEFAULT '[]',
+    expressions    jsonb NOT NULL DEFAULT '[]',
     added          TIMESTAMP NOT NULL,
     updated        TIMESTAMP NOT NULL,
 
@@ -139,3 +139,201 @@ ALTER TABLE expressions ADD COLUMN IF NOT EXISTS properties json NOT NULL DEFAUL
 ---------------------------------------------------------------------------------------------------------------
 
 ALTER TABLE dialogues ADD COLUMN IF NOT EXISTS properties json NOT NULL DEFAULT '{}';
+
+---------------------------------------------------------------------------------------------------------------
+
+-- daily training learn list moved from users.properties to its own table
+-- "position" is the item training progress, "sort_key" defines the order of the list
+CREATE TABLE IF NOT EXISTS learn_list_items (
+    user_id             uuid NOT NULL,
+    expression_id       uuid NOT NULL,
+    sort_key            DOUBLE PRECISION NOT NULL,
+    position            INT NOT NULL DEFAULT 0,
+    practice_count      INT NOT NULL DEFAULT 0,
+    knowledge_level     NUMERIC(8, 5) NOT NULL DEFAULT 0,
+    last_practice_time  TIMESTAMP,
+
+    PRIMARY KEY         (user_id, expression_id),
+    FOREIGN KEY         (user_id) REFERENCES users (id) ON DELETE CASCADE,
+    FOREIGN KEY         (user_id, expression_id) REFERENCES user_expression (user_id, expression_id) ON DELETE CASCADE
+);
+
+CREATE INDEX IF NOT EXISTS learn_list_items_user_id_sort_key_idx ON learn_list_items (user_id, sort_key);
+
+INSERT INTO learn_list_items (user_id, expression_id, sort_key, position, practice_count, knowledge_level, last_practice_time)
+SELECT
+    u.id,
+    ue.expression_id,
+    item.ordinality * 1024,
+    COALESCE((item.value->>'position')::INT, 0),
+    COALESCE((item.value->>'practiceCount')::INT, 0),
+    COALESCE((item.value->>'knowledgeLevel')::NUMERIC(8, 5), 0),
+    (item.value->>'lastPracticeTime')::TIMESTAMP
+FROM users u
+CROSS JOIN LATERAL json_array_elements((u.properties->'challenges'->'dailyTraining'->'learning_list')::json) WITH ORDINALITY AS item(value, ordinality)
+JOIN user_expression ue ON ue.user_id = u.id AND ue.expression_id = (item.value->>'expressionId')::uuid
+ON CONFLICT DO NOTHING;
+
+UPDATE users
+SET properties = (properties::jsonb #- '{challenges,dailyTraining,learning_list}')::json
+WHERE properties::jsonb #> '{challenges,dailyTraining,learning_list}' IS NOT NULL;
+
+---------------------------------------------------------------------------------------------------------------
+
+-- new learn list items are the newest not practiced user expressions
+CREATE INDEX IF NOT EXISTS user_expression_learn_list_candidates_idx ON user_expression (user_id, added DESC) WHERE practice_count = 0;
+
+---------------------------------------------------------------------------------------------------------------
+
+-- keyset pagination of the user expressions list
+CREATE INDEX IF NOT EXISTS user_expression_user_id_added_idx ON user_expression (user_id, added DESC, expression_id DESC);
+
+---------------------------------------------------------------------------------------------------------------
+
+-- indexes for the columns the DAO queries filter on,
+-- checked with "python -m scripts.check_query_plans -e test"
+CREATE INDEX IF NOT EXISTS user_expression_user_id_last_practice_time_idx ON user_expression (user_id, last_practice_time);
+CREATE INDEX IF NOT EXISTS dialogues_user_id_added_idx ON dialogues (user_id, added DESC);
+CREATE INDEX IF NOT EXISTS writings_user_id_idx ON writings (user_id);
+CREATE INDEX IF NOT EXISTS expression_context_expression_id_idx ON expression_context (expression_id);
+
+---------------------------------------------------------------------------------------------------------------
+
+-- full text search over expressions, the vector is kept up to date by the trigger
+ALTER TABLE expressions ADD COLUMN IF NOT EXISTS search_vector tsvector;
+
+CREATE OR REPLACE FUNCTION expressions_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', coalesce(NEW.expression, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(NEW.definition, '')), 'B') ||
+        setweight(to_tsvector('english', coalesce(NEW.example, '')), 'C');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS expressions_search_vector_trigger ON expressions;
+CREATE TRIGGER expressions_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF expression, definition, example ON expressions
+    FOR EACH ROW EXECUTE FUNCTION expressions_search_vector_update();
+
+UPDATE expressions SET expression = expression WHERE search_vector IS NULL;
+
+CREATE INDEX IF NOT EXISTS expressions_search_vector_idx ON expressions USING GIN (search_vector);
+
+---------------------------------------------------------------------------------------------------------------
+
+-- trigram index for similar expressions lookup, skipped where pg_trgm is not installed
+DO $$
+BEGIN
+  IF EXISTS(SELECT * FROM pg_available_extensions WHERE name = 'pg_trgm')
+  THEN
+      CREATE EXTENSION IF NOT EXISTS pg_trgm;
+      CREATE INDEX IF NOT EXISTS expressions_expression_trgm_idx ON expressions USING GIN (lower(expression) gin_trgm_ops);
+  END IF;
+END $$;
+
+---------------------------------------------------------------------------------------------------------------
+
+-- jsonb columns can be updated in place with jsonb_set and || instead of rewriting the whole document
+DO $$
+DECLARE
+  col RECORD;
+BEGIN
+  FOR col IN
+    SELECT table_name, column_name, column_default
+    FROM information_schema.columns
+    WHERE table_schema = 'public'
+      AND data_type = 'json'
+      AND (table_name, column_name) IN (
+        ('users', 'properties'),
+        ('expressions', 'translations'),
+        ('dialogues', 'properties'),
+        ('dialogues', 'dialogues'),
+        ('dialogues', 'expressions'),
+        ('writings', 'writings'),
+        ('writings', 'expressions')
+      )
+  LOOP
+      EXECUTE format('ALTER TABLE %I ALTER COLUMN %I DROP DEFAULT', col.table_name, col.column_name);
+      EXECUTE format('ALTER TABLE %I ALTER COLUMN %I TYPE jsonb USING %I::jsonb', col.table_name, col.column_name, col.column_name);
+      IF col.column_default IS NOT NULL
+      THEN
+          EXECUTE format('ALTER TABLE %I ALTER COLUMN %I SET DEFAULT %s', col.table_name, col.column_name, replace(col.column_default, '::json', '::jsonb'));
+      END IF;
+  END LOOP;
+END $$;
+
+---------------------------------------------------------------------------------------------------------------
+
+-- dialogue messages moved from dialogues.dialogues to an append-only table, read by pages of "seq"
+ALTER TABLE dialogues ADD COLUMN IF NOT EXISTS messages_count INT NOT NULL DEFAULT 0;
+
+CREATE TABLE IF NOT EXISTS dialogue_messages (
+    dialogue_id    uuid NOT NULL,
+    seq            INT NOT NULL,
+    user_id        uuid NOT NULL,
+    role           VARCHAR(20) NOT NULL,
+    text           TEXT NOT NULL,
+    comment        jsonb,
+
+    PRIMARY KEY    (dialogue_id, seq),
+    FOREIGN KEY    (dialogue_id, user_id) REFERENCES dialogues (id, user_id) ON DELETE CASCADE
+);
+
+-- the old column is kept as dialogues_backup, it's dropped by a later migration
+-- once the copied messages are checked
+DO $$
+DECLARE
+  expected_count INT;
+  copied_count INT;
+BEGIN
+  IF EXISTS(SELECT *
+    FROM information_schema.columns
+    WHERE table_name='dialogues' and column_name='dialogues')
+  THEN
+      INSERT INTO dialogue_messages (dialogue_id, seq, user_id, role, text, comment)
+      SELECT
+          d.id,
+          message.ordinality,
+          d.user_id,
+          message.value->>'role',
+          COALESCE(message.value->>'text', ''),
+          message.value->'comment'
+      FROM dialogues d
+      CROSS JOIN LATERAL jsonb_array_elements(d.dialogues::jsonb) WITH ORDINALITY AS message(value, ordinality)
+      ON CONFLICT DO NOTHING;
+
+      SELECT COALESCE(sum(jsonb_array_length(dialogues::jsonb)), 0) INTO expected_count FROM dialogues;
+      SELECT count(*) INTO copied_count FROM dialogue_messages;
+      IF copied_count <> expected_count THEN
+          RAISE EXCEPTION 'dialogue messages backfill copied % of % messages', copied_count, expected_count;
+      END IF;
+
+      UPDATE dialogues SET messages_count = jsonb_array_length(dialogues::jsonb);
+
+      ALTER TABLE dialogues RENAME COLUMN dialogues TO dialogues_backup;
+  END IF;
+END $$;
+
+---------------------------------------------------------------------------------------------------------------
+
+-- background jobs, e.g. grading of the submitted writings, the workers poll them with FOR UPDATE SKIP LOCKED
+CREATE TABLE IF NOT EXISTS jobs (
+    id             uuid NOT NULL,
+    user_id        uuid NOT NULL,
+    type           VARCHAR(50) NOT NULL,
+    payload        jsonb NOT NULL DEFAULT '{}',
+    status         VARCHAR(20) NOT NULL DEFAULT 'pending',
+    result         jsonb,
+    error          TEXT,
+    attempts       INT NOT NULL DEFAULT 0,
+    run_after      TIMESTAMP NOT NULL,
+    added          TIMESTAMP NOT NULL,
+    updated        TIMESTAMP NOT NULL,
+
+    PRIMARY KEY    (id),
+    FOREIGN KEY    (user_id) REFERENCES users (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS jobs_status_run_after_idx ON jobs (status, run_after);
+CREATE INDEX IF NOT EXISTS jobs_user_id_idx ON jobs (user_id);
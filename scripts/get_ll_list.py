@@ -1,4 +1,3 @@
-import json
 from dotenv import dotenv_values
 
 from common.utils import get_connection
@@ -9,16 +8,29 @@ CONFIGS = dotenv_values(".env.prod")
 # CONFIGS = dotenv_values(".env.dev")
 
 
-def get_properties(user_id):
+def get_ll_list(user_id):
     sql = """
-        SELECT properties
-        FROM users
-        WHERE id=%(user_id)s
+        SELECT
+            expression_id,
+            position,
+            practice_count,
+            knowledge_level
+        FROM learn_list_items
+        WHERE user_id=%(user_id)s
+        ORDER BY sort_key
     """
     with get_connection(CONFIGS).cursor() as cursor:
         cursor.execute(sql, {"user_id": user_id})
-        props = cursor.fetchone()
-    return props
+        rows = cursor.fetchall()
+    return [
+        {
+            "expressionId": str(row[0]),
+            "position": row[1],
+            "practiceCount": row[2],
+            "knowledgeLevel": float(row[3]),
+        }
+        for row in rows
+    ]
 
 
 def get_expression(expr_id):
@@ -33,10 +45,6 @@ def get_expression(expr_id):
     return expr[0]
 
 
-def get_ll_list(props):
-    return props["challenges"]["dailyTraining"]["learning_list"]
-
-
 def print_ll_list(ll_list):
     print("i, pk, lp, kl, expr")
     for i, item in enumerate(ll_list):
@@ -53,8 +61,7 @@ def print_ll_list(ll_list):
 
 
 def main():
-    props = get_properties(USER_ID)[0]
-    ll_list = get_ll_list(props)
+    ll_list = get_ll_list(USER_ID)
     print_ll_list(ll_list)
 
 
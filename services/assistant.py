@@ -1,5 +1,5 @@
 # TODO: analyze from the langchain best practices perspective
-from typing import TypedDict
+from typing import Iterator, TypedDict
 import os
 import logging
 from langchain_core.messages import (
@@ -10,14 +10,36 @@ from langchain_core.messages import (
 )
 from langchain.output_parsers import PydanticOutputParser
 from langchain.prompts.prompt import PromptTemplate
+from langchain_core.runnables import Runnable
 from pydantic import BaseModel, Field
 
+from helpers import metrics
+from helpers.expression_matcher import ExpressionMatcher
+from helpers.ff_helper import is_feature_flag_enabled
+from helpers.token_helper import (
+    CHARS_PER_TOKEN,
+    MESSAGE_OVERHEAD_TOKENS,
+    estimate_messages_tokens,
+)
 from services.venice_chat_model import ChatVeniceAI
 from services.llm_callbacks import ModelCallbackHandler
+from services.llm_cache import get_llm_cache
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# prompt budget of a single model call, can be changed with
+# VENICE_MAX_INPUT_TOKENS env var
+MAX_INPUT_TOKENS = 8000
+DIALOGUE_TEMPERATURE = 0.8
+# estimated tokens of the messages sent in one summary call, longer
+# dialogues are folded into the summary chunk by chunk
+SUMMARY_CHUNK_TOKENS = 2000
+
+# model calls not made, since the expressions were matched locally
+SAVED_LLM_CALLS_METRIC = "expression_matcher.saved_llm_calls"
+ESCALATED_METRIC = "expression_matcher.escalated"
+
 character = """
 The assistant is the following character:
 
@@ -67,6 +89,27 @@ Do not include any additional text, explanations, or formatting.
 """
 
 
+dialogue_summary_template = """
+Here is the summary of a conversation between a user and an assistant:
+<summary>
+{summary}
+</summary>
+
+Here are the next messages of the conversation:
+<messages>
+{messages}
+</messages>
+
+Write a new summary of the whole conversation.
+Keep the topics, facts, names and questions that are still open,
+so the conversation can be continued from the summary only.
+The summary must be no longer than {max_words} words.
+
+**IMPORTANT:**
+Respond ONLY with the summary text.
+"""
+
+
 class Problem(BaseModel):
     problem: str = Field(description="A part from the text that has a problem")
     explanation: str = Field(description="Explanation of the problem")
@@ -146,29 +189,151 @@ class ExpressionUsageResponse(BaseModel):
     )
 
 
+# detection and usage judgement of all the expressions in one call,
+# instead of the detection and a judgement per detected expression
+expressions_usage_judgement_template = """
+In the text below:
+{text}
+
+I want you to identify usage of the following expressions:
+{expression_list}
+
+For every expression that is USED in the text answer,
+is it used correctly according to its meaning, and comment the usage.
+It's important to return ONLY expressions that are USED in the text.
+**IMPORTANT:**
+Respond ONLY with valid JSON in the exact format specified below.
+Do not include any additional text, explanations, or formatting.
+{response_format}
+
+If no expression is used, please provide an empty list.
+"""
+
+
+class ExpressionsUsageJudgementResponse(BaseModel):
+    expressions: list[ExpressionUsageResponse] = Field(
+        description="List of the used expressions with their ids"
+    )
+
+
 class VeniceAssistant:
-    def __init__(self):
+    def __init__(self, local_matching: bool | None = None):
         self.default_temperature = 0
+        # find the obviously used and not used expressions without a model
+        self.local_matching = (
+            is_feature_flag_enabled("LOCAL_EXPRESSION_MATCHING")
+            if local_matching is None
+            else local_matching
+        )
         self.chat_model: ChatVeniceAI = ChatVeniceAI(
             model=os.environ.get("VENICE_MODEL", ""),
             api_key=os.environ.get("VENICE_API_KEY"),
             temperature=self.default_temperature,
+            max_input_tokens=int(
+                os.environ.get("VENICE_MAX_INPUT_TOKENS", MAX_INPUT_TOKENS)
+            ),
             callbacks=[ModelCallbackHandler()],
+            # the same prompt gets the same answer with the zero temperature
+            cache=get_llm_cache(),
+        )
+        # a copy, so the judgements running at the same time
+        # keep the default temperature, the answers are not cached
+        self.dialogue_chat_model: ChatVeniceAI = self.chat_model.model_copy(
+            update={"temperature": DIALOGUE_TEMPERATURE, "cache": False}
         )
 
     def complete_dialogue(self, dialogue: list[dict]) -> str:
         logger.info("Completing dialogue")
-        self.chat_model.temperature = 0.8
+        answer = self.dialogue_chat_model.invoke(
+            self._get_complete_dialogue_messages(dialogue)
+        )
+        return answer.content
+
+    async def acomplete_dialogue(self, dialogue: list[dict]) -> str:
+        logger.info("Completing dialogue")
+        answer = await self.dialogue_chat_model.ainvoke(
+            self._get_complete_dialogue_messages(dialogue)
+        )
+        return answer.content
+
+    def stream_dialogue(self, dialogue: list[dict]) -> Iterator[str]:
+        """Yield the parts of the answer as the model generates them"""
+        logger.info("Streaming dialogue")
+        for chunk in self.dialogue_chat_model.stream(
+            self._get_complete_dialogue_messages(dialogue)
+        ):
+            if chunk.content:
+                yield chunk.content
+
+    def _get_complete_dialogue_messages(
+        self, dialogue: list[dict]
+    ) -> list[BaseMessage]:
         messages = self._generate_dialogue_messages(dialogue)
         messages.insert(0, SystemMessage(content=character))
-        answer = self.chat_model.invoke(messages)
-        self.chat_model.temperature = self.default_temperature
-        return answer.content
+        return messages
+
+    def summarize_dialogue(
+        self,
+        summary: str | None,
+        dialogue: list[dict],
+        max_words: int = 150,
+    ) -> str:
+        """
+        Condense the previous summary and the next messages into one.
+        The messages are folded into the summary in chunks, so the input
+        of every call is bounded whatever the number of messages.
+        """
+        for chunk in self._split_summary_chunks(dialogue):
+            summary = self._summarize_dialogue_chunk(summary, chunk, max_words)
+        return summary or ""
+
+    @staticmethod
+    def _split_summary_chunks(dialogue: list[dict]) -> list[list[dict]]:
+        # a message longer than a chunk is cut to fit it alone
+        max_tokens = SUMMARY_CHUNK_TOKENS - MESSAGE_OVERHEAD_TOKENS
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        chunks: list[list[dict]] = []
+        chunk: list[dict] = []
+        tokens = 0
+        for message in dialogue:
+            message = {**message, "content": message["content"][:max_chars]}
+            message_tokens = estimate_messages_tokens([message])
+            if chunk and tokens + message_tokens > SUMMARY_CHUNK_TOKENS:
+                chunks.append(chunk)
+                chunk, tokens = [], 0
+            chunk.append(message)
+            tokens += message_tokens
+        if chunk:
+            chunks.append(chunk)
+        return chunks
+
+    def _summarize_dialogue_chunk(
+        self, summary: str | None, dialogue: list[dict], max_words: int
+    ) -> str:
+        logger.info("Summarizing dialogue")
+        template = PromptTemplate(
+            input_variables=["summary", "messages", "max_words"],
+            template=dialogue_summary_template,
+        )
+        chain = template | self.chat_model
+        answer = chain.invoke(
+            {
+                "summary": summary or "The conversation has just started.",
+                "messages": "\n".join(
+                    f"{message['role']}: {message['content']}"
+                    for message in dialogue
+                ),
+                "max_words": max_words,
+            },
+            config={"metadata": {"run_type": "dialogue_summary"}},
+        )
+        return answer.content.strip()
 
     def _generate_dialogue_messages(
         self, dialogue: list[dict]
     ) -> list[BaseMessage]:
         type_mapping = {
+            "system": SystemMessage,
             "user": HumanMessage,
             "assistant": AIMessage,
         }
@@ -179,6 +344,21 @@ class VeniceAssistant:
 
     def get_general_judgement(self, text: str) -> GeneralJudgementResponse:
         logger.info("Getting general judgement")
+        return self._get_general_judgement_chain().invoke(
+            {"text_to_analyze": text},
+            config={"metadata": {"run_type": "general_judgement"}},
+        )
+
+    async def aget_general_judgement(
+        self, text: str
+    ) -> GeneralJudgementResponse:
+        logger.info("Getting general judgement")
+        return await self._get_general_judgement_chain().ainvoke(
+            {"text_to_analyze": text},
+            config={"metadata": {"run_type": "general_judgement"}},
+        )
+
+    def _get_general_judgement_chain(self) -> Runnable:
         response_parser = PydanticOutputParser(
             pydantic_object=GeneralJudgementResponse
         )
@@ -189,16 +369,59 @@ class VeniceAssistant:
                 "response_format": response_parser.get_format_instructions()
             },
         )
-        chain = template | self.chat_model | response_parser
-        return chain.invoke(
-            {"text_to_analyze": text},
-            config={"metadata": {"run_type": "general_judgement"}},
-        )
+        return template | self.chat_model | response_parser
 
     def detect_phrases_usage(
         self, text: str, expressions: list[ExpressionDetectionRequest]
     ) -> ExpressionDetectionResponse:
         logger.info("Detecting phrases usage")
+        hits, expressions = self._match_locally(text, expressions)
+        if self.local_matching and not expressions:
+            metrics.increment(SAVED_LLM_CALLS_METRIC)
+            return ExpressionDetectionResponse(expressions=hits)
+        detection = self._get_detect_phrases_usage_chain().invoke(
+            {"text": text, "expression_list": expressions},
+            config={"metadata": {"run_type": "phrase_usage_detection"}},
+        )
+        detection.expressions = hits + detection.expressions
+        return detection
+
+    async def adetect_phrases_usage(
+        self, text: str, expressions: list[ExpressionDetectionRequest]
+    ) -> ExpressionDetectionResponse:
+        logger.info("Detecting phrases usage")
+        hits, expressions = self._match_locally(text, expressions)
+        if self.local_matching and not expressions:
+            metrics.increment(SAVED_LLM_CALLS_METRIC)
+            return ExpressionDetectionResponse(expressions=hits)
+        detection = await self._get_detect_phrases_usage_chain().ainvoke(
+            {"text": text, "expression_list": expressions},
+            config={"metadata": {"run_type": "phrase_usage_detection"}},
+        )
+        detection.expressions = hits + detection.expressions
+        return detection
+
+    def _match_locally(
+        self, text: str, expressions: list[ExpressionDetectionRequest]
+    ) -> tuple[list[str], list[ExpressionDetectionRequest]]:
+        """
+        Ids of the obviously used expressions and the ambiguous
+        expressions left for the model, the obviously not used ones
+        are dropped. All the expressions are left without local_matching.
+        """
+        if not self.local_matching:
+            return [], expressions
+        match = ExpressionMatcher(
+            {str(item["id"]): item["expression"] for item in expressions}
+        ).match(text)
+        ambiguous = [
+            item for item in expressions if str(item["id"]) in match.ambiguous
+        ]
+        if ambiguous:
+            metrics.increment(ESCALATED_METRIC, len(ambiguous))
+        return match.hits, ambiguous
+
+    def _get_detect_phrases_usage_chain(self) -> Runnable:
         response_parser = PydanticOutputParser(
             pydantic_object=ExpressionDetectionResponse
         )
@@ -209,15 +432,29 @@ class VeniceAssistant:
                 "response_format": response_parser.get_format_instructions()
             },
         )
-        chain = template | self.chat_model | response_parser
-        return chain.invoke(
-            {"text": text, "expression_list": expressions},
-            config={"metadata": {"run_type": "phrase_usage_detection"}},
-        )
+        return template | self.chat_model | response_parser
 
     def get_expression_usage_judgement(
         self, text: str, expression: ExpressionUsageRequest
     ) -> ExpressionUsageResponse:
+        judgement = self._get_expression_usage_judgement_chain().invoke(
+            self._get_expression_usage_judgement_input(text, expression),
+            config={"metadata": {"run_type": "expression_usage_judgement"}},
+        )
+        judgement.id = expression["id"]
+        return judgement
+
+    async def aget_expression_usage_judgement(
+        self, text: str, expression: ExpressionUsageRequest
+    ) -> ExpressionUsageResponse:
+        judgement = await self._get_expression_usage_judgement_chain().ainvoke(
+            self._get_expression_usage_judgement_input(text, expression),
+            config={"metadata": {"run_type": "expression_usage_judgement"}},
+        )
+        judgement.id = expression["id"]
+        return judgement
+
+    def _get_expression_usage_judgement_chain(self) -> Runnable:
         response_parser = PydanticOutputParser(
             pydantic_object=ExpressionUsageResponse
         )
@@ -228,15 +465,96 @@ class VeniceAssistant:
                 "response_format": response_parser.get_format_instructions()
             },
         )
+        return template | self.chat_model | response_parser
+
+    @staticmethod
+    def _get_expression_usage_judgement_input(
+        text: str, expression: ExpressionUsageRequest
+    ) -> dict:
+        return {
+            "text": text,
+            "expression": expression["expression"],
+            "meaning": expression["meaning"],
+        }
 
-        chain = template | self.chat_model | response_parser
-        judgement = chain.invoke(
-            {
-                "text": text,
-                "expression": expression["expression"],
-                "meaning": expression["meaning"],
+    def judge_expressions_usage(
+        self, text: str, expressions: list[ExpressionUsageRequest]
+    ) -> list[ExpressionUsageResponse]:
+        """Detect the used expressions and judge their usage in one call"""
+        logger.info("Judging expressions usage")
+        expressions = self._drop_misses(text, expressions)
+        if not expressions:
+            return []
+        judgement = self._get_expressions_usage_judgement_chain().invoke(
+            {"text": text, "expression_list": expressions},
+            config={"metadata": {"run_type": "expressions_usage_judgement"}},
+        )
+        return self._filter_requested(judgement, expressions)
+
+    async def ajudge_expressions_usage(
+        self, text: str, expressions: list[ExpressionUsageRequest]
+    ) -> list[ExpressionUsageResponse]:
+        logger.info("Judging expressions usage")
+        expressions = self._drop_misses(text, expressions)
+        if not expressions:
+            return []
+        judgement = (
+            await self._get_expressions_usage_judgement_chain().ainvoke(
+                {"text": text, "expression_list": expressions},
+                config={
+                    "metadata": {"run_type": "expressions_usage_judgement"}
+                },
+            )
+        )
+        return self._filter_requested(judgement, expressions)
+
+    def _drop_misses(
+        self, text: str, expressions: list[ExpressionUsageRequest]
+    ) -> list[ExpressionUsageRequest]:
+        """The used expressions are judged anyway, only misses are dropped"""
+        if not self.local_matching:
+            return expressions
+        misses = (
+            ExpressionMatcher(
+                {str(item["id"]): item["expression"] for item in expressions}
+            )
+            .match(text)
+            .misses
+        )
+        expressions = [
+            item for item in expressions if str(item["id"]) not in misses
+        ]
+        if not expressions:
+            metrics.increment(SAVED_LLM_CALLS_METRIC)
+        return expressions
+
+    def _get_expressions_usage_judgement_chain(self) -> Runnable:
+        response_parser = PydanticOutputParser(
+            pydantic_object=ExpressionsUsageJudgementResponse
+        )
+        template = PromptTemplate(
+            input_variables=["text", "expression_list"],
+            template=expressions_usage_judgement_template,
+            partial_variables={
+                "response_format": response_parser.get_format_instructions()
             },
-            config={"metadata": {"run_type": "expression_usage_judgement"}},
         )
-        judgement.id = expression["id"]
-        return judgement
+        return template | self.chat_model | response_parser
+
+    @staticmethod
+    def _filter_requested(
+        judgement: ExpressionsUsageJudgementResponse,
+        expressions: list[ExpressionUsageRequest],
+    ) -> list[ExpressionUsageResponse]:
+        # the model can make up an id or repeat an expression,
+        # the ids of the request are returned as they are
+        requested_ids = {
+            str(expression["id"]): expression["id"]
+            for expression in expressions
+        }
+        judgments = {}
+        for item in judgement.expressions:
+            if item.id in requested_ids:
+                item.id = requested_ids[item.id]
+                judgments[item.id] = item
+        return list(judgments.values())
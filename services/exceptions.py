@@ -28,3 +28,7 @@ class ExpressionNotFoundException(Exception):
 
 class InvalidUpdateExpressionDataException(Exception):
     pass
+
+
+class InvalidPageCursorException(Exception):
+    pass
@@ -9,6 +9,7 @@ from services.exceptions import (
     TagNotFoundException,
     InvalidUpdateExpressionDataException,
 )
+from helpers.search_helper import SEARCH_LIMIT
 from helpers.time_helpers import get_current_utc_time
 from constants import GrammarTag
 
@@ -68,7 +69,7 @@ class ExpressionService:
 
     def search(self, pattern: str) -> List[ExpressionsListItemType]:
         return self._format_expressions_list(
-            self.expressions_repo.search(pattern)
+            self.expressions_repo.search(pattern, limit=SEARCH_LIMIT)
         )
 
     def update_expression(
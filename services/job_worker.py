@@ -0,0 +1,94 @@
+import json
+import logging
+import threading
+from typing import Any, Callable
+
+from dao.jobs_dao import MAX_ATTEMPTS, JobsDAO
+from extensions import db
+from helpers import metrics
+from models.models import Job
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+DONE_METRIC = "jobs.done"
+FAILED_METRIC = "jobs.failed"
+
+# seconds to wait when there are no due jobs
+POLL_INTERVAL = 1
+
+JobHandler = Callable[[Job], dict[str, Any] | None]
+
+
+class JobWorker:
+    """
+    Runs the queued jobs one by one with the handler of the job type.
+    Any number of workers can poll the same table, a job is taken
+    by one of them. A failed job is retried up to max_attempts times.
+
+    A handler must not commit, its changes are committed with the job
+    completion. So a failed job or a job of a stopped worker is run
+    again from scratch, its changes are not applied twice. The claimed
+    job is committed before the handler runs, the handler makes its
+    model calls before it reads the db, so no transaction is kept open
+    during them.
+    """
+
+    def __init__(
+        self,
+        handlers: dict[str, JobHandler],
+        jobs_dao: JobsDAO | None = None,
+        poll_interval: float = POLL_INTERVAL,
+        max_attempts: int = MAX_ATTEMPTS,
+    ) -> None:
+        self.handlers = handlers
+        self.jobs_dao = jobs_dao or JobsDAO()
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        stop = stop or threading.Event()
+        logger.info("Worker started")
+        while not stop.is_set():
+            if not self.run_once():
+                stop.wait(self.poll_interval)
+        logger.info("Worker stopped")
+
+    def run_once(self) -> bool:
+        """Run the next due job, False when there is none"""
+        job = self.jobs_dao.claim()
+        if job is None:
+            return False
+
+        # the job is expired when its transaction fails
+        name = repr(job)
+        logger.info(f"Running job {name}, attempt {job.attempts}")
+        try:
+            result = self.handlers[job.type](job)
+            # stored as json, e.g. uuids as strings. The changes
+            # of the handler are committed in the same transaction.
+            self.jobs_dao.complete(
+                job, json.loads(json.dumps(result, default=str))
+            )
+        except Exception as error:
+            # the handler doesn't commit, its changes are dropped
+            self.jobs_dao.session.rollback()
+            logger.exception(f"Job {name} failed")
+            self._fail(job, name, repr(error))
+        else:
+            metrics.increment(DONE_METRIC)
+        finally:
+            # the next job sees the changes made by the web workers
+            if self.jobs_dao.session is db.session:
+                db.session.remove()
+        return True
+
+    def _fail(self, job: Job, name: str, error: str) -> None:
+        metrics.increment(FAILED_METRIC)
+        try:
+            self.jobs_dao.fail(job, error, self.max_attempts)
+        except Exception:
+            # e.g. the db is unreachable, the worker goes on
+            # and the job is taken again after the running timeout
+            self.jobs_dao.session.rollback()
+            logger.exception(f"Job {name} is not marked as failed")
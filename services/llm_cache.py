@@ -0,0 +1,257 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator, Optional, TypedDict
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from helpers import metrics
+
+HITS_METRIC = "llm_cache.hits"
+MISSES_METRIC = "llm_cache.misses"
+
+# can be changed with LLM_CACHE_PATH, LLM_CACHE_TTL (seconds)
+# and LLM_CACHE_MAX_BYTES env vars
+CACHE_PATH = Path.cwd() / "cache/llm_cache.sqlite3"
+TTL = 7 * 24 * 60 * 60
+MAX_BYTES = 50 * 1024 * 1024
+
+_llm_cache: "LLMResponseCache | None" = None
+_llm_cache_lock = threading.Lock()
+
+
+class LLMCacheStats(TypedDict):
+    hits: int
+    misses: int
+    hitRate: float | None
+    entries: int
+    bytes: int
+    maxBytes: int
+
+
+class LLMResponseCache(BaseCache):
+    """
+    Persistent cache of the model responses in a local SQLite file,
+    keyed by the hash of the model parameters and the rendered prompt.
+    Entries expire after the TTL, the least recently used ones are
+    evicted when the responses take more than max_bytes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = CACHE_PATH,
+        ttl: float = TTL,
+        max_bytes: int = MAX_BYTES,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_used REAL NOT NULL
+                )
+                """
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_last_used_idx "
+                "ON llm_cache (last_used)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS llm_cache_expires_at_idx "
+                "ON llm_cache (expires_at)"
+            )
+            # the running total of the sizes, kept by the triggers,
+            # so the eviction doesn't sum the sizes of all the entries
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_cache_size (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    total INTEGER NOT NULL
+                )
+                """
+            )
+            connection.execute(
+                "INSERT OR IGNORE INTO llm_cache_size (id, total) "
+                "SELECT 0, coalesce(sum(size), 0) FROM llm_cache"
+            )
+            connection.executescript(
+                """
+                CREATE TRIGGER IF NOT EXISTS llm_cache_size_insert
+                AFTER INSERT ON llm_cache BEGIN
+                    UPDATE llm_cache_size SET total = total + new.size;
+                END;
+                CREATE TRIGGER IF NOT EXISTS llm_cache_size_update
+                AFTER UPDATE OF size ON llm_cache BEGIN
+                    UPDATE llm_cache_size
+                    SET total = total + new.size - old.size;
+                END;
+                CREATE TRIGGER IF NOT EXISTS llm_cache_size_delete
+                AFTER DELETE ON llm_cache BEGIN
+                    UPDATE llm_cache_size SET total = total - old.size;
+                END;
+                """
+            )
+
+    def lookup(
+        self, prompt: str, llm_string: str
+    ) -> Optional[RETURN_VAL_TYPE]:
+        key = self._get_key(prompt, llm_string)
+        now = time.time()
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT response FROM llm_cache "
+                "WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row:
+                connection.execute(
+                    "UPDATE llm_cache SET last_used = ? WHERE key = ?",
+                    (now, key),
+                )
+
+        metrics.increment(HITS_METRIC if row else MISSES_METRIC)
+        return (
+            [
+                ChatGeneration(message=AIMessage(content=content))
+                for content in json.loads(row[0])
+            ]
+            if row
+            else None
+        )
+
+    def update(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        # only the answers are kept, a cached answer costs no tokens
+        response = json.dumps(
+            [generation.message.content for generation in return_val]
+        )
+        size = len(response.encode())
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self._connect() as connection:
+            # an upsert, the replaced row would skip the delete trigger
+            connection.execute(
+                "INSERT INTO llm_cache "
+                "(key, response, size, expires_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET "
+                "response = excluded.response, size = excluded.size, "
+                "expires_at = excluded.expires_at, "
+                "last_used = excluded.last_used",
+                (
+                    self._get_key(prompt, llm_string),
+                    response,
+                    size,
+                    now + self.ttl,
+                    now,
+                ),
+            )
+            connection.execute(
+                "DELETE FROM llm_cache WHERE expires_at <= ?", (now,)
+            )
+            self._evict(connection)
+
+    # sqlite calls block, e.g. waiting for the write lock of the other
+    # process, so they don't run on the event loop shared by the model calls
+    async def alookup(
+        self, prompt: str, llm_string: str
+    ) -> Optional[RETURN_VAL_TYPE]:
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.lookup, prompt, llm_string
+        )
+
+    async def aupdate(
+        self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE
+    ) -> None:
+        await asyncio.get_running_loop().run_in_executor(
+            None, self.update, prompt, llm_string, return_val
+        )
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM llm_cache")
+
+    def get_stats(self) -> LLMCacheStats:
+        with self._connect() as connection:
+            (entries,) = connection.execute(
+                "SELECT count(*) FROM llm_cache"
+            ).fetchone()
+            bytes_ = self._get_total_size(connection)
+
+        hits = metrics.get_count(HITS_METRIC)
+        misses = metrics.get_count(MISSES_METRIC)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hitRate": hits / (hits + misses) if hits + misses else None,
+            "entries": entries,
+            "bytes": bytes_,
+            "maxBytes": self.max_bytes,
+        }
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        """Delete the least recently used entries above max_bytes"""
+        while self._get_total_size(connection) > self.max_bytes:
+            deleted = connection.execute(
+                "DELETE FROM llm_cache WHERE key = ("
+                "SELECT key FROM llm_cache ORDER BY last_used, key LIMIT 1)"
+            )
+            if not deleted.rowcount:
+                break
+
+    @staticmethod
+    def _get_total_size(connection: sqlite3.Connection) -> int:
+        return connection.execute(
+            "SELECT total FROM llm_cache_size"
+        ).fetchone()[0]
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # a connection per call, so the cache can be used from any thread
+        connection = sqlite3.connect(self.path, timeout=5)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _get_key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode()).hexdigest()
+
+
+def get_llm_cache() -> LLMResponseCache | None:
+    """Process-wide cache, it's not used in the tests"""
+    global _llm_cache
+    if os.getenv("LL_TESTING") == "1":
+        return None
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache(
+                    path=os.environ.get("LLM_CACHE_PATH", CACHE_PATH),
+                    ttl=float(os.environ.get("LLM_CACHE_TTL", TTL)),
+                    max_bytes=int(
+                        os.environ.get("LLM_CACHE_MAX_BYTES", MAX_BYTES)
+                    ),
+                )
+    return _llm_cache
@@ -10,6 +10,10 @@ from langchain.schema import LLMResult
 # TODO: don't log when testing
 # TODO: Error in ModelCallbackHandler.on_llm_end callback: KeyError('metadata') during testing
 class ModelCallbackHandler(BaseCallbackHandler):
+    # only logs, so it's called in the event loop of async runs
+    # instead of a thread of the default executor
+    run_inline = True
+
     def __init__(self) -> None:
         super().__init__()
         self._init_logger()
@@ -0,0 +1,123 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, TypeVar
+
+from helpers import metrics
+from helpers.async_helper import get_event_loop
+from services.venice_client import POOL_SIZE
+
+T = TypeVar("T")
+
+# model calls waiting for a free slot, goes up and down
+QUEUE_DEPTH_METRIC = "llm_executor.queue_depth"
+RUNNING_METRIC = "llm_executor.running"
+SHED_METRIC = "llm_executor.shed"
+
+# can be changed with LLM_MAX_CONCURRENT_CALLS env var,
+# more calls would wait for a connection of the pool anyway
+MAX_CONCURRENT_CALLS = POOL_SIZE
+# can be changed with LLM_MAX_QUEUE_SIZE env var
+MAX_QUEUE_SIZE = 50
+
+
+class LLMOverloadedError(Exception):
+    pass
+
+
+_llm_executor: "LLMExecutor | None" = None
+_llm_executor_lock = threading.Lock()
+
+
+class LLMExecutor:
+    """
+    App-level limit of model calls: no more than max_concurrent_calls
+    of all the requests run at once, the rest wait in the queue.
+    A request whose calls don't fit the queue is rejected at once
+    with LLMOverloadedError instead of waiting.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_calls: int = MAX_CONCURRENT_CALLS,
+        max_queue_size: int = MAX_QUEUE_SIZE,
+    ) -> None:
+        self.max_concurrent_calls = max_concurrent_calls
+        self.max_queue_size = max_queue_size
+        self._lock = threading.Lock()
+        self._queue_depth = 0
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self._queue_depth
+
+    def gather(self, *coroutines: Coroutine[Any, Any, T]) -> list[T]:
+        """Run the coroutines on the process-wide loop, wait for results"""
+        return self.submit(*coroutines).result()
+
+    def submit(self, *coroutines: Coroutine[Any, Any, T]) -> Future[list[T]]:
+        """
+        Run the coroutines on the process-wide loop without waiting,
+        the request thread can do something else meanwhile
+        """
+        with self._lock:
+            if self._queue_depth + len(coroutines) > self.max_queue_size:
+                for coroutine in coroutines:
+                    coroutine.close()
+                metrics.increment(SHED_METRIC, len(coroutines))
+                raise LLMOverloadedError(
+                    "Too many requests to the assistant, try again later"
+                )
+            self._queue_depth += len(coroutines)
+        metrics.increment(QUEUE_DEPTH_METRIC, len(coroutines))
+
+        return asyncio.run_coroutine_threadsafe(
+            self._gather(coroutines), get_event_loop()
+        )
+
+    async def _gather(self, coroutines: tuple[Coroutine[Any, Any, T], ...]):
+        return await asyncio.gather(
+            *(self._run(coroutine) for coroutine in coroutines)
+        )
+
+    async def _run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        try:
+            await self._get_semaphore().acquire()
+        finally:
+            with self._lock:
+                self._queue_depth -= 1
+            metrics.increment(QUEUE_DEPTH_METRIC, -1)
+
+        metrics.increment(RUNNING_METRIC)
+        try:
+            return await coroutine
+        finally:
+            metrics.increment(RUNNING_METRIC, -1)
+            self._get_semaphore().release()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # created and used only on the process-wide loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_calls)
+        return self._semaphore
+
+
+def get_llm_executor() -> LLMExecutor:
+    global _llm_executor
+    if _llm_executor is None:
+        with _llm_executor_lock:
+            if _llm_executor is None:
+                _llm_executor = LLMExecutor(
+                    max_concurrent_calls=int(
+                        os.environ.get(
+                            "LLM_MAX_CONCURRENT_CALLS", MAX_CONCURRENT_CALLS
+                        )
+                    ),
+                    max_queue_size=int(
+                        os.environ.get("LLM_MAX_QUEUE_SIZE", MAX_QUEUE_SIZE)
+                    ),
+                )
+    return _llm_executor
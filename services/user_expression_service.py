@@ -1,19 +1,26 @@
+import base64
+import binascii
+from datetime import datetime
 from typing import List, Optional, TypedDict
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 from dao.user_expressions_dao import UserExpressionsDAO
 from models.models import Expression, UserExpression
 from dao.user_dao import UsersDAO
+from repository.expressions_repo import ExpressionsRepo
 from repository.tags_repo import TagsRepo
+from helpers.search_helper import SEARCH_LIMIT
 from helpers.time_helpers import get_current_utc_time
 from services.exceptions import (
     UserNotFoundException,
     TagNotFoundException,
+    ExpressionNotFoundException,
     UserExpressionNotFoundException,
     InvalidPostUserExpressionDataException,
+    InvalidPageCursorException,
 )
 from exercises.daily_training_v3 import DailyTraining
-from repository.training_expressions_repo import DailyTrainingRepo
+from repository.training_expressions_repo import get_request_repo
 
 
 class UserExpressionListItem(TypedDict):
@@ -25,6 +32,18 @@ class UserExpressionListItem(TypedDict):
     isInLearnList: bool
 
 
+class UserExpressionsPage(TypedDict):
+    expressions: List[UserExpressionListItem]
+    nextCursor: Optional[str]
+
+
+class SimilarExpressionItem(TypedDict):
+    expressionId: str
+    expression: str
+    definition: str
+    isAdded: bool
+
+
 class UserExpressionType(TypedDict):
     expression: str
     definition: str
@@ -36,18 +55,43 @@ class UserExpressionService:
     def __init__(self, user_id: str) -> None:
         self.user_id = user_id
         self.repo = UserExpressionsDAO(user_id)
-        self.daily_training = DailyTraining(DailyTrainingRepo(user_id))
+        self.expressions_repo = ExpressionsRepo()
+        self.daily_training = DailyTraining(get_request_repo(user_id))
 
     def get_expression_by_id(self, expr_id: str) -> UserExpressionType:
-        if not (expr := self.repo.get_by_id(expr_id)):
+        if not (expr := self.repo.get_by_id(expr_id, profile="detail")):
             raise UserExpressionNotFoundException
         return self._format(expr)
 
     def get_all(self) -> List[UserExpressionListItem]:
-        return self._format_list(self.repo.get())
+        return self._format_list(self.repo.get(profile="list"))
+
+    def get_page(
+        self, page_size: int, cursor: Optional[str] = None
+    ) -> UserExpressionsPage:
+        """
+        Get a page of user expressions, newest first. "nextCursor" points
+        to the last expression of the page, so the next page stays the same
+        when expressions are added before it.
+        """
+        after = self._decode_cursor(cursor) if cursor else None
+        # one extra expression tells if there is a next page
+        exprs = self.repo.get_page(page_size + 1, after)
+
+        next_cursor = None
+        if len(exprs) > page_size:
+            exprs = exprs[:page_size]
+            next_cursor = self._encode_cursor(exprs[-1])
+
+        return {
+            "expressions": self._format_list(exprs),
+            "nextCursor": next_cursor,
+        }
 
     def search(self, pattern: str) -> List[UserExpressionListItem]:
-        return self._format_list(self.repo.search(pattern))
+        return self._format_list(
+            self.repo.search(pattern, profile="list", limit=SEARCH_LIMIT)
+        )
 
     def post_expression(
         self,
@@ -100,6 +144,58 @@ class UserExpressionService:
 
         self.daily_training.refresh_learning_list()
 
+    def get_similar_expressions(
+        self, pattern: str
+    ) -> List[SimilarExpressionItem]:
+        """
+        Get existing expressions similar to the pattern, so the user can
+        add one of them instead of posting a duplicate.
+        """
+        if not (exprs := self.expressions_repo.get_similar(pattern)):
+            return []
+
+        added_ids = {
+            str(usr_expr.expression_id)
+            for usr_expr in self.repo.get(
+                include=[str(expr.id) for expr in exprs]
+            )
+        }
+        return [
+            {
+                "expressionId": str(expr.id),
+                "expression": expr.expression,
+                "definition": expr.definition,
+                "isAdded": str(expr.id) in added_ids,
+            }
+            for expr in exprs
+        ]
+
+    def add_existing_expression(self, expression_id: str) -> None:
+        try:
+            expression_id = str(UUID(expression_id))
+        except ValueError:
+            raise ExpressionNotFoundException
+
+        if self.repo.get_by_id(expression_id):
+            return
+
+        if not self.expressions_repo.get_by_id(expression_id):
+            raise ExpressionNotFoundException
+
+        current_utc_time = get_current_utc_time()
+        self.repo.post(
+            UserExpression(
+                user_id=self.user_id,
+                expression_id=expression_id,
+                active=1,
+                added=current_utc_time,
+                updated=current_utc_time,
+                properties={},
+            )
+        )
+
+        self.daily_training.refresh_learning_list()
+
     def count_user_expressions(self) -> int:
         return self.repo.count()
 
@@ -107,6 +203,7 @@ class UserExpressionService:
         self,
         us_exprs: List[UserExpression],
     ) -> List[UserExpressionListItem]:
+        learn_list_ids = self.daily_training.get_learn_list_expression_ids()
         return [
             {
                 "expressionId": str(expr.expression_id),
@@ -114,13 +211,26 @@ class UserExpressionService:
                 "knowledgeLevel": expr.knowledge_level,
                 "practiceCount": expr.practice_count,
                 "lastPracticeTime": expr.last_practice_time,
-                "isInLearnList": self.daily_training.is_expression_in_learn_list(
-                    str(expr.expression_id)
-                ),
+                "isInLearnList": str(expr.expression_id) in learn_list_ids,
             }
             for expr in us_exprs
         ]
 
+    @staticmethod
+    def _encode_cursor(usr_expr: UserExpression) -> str:
+        key = f"{usr_expr.added.isoformat()}|{usr_expr.expression_id}"
+        return base64.urlsafe_b64encode(key.encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+        try:
+            added, expression_id = (
+                base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+            )
+            return datetime.fromisoformat(added), str(UUID(expression_id))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise InvalidPageCursorException(f"Invalid cursor: {cursor}")
+
     @staticmethod
     def _format(usr_expr: UserExpression) -> UserExpressionType:
         return {
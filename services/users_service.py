@@ -18,7 +18,6 @@ DEFAULT_USER_PROPERTIES = {
             "learnListSize": 50,
             "practiceCountThreshold": 50,
             "knowledgeLevelThreshold": 0.9,
-            "learning_list": [],
         }
     },
 }
@@ -1,13 +1,25 @@
-from typing import Any, Dict, List, Optional
+import logging
+from typing import Any, Dict, Iterator, List, Optional
 
-from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
 from langchain_core.language_models import BaseChatModel
-from langchain_core.messages import BaseMessage, AIMessage
-from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.messages.ai import UsageMetadata
+from langchain_core.outputs import (
+    ChatGeneration,
+    ChatGenerationChunk,
+    ChatResult,
+)
 from pydantic import Field, SecretStr
 
+from helpers.token_helper import estimate_messages_tokens
 from services.venice_client import VeniceClient
 
+logger = logging.getLogger(__name__)
+
 
 class ChatVeniceAI(BaseChatModel):
 
@@ -17,6 +29,8 @@ class ChatVeniceAI(BaseChatModel):
     timeout: Optional[int] = None
     stop: Optional[List[str]] = None
     max_retries: int = 2
+    # estimated prompt tokens, the oldest messages are dropped above it
+    max_input_tokens: Optional[int] = None
     api_key: SecretStr
 
     def _init_venice_client(self) -> VeniceClient:
@@ -37,21 +51,74 @@ class ChatVeniceAI(BaseChatModel):
         client = self._init_venice_client()
 
         response = client.do_chat_completion(
-            messages=self._get_chat_messages(messages),
+            messages=self._fit_input_tokens(self._get_chat_messages(messages)),
         )
+        return self._create_chat_result(response)
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
 
+        client = self._init_venice_client()
+
+        response = await client.ado_chat_completion(
+            messages=self._fit_input_tokens(self._get_chat_messages(messages)),
+        )
+        return self._create_chat_result(response)
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+
+        client = self._init_venice_client()
+
+        for response in client.stream_chat_completion(
+            messages=self._fit_input_tokens(self._get_chat_messages(messages)),
+        ):
+            content = (
+                response["choices"][0]["delta"].get("content") or ""
+                if response.get("choices")
+                else ""
+            )
+            usage = response.get("usage")
+            chunk = ChatGenerationChunk(
+                message=AIMessageChunk(
+                    content=content,
+                    usage_metadata=self._get_usage_metadata(usage)
+                    if usage
+                    else None,
+                )
+            )
+            if run_manager and content:
+                run_manager.on_llm_new_token(content, chunk=chunk)
+            yield chunk
+
+    @classmethod
+    def _create_chat_result(cls, response: Dict[str, Any]) -> ChatResult:
         message = AIMessage(
             content=response["choices"][0]["message"]["content"],
-            usage_metadata={
-                "input_tokens": response["usage"]["prompt_tokens"],
-                "output_tokens": response["usage"]["completion_tokens"],
-                "total_tokens": response["usage"]["total_tokens"],
-            },
+            usage_metadata=cls._get_usage_metadata(response["usage"]),
         )
 
         generation = ChatGeneration(message=message)
         return ChatResult(generations=[generation])
 
+    @staticmethod
+    def _get_usage_metadata(usage: Dict[str, Any]) -> UsageMetadata:
+        return {
+            "input_tokens": usage["prompt_tokens"],
+            "output_tokens": usage["completion_tokens"],
+            "total_tokens": usage["total_tokens"],
+        }
+
     def _get_chat_messages(
         self, messages: List[BaseMessage]
     ) -> List[Dict[str, Any]]:
@@ -68,6 +135,35 @@ class ChatVeniceAI(BaseChatModel):
             for message in messages
         ]
 
+    def _fit_input_tokens(
+        self, messages: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Drop the oldest not system messages until the prompt fits
+        max_input_tokens, the last message is always kept.
+        """
+        if self.max_input_tokens is None:
+            return messages
+
+        messages = list(messages)
+        tokens = estimate_messages_tokens(messages)
+        while tokens > self.max_input_tokens:
+            droppable = [
+                i
+                for i, message in enumerate(messages[:-1])
+                if message["role"] != "system"
+            ]
+            if not droppable:
+                break
+            tokens -= estimate_messages_tokens([messages.pop(droppable[0])])
+
+        if tokens > self.max_input_tokens:
+            logger.warning(
+                f"Prompt of {tokens} estimated tokens "
+                f"exceeds the {self.max_input_tokens} tokens budget"
+            )
+        return messages
+
     @property
     def _llm_type(self) -> str:
         """Get the type of language model used by this chat model."""
@@ -86,4 +182,6 @@ class ChatVeniceAI(BaseChatModel):
             # can provide per token pricing for their model and monitor
             # costs for the given LLM.)
             "model_name": self.model_name,
+            # a part of the responses cache key
+            "temperature": self.temperature,
         }
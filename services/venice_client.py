@@ -1,7 +1,33 @@
+import asyncio
 import http
-from pprint import pprint
+import json
+import os
+import random
+import threading
+from typing import Iterator
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# a dialogue turn runs the completion, the general judgement, the detection
+# and up to "maxExpressionsToTrain" usage judgements at the same time,
+# can be changed with VENICE_POOL_SIZE env var
+POOL_SIZE = 10
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5
+RETRY_STATUSES = (
+    http.HTTPStatus.TOO_MANY_REQUESTS.value,
+    http.HTTPStatus.INTERNAL_SERVER_ERROR.value,
+    http.HTTPStatus.BAD_GATEWAY.value,
+    http.HTTPStatus.SERVICE_UNAVAILABLE.value,
+    http.HTTPStatus.GATEWAY_TIMEOUT.value,
+)
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+_async_client: httpx.AsyncClient | None = None
 
 
 class VeniceClientError(Exception):
@@ -11,12 +37,99 @@ class VeniceClientError(Exception):
         super().__init__(self.message)
 
 
+class JitterRetry(Retry):
+    """
+    Exponential backoff with full jitter: a random delay up to
+    backoff_factor * 2 ** (retry number - 1), so the parallel calls
+    that failed together don't retry together.
+    Retry-After header of 429 and 503 responses is respected as it is.
+    """
+
+    def get_backoff_time(self) -> float:
+        return get_backoff_time(len(self.history), self.backoff_factor)
+
+
+def get_backoff_time(retry_number: int, backoff_factor: float) -> float:
+    if not retry_number:
+        return 0
+    backoff = backoff_factor * 2 ** (retry_number - 1)
+    return random.uniform(0, min(Retry.DEFAULT_BACKOFF_MAX, backoff))
+
+
+def create_session(
+    pool_size: int = POOL_SIZE,
+    max_retries: int = MAX_RETRIES,
+    backoff_factor: float = BACKOFF_FACTOR,
+) -> requests.Session:
+    retry = JitterRetry(
+        total=max_retries,
+        # the request could be processed already, it's not repeated
+        read=0,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"POST"}),
+        backoff_factor=backoff_factor,
+        # the last response is returned to report its error
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Process-wide session, its connections are kept alive and reused"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session(
+                    pool_size=int(
+                        os.environ.get("VENICE_POOL_SIZE", POOL_SIZE)
+                    )
+                )
+    return _session
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Process-wide async client, it's bound to the event loop it's used in,
+    so it's used only on the loop of helpers.async_helper
+    """
+    global _async_client
+    if _async_client is None:
+        pool_size = int(os.environ.get("VENICE_POOL_SIZE", POOL_SIZE))
+        limits = httpx.Limits(
+            max_connections=pool_size, max_keepalive_connections=pool_size
+        )
+        _async_client = httpx.AsyncClient(
+            limits=limits,
+            # retries of failed connections, statuses are retried by the client
+            transport=httpx.AsyncHTTPTransport(
+                limits=limits, retries=MAX_RETRIES
+            ),
+        )
+    return _async_client
+
+
 class VeniceClient:
-    def __init__(self, model: str, api_key: str, temperature: float = 0):
+    def __init__(
+        self,
+        model: str,
+        api_key: str,
+        temperature: float = 0,
+        session: requests.Session | None = None,
+        async_client: httpx.AsyncClient | None = None,
+        backoff_factor: float = BACKOFF_FACTOR,
+    ):
         self.base_url = "https://api.venice.ai/api/v1"
         self.model = model
         self.temperature = temperature
         self.api_key = api_key
+        self.session = session or get_session()
+        self.async_client = async_client
+        self.backoff_factor = backoff_factor
 
     @property
     def headers(self) -> dict:
@@ -29,13 +142,9 @@ class VeniceClient:
         self, messages: list[dict], timeout: int = 60
     ) -> dict:
         url = f"{self.base_url}/chat/completions"
-        payload = {
-            "model": self.model,
-            "messages": messages,
-            "temperature": self.temperature,
-        }
+        payload = self._get_payload(messages)
         try:
-            response = requests.post(
+            response = self.session.post(
                 url, headers=self.headers, json=payload, timeout=timeout
             )
         except requests.exceptions.Timeout:
@@ -49,3 +158,78 @@ class VeniceClient:
             )
 
         return response.json()
+
+    def stream_chat_completion(
+        self, messages: list[dict], timeout: int = 60
+    ) -> Iterator[dict]:
+        """
+        Yield the completion chunks as the model generates them,
+        the usage comes in the last chunk without choices
+        """
+        url = f"{self.base_url}/chat/completions"
+        payload = {
+            **self._get_payload(messages),
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+        try:
+            response = self.session.post(
+                url,
+                headers=self.headers,
+                json=payload,
+                timeout=timeout,
+                stream=True,
+            )
+        except requests.exceptions.Timeout:
+            raise VeniceClientError(
+                "Request timed out", http.HTTPStatus.REQUEST_TIMEOUT.value
+            )
+
+        with response:
+            if not response.ok:
+                raise VeniceClientError(
+                    f"Venice API error: {response.text}", response.status_code
+                )
+            # server-sent events, a "data: <json>" line per chunk
+            for line in response.iter_lines():
+                if not line.startswith(b"data:"):
+                    continue
+                data = line[len(b"data:") :].strip()
+                if data == b"[DONE]":
+                    break
+                yield json.loads(data)
+
+    async def ado_chat_completion(
+        self, messages: list[dict], timeout: int = 60
+    ) -> dict:
+        client = self.async_client or get_async_client()
+        url = f"{self.base_url}/chat/completions"
+        payload = self._get_payload(messages)
+        for retry_number in range(MAX_RETRIES + 1):
+            await asyncio.sleep(
+                get_backoff_time(retry_number, self.backoff_factor)
+            )
+            try:
+                response = await client.post(
+                    url, headers=self.headers, json=payload, timeout=timeout
+                )
+            except httpx.TimeoutException:
+                raise VeniceClientError(
+                    "Request timed out", http.HTTPStatus.REQUEST_TIMEOUT.value
+                )
+            if response.status_code not in RETRY_STATUSES:
+                break
+
+        if not response.is_success:
+            raise VeniceClientError(
+                f"Venice API error: {response.text}", response.status_code
+            )
+
+        return response.json()
+
+    def _get_payload(self, messages: list[dict]) -> dict:
+        return {
+            "model": self.model,
+            "messages": messages,
+            "temperature": self.temperature,
+        }
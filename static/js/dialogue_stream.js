@@ -0,0 +1,112 @@
+const form = document.querySelector('.dialogue-form');
+const dialogueFlow = document.querySelector('.dialogue-flow');
+const expressionsContainer = document.querySelector('.dialogue-expressions');
+
+form.addEventListener('submit', async function(event) {
+    event.preventDefault();
+    const input = form.querySelector('textarea');
+    const button = form.querySelector('button');
+    const body = new FormData(form);
+    button.disabled = true;
+
+    const response = await fetch(form.dataset.streamUrl, {method: 'POST', body: body});
+    if (!response.ok) {
+        // the usual submit, it renders the page of the error
+        form.submit();
+        return;
+    };
+
+    input.value = '';
+    const statementItem = appendDialogueItem('user', body.get('input'));
+    const answer = appendDialogueItem('assistant', '').querySelector('p');
+
+    const handlers = {
+        token: function(token) {
+            answer.textContent += token;
+            dialogueFlow.scrollTop = dialogueFlow.scrollHeight;
+        },
+        comment: function(comment) {
+            renderComment(statementItem, comment);
+        },
+        expressions: renderExpressions,
+        error: function() {
+            answer.textContent += ' [The answer is interrupted, please reload the page]';
+        },
+        done: function() {},
+    };
+    await readEvents(response, function(event, data) {
+        handlers[event](data);
+    });
+    button.disabled = false;
+});
+
+async function readEvents(response, onEvent) {
+    const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    while (true) {
+        const {value, done} = await reader.read();
+        if (done) break;
+        buffer += value;
+        // events are separated by an empty line
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const rawEvent of events) {
+            const fields = {};
+            for (const line of rawEvent.split('\n')) {
+                const separator = line.indexOf(': ');
+                fields[line.slice(0, separator)] = line.slice(separator + 2);
+            };
+            onEvent(fields.event, JSON.parse(fields.data));
+        };
+    };
+};
+
+function appendDialogueItem(role, text) {
+    const item = cloneTemplate('dialogue-item-template');
+    item.querySelector('div').classList.add(role);
+    item.querySelector('h3').textContent = role;
+    item.querySelector('p').textContent = text;
+    dialogueFlow.appendChild(item);
+    dialogueFlow.scrollTop = dialogueFlow.scrollHeight;
+    return item;
+};
+
+function renderComment(statementItem, comment) {
+    if (!comment.length) return;
+
+    const commentContainer = document.createElement('div');
+    commentContainer.classList.add('dialogue-comment');
+    for (const commentItem of comment) {
+        const element = cloneTemplate('comment-item-template');
+        element.querySelector('.comment-problem').textContent = commentItem.problem;
+        element.querySelector('.comment-explanation').textContent = commentItem.explanation;
+        element.querySelector('.comment-solution').textContent = commentItem.solution;
+        commentContainer.appendChild(element);
+    };
+    statementItem.querySelector('.user').appendChild(commentContainer);
+
+    const icon = cloneTemplate('comment-icon-template');
+    statementItem.querySelector('h3').prepend(icon);
+    window.bindCommentTooltip(icon);
+};
+
+function renderExpressions(expressions) {
+    expressionsContainer.replaceChildren(...expressions.map(function(expression) {
+        const element = cloneTemplate('expression-item-template');
+        if (expression.status === 'failed') element.classList.add('red-font');
+        element.querySelector('.expression-definition').textContent = expression.definition;
+        if (expression.comment) {
+            element.querySelector('p.expression-comment').textContent = expression.comment;
+        } else {
+            element.querySelectorAll('.expression-comment').forEach(function(e) {e.remove()});
+        };
+        const link = element.querySelector('.expression-link');
+        link.href = link.getAttribute('href').replace('__id__', expression.id);
+        link.textContent = expression.expression;
+        return element;
+    }));
+};
+
+function cloneTemplate(id) {
+    return document.getElementById(id).content.firstElementChild.cloneNode(true);
+};
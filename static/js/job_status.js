@@ -0,0 +1,15 @@
+const jobStatus = document.querySelector('.job-status');
+const POLL_INTERVAL = 2000;
+
+async function pollJob() {
+    const response = await fetch(jobStatus.dataset.jobUrl);
+    const job = response.ok ? await response.json() : null;
+    if (job && ['pending', 'running'].includes(job.status)) {
+        setTimeout(pollJob, POLL_INTERVAL);
+        return;
+    };
+    // the page with the result of the finished job
+    window.location = jobStatus.dataset.doneUrl;
+};
+
+setTimeout(pollJob, POLL_INTERVAL);
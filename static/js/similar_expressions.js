@@ -0,0 +1,66 @@
+'use strict';
+
+const similarBox = document.querySelector('.similar-expressions');
+const expressionInput = document.getElementById('expression');
+const SUGGEST_DELAY_MS = 300;
+
+let suggestTimeout = null;
+
+const renderSimilarExpressions = function(expressions) {
+    const list = document.createElement('ul');
+
+    for (const expr of expressions) {
+        const item = document.createElement('li');
+        item.appendChild(expr.isAdded ? createLink(expr) : createAddForm(expr));
+        item.append(` - ${expr.definition}${expr.isAdded ? ' (added)' : ''}`);
+        list.appendChild(item);
+    }
+
+    similarBox.replaceChildren();
+    if (expressions.length) {
+        const title = document.createElement('p');
+        title.textContent = 'Already in the dictionary:';
+        similarBox.appendChild(title);
+    }
+    similarBox.appendChild(list);
+};
+
+const createLink = function(expr) {
+    const link = document.createElement('a');
+    link.classList.add('expression-link');
+    link.href = expr.url;
+    link.textContent = expr.expression;
+    return link;
+};
+
+// adding changes the user data, so it's a POST with the csrf token
+const createAddForm = function(expr) {
+    const form = document.createElement('form');
+    form.classList.add('add-existing-expression-form');
+    form.method = 'POST';
+    form.action = expr.url;
+
+    const token = document.createElement('input');
+    token.type = 'hidden';
+    token.name = 'csrf_token';
+    token.value = similarBox.dataset.csrfToken;
+
+    const button = document.createElement('button');
+    button.classList.add('expression-link');
+    button.type = 'submit';
+    button.textContent = expr.expression;
+
+    form.append(token, button);
+    return form;
+};
+
+const suggestSimilarExpressions = async function() {
+    const url = `${similarBox.dataset.url}?query=${encodeURIComponent(expressionInput.value)}`;
+    const response = await fetch(url);
+    if (response.ok) renderSimilarExpressions(await response.json());
+};
+
+expressionInput.addEventListener('input', function() {
+    clearTimeout(suggestTimeout);
+    suggestTimeout = setTimeout(suggestSimilarExpressions, SUGGEST_DELAY_MS);
+});
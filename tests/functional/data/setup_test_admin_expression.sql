@@ -5,7 +5,7 @@ DELETE FROM tag_expression;
 DELETE FROM tags;
 
 INSERT INTO users (id, first, last, email, role, password_hash, properties, added, updated, last_login) VALUES -- psw: daily_training
-  ('2f732f36-c0f4-430f-921d-b62877891c80', 'first', 'last', 'admin@test.com', 'super-admin', '2c835ba8966d902120fb4504037fad34effa4b9461e988e4c4da073ad50dae82', '{"nativeLang": "uk", "challenges": {"dailyTraining": {"learnListSize": 50, "practiceCountThreshold": 50, "knowledgeLevelThreshold": 0.9, "learning_list": []}}}', '2023-04-09 10:34:42', '2023-04-09 10:34:42', '2023-04-09 10:34:42');
+  ('2f732f36-c0f4-430f-921d-b62877891c80', 'first', 'last', 'admin@test.com', 'super-admin', '2c835ba8966d902120fb4504037fad34effa4b9461e988e4c4da073ad50dae82', '{"nativeLang": "uk", "challenges": {"dailyTraining": {"learnListSize": 50, "practiceCountThreshold": 50, "knowledgeLevelThreshold": 0.9}}}', '2023-04-09 10:34:42', '2023-04-09 10:34:42', '2023-04-09 10:34:42');
 
 INSERT INTO expressions (id, expression, definition, translations, added, updated, example) VALUES
   ('4d7993aa-d897-4647-994b-e0625c88f349', 'preceding', 'coming before something in order, position, or time', '{"uk": "попередній"}', '2016-06-22 19:10:25', '2016-06-22 19:10:25', 'preceding in sentence');
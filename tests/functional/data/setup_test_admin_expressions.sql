@@ -3,8 +3,8 @@ DELETE FROM expressions;
 DELETE FROM user_expression;
 
 INSERT INTO users (id, first, last, email, role, password_hash, properties, added, updated, last_login) VALUES -- psw: daily_training
-  ('2f732f36-c0f4-430f-921d-b62877891c80', 'first', 'last', 'admin@test.com', 'super-admin', '2c835ba8966d902120fb4504037fad34effa4b9461e988e4c4da073ad50dae82', '{"nativeLang": "uk", "challenges": {"dailyTraining": {"learnListSize": 50, "practiceCountThreshold": 50, "knowledgeLevelThreshold": 0.9, "learning_list": []}}}', '2023-04-09 10:34:42', '2023-04-09 10:34:42', '2023-04-09 10:34:42'),
-  ('04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef', 'First', 'Last', 'daily_training@test.mail', 'self-educated', 'c1a4b7e252281a7649d17a0f9f1d5180d5b5b1783dca84e121bbfcadda4ecc12', '{"nativeLang": "uk", "challenges": {"dailyTraining": {"learnListSize": 50, "practiceCountThreshold": 50, "knowledgeLevelThreshold": 0.9, "learning_list": [{"expressionId": "4d7993aa-d897-4647-994b-e0625c88f349", "position": 0, "practiceCount": 0, "knowledgeLevel": "0"}, {"expressionId": "24d96f68-46e1-4fb3-b300-81cd89cea435", "position": 0, "practiceCount": 0, "knowledgeLevel": "0"}, {"expressionId": "d5c26549-74f7-4930-9c2c-16d10d46e55e", "position": 0, "practiceCount": 0, "knowledgeLevel": "0"}]}}}', '2023-04-16 09:10:25', '2023-04-16 09:10:25', '2023-04-16 09:10:25');
+  ('2f732f36-c0f4-430f-921d-b62877891c80', 'first', 'last', 'admin@test.com', 'super-admin', '2c835ba8966d902120fb4504037fad34effa4b9461e988e4c4da073ad50dae82', '{"nativeLang": "uk", "challenges": {"dailyTraining": {"learnListSize": 50, "practiceCountThreshold": 50, "knowledgeLevelThreshold": 0.9}}}', '2023-04-09 10:34:42', '2023-04-09 10:34:42', '2023-04-09 10:34:42'),
+  ('04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef', 'First', 'Last', 'daily_training@test.mail', 'self-educated', 'c1a4b7e252281a7649d17a0f9f1d5180d5b5b1783dca84e121bbfcadda4ecc12', '{"nativeLang": "uk", "challenges": {"dailyTraining": {"learnListSize": 50, "practiceCountThreshold": 50, "knowledgeLevelThreshold": 0.9}}}', '2023-04-16 09:10:25', '2023-04-16 09:10:25', '2023-04-16 09:10:25');
 
 INSERT INTO expressions (id, expression, definition, translations, added, updated) VALUES
   ('4d7993aa-d897-4647-994b-e0625c88f349', 'preceding'                    , 'coming before something in order, position, or time'      , '{"uk": "попередній"}'   , '2016-06-22 19:10:25', '2016-06-22 19:10:25'),
@@ -25,3 +25,6 @@ INSERT INTO user_expression (user_id, expression_id, added, updated, properties)
   ('04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef', 'd5c26549-74f7-4930-9c2c-16d10d46e55e', '2023-04-13 10:10:25', '2023-04-16 10:10:25', '{}'),
   ('04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef', '66c21b88-3e73-471a-9776-9b691978e650', '2023-04-13 10:10:25', '2023-04-16 10:10:25', '{}'),
   ('04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef', '4eb806c0-a8cd-4ac9-8387-1b79cb97b138', '2023-04-15 10:10:25', '2023-04-16 10:10:25', '{}');
+
+INSERT INTO learn_list_items (user_id, expression_id, sort_key, position, practice_count, knowledge_level, last_practice_time) VALUES
+  ('04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef', 'd5c26549-74f7-4930-9c2c-16d10d46e55e', 1024, 0, 0, 0, null);
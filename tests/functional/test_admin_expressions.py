@@ -69,14 +69,19 @@ class SearchTests(FunctionalTestsHelper):
 
         cases = {
             "school go": [
-                "542d93d5-6a38-4ce6-95ba-de942ad3b309",
                 "66c21b88-3e73-471a-9776-9b691978e650",
                 "b02dcda4-65ae-45ba-a2d7-0502fae3d08a",
+                "542d93d5-6a38-4ce6-95ba-de942ad3b309",
             ],
             "go school": [
+                "66c21b88-3e73-471a-9776-9b691978e650",
+                "b02dcda4-65ae-45ba-a2d7-0502fae3d08a",
                 "542d93d5-6a38-4ce6-95ba-de942ad3b309",
+            ],
+            "go scho": [
                 "66c21b88-3e73-471a-9776-9b691978e650",
                 "b02dcda4-65ae-45ba-a2d7-0502fae3d08a",
+                "542d93d5-6a38-4ce6-95ba-de942ad3b309",
             ],
             "go": [
                 "542d93d5-6a38-4ce6-95ba-de942ad3b309",
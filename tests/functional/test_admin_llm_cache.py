@@ -0,0 +1,55 @@
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from helpers import metrics
+from repository.training_expressions_repo import SKIPPED_WRITES_METRIC
+from services.llm_cache import LLMResponseCache
+from tests.functional.utils import FunctionalTestsHelper
+
+
+class TestAdminLLMCache(FunctionalTestsHelper):
+    def setUp(self):
+        super().setUp()
+
+        with open(
+            "tests/functional/data/setup_test_admin_index.sql", "r"
+        ) as file:
+            sql = file.read()
+
+        self._setup_test_db(sql)
+        self._set_session(
+            user="admin@test.com",
+            user_id="4d7993aa-d897-4647-994b-e0625c88f349",
+        )
+
+    def test_get(self):
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        cache = LLMResponseCache(Path(temp_dir.name) / "llm_cache.sqlite3")
+
+        with patch("routes.admin.get_llm_cache", return_value=cache):
+            context = self._get_test_template_context(
+                "GET", "admin/llm_cache.html", "/admin/llm-cache"
+            )
+
+        self.assertEqual(0, context["stats"]["entries"])
+        self.assertEqual(0, context["stats"]["bytes"])
+
+    def test_get_cache_disabled(self):
+        context = self._get_test_template_context(
+            "GET", "admin/llm_cache.html", "/admin/llm-cache"
+        )
+
+        self.assertIsNone(context["stats"])
+
+    def test_get_counters(self):
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
+        metrics.increment(SKIPPED_WRITES_METRIC, 2)
+
+        context = self._get_test_template_context(
+            "GET", "admin/llm_cache.html", "/admin/llm-cache"
+        )
+
+        self.assertEqual(2, context["counters"][SKIPPED_WRITES_METRIC])
@@ -1,9 +1,10 @@
 from unittest.mock import ANY
 from datetime import datetime
+from http import HTTPStatus
 from decimal import Decimal
 
 import psycopg2
-from psycopg2.extras import DictCursor
+from psycopg2.extras import DictCursor, RealDictCursor
 
 from tests.functional.utils import FunctionalTestsHelper
 
@@ -269,18 +270,21 @@ class DailyTestTest(FunctionalTestsHelper):
                 "knowledgeLevel": 0,
                 "position": 0,
                 "practiceCount": 0,
+                "lastPracticeTime": None,
             },
             {
                 "expressionId": "24d96f68-46e1-4fb3-b300-81cd89cea435",
                 "knowledgeLevel": 0,
                 "position": 0,
                 "practiceCount": 0,
+                "lastPracticeTime": None,
             },
             {
                 "expressionId": "d5c26549-74f7-4930-9c2c-16d10d46e55e",
                 "knowledgeLevel": 0,
                 "position": 0,
                 "practiceCount": 0,
+                "lastPracticeTime": None,
             },
         ]
 
@@ -288,7 +292,144 @@ class DailyTestTest(FunctionalTestsHelper):
         self.assertEqual(datetime(2023, 4, 17).date(), practice_data["last_practice_time"].date())  # type: ignore
         self.assertEqual(0, practice_data["knowledge_level"])  # type: ignore
         self.assertEqual(0, practice_data["practice_count"])  # type: ignore
-        self.assertEqual(expected_exprs_learn_list, self._get_user_exprs_learn_list(user_id))  # type: ignore
+        self._assert_learn_list(
+            expected_exprs_learn_list, self._get_user_exprs_learn_list(user_id)
+        )
+
+    def test_daily_training_batch_get(self):
+        user_id = "04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef"
+        session = {
+            "user": "daily_training@test.mail",
+            "user_id": user_id,
+        }
+        self._set_session(**session)
+        context = self._get_test_template_context(
+            "GET",
+            "exercises/daily_training_batch_challenge.html",
+            "/exercise/daily-training/batch?amount=2",
+        )
+
+        self.assertEqual(
+            [
+                "4d7993aa-d897-4647-994b-e0625c88f349",
+                "24d96f68-46e1-4fb3-b300-81cd89cea435",
+            ],
+            [
+                challenge["expression_id"]
+                for challenge in context["challenges"]
+            ],
+        )
+
+    def test_daily_training_batch_submit(self):
+        today = datetime.utcnow().date()
+        user_id = "04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef"
+        session = {
+            "user": "daily_training@test.mail",
+            "user_id": user_id,
+        }
+        self._set_session(**session)
+        form = {
+            "expression_id": [
+                "4d7993aa-d897-4647-994b-e0625c88f349",
+                "24d96f68-46e1-4fb3-b300-81cd89cea435",
+                "d5c26549-74f7-4930-9c2c-16d10d46e55e",
+            ],
+            "answer": ["preceding", "aboba", "annual"],
+            "hint": ["false", "false", "true"],
+        }
+
+        context = self._get_test_template_context(
+            "POST",
+            "exercises/daily_training_batch_solution.html",
+            "/exercise/daily-training/batch",
+            data=form,
+        )
+
+        self.assertEqual(
+            [
+                ("preceding", "preceding"),
+                ("aboba", "despair"),
+                ("annual", "annual"),
+            ],
+            [
+                (solution["usersAnswer"], solution["correctAnswer"])
+                for solution in context["solutions"]
+            ],
+        )
+
+        expected_exprs_learn_list = [
+            {
+                "expressionId": "24d96f68-46e1-4fb3-b300-81cd89cea435",
+                "knowledgeLevel": 0,
+                "position": 0,
+                "practiceCount": 1,
+                "lastPracticeTime": today,
+            },
+            {
+                "expressionId": "4d7993aa-d897-4647-994b-e0625c88f349",
+                "knowledgeLevel": 1,
+                "position": 1,
+                "practiceCount": 1,
+                "lastPracticeTime": today,
+            },
+            {
+                "expressionId": "d5c26549-74f7-4930-9c2c-16d10d46e55e",
+                "knowledgeLevel": 0,
+                "position": 0,
+                "practiceCount": 0,
+                "lastPracticeTime": None,
+            },
+        ]
+        self._assert_learn_list(
+            expected_exprs_learn_list, self._get_user_exprs_learn_list(user_id)
+        )
+
+        practice_data = self._get_practice_data(
+            "d5c26549-74f7-4930-9c2c-16d10d46e55e", user_id
+        )
+        self.assertEqual(0, practice_data["practice_count"])  # type: ignore
+
+    def test_daily_training_batch_submit_invalid_form(self):
+        user_id = "04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef"
+        self._set_session(user="daily_training@test.mail", user_id=user_id)
+        expression_ids = [
+            "4d7993aa-d897-4647-994b-e0625c88f349",
+            "24d96f68-46e1-4fb3-b300-81cd89cea435",
+        ]
+        forms = {
+            "no hint": {
+                "expression_id": expression_ids,
+                "answer": ["preceding", "aboba"],
+                "hint": ["false"],
+            },
+            "no answer": {
+                "expression_id": expression_ids,
+                "answer": ["preceding"],
+                "hint": ["false", "false"],
+            },
+            "empty": {},
+            "too long": {
+                "expression_id": expression_ids * 26,
+                "answer": ["preceding"] * 52,
+                "hint": ["false"] * 52,
+            },
+        }
+
+        for name, form in forms.items():
+            with self.subTest(name):
+                resp = self.client.post(
+                    "/exercise/daily-training/batch", data=form
+                )
+
+                self.assertEqual(
+                    HTTPStatus.BAD_REQUEST.value, resp.status_code
+                )
+        self.assertEqual(
+            0,
+            self._get_practice_data(expression_ids[0], user_id)[
+                "practice_count"
+            ],
+        )
 
     def _get_practice_data(self, expr_id, user_id):
         sql = """
@@ -310,17 +451,22 @@ class DailyTestTest(FunctionalTestsHelper):
 
     def _get_user_exprs_learn_list(self, user_id):
         sql = """
-            SELECT properties
-            FROM users
-            WHERE id=%(user_id)s
+            SELECT
+                expression_id AS "expressionId",
+                knowledge_level AS "knowledgeLevel",
+                position,
+                practice_count AS "practiceCount",
+                last_practice_time AS "lastPracticeTime"
+            FROM learn_list_items
+            WHERE user_id=%(user_id)s
+            ORDER BY sort_key
         """
         with psycopg2.connect(**self._get_test_db_dsn()) as con:  # type: ignore
-            with con.cursor() as cur:
+            with con.cursor(cursor_factory=RealDictCursor) as cur:
                 cur.execute(sql, {"user_id": user_id})
-                data = cur.fetchone()
-        props = data[0]  # type: ignore
+                data = cur.fetchall()
 
-        return props["challenges"]["dailyTraining"]["learning_list"]
+        return data
 
     def _assert_learn_list(self, expected, actual):
         self.assertEqual(
@@ -346,12 +492,10 @@ class DailyTestTest(FunctionalTestsHelper):
             if expected_item["lastPracticeTime"] is None:
                 self.assertIsNone(actual_item["lastPracticeTime"])
             else:
-                expected_time = expected_item["lastPracticeTime"].strftime(
-                    "%Y-%m-%d"
+                self.assertEqual(
+                    expected_item["lastPracticeTime"],
+                    actual_item["lastPracticeTime"].date(),
                 )
-                actual_time = actual_item["lastPracticeTime"].split()[0]
-
-                self.assertEqual(expected_time, actual_time)
 
 
 class DailyTrainingExpressionsTests(FunctionalTestsHelper):
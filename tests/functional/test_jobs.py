@@ -0,0 +1,40 @@
+from http import HTTPStatus
+
+from dao.jobs_dao import JobsDAO
+from tests.functional.utils import FunctionalTestsHelper
+
+USER_ID = "4d7993aa-d897-4647-994b-e0625c88f349"
+
+
+class TestJobs(FunctionalTestsHelper):
+    def setUp(self):
+        super().setUp()
+
+        with open(
+            "tests/functional/data/setup_test_admin_index.sql", "r"
+        ) as file:
+            sql = file.read()
+
+        self._setup_test_db(sql)
+        self._set_session(user="admin@test.com", user_id=USER_ID)
+
+    def test_get(self):
+        with self.app.app_context():
+            job_id = str(JobsDAO().enqueue(USER_ID, "test", {}).id)
+
+        resp = self.client.get(f"/jobs/{job_id}")
+
+        self.assertEqual(HTTPStatus.OK.value, resp.status_code)
+        self.assertEqual(
+            {"id": job_id, "type": "test", "status": "pending"}, resp.json
+        )
+
+    def test_get_not_found(self):
+        resp = self.client.get("/jobs/2de2dc8b-ca69-4553-98dc-09e3f2998d12")
+
+        self.assertEqual(HTTPStatus.NOT_FOUND.value, resp.status_code)
+
+    def test_get_invalid_id(self):
+        resp = self.client.get("/jobs/not-a-uuid")
+
+        self.assertEqual(HTTPStatus.NOT_FOUND.value, resp.status_code)
@@ -44,7 +44,6 @@ class SignOnTest(FunctionalTestsHelper):
                     "learnListSize": 50,
                     "practiceCountThreshold": 50,
                     "knowledgeLevelThreshold": 0.9,
-                    "learning_list": [],
                 }
             },
         }
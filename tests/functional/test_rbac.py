@@ -1,5 +1,7 @@
 from http import HTTPStatus
 
+from helpers import metrics
+from helpers.user_role_cache import HITS_METRIC, MISSES_METRIC
 from tests.functional.utils import FunctionalTestsHelper
 
 SUPER_ADMIN = "super-admin"
@@ -63,6 +65,10 @@ ROUTS = [
         "url": "/exercise/expression_recall_expressions",
         "methods": [{"method": "GET", "allowed_roles": ALL_VALID_ROLES}],
     },
+    {
+        "url": "/exercise/dialogues/<dialogue_id>/stream",
+        "methods": [{"method": "POST", "allowed_roles": ALL_VALID_ROLES}],
+    },
     {
         "url": "/admin",
         "methods": [{"method": "GET", "allowed_roles": ADMINS}],
@@ -102,6 +108,33 @@ class RBACTests(FunctionalTestsHelper):
                             patient["url"], method["method"], ROLES[role]
                         )
 
+    def test_role_cached(self):
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
+        self.test_session["user_id"] = ROLES[SELF_EDUCATED]
+        self._set_session(**self.test_session)
+
+        for _ in range(3):
+            resp = self.client.get("/admin")
+            self.assertEqual(HTTPStatus.FORBIDDEN.value, resp.status_code)
+
+        self.assertEqual(2, metrics.get_count(HITS_METRIC))
+        self.assertEqual(1, metrics.get_count(MISSES_METRIC))
+
+    def test_role_cache_invalidated_on_logout(self):
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
+        self.test_session["user_id"] = ROLES[SELF_EDUCATED]
+        self._set_session(**self.test_session)
+        self.client.get("/admin")
+
+        self.client.get("/login/logout")
+        self._set_session(**self.test_session)
+        self.client.get("/admin")
+
+        self.assertEqual(0, metrics.get_count(HITS_METRIC))
+        self.assertEqual(2, metrics.get_count(MISSES_METRIC))
+
     def _test_method(self, url: str, method: str, role: str):
         self.test_session["user_id"] = role
         self._set_session(**self.test_session)
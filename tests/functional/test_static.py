@@ -0,0 +1,91 @@
+import gzip
+import os
+from http import HTTPStatus
+
+from flask import url_for
+
+from helpers.static_helper import VERSIONED_MAX_AGE
+from tests.functional.utils import FunctionalTestsHelper
+
+FILENAME = "js/expression_input.js"
+
+
+class StaticTests(FunctionalTestsHelper):
+    def _get_static_url(self, filename):
+        with self.app.test_request_context():
+            return url_for("static", filename=filename)
+
+    def _get(self, url, **kwargs):
+        resp = self.client.get(url, **kwargs)
+        self.addCleanup(resp.close)
+        return resp
+
+    def test_static_without_session(self):
+        resp = self._get(f"/static/{FILENAME}")
+
+        self.assertEqual(HTTPStatus.OK.value, resp.status_code)
+
+    def test_static_url_has_file_hash(self):
+        url = self._get_static_url(FILENAME)
+
+        self.assertRegex(url, rf"^/static/{FILENAME}\?v=[0-9a-f]{{12}}$")
+
+    def test_static_url_file_not_found(self):
+        url = self._get_static_url("js/not_found.js")
+
+        self.assertEqual("/static/js/not_found.js", url)
+
+    def test_versioned_static_cached(self):
+        resp = self._get(self._get_static_url(FILENAME))
+
+        self.assertEqual(HTTPStatus.OK.value, resp.status_code)
+        self.assertEqual(VERSIONED_MAX_AGE, resp.cache_control.max_age)
+        self.assertTrue(resp.cache_control.public)
+        self.assertTrue(resp.cache_control.immutable)
+
+    def test_outdated_version_not_cached(self):
+        resp = self._get(f"/static/{FILENAME}?v=000000000000")
+
+        self.assertEqual(HTTPStatus.OK.value, resp.status_code)
+        self.assertIsNone(resp.cache_control.max_age)
+        self.assertFalse(resp.cache_control.immutable)
+
+    def test_gzip(self):
+        path = os.path.join(self.app.static_folder, FILENAME)
+        with open(path, "rb") as file:
+            content = file.read()
+        with open(path + ".gz", "wb") as file:
+            file.write(gzip.compress(content))
+        self.addCleanup(os.remove, path + ".gz")
+
+        resp = self._get(
+            f"/static/{FILENAME}", headers={"Accept-Encoding": "gzip"}
+        )
+
+        self.assertEqual(HTTPStatus.OK.value, resp.status_code)
+        self.assertEqual("gzip", resp.content_encoding)
+        self.assertEqual("text/javascript", resp.mimetype)
+        self.assertIn("Accept-Encoding", resp.vary)
+        self.assertEqual(content, gzip.decompress(resp.data))
+
+    def test_stale_gzip_not_served(self):
+        path = os.path.join(self.app.static_folder, FILENAME)
+        with open(path + ".gz", "wb") as file:
+            file.write(gzip.compress(b"outdated content"))
+        self.addCleanup(os.remove, path + ".gz")
+        modified = os.path.getmtime(path)
+        os.utime(path + ".gz", (modified - 60, modified - 60))
+
+        resp = self._get(
+            f"/static/{FILENAME}", headers={"Accept-Encoding": "gzip"}
+        )
+
+        self.assertEqual(HTTPStatus.OK.value, resp.status_code)
+        self.assertIsNone(resp.content_encoding)
+        with open(path, "rb") as file:
+            self.assertEqual(file.read(), resp.data)
+
+    def test_gzip_not_accepted(self):
+        resp = self._get(f"/static/{FILENAME}")
+
+        self.assertIsNone(resp.content_encoding)
@@ -268,6 +268,79 @@ class AddUserExpressionTest(FunctionalTestsHelper):
 
         self.assertEqual([], self._get_expression(expression=expression))
 
+    def test_similar_expressions(self):
+        response = self.client.get(
+            "/user/expressions/similar", query_string={"query": "terrible"}
+        )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            [
+                {
+                    "expressionId": "b2f3a8c1-6a52-4f0e-9d0b-7e0f5c1d2a44",
+                    "expression": "terrible weather",
+                    "definition": "weather that is very bad",
+                    "isAdded": False,
+                    "url": "/user/expressions/"
+                    "b2f3a8c1-6a52-4f0e-9d0b-7e0f5c1d2a44/add",
+                },
+                {
+                    "expressionId": "542d93d5-6a38-4ce6-95ba-de942ad3b309",
+                    "expression": "go away from terrible school",
+                    "definition": "go away from terrible school definition",
+                    "isAdded": True,
+                    "url": "/user/expressions/"
+                    "542d93d5-6a38-4ce6-95ba-de942ad3b309",
+                },
+            ],
+            sorted(
+                response.json, key=lambda item: item["isAdded"]  # type: ignore
+            ),
+        )
+
+    def test_add_existing_expression(self):
+        expr_id = "b2f3a8c1-6a52-4f0e-9d0b-7e0f5c1d2a44"
+
+        context = self._get_test_template_context(
+            "POST",
+            "expressions/list.html",
+            f"/user/expressions/{expr_id}/add",
+            follow_redirects=True,
+        )
+
+        self.assertIn(
+            expr_id, [str(item["expressionId"]) for item in context["exprs"]]
+        )
+        self.assertEqual(
+            expr_id, str(self._get_user_llist(self.user_id)[0]["expressionId"])
+        )
+
+    def test_add_existing_expression_not_found(self):
+        response = self.client.post(
+            "/user/expressions/6c1ee5a9-1d0e-4d1b-8a44-0a7a25b1f0aa/add"
+        )
+
+        self.assertEqual(404, response.status_code)
+
+    def test_add_existing_expression_invalid_id(self):
+        response = self.client.post("/user/expressions/not-an-id/add")
+
+        self.assertEqual(404, response.status_code)
+
+    def test_add_existing_expression_get_not_allowed(self):
+        expr_id = "b2f3a8c1-6a52-4f0e-9d0b-7e0f5c1d2a44"
+
+        response = self.client.get(f"/user/expressions/{expr_id}/add")
+
+        self.assertEqual(405, response.status_code)
+        self.assertNotIn(
+            expr_id,
+            [
+                str(item["expressionId"])
+                for item in self._get_user_llist(self.user_id)
+            ],
+        )
+
     def _get_expression(self, expr_id=None, expression=None):
         sql = """
             SELECT
@@ -302,10 +375,18 @@ class AddUserExpressionTest(FunctionalTestsHelper):
         return data
 
     def _get_user_llist(self, user_id):
-        sql = """SELECT properties FROM users WHERE id=%(user_id)s"""
+        sql = """
+            SELECT
+                expression_id AS "expressionId",
+                position,
+                practice_count AS "practiceCount"
+            FROM learn_list_items
+            WHERE user_id=%(user_id)s
+            ORDER BY sort_key
+        """
         with psycopg2.connect(**self._get_test_db_dsn()) as con:  # type: ignore
             with con.cursor(cursor_factory=DictCursor) as cur:
                 cur.execute(sql, {"user_id": user_id})
-                data = cur.fetchone()[0]
+                data = cur.fetchall()
 
-        return data["challenges"]["dailyTraining"]["learning_list"]
+        return data
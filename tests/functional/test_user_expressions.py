@@ -85,3 +85,48 @@ class UserPageTest(FunctionalTestsHelper):
                     str(item["expressionId"]) for item in context["exprs"]
                 ]
                 self.assertEqual(expected, context_expressions, case)
+
+    def test_user_expressions_get_pages(self):
+        user_id = "04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef"
+        session = {
+            "user": "daily_training@test.mail",
+            "user_id": user_id,
+        }
+        self._set_session(**session)
+
+        expected_pages = [
+            [
+                "a0a68135-bc73-4025-a754-966450fa6cac",
+                "4eb806c0-a8cd-4ac9-8387-1b79cb97b138",
+                "24d96f68-46e1-4fb3-b300-81cd89cea435",
+            ],
+            [
+                "d5c26549-74f7-4930-9c2c-16d10d46e55e",
+                "4d7993aa-d897-4647-994b-e0625c88f349",
+                "b02dcda4-65ae-45ba-a2d7-0502fae3d08a",
+            ],
+            [
+                "eaf0a44f-abb2-4ddd-98d0-8944c163dae5",
+                "542d93d5-6a38-4ce6-95ba-de942ad3b309",
+            ],
+        ]
+
+        url = "/user/expressions?page_size=3"
+        for expected in expected_pages:
+            context = self._get_test_template_context(
+                "GET", "expressions/list.html", url
+            )
+            self.assertEqual(
+                expected,
+                [str(item["expressionId"]) for item in context["exprs"]],
+            )
+            url = f"/user/expressions?page_size=3&cursor={context['next_cursor']}"
+
+        self.assertIsNone(context["next_cursor"])
+
+    def test_user_expressions_get_invalid_cursor(self):
+        self._set_session(user_id="04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef")
+
+        resp = self.client.get("/user/expressions?cursor=invalid")
+
+        self.assertEqual(400, resp.status_code)
@@ -6,6 +6,7 @@ from typing import TypedDict
 from flask import template_rendered
 import psycopg2
 
+from helpers.user_role_cache import user_role_cache
 from main import app
 
 
@@ -41,6 +42,7 @@ class FunctionalTestsHelper(TestCase):
 
         self.app = app
         self.client = app.test_client()
+        user_role_cache.clear()
 
         self._set_up_test_configs()
 
@@ -157,7 +157,6 @@ def get_dialogue(
     description: str,
     settings: dict,
     expressions: List[dict],
-    dialogues: List[dict],
     properties: dict = {"trainedExpressionsCount": 0},
     added: str = "2023-04-12 10:10:25",
     updated: str = "2023-04-12 10:10:25",
@@ -170,7 +169,6 @@ def get_dialogue(
         properties=properties,
         settings=settings,
         expressions=expressions,
-        dialogues=dialogues,
         added=added,
         updated=updated,
     )
@@ -0,0 +1,20 @@
+import asyncio
+from unittest import TestCase
+
+from helpers.async_helper import get_event_loop
+
+
+class GetEventLoopTests(TestCase):
+    def test_loop_is_shared(self):
+        self.assertIs(get_event_loop(), get_event_loop())
+
+    def test_loop_is_running(self):
+        async def get_loop():
+            return asyncio.get_running_loop()
+
+        self.assertIs(
+            get_event_loop(),
+            asyncio.run_coroutine_threadsafe(
+                get_loop(), get_event_loop()
+            ).result(),
+        )
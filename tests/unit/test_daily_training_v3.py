@@ -4,6 +4,7 @@ from unittest.mock import Mock
 
 from repository.training_expressions_repo import DailyTrainingRepo
 from exercises.daily_training_v3 import DailyTraining
+from exercises.exceptions import ExpressionNotFoundException
 from tests.unit.fixtures import (
     get_daily_training_expressions_list_item,
     get_expression,
@@ -276,3 +277,143 @@ class IsExpressionInLearnListTests(DailyTrainingTestHelper):
         self.repo.is_expression_in_learn_list.assert_called_once_with(
             self.expression_id
         )
+
+
+class GetLearnListExpressionIdsTests(DailyTrainingTestHelper):
+    def setUp(self):
+        super().setUp()
+
+        self.subject = DailyTraining(self.repo)
+
+    def test_get_learn_list_expression_ids(self):
+        self.repo.get_learn_list_expression_ids.return_value = {
+            self.expression_id
+        }
+
+        actual = self.subject.get_learn_list_expression_ids()
+        self.assertEqual({self.expression_id}, actual)
+        self.repo.get_learn_list_expression_ids.assert_called_once_with()
+
+
+class GetChallengesTests(DailyTrainingTestHelper):
+    def setUp(self):
+        super().setUp()
+
+        self.subject = DailyTraining(self.repo)
+
+    def test_get_challenges(self):
+        self.repo.get_next.return_value = [
+            {
+                "expression": get_user_expression(
+                    user_id=self.user_id,
+                    user=get_user(self.user_id),
+                    expression=get_expression(
+                        expression_id=f"{self.expression_id}-{i}",
+                        expression=f"{self.expression} {i}",
+                        definition=self.definition,
+                    ),
+                ),
+                "knowledgeLevel": 0,
+                "practiceCount": i,
+            }
+            for i in range(2)
+        ]
+
+        actual = self.subject.get_challenges(2)
+
+        self.assertEqual(
+            [f"{self.expression_id}-0", f"{self.expression_id}-1"],
+            [challenge["expression_id"] for challenge in actual],
+        )
+        self.repo.get_next.assert_called_once_with(2)
+
+
+class SubmitChallengesTests(DailyTrainingTestHelper):
+    def setUp(self):
+        super().setUp()
+
+        self.subject = DailyTraining(self.repo)
+
+        self.user_expressions = [
+            get_user_expression(
+                user_id=self.user_id,
+                user=get_user(self.user_id),
+                expression=get_expression(
+                    expression_id=f"{self.expression_id}-{i}",
+                    expression=f"{self.expression} {i}",
+                    definition=self.definition,
+                ),
+            )
+            for i in range(3)
+        ]
+        self.repo.get_by_ids.return_value = self.user_expressions
+
+    def test_submit_challenges(self):
+        actual = self.subject.submit_challenges(
+            [
+                {
+                    "expression_id": f"{self.expression_id}-0",
+                    "answer": f"{self.expression} 0",
+                    "hint": False,
+                },
+                {
+                    "expression_id": f"{self.expression_id}-1",
+                    "answer": "wrong answer",
+                    "hint": False,
+                },
+                {
+                    "expression_id": f"{self.expression_id}-2",
+                    "answer": f"{self.expression} 2",
+                    "hint": True,
+                },
+            ]
+        )
+
+        self.assertEqual(
+            [
+                f"{self.expression} 0",
+                "wrong answer",
+                f"{self.expression} 2",
+            ],
+            [solution["usersAnswer"] for solution in actual],
+        )
+        self.repo.get_by_ids.assert_called_once()
+        self.repo.update_expressions.assert_called_once_with(
+            [
+                {
+                    "user_expression": self.user_expressions[0],
+                    "is_trained_successfully": True,
+                },
+                {
+                    "user_expression": self.user_expressions[1],
+                    "is_trained_successfully": False,
+                },
+            ]
+        )
+
+    def test_submit_challenges_all_with_hint(self):
+        self.subject.submit_challenges(
+            [
+                {
+                    "expression_id": f"{self.expression_id}-0",
+                    "answer": "",
+                    "hint": True,
+                }
+            ]
+        )
+
+        self.repo.update_expressions.assert_not_called()
+
+    def test_submit_challenges_expression_not_found(self):
+        with self.assertRaises(ExpressionNotFoundException):
+            self.subject.submit_challenges(
+                [
+                    {
+                        "expression_id": "not-found",
+                        "answer": "",
+                        "hint": False,
+                    }
+                ]
+            )
+
+        self.repo.update_expressions.assert_not_called()
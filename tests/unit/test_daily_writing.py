@@ -1,6 +1,6 @@
 import os
 from unittest import TestCase
-from unittest.mock import Mock, call, patch
+from unittest.mock import Mock, call, create_autospec, patch
 
 from exercises.daily_writing import DailyWriting
 from tests.unit.fixtures import (
@@ -15,6 +15,7 @@ from services.assistant import (
     ExpressionUsageResponse,
     GeneralJudgementResponse,
     Problem,
+    VeniceAssistant,
 )
 
 
@@ -25,11 +26,13 @@ class BaseDailyWritingTest(TestCase):
         # os.environ["VENICE_API_KEY"] = "test_api_key"
 
         self.mock_repo = Mock()
-        self.mock_assistant = Mock()
+        self.mock_assistant = create_autospec(VeniceAssistant)
+        self.mock_jobs_dao = Mock()
         self.subject = DailyWriting(
             user_id=self.user_id,
             training_repo=self.mock_repo,
             assistant=self.mock_assistant,
+            jobs_dao=self.mock_jobs_dao,
         )
 
 
@@ -163,26 +166,24 @@ class SubmitChallengeTest(BaseDailyWritingTest):
             get_training_expression_data(self.user_expr_4, kl=0.9, pc=3),
         ]
 
-        self.mock_assistant.return_value.get_general_judgement.return_value = (
-            GeneralJudgementResponse(
-                problems=[
-                    Problem(
-                        problem="problem_part1",
-                        explanation="explanation1",
-                        solution="solution1",
-                    ),
-                    Problem(
-                        problem="problem_part2",
-                        explanation="explanation2",
-                        solution="solution2",
-                    ),
-                ]
-            )
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[
+                Problem(
+                    problem="problem_part1",
+                    explanation="explanation1",
+                    solution="solution1",
+                ),
+                Problem(
+                    problem="problem_part2",
+                    explanation="explanation2",
+                    solution="solution2",
+                ),
+            ]
         )
-        self.mock_assistant.return_value.detect_phrases_usage.return_value = (
+        self.mock_assistant.return_value.adetect_phrases_usage.return_value = (
             ExpressionDetectionResponse(expressions=["expr_id-1", "expr_id-2"])
         )
-        self.mock_assistant.return_value.get_expression_usage_judgement.side_effect = [
+        self.mock_assistant.return_value.aget_expression_usage_judgement.side_effect = [
             ExpressionUsageResponse(
                 id="expr_id-1",
                 is_correct=True,
@@ -248,10 +249,10 @@ class SubmitChallengeTest(BaseDailyWritingTest):
         self.mock_repo.return_value.get_by_ids.assert_called_once_with(
             expressions_to_train_ids
         )
-        self.mock_assistant.return_value.get_general_judgement.assert_called_once_with(
+        self.mock_assistant.return_value.aget_general_judgement.assert_called_once_with(
             text
         )
-        self.mock_assistant.return_value.detect_phrases_usage.assert_called_once_with(
+        self.mock_assistant.return_value.adetect_phrases_usage.assert_called_once_with(
             text,
             [
                 {"id": "expr_id-1", "expression": "expr1"},
@@ -259,7 +260,7 @@ class SubmitChallengeTest(BaseDailyWritingTest):
                 {"id": "expr_id-3", "expression": "expr3"},
             ],
         )
-        self.mock_assistant.return_value.get_expression_usage_judgement.has_calls(
+        self.mock_assistant.return_value.aget_expression_usage_judgement.assert_has_calls(
             [
                 call(
                     text,
@@ -290,6 +291,193 @@ class SubmitChallengeTest(BaseDailyWritingTest):
                     "user_expression": self.user_expr_2,
                     "is_trained_successfully": False,
                 },
-            ]
+            ],
+            commit=True,
         )
         self.mock_repo.return_value.get_next.assert_called_once_with(10)
+
+    def test_submit_challenge_combined_judgement(self):
+        self.subject.combined_judgement = True
+        text = "This is a test writing with expr1 and expr2."
+        self.mock_repo.return_value.get_by_ids.return_value = [
+            self.user_expr_1,
+            self.user_expr_2,
+        ]
+        self.mock_repo.return_value.get_next.return_value = [
+            get_training_expression_data(self.user_expr_2, kl=0.9, pc=3),
+        ]
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[]
+        )
+        self.mock_assistant.return_value.ajudge_expressions_usage.return_value = [
+            ExpressionUsageResponse(
+                id="expr_id-2",
+                is_correct=False,
+                comment="Incorrect usage of expr2.",
+            ),
+        ]
+
+        actual = self.subject.submit_writing(text, ["expr_id-1", "expr_id-2"])
+
+        self.assertEqual(
+            [
+                {
+                    "comment": "Incorrect usage of expr2.",
+                    "definition": "definition2",
+                    "expression": "expr2",
+                    "id": "expr_id-2",
+                    "status": "failed",
+                    "pk": 3,
+                    "kl": 0.9,
+                }
+            ],
+            actual["expressions"],
+        )
+        self.mock_assistant.return_value.ajudge_expressions_usage.assert_called_once_with(
+            text,
+            [
+                {
+                    "id": "expr_id-1",
+                    "expression": "expr1",
+                    "meaning": "definition1",
+                },
+                {
+                    "id": "expr_id-2",
+                    "expression": "expr2",
+                    "meaning": "definition2",
+                },
+            ],
+        )
+        self.mock_assistant.return_value.adetect_phrases_usage.assert_not_called()
+        self.mock_assistant.return_value.aget_expression_usage_judgement.assert_not_called()
+        self.mock_repo.return_value.update_expressions.assert_called_once_with(
+            [
+                {
+                    "user_expression": self.user_expr_2,
+                    "is_trained_successfully": False,
+                },
+            ],
+            commit=True,
+        )
+
+
+class BackgroundGradingTest(BaseDailyWritingTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.job_id = "b2d6c1c4-5b2a-4f7e-9d43-0c1f6f0e4e2a"
+        self.job = Mock(
+            id=self.job_id,
+            payload={"text": "Some text", "expressionsIds": ["expr_id-1"]},
+        )
+        self.job.serialize.return_value = {"id": self.job_id}
+        self.user_expr = get_user_expression(
+            user_id=self.user_id,
+            user=get_user(self.user_id),
+            expression=get_expression("expr_id-1", "expr1", "definition1"),
+            kl=0.5,
+            pc=1,
+        )
+        self.expressions = [
+            {
+                "id": "expr_id-1",
+                "expression": "expr1",
+                "meaning": "definition1",
+            }
+        ]
+
+    def test_enqueue_writing(self):
+        self.mock_jobs_dao.return_value.enqueue.return_value = self.job
+        self.mock_repo.return_value.get_by_ids.return_value = [self.user_expr]
+
+        actual = self.subject.enqueue_writing("Some text", ["expr_id-1"])
+
+        self.assertEqual(self.job_id, actual)
+        self.mock_jobs_dao.return_value.enqueue.assert_called_once_with(
+            self.user_id,
+            "daily_writing.grading",
+            {
+                "text": "Some text",
+                "expressionsIds": ["expr_id-1"],
+                "expressions": self.expressions,
+            },
+        )
+        self.mock_assistant.return_value.aget_general_judgement.assert_not_called()
+
+    def test_grade_writing(self):
+        self.subject.combined_judgement = True
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[]
+        )
+        judgements = [
+            ExpressionUsageResponse(
+                id="expr_id-1", is_correct=True, comment="judgement"
+            )
+        ]
+        # the repo reads the db, it's not created before the model calls
+        self.mock_assistant.return_value.ajudge_expressions_usage.side_effect = lambda *_: (
+            self.mock_repo.assert_not_called() or judgements
+        )
+        self.mock_repo.return_value.get_by_ids.return_value = [self.user_expr]
+        self.mock_repo.return_value.get_next.return_value = []
+
+        actual = self.subject.grade_writing(
+            "Some text", ["expr_id-1"], self.expressions
+        )
+
+        self.assertEqual(
+            {"userText": "Some text", "comment": []}, actual["lastWriting"]
+        )
+        self.mock_assistant.return_value.ajudge_expressions_usage.assert_called_once_with(
+            "Some text", self.expressions
+        )
+        self.mock_repo.return_value.update_expressions.assert_called_once_with(
+            [
+                {
+                    "user_expression": self.user_expr,
+                    "is_trained_successfully": True,
+                }
+            ],
+            commit=False,
+        )
+
+    def test_get_graded_writing_done(self):
+        self.job.status = "done"
+        self.job.result = {"expressions": [], "lastWriting": None}
+        self.mock_jobs_dao.return_value.get.return_value = self.job
+
+        actual = self.subject.get_graded_writing(self.job_id)
+
+        self.assertEqual(
+            (
+                {"id": self.job_id},
+                {"expressions": [], "lastWriting": None},
+            ),
+            actual,
+        )
+        self.mock_jobs_dao.return_value.get.assert_called_once_with(
+            self.user_id, self.job_id
+        )
+        self.mock_repo.return_value.get_next.assert_not_called()
+
+    def test_get_graded_writing_pending(self):
+        self.job.status = "pending"
+        self.mock_jobs_dao.return_value.get.return_value = self.job
+        self.mock_repo.return_value.get_next.return_value = []
+
+        actual = self.subject.get_graded_writing(self.job_id)
+
+        self.assertEqual(
+            (
+                {"id": self.job_id},
+                {
+                    "expressions": [],
+                    "lastWriting": {"userText": "Some text", "comment": None},
+                },
+            ),
+            actual,
+        )
+
+    def test_get_graded_writing_not_found(self):
+        self.mock_jobs_dao.return_value.get.return_value = None
+
+        self.assertIsNone(self.subject.get_graded_writing(self.job_id))
@@ -1,16 +1,17 @@
 from copy import deepcopy
 import os
 from unittest import TestCase
-from unittest.mock import patch, Mock, call
+from unittest.mock import create_autospec, patch, Mock, call
 
 from services.assistant import (
     ExpressionDetectionResponse,
     Problem,
     GeneralJudgementResponse,
     ExpressionUsageResponse,
+    VeniceAssistant,
 )
 from exercises.dialogue_training import DialogueTraining
-from models.models import Dialogue
+from models.models import Dialogue, DialogueMessage
 from tests.unit.fixtures import (
     get_dialogue,
     get_user_expression,
@@ -26,7 +27,7 @@ class BaseDialogueTrainingTest(TestCase):
 
         self.mock_dialogue_repo = Mock()
         self.mock_user_expression_repo = Mock()
-        self.mock_assistant = Mock()
+        self.mock_assistant = create_autospec(VeniceAssistant)
         self.subject = DialogueTraining(
             self.user_id,
             self.mock_dialogue_repo,
@@ -54,7 +55,6 @@ class GetTests(BaseDialogueTrainingTest):
                 title="Dialogue 1",
                 description="Dialogue 1 description",
                 settings={"setting": "value"},
-                dialogues=[{"dialogue": "dialogue 1"}],
                 expressions=[{"expression": "expression 1"}],
                 added="2016-06-22 19:10:26",
                 updated="2016-06-22 19:10:25",
@@ -65,7 +65,6 @@ class GetTests(BaseDialogueTrainingTest):
                 title="Dialogue 2",
                 description="Dialogue 2 description",
                 settings={"setting": "value"},
-                dialogues=[{"dialogue": "dialogue 2"}],
                 expressions=[{"expression": "expression 2"}],
                 added="2016-06-22 19:10:24",
                 updated="2016-06-22 19:10:25",
@@ -98,13 +97,21 @@ class GetTests(BaseDialogueTrainingTest):
         self.mock_dialogue_repo.return_value.get.return_value = self.dialogues[
             0
         ]
+        self.mock_dialogue_repo.return_value.get_messages.return_value = [
+            DialogueMessage(seq=1, role="assistant", text="message 1"),
+            DialogueMessage(seq=2, role="user", text="message 2", comment=[]),
+        ]
         expected = {
             "id": "4d7993aa-d897-4647-994b-e0625c88f349",
             "title": "Dialogue 1",
             "description": "Dialogue 1 description",
             "settings": {"setting": "value"},
-            "dialogue": [{"dialogue": "dialogue 1"}],
+            "dialogue": [
+                {"id": 1, "role": "assistant", "text": "message 1"},
+                {"id": 2, "role": "user", "text": "message 2", "comment": []},
+            ],
             "expressions": [{"expression": "expression 1"}],
+            "previousPageBefore": None,
         }
         actual = self.subject.get_dialogue(
             "4d7993aa-d897-4647-994b-e0625c88f349"
@@ -115,6 +122,30 @@ class GetTests(BaseDialogueTrainingTest):
         self.mock_dialogue_repo.return_value.get.assert_called_once_with(
             "4d7993aa-d897-4647-994b-e0625c88f349"
         )
+        self.mock_dialogue_repo.return_value.get_messages.assert_called_once_with(
+            "4d7993aa-d897-4647-994b-e0625c88f349", before=None, limit=50
+        )
+
+    def test_get_one_page_before(self):
+        self.mock_dialogue_repo.return_value.get.return_value = self.dialogues[
+            0
+        ]
+        self.mock_dialogue_repo.return_value.get_messages.return_value = [
+            DialogueMessage(seq=5, role="assistant", text="message 5"),
+        ]
+
+        actual = self.subject.get_dialogue(
+            "4d7993aa-d897-4647-994b-e0625c88f349", before=6
+        )
+
+        self.assertEqual(
+            [{"id": 5, "role": "assistant", "text": "message 5"}],
+            actual["dialogue"],
+        )
+        self.assertEqual(5, actual["previousPageBefore"])
+        self.mock_dialogue_repo.return_value.get_messages.assert_called_once_with(
+            "4d7993aa-d897-4647-994b-e0625c88f349", before=6, limit=50
+        )
 
 
 class CreateDialogueTests(BaseDialogueTrainingTest):
@@ -164,7 +195,7 @@ class CreateDialogueTests(BaseDialogueTrainingTest):
         self.assertEqual(self.dialogue_id, actual)
 
         self.mock_user_expression_repo.return_value.get_trained_expressions.assert_called_once_with(
-            10
+            10, profile="list"
         )
 
         actual_dialogue = (
@@ -185,8 +216,9 @@ class CreateDialogueTests(BaseDialogueTrainingTest):
                     "text": "Hello! What are we going to talk about?",
                 }
             ],
-            actual_dialogue.dialogues,
+            [message.serialize() for message in actual_dialogue.new_messages],
         )
+        self.assertEqual(1, actual_dialogue.messages_count)
         self.assertEqual(
             [
                 {
@@ -235,13 +267,7 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
             description="Dialogue 1 description",
             properties={"trainedExpressionsCount": 0},
             settings={"maxExpressionsToTrain": 3},
-            dialogues=[
-                {
-                    "id": 1,
-                    "role": "assistant",
-                    "text": "Hello! What are we going to talk about?",
-                },
-            ],
+            messages_count=1,
             expressions=[
                 {
                     "id": "1",
@@ -267,6 +293,9 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
         )
 
         self.updated = "2016-06-22 19:15:25"
+        self.mock_dialogue_repo.return_value.get_messages.side_effect = (
+            self._get_messages
+        )
         current_patcher = patch(
             "exercises.dialogue_training.get_current_utc_time",
             return_value=self.updated,
@@ -274,6 +303,18 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
         current_patcher.start()
         self.addCleanup(current_patcher.stop)
 
+    def _get_messages(self, dialogue_id, before=None, limit=None, after=None):
+        dialogue = self.mock_dialogue_repo.return_value.get.return_value
+        greeting = DialogueMessage(
+            seq=1,
+            role="assistant",
+            text="Hello! What are we going to talk about?",
+        )
+        messages = [greeting, *(dialogue.new_messages or [])]
+        if after is not None:
+            messages = [m for m in messages if (m.seq or 0) > after]
+        return messages[-limit:] if limit else messages
+
     def _get_expected_updated_dialogue(
         self, problems=None, expressions=None, trained_expressions_count=0
     ):
@@ -284,26 +325,7 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
             description="Dialogue 1 description",
             properties={"trainedExpressionsCount": trained_expressions_count},
             settings={"maxExpressionsToTrain": 3},
-            dialogues=[
-                {
-                    "id": 1,
-                    "role": "assistant",
-                    "text": "Hello! What are we going to talk about?",
-                },
-                {
-                    "id": 2,
-                    "role": "user",
-                    "text": "test statement",
-                    "comment": [
-                        {
-                            "problem": "the problem",
-                            "explanation": "the explanation",
-                            "solution": "the solution",
-                        }
-                    ],
-                },
-                {"id": 3, "role": "assistant", "text": "test response"},
-            ],
+            messages_count=3,
             expressions=[
                 {
                     "id": "1",
@@ -327,8 +349,23 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
             added="2016-06-22 19:10:26",
             updated=self.updated,
         )
+        res.new_messages = [
+            DialogueMessage(
+                seq=2,
+                role="user",
+                text="test statement",
+                comment=[
+                    {
+                        "problem": "the problem",
+                        "explanation": "the explanation",
+                        "solution": "the solution",
+                    }
+                ],
+            ),
+            DialogueMessage(seq=3, role="assistant", text="test response"),
+        ]
         if problems is not None:
-            res.dialogues[1]["comment"] = problems
+            res.new_messages[0].comment = problems
         if expressions is not None:
             res.expressions = expressions
         return res
@@ -367,6 +404,8 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
             ],
             "id": "4d7993aa-d897-4647-994b-e0625c88f349",
             "title": "Dialogue 1",
+            "settings": {"maxExpressionsToTrain": 3},
+            "previousPageBefore": None,
         }
         if problems is not None:
             res["dialogue"][1]["comment"] = problems
@@ -484,13 +523,13 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
                 self.mock_dialogue_repo.return_value.get.return_value = (
                     deepcopy(self.dialogue)
                 )
-                self.mock_assistant.return_value.complete_dialogue.return_value = (
+                self.mock_assistant.return_value.acomplete_dialogue.return_value = (
                     "test response"
                 )
-                self.mock_assistant.return_value.get_general_judgement.return_value = case[
+                self.mock_assistant.return_value.aget_general_judgement.return_value = case[
                     "problems"
                 ]
-                self.mock_assistant.return_value.detect_phrases_usage.return_value = ExpressionDetectionResponse(
+                self.mock_assistant.return_value.adetect_phrases_usage.return_value = ExpressionDetectionResponse(
                     expressions=[]
                 )
 
@@ -503,7 +542,7 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
                 self.mock_dialogue_repo.return_value.get.assert_called_once_with(
                     self.dialogue_id
                 )
-                self.mock_assistant.return_value.complete_dialogue.assert_called_once_with(
+                self.mock_assistant.return_value.acomplete_dialogue.assert_called_once_with(
                     [
                         {
                             "role": "assistant",
@@ -512,10 +551,10 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
                         {"role": "user", "content": "test statement"},
                     ]
                 )
-                self.mock_assistant.return_value.get_general_judgement.assert_called_once_with(
+                self.mock_assistant.return_value.aget_general_judgement.assert_called_once_with(
                     "test statement"
                 )
-                self.mock_assistant.return_value.detect_phrases_usage.assert_called_once_with(
+                self.mock_assistant.return_value.adetect_phrases_usage.assert_called_once_with(
                     "test statement",
                     [
                         {"id": "1", "expression": "expression 1"},
@@ -530,20 +569,59 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
                     ],
                 )
 
+    def test_prompt_with_last_messages_and_summary(self):
+        dialogue = deepcopy(self.dialogue)
+        dialogue.properties["summary"] = "We talked about cats."
+        self.mock_dialogue_repo.return_value.get.return_value = dialogue
+        self.mock_assistant.return_value.acomplete_dialogue.return_value = (
+            "test response"
+        )
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[]
+        )
+        self.mock_assistant.return_value.adetect_phrases_usage.return_value = (
+            ExpressionDetectionResponse(expressions=[])
+        )
+
+        self.subject.submit_dialogue_statement(
+            self.dialogue_id, self.statement
+        )
+
+        self.assertEqual(
+            call(self.dialogue_id, after=0),
+            self.mock_dialogue_repo.return_value.get_messages.call_args_list[
+                0
+            ],
+        )
+        self.mock_assistant.return_value.acomplete_dialogue.assert_called_once_with(
+            [
+                {
+                    "role": "system",
+                    "content": "Summary of the conversation so far: "
+                    "We talked about cats.",
+                },
+                {
+                    "role": "assistant",
+                    "content": "Hello! What are we going to talk about?",
+                },
+                {"role": "user", "content": "test statement"},
+            ]
+        )
+
     def test_handle_general_statement_expression_judgement(self):
         self.mock_dialogue_repo.return_value.get.return_value = deepcopy(
             self.dialogue
         )
-        self.mock_assistant.return_value.complete_dialogue.return_value = (
+        self.mock_assistant.return_value.acomplete_dialogue.return_value = (
             "test response"
         )
-        self.mock_assistant.return_value.get_general_judgement.return_value = (
-            GeneralJudgementResponse(problems=[])
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[]
         )
-        self.mock_assistant.return_value.detect_phrases_usage.return_value = (
+        self.mock_assistant.return_value.adetect_phrases_usage.return_value = (
             ExpressionDetectionResponse(expressions=["1", "2"])
         )
-        self.mock_assistant.return_value.get_expression_usage_judgement.side_effect = [
+        self.mock_assistant.return_value.aget_expression_usage_judgement.side_effect = [
             ExpressionUsageResponse(
                 id="1", is_correct=False, comment="expression-1 judgement"
             ),
@@ -623,7 +701,7 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
         self.mock_dialogue_repo.return_value.get.assert_called_once_with(
             self.dialogue_id
         )
-        self.mock_assistant.return_value.complete_dialogue.assert_called_once_with(
+        self.mock_assistant.return_value.acomplete_dialogue.assert_called_once_with(
             [
                 {
                     "role": "assistant",
@@ -632,10 +710,10 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
                 {"role": "user", "content": "test statement"},
             ]
         )
-        self.mock_assistant.return_value.get_general_judgement.assert_called_once_with(
+        self.mock_assistant.return_value.aget_general_judgement.assert_called_once_with(
             "test statement"
         )
-        self.mock_assistant.return_value.detect_phrases_usage.assert_called_once_with(
+        self.mock_assistant.return_value.adetect_phrases_usage.assert_called_once_with(
             "test statement",
             [
                 {"id": "1", "expression": "expression 1"},
@@ -643,7 +721,7 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
                 {"id": "3", "expression": "expression 3"},
             ],
         )
-        self.mock_assistant.return_value.get_expression_usage_judgement.assert_has_calls(
+        self.mock_assistant.return_value.aget_expression_usage_judgement.assert_has_calls(
             [
                 call(
                     "test statement",
@@ -685,7 +763,7 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
         )
 
         self.mock_user_expression_repo.return_value.get_trained_expressions.assert_called_once_with(
-            limit=1, excludes=["1", "3"]
+            limit=1, excludes=["1", "3"], profile="list"
         )
         self._assert_dialogue(
             self._get_expected_updated_dialogue(
@@ -696,6 +774,228 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
             self.mock_dialogue_repo.return_value.update.call_args.args[0],
         )
 
+    def test_handle_statement_combined_judgement(self):
+        self.subject.combined_judgement = True
+        self.mock_dialogue_repo.return_value.get.return_value = deepcopy(
+            self.dialogue
+        )
+        self.mock_assistant.return_value.acomplete_dialogue.return_value = (
+            "test response"
+        )
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[]
+        )
+        self.mock_assistant.return_value.ajudge_expressions_usage.return_value = [
+            ExpressionUsageResponse(
+                id="1", is_correct=False, comment="expression-1 judgement"
+            ),
+        ]
+        self.mock_user_expression_repo.return_value.get.return_value = [
+            get_user_expression(
+                user_id=self.user_id,
+                user=None,
+                expression=get_expression(
+                    expression_id="1",
+                    expression="expression 1",
+                    definition="definition 1",
+                ),
+                kl=0.5,
+                pc=1,
+            ),
+        ]
+
+        actual = self.subject.submit_dialogue_statement(
+            self.dialogue_id, self.statement
+        )
+
+        self.assertEqual(
+            {
+                "definition": "definition 1",
+                "expression": "expression 1",
+                "id": "1",
+                "status": "failed",
+                "comment": "expression-1 judgement",
+            },
+            actual["expressions"][0],
+        )
+        self.mock_assistant.return_value.ajudge_expressions_usage.assert_called_once_with(
+            "test statement",
+            [
+                {
+                    "id": "1",
+                    "expression": "expression 1",
+                    "meaning": "definition 1",
+                },
+                {
+                    "id": "2",
+                    "expression": "expression 2",
+                    "meaning": "definition 2",
+                },
+                {
+                    "id": "3",
+                    "expression": "expression 3",
+                    "meaning": "definition 3",
+                },
+            ],
+        )
+        self.mock_assistant.return_value.adetect_phrases_usage.assert_not_called()
+        self.mock_assistant.return_value.aget_expression_usage_judgement.assert_not_called()
+        self.mock_user_expression_repo.return_value.get.assert_called_once_with(
+            include=["1"]
+        )
+
+    def test_stream_statement(self):
+        self.mock_dialogue_repo.return_value.get.return_value = deepcopy(
+            self.dialogue
+        )
+        self.mock_assistant.return_value.stream_dialogue.return_value = iter(
+            ["test ", "response"]
+        )
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[
+                Problem(
+                    problem="the problem",
+                    explanation="the explanation",
+                    solution="the solution",
+                )
+            ]
+        )
+        self.mock_assistant.return_value.adetect_phrases_usage.return_value = (
+            ExpressionDetectionResponse(expressions=["1"])
+        )
+        self.mock_assistant.return_value.aget_expression_usage_judgement.return_value = ExpressionUsageResponse(
+            id="1", is_correct=False, comment="expression-1 judgement"
+        )
+        self.mock_user_expression_repo.return_value.get.return_value = [
+            get_user_expression(
+                user_id=self.user_id,
+                user=None,
+                expression=get_expression(
+                    expression_id="1",
+                    expression="expression 1",
+                    definition="definition 1",
+                ),
+                kl=0.5,
+                pc=1,
+            ),
+        ]
+
+        actual = list(
+            self.subject.stream_dialogue_statement(
+                self.dialogue_id, self.statement
+            )
+        )
+
+        expected_expressions = self._get_expected_response()["expressions"]
+        expected_expressions[0]["status"] = "failed"
+        expected_expressions[0]["comment"] = "expression-1 judgement"
+        self.assertEqual(
+            [
+                ("token", "test "),
+                ("token", "response"),
+                (
+                    "comment",
+                    [
+                        {
+                            "problem": "the problem",
+                            "explanation": "the explanation",
+                            "solution": "the solution",
+                        }
+                    ],
+                ),
+                ("expressions", expected_expressions),
+            ],
+            actual,
+        )
+        self.mock_assistant.return_value.stream_dialogue.assert_called_once_with(
+            [
+                {
+                    "role": "assistant",
+                    "content": "Hello! What are we going to talk about?",
+                },
+                {"role": "user", "content": "test statement"},
+            ]
+        )
+        self.mock_assistant.return_value.acomplete_dialogue.assert_not_called()
+        statement_message = (
+            self.mock_dialogue_repo.return_value.update_message.call_args.args[
+                0
+            ]
+        )
+        self.assertEqual("test statement", statement_message.text)
+        self.assertEqual(actual[2][1], statement_message.comment)
+        self._assert_dialogue(
+            self._get_expected_updated_dialogue(
+                expressions=expected_expressions
+            ),
+            self.mock_dialogue_repo.return_value.update.call_args.args[0],
+        )
+
+    def test_stream_statement_combined_judgement(self):
+        self.subject.combined_judgement = True
+        self.mock_dialogue_repo.return_value.get.return_value = deepcopy(
+            self.dialogue
+        )
+        self.mock_assistant.return_value.stream_dialogue.return_value = iter(
+            ["test response"]
+        )
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[]
+        )
+        self.mock_assistant.return_value.ajudge_expressions_usage.return_value = (
+            []
+        )
+
+        actual = list(
+            self.subject.stream_dialogue_statement(
+                self.dialogue_id, self.statement
+            )
+        )
+
+        self.assertEqual(
+            [
+                ("token", "test response"),
+                ("comment", []),
+                (
+                    "expressions",
+                    self._get_expected_response()["expressions"],
+                ),
+            ],
+            actual,
+        )
+        self.mock_assistant.return_value.adetect_phrases_usage.assert_not_called()
+        self.mock_user_expression_repo.return_value.get.assert_not_called()
+        self.assertEqual(
+            2, self.mock_dialogue_repo.return_value.update.call_count
+        )
+
+    def test_stream_statement_saved_before_answer(self):
+        self.mock_dialogue_repo.return_value.get.return_value = deepcopy(
+            self.dialogue
+        )
+        self.mock_assistant.return_value.stream_dialogue.return_value = iter(
+            ["test ", "response"]
+        )
+
+        events = self.subject.stream_dialogue_statement(
+            self.dialogue_id, self.statement
+        )
+
+        self.mock_dialogue_repo.return_value.update.assert_called_once()
+        saved = self.mock_dialogue_repo.return_value.update.call_args.args[0]
+        self.assertEqual(
+            [("user", "test statement", None)],
+            [
+                (message.role, message.text, message.comment)
+                for message in saved.new_messages
+            ],
+        )
+        # the client leaves after the first token
+        self.assertEqual(("token", "test "), next(events))
+        events.close()
+        self.mock_dialogue_repo.return_value.update.assert_called_once()
+        self.mock_dialogue_repo.return_value.update_message.assert_not_called()
+
     def _assert_dialogue(self, expected: Dialogue, actual: Dialogue):
         self.assertEqual(expected.id, actual.id)
         self.assertEqual(expected.user_id, actual.user_id)
@@ -703,7 +1003,191 @@ class SubmitDialogueStatementTests(BaseDialogueTrainingTest):
         self.assertEqual(expected.description, actual.description)
         self.assertEqual(expected.properties, actual.properties)
         self.assertEqual(expected.settings, actual.settings)
-        self.assertEqual(expected.dialogues, actual.dialogues)
+        self.assertEqual(expected.messages_count, actual.messages_count)
+        self.assertEqual(
+            [message.serialize() for message in expected.new_messages],
+            [message.serialize() for message in actual.new_messages],
+        )
         self.assertEqual(expected.expressions, actual.expressions)
         self.assertEqual(expected.added, actual.added)
         self.assertEqual(expected.updated, actual.updated)
+
+
+class SummarizeDialogueTests(BaseDialogueTrainingTest):
+    def setUp(self):
+        super().setUp()
+        self.dialogue_id = "4d7993aa-d897-4647-994b-e0625c88f349"
+        self.dialogue = get_dialogue(
+            id_=self.dialogue_id,
+            user_id=self.user_id,
+            title="Dialogue 1",
+            description="Dialogue 1 description",
+            settings={"maxExpressionsToTrain": 0},
+            expressions=[],
+            properties={"trainedExpressionsCount": 0},
+        )
+        self.dialogue.messages_count = 10
+        self.messages = [
+            DialogueMessage(
+                seq=seq,
+                role="user" if seq % 2 else "assistant",
+                text=f"message {seq}",
+            )
+            for seq in range(1, 11)
+        ]
+        self.mock_dialogue_repo.return_value.get.return_value = self.dialogue
+        self.mock_dialogue_repo.return_value.get_messages.side_effect = (
+            lambda dialogue_id, after=None, **_: [
+                message
+                for message in self.messages
+                if after is None or message.seq > after
+            ]
+        )
+        self.mock_assistant.return_value.acomplete_dialogue.return_value = (
+            "test response"
+        )
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[]
+        )
+        self.mock_assistant.return_value.adetect_phrases_usage.return_value = (
+            ExpressionDetectionResponse(expressions=[])
+        )
+        self.mock_assistant.return_value.summarize_dialogue.return_value = (
+            "new summary"
+        )
+
+    def _get_prompt(self):
+        return (
+            self.mock_assistant.return_value.acomplete_dialogue.call_args.args[
+                0
+            ]
+        )
+
+    def test_history_within_budget_not_summarized(self):
+        self.subject.submit_dialogue_statement(self.dialogue_id, "statement")
+
+        self.mock_assistant.return_value.summarize_dialogue.assert_not_called()
+        self.assertEqual(
+            [f"message {seq}" for seq in range(1, 11)] + ["statement"],
+            [message["content"] for message in self._get_prompt()],
+        )
+
+    def test_history_over_budget_summarized(self):
+        self.dialogue.settings["historyTokenBudget"] = 50
+        self.dialogue.properties["summary"] = "old summary"
+
+        self.subject.submit_dialogue_statement(self.dialogue_id, "statement")
+
+        self.mock_assistant.return_value.summarize_dialogue.assert_called_once_with(
+            "old summary",
+            [
+                {
+                    "role": "user" if seq % 2 else "assistant",
+                    "content": f"message {seq}",
+                }
+                for seq in range(1, 5)
+            ],
+        )
+        self.assertEqual(
+            [
+                "Summary of the conversation so far: new summary",
+                *[f"message {seq}" for seq in range(5, 11)],
+                "statement",
+            ],
+            [message["content"] for message in self._get_prompt()],
+        )
+        updated_dialogue = (
+            self.mock_dialogue_repo.return_value.update.call_args.args[0]
+        )
+        self.assertEqual("new summary", updated_dialogue.properties["summary"])
+        self.assertEqual(4, updated_dialogue.properties["summarySeq"])
+
+    def test_summarized_messages_not_sent(self):
+        self.dialogue.properties["summary"] = "old summary"
+        self.dialogue.properties["summarySeq"] = 7
+
+        self.subject.submit_dialogue_statement(self.dialogue_id, "statement")
+
+        self.mock_assistant.return_value.summarize_dialogue.assert_not_called()
+        self.assertEqual(
+            [
+                "Summary of the conversation so far: old summary",
+                "message 8",
+                "message 9",
+                "message 10",
+                "statement",
+            ],
+            [message["content"] for message in self._get_prompt()],
+        )
+
+    def test_full_window_summarized(self):
+        self.messages = [
+            DialogueMessage(seq=seq, role="user", text="hi")
+            for seq in range(1, 21)
+        ]
+        self.mock_dialogue_repo.return_value.get_messages.return_value = (
+            self.messages
+        )
+
+        self.subject.submit_dialogue_statement(self.dialogue_id, "statement")
+
+        self.mock_assistant.return_value.summarize_dialogue.assert_called_once_with(
+            None, [{"role": "user", "content": "hi"}] * 14
+        )
+        self.assertEqual(14, self.dialogue.properties["summarySeq"])
+
+    def test_all_messages_after_summary_summarized(self):
+        self.messages = [
+            DialogueMessage(seq=seq, role="user", text="hi")
+            for seq in range(1, 41)
+        ]
+        self.dialogue.properties["summary"] = "old summary"
+        self.dialogue.properties["summarySeq"] = 5
+
+        self.subject.submit_dialogue_statement(self.dialogue_id, "statement")
+
+        self.mock_dialogue_repo.return_value.get_messages.assert_any_call(
+            self.dialogue_id, after=5
+        )
+        self.mock_assistant.return_value.summarize_dialogue.assert_called_once_with(
+            "old summary", [{"role": "user", "content": "hi"}] * 29
+        )
+        self.assertEqual(34, self.dialogue.properties["summarySeq"])
+
+    def test_kept_messages_over_budget_trimmed(self):
+        self.dialogue.settings["historyTokenBudget"] = 20
+
+        self.subject.submit_dialogue_statement(self.dialogue_id, "statement")
+
+        self.mock_assistant.return_value.summarize_dialogue.assert_called_once_with(
+            None,
+            [
+                {
+                    "role": "user" if seq % 2 else "assistant",
+                    "content": f"message {seq}",
+                }
+                for seq in range(1, 9)
+            ],
+        )
+        self.assertEqual(
+            [
+                "Summary of the conversation so far: new summary",
+                "message 9",
+                "message 10",
+                "statement",
+            ],
+            [message["content"] for message in self._get_prompt()],
+        )
+        self.assertEqual(8, self.dialogue.properties["summarySeq"])
+
+    def test_few_messages_over_budget_trimmed(self):
+        self.messages = self.messages[:4]
+        self.dialogue.settings["historyTokenBudget"] = 10
+
+        self.subject.submit_dialogue_statement(self.dialogue_id, "statement")
+
+        self.assertEqual(
+            ["Summary of the conversation so far: new summary", "message 4"],
+            [message["content"] for message in self._get_prompt()][:-1],
+        )
+        self.assertEqual(3, self.dialogue.properties["summarySeq"])
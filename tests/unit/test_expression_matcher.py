@@ -0,0 +1,120 @@
+from unittest import TestCase
+
+from helpers.expression_matcher import ExpressionMatcher, MatchResult, stem
+
+
+class StemTests(TestCase):
+    def test_inflected_forms(self):
+        cases = [
+            ("run", ["run", "runs", "running", "ran"]),
+            ("try", ["try", "tries", "tried", "trying"]),
+            ("make", ["make", "makes", "making", "made"]),
+            ("pass", ["pass", "passes", "passed", "passing"]),
+            ("be", ["be", "is", "was", "were", "been"]),
+            ("child", ["child", "children", "child's"]),
+            ("sing", ["sing", "sings", "sang", "sung"]),
+            ("fly", ["fly", "flies", "flew", "flown"]),
+            ("lose", ["lose", "loses", "lost", "losing"]),
+            ("bus", ["bus", "buses"]),
+            ("class", ["class", "classes"]),
+        ]
+        for word, forms in cases:
+            with self.subTest(word=word):
+                self.assertEqual({stem(word)}, {stem(form) for form in forms})
+
+    def test_word_not_stemmed_to_other_word(self):
+        self.assertNotEqual(stem("new"), stem("news"))
+        self.assertNotEqual(stem("bu"), stem("bus"))
+
+
+class ExpressionMatcherTests(TestCase):
+    def setUp(self):
+        self.subject = ExpressionMatcher(
+            {
+                "1": "give up",
+                "2": "get on somebody's nerves",
+                "3": "turn off",
+                "4": "terrible weather",
+                "5": "be in hot water",
+                "6": "attic",
+                "7": "something",
+            }
+        )
+
+    def test_match(self):
+        actual = self.subject.match(
+            "He was getting on my nerves, so I gave up. "
+            "Turn the light off, we are in hot water."
+        )
+
+        self.assertEqual(
+            MatchResult(
+                hits=["1", "2", "5"],
+                ambiguous=["3", "7"],
+                misses=["4", "6"],
+            ),
+            actual,
+        )
+
+    def test_words_in_other_order(self):
+        actual = self.subject.match("What weather! Terrible. Up, give it.")
+
+        self.assertEqual([], actual.hits)
+        self.assertEqual(["1", "4", "7"], actual.ambiguous)
+
+    def test_slot_is_limited(self):
+        actual = self.subject.match(
+            "It gets on the very old neighbour's nerves"
+        )
+
+        self.assertIn("2", actual.ambiguous)
+
+    def test_overlapping_expressions(self):
+        subject = ExpressionMatcher(
+            {"1": "hot water", "2": "in hot water", "3": "water"}
+        )
+
+        actual = subject.match("I'm in hot water")
+
+        self.assertEqual(["1", "2", "3"], actual.hits)
+
+    def test_empty_text(self):
+        actual = self.subject.match("")
+
+        self.assertEqual([], actual.hits)
+        self.assertEqual(["7"], actual.ambiguous)
+
+    def test_irregular_past_forms(self):
+        subject = ExpressionMatcher(
+            {
+                "1": "spill the beans",
+                "2": "lose one's temper",
+                "3": "sing",
+            }
+        )
+
+        actual = subject.match(
+            "She spilt the beans, they lost their tempers and we sang."
+        )
+
+        self.assertEqual(["1", "2", "3"], actual.hits)
+
+    def test_plurals(self):
+        subject = ExpressionMatcher({"1": "bus", "2": "news"})
+
+        actual = subject.match("The buses were late, the new ones.")
+
+        self.assertEqual(["1"], actual.hits)
+        self.assertEqual(["2"], actual.ambiguous)
+
+    def test_partial_match_ambiguous(self):
+        subject = ExpressionMatcher(
+            {"1": "fly off the handle", "2": "go for a swim"}
+        )
+
+        # only some of the words are found, a model decides
+        actual = subject.match("He flew into a rage and swam for hours.")
+
+        self.assertEqual(
+            MatchResult(hits=[], ambiguous=["1", "2"], misses=[]), actual
+        )
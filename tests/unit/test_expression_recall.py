@@ -44,14 +44,14 @@ class GetChallengeTests(TestCase):
 
         self.assertEqual(expected, actual)
 
-        self.mock_get.assert_called_once_with(limit=1)
+        self.mock_get.assert_called_once_with(limit=1, profile="challenge")
 
     def test_no_expression_for_challenge_returns_none(self):
         self.mock_get.return_value = []
 
         self.assertIsNone(self.subject.get_challenge())
 
-        self.mock_get.assert_called_once_with(limit=1)
+        self.mock_get.assert_called_once_with(limit=1, profile="challenge")
 
 
 class SubmitChallengeTests(TestCase):
@@ -248,7 +248,7 @@ class GetExpressionsNeededRecallingTests(TestCase):
 
         self.assertEqual(expected, actual)
 
-        self.mock_get.assert_called_once_with()
+        self.mock_get.assert_called_once_with(profile="list")
 
     def test_get_expressions_needed_recalling_no_expressions(self):
         self.mock_get.return_value = []
@@ -257,4 +257,4 @@ class GetExpressionsNeededRecallingTests(TestCase):
 
         self.assertEqual([], actual)
 
-        self.mock_get.assert_called_once_with()
+        self.mock_get.assert_called_once_with(profile="list")
@@ -1,6 +1,7 @@
 from unittest import TestCase
 from unittest.mock import patch
 
+from helpers.search_helper import SEARCH_LIMIT
 from services.expression_service import ExpressionService
 from services.exceptions import ExpressionNotFoundException
 from tests.unit.fixtures import get_expression, get_tag
@@ -72,7 +73,7 @@ class SearchTests(TestCase):
 
         self.assertEqual(expected, actual)
 
-        self.mock.assert_called_once_with(pattern)
+        self.mock.assert_called_once_with(pattern, limit=SEARCH_LIMIT)
 
     def test_search_nothing_found(self):
         pattern = "expression"
@@ -83,7 +84,7 @@ class SearchTests(TestCase):
 
         self.assertEqual([], actual)
 
-        self.mock.assert_called_once_with(pattern)
+        self.mock.assert_called_once_with(pattern, limit=SEARCH_LIMIT)
 
 
 class GetByIDTests(TestCase):
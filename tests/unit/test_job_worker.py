@@ -0,0 +1,134 @@
+import threading
+from unittest import TestCase
+from unittest.mock import Mock, create_autospec
+from uuid import UUID
+
+from constants import JobStatus
+from dao.jobs_dao import JobsDAO
+from extensions import db
+from helpers import metrics
+from models.models import Job
+from services.job_worker import DONE_METRIC, FAILED_METRIC, JobWorker
+from tests.unit.test_repos.utils import BaseRepoTestUtils
+
+
+class JobWorkerTests(TestCase):
+    def setUp(self):
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
+        self.jobs_dao = create_autospec(JobsDAO, instance=True)
+        self.jobs_dao.session = Mock()
+        self.job = Job(type="test", payload={"text": "Text"}, attempts=1)
+        self.handler = Mock()
+        self.subject = JobWorker(
+            {"test": self.handler}, jobs_dao=self.jobs_dao, max_attempts=2
+        )
+
+    def test_no_due_jobs(self):
+        self.jobs_dao.claim.return_value = None
+
+        self.assertFalse(self.subject.run_once())
+
+        self.jobs_dao.complete.assert_not_called()
+
+    def test_job_done(self):
+        self.jobs_dao.claim.return_value = self.job
+        self.handler.return_value = {
+            "id": UUID("4d7993aa-d897-4647-994b-e0625c88f349")
+        }
+
+        self.assertTrue(self.subject.run_once())
+
+        self.handler.assert_called_once_with(self.job)
+        self.jobs_dao.complete.assert_called_once_with(
+            self.job, {"id": "4d7993aa-d897-4647-994b-e0625c88f349"}
+        )
+        self.assertEqual(1, metrics.get_count(DONE_METRIC))
+
+    def test_job_failed(self):
+        self.jobs_dao.claim.return_value = self.job
+        self.handler.side_effect = ValueError("failed")
+
+        self.assertTrue(self.subject.run_once())
+
+        self.jobs_dao.session.rollback.assert_called_once()
+        self.jobs_dao.fail.assert_called_once_with(
+            self.job, "ValueError('failed')", 2
+        )
+        self.jobs_dao.complete.assert_not_called()
+        self.assertEqual(1, metrics.get_count(FAILED_METRIC))
+
+    def test_job_not_completed(self):
+        self.jobs_dao.claim.return_value = self.job
+        self.jobs_dao.complete.side_effect = ValueError("not committed")
+
+        self.assertTrue(self.subject.run_once())
+
+        self.jobs_dao.session.rollback.assert_called_once()
+        self.jobs_dao.fail.assert_called_once_with(
+            self.job, "ValueError('not committed')", 2
+        )
+        self.assertEqual(0, metrics.get_count(DONE_METRIC))
+        self.assertEqual(1, metrics.get_count(FAILED_METRIC))
+
+    def test_job_not_marked_as_failed(self):
+        self.jobs_dao.claim.return_value = self.job
+        self.handler.side_effect = ValueError("failed")
+        self.jobs_dao.fail.side_effect = ValueError("db is gone")
+
+        self.assertTrue(self.subject.run_once())
+
+        self.assertEqual(2, self.jobs_dao.session.rollback.call_count)
+        self.assertEqual(1, metrics.get_count(FAILED_METRIC))
+
+    def test_run_until_stopped(self):
+        stop = threading.Event()
+        jobs = iter([self.job, self.job])
+        self.jobs_dao.claim.side_effect = lambda: next(jobs, None) or (
+            stop.set()
+        )
+
+        self.subject.run(stop)
+
+        self.assertEqual(2, self.handler.call_count)
+
+
+class JobWorkerCommitTests(BaseRepoTestUtils):
+    def setUp(self):
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
+        self._clean_jobs()
+        self._clean_users()
+
+        self.user_id = self._seed_user()
+        self.jobs_dao = JobsDAO()
+
+    def test_handler_changes_not_committed(self):
+        job = self.jobs_dao.enqueue(self.user_id, "test", {})
+        job_id = job.id
+
+        def handler(job):
+            # a job of an unknown user violates the foreign key on commit
+            db.session.add(
+                Job(
+                    user_id="2de2dc8b-ca69-4553-98dc-09e3f2998d12",
+                    type="test",
+                    payload={},
+                    status=JobStatus.PENDING.value,
+                    run_after=job.run_after,
+                    added=job.added,
+                    updated=job.updated,
+                )
+            )
+
+        subject = JobWorker({"test": handler})
+
+        self.assertTrue(subject.run_once())
+        self.assertFalse(subject.run_once())
+
+        jobs = db.session.query(Job).all()
+        self.assertEqual([job_id], [job.id for job in jobs])
+        self.assertEqual(JobStatus.PENDING.value, jobs[0].status)
+        self.assertEqual(1, jobs[0].attempts)
+        self.assertIn("IntegrityError", jobs[0].error)
+        self.assertEqual(1, metrics.get_count(FAILED_METRIC))
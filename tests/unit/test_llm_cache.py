@@ -0,0 +1,173 @@
+import asyncio
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration
+
+from helpers import metrics
+from services.llm_cache import (
+    HITS_METRIC,
+    MISSES_METRIC,
+    LLMResponseCache,
+)
+from services.venice_chat_model import ChatVeniceAI
+
+
+class LLMResponseCacheTests(TestCase):
+    def setUp(self):
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.path = Path(temp_dir.name) / "cache/llm_cache.sqlite3"
+        self.subject = LLMResponseCache(self.path, ttl=60, max_bytes=10_000)
+
+    @staticmethod
+    def _get_generations(content: str) -> list[ChatGeneration]:
+        return [ChatGeneration(message=AIMessage(content=content))]
+
+    def test_lookup_update(self):
+        self.assertIsNone(self.subject.lookup("prompt", "llm"))
+
+        self.subject.update("prompt", "llm", self._get_generations("answer"))
+
+        actual = self.subject.lookup("prompt", "llm")
+        self.assertEqual("answer", actual[0].message.content)
+        self.assertIsNone(self.subject.lookup("prompt", "other llm"))
+        self.assertIsNone(self.subject.lookup("other prompt", "llm"))
+        self.assertEqual(1, metrics.get_count(HITS_METRIC))
+        self.assertEqual(3, metrics.get_count(MISSES_METRIC))
+
+    def test_cache_is_persistent(self):
+        self.subject.update("prompt", "llm", self._get_generations("answer"))
+
+        actual = LLMResponseCache(self.path).lookup("prompt", "llm")
+
+        self.assertEqual("answer", actual[0].message.content)
+
+    @patch("services.llm_cache.time.time")
+    def test_lookup_expired(self, mock_time):
+        mock_time.return_value = 1000
+        self.subject.update("prompt", "llm", self._get_generations("answer"))
+
+        mock_time.return_value = 1059
+        self.assertIsNotNone(self.subject.lookup("prompt", "llm"))
+        mock_time.return_value = 1060
+        self.assertIsNone(self.subject.lookup("prompt", "llm"))
+
+    @patch("services.llm_cache.time.time")
+    def test_least_recently_used_evicted(self, mock_time):
+        # '["a"]' takes 5 bytes
+        self.subject.max_bytes = 10
+        for now, prompt in enumerate(("first", "second")):
+            mock_time.return_value = now
+            self.subject.update(prompt, "llm", self._get_generations("a"))
+        mock_time.return_value = 2
+        self.subject.lookup("first", "llm")
+
+        mock_time.return_value = 3
+        self.subject.update("third", "llm", self._get_generations("a"))
+
+        self.assertIsNotNone(self.subject.lookup("first", "llm"))
+        self.assertIsNone(self.subject.lookup("second", "llm"))
+        self.assertIsNotNone(self.subject.lookup("third", "llm"))
+        self.assertEqual(10, self.subject.get_stats()["bytes"])
+
+    def test_replaced_entry_size_counted_once(self):
+        self.subject.update("prompt", "llm", self._get_generations("a"))
+        self.subject.update("prompt", "llm", self._get_generations("abc"))
+
+        # '["abc"]' takes 7 bytes
+        self.assertEqual(7, self.subject.get_stats()["bytes"])
+
+        self.subject.clear()
+
+        self.assertEqual(0, self.subject.get_stats()["bytes"])
+
+    def test_total_size_of_existing_cache(self):
+        self.subject.update("prompt", "llm", self._get_generations("a"))
+        with sqlite3.connect(self.path) as connection:
+            connection.execute("DROP TABLE llm_cache_size")
+
+        actual = LLMResponseCache(self.path).get_stats()
+
+        self.assertEqual(5, actual["bytes"])
+
+    def test_async_calls_out_of_event_loop(self):
+        threads = []
+        lookup = self.subject.lookup
+
+        def record_thread(*args):
+            threads.append(threading.current_thread())
+            return lookup(*args)
+
+        async def run():
+            await self.subject.aupdate(
+                "prompt", "llm", self._get_generations("answer")
+            )
+            return await self.subject.alookup("prompt", "llm")
+
+        with patch.object(self.subject, "lookup", side_effect=record_thread):
+            actual = asyncio.run(run())
+
+        self.assertEqual("answer", actual[0].message.content)
+        self.assertNotIn(threading.current_thread(), threads)
+
+    def test_get_stats(self):
+        self.assertEqual(
+            {
+                "hits": 0,
+                "misses": 0,
+                "hitRate": None,
+                "entries": 0,
+                "bytes": 0,
+                "maxBytes": 10_000,
+            },
+            self.subject.get_stats(),
+        )
+
+        self.subject.update("prompt", "llm", self._get_generations("answer"))
+        self.subject.lookup("prompt", "llm")
+        self.subject.lookup("other prompt", "llm")
+
+        stats = self.subject.get_stats()
+        self.assertEqual(0.5, stats["hitRate"])
+        self.assertEqual(1, stats["entries"])
+        self.assertGreater(stats["bytes"], 0)
+
+    def test_clear(self):
+        self.subject.update("prompt", "llm", self._get_generations("answer"))
+
+        self.subject.clear()
+
+        self.assertIsNone(self.subject.lookup("prompt", "llm"))
+
+    @patch("services.venice_chat_model.VeniceClient")
+    def test_chat_model_cache(self, mock_venice_client):
+        mock_venice_client.return_value.do_chat_completion.return_value = {
+            "choices": [{"message": {"content": "response content"}}],
+            "usage": {
+                "prompt_tokens": 10,
+                "completion_tokens": 5,
+                "total_tokens": 15,
+            },
+        }
+        chat_model = ChatVeniceAI(
+            model="test_model", api_key="test_api_key", cache=self.subject
+        )
+
+        first = chat_model.invoke([HumanMessage(content="Hello")])
+        second = chat_model.invoke([HumanMessage(content="Hello")])
+        chat_model.temperature = 0.8
+        chat_model.invoke([HumanMessage(content="Hello")])
+
+        self.assertEqual("response content", first.content)
+        self.assertEqual("response content", second.content)
+        self.assertEqual(
+            2, mock_venice_client.return_value.do_chat_completion.call_count
+        )
@@ -0,0 +1,105 @@
+import asyncio
+import threading
+import time
+from unittest import TestCase
+
+from helpers import metrics
+from services.llm_executor import (
+    QUEUE_DEPTH_METRIC,
+    RUNNING_METRIC,
+    SHED_METRIC,
+    LLMExecutor,
+    LLMOverloadedError,
+    get_llm_executor,
+)
+
+
+class LLMExecutorTests(TestCase):
+    def setUp(self):
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
+        self.subject = LLMExecutor(max_concurrent_calls=2, max_queue_size=4)
+        self.running = 0
+        self.max_running = 0
+
+    async def _call(self, value, release: threading.Event | None = None):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        while release is not None and not release.is_set():
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        return value
+
+    def test_gather(self):
+        actual = self.subject.gather(self._call(1), self._call(2))
+
+        self.assertEqual([1, 2], actual)
+        self.assertEqual(0, self.subject.queue_depth)
+        self.assertEqual(0, metrics.get_count(QUEUE_DEPTH_METRIC))
+        self.assertEqual(0, metrics.get_count(RUNNING_METRIC))
+
+    def test_submit(self):
+        future = self.subject.submit(self._call(1), self._call(2))
+
+        self.assertEqual([1, 2], future.result())
+        self.assertEqual(0, self.subject.queue_depth)
+
+    def test_concurrent_calls_limit(self):
+        actual = self.subject.gather(*(self._call(i) for i in range(4)))
+
+        self.assertEqual([0, 1, 2, 3], actual)
+        self.assertEqual(2, self.max_running)
+
+    def test_limit_is_shared_between_requests(self):
+        threads = [
+            threading.Thread(
+                target=self.subject.gather,
+                args=(self._call(1), self._call(2)),
+            )
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(2, self.max_running)
+
+    def test_gather_raises(self):
+        async def fail():
+            raise ValueError("failed")
+
+        with self.assertRaises(ValueError):
+            self.subject.gather(self._call(1), fail())
+
+    def test_overloaded(self):
+        release = threading.Event()
+        blocked = threading.Thread(
+            target=self.subject.gather,
+            args=tuple(self._call(i, release) for i in range(4)),
+        )
+        blocked.start()
+        self.addCleanup(blocked.join)
+        self.addCleanup(release.set)
+        for _ in range(1000):
+            if self.running == 2:
+                break
+            time.sleep(0.001)
+        self.assertEqual(2, self.subject.queue_depth)
+        self.assertEqual(2, metrics.get_count(QUEUE_DEPTH_METRIC))
+        self.assertEqual(2, metrics.get_count(RUNNING_METRIC))
+
+        with self.assertRaises(LLMOverloadedError):
+            self.subject.gather(*(self._call(i) for i in range(3)))
+
+        self.assertEqual(3, metrics.get_count(SHED_METRIC))
+        self.assertEqual(2, self.subject.queue_depth)
+
+        release.set()
+        self.assertEqual([7], self.subject.gather(self._call(7)))
+
+
+class GetLLMExecutorTests(TestCase):
+    def test_executor_is_shared(self):
+        self.assertIs(get_llm_executor(), get_llm_executor())
@@ -0,0 +1,19 @@
+from unittest import TestCase
+
+from helpers import metrics
+
+
+class MetricsTests(TestCase):
+    def setUp(self):
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
+
+    def test_increment(self):
+        metrics.increment("test.counter")
+        metrics.increment("test.counter", 2)
+
+        self.assertEqual(3, metrics.get_count("test.counter"))
+        self.assertEqual({"test.counter": 3}, metrics.get_counters())
+
+    def test_get_count_unknown_counter(self):
+        self.assertEqual(0, metrics.get_count("test.unknown"))
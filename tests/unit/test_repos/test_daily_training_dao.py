@@ -1,5 +1,6 @@
 from dao.daily_training_dao import DailyTrainingDAO
 from repository.exceptions import UserNotFoundException
+from tests.unit.test_repos.test_learn_list_dao import LearnListDAOTestHelper
 from tests.unit.test_repos.utils import BaseRepoTestUtils
 
 import psycopg2
@@ -210,3 +211,15 @@ class PutTests(BaseRepoTestUtils):
         con.close()
 
         return data[0]
+
+
+class GetLearnListCandidatesTests(LearnListDAOTestHelper):
+    def test_get_learn_list_candidates(self):
+        subject = DailyTrainingDAO(self.user_id)
+
+        actual = subject.get_learn_list_candidates(5, self.expression_ids[:2])
+
+        self.assertEqual(
+            set(self.expression_ids[2:]),
+            {str(expr.expression_id) for expr in actual},
+        )
@@ -3,7 +3,11 @@ from datetime import datetime
 from unittest import TestCase
 from unittest.mock import Mock, MagicMock, ANY
 
-from repository.training_expressions_repo import DailyTrainingRepo
+from helpers import metrics
+from repository.training_expressions_repo import (
+    DailyTrainingRepo,
+    SKIPPED_WRITES_METRIC,
+)
 from dao.daily_training_dao import DailyTrainingDAO
 from dao.user_expressions_dao import UserExpressionsDAO
 from tests.unit.fixtures import (
@@ -20,6 +24,9 @@ class DailyTrainingRepoTestsHelper(TestCase):
         self.user_id = "test_user_id"
         self.mock_daily_training_dao = Mock(spec=DailyTrainingDAO)
         self.mock_user_expressions_dao = Mock(spec=UserExpressionsDAO)
+        self.mock_get_candidates = (
+            self.mock_daily_training_dao.return_value.get_learn_list_candidates
+        )
         self.mock_session = MagicMock()
 
         self.expr_id_1 = "4d7993aa-d897-4647-994b-e0625c88f349"
@@ -124,7 +131,7 @@ class GetNextTests(DailyTrainingRepoTestsHelper):
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
         self.mock_user_expressions_dao.return_value.get.assert_called_once_with(
-            include=[self.expr_id_1]
+            include=[self.expr_id_1], profile="challenge"
         )
 
     def _assert_training_expressions_data(self, expected: list, actual: list):
@@ -163,7 +170,7 @@ class GetNextTests(DailyTrainingRepoTestsHelper):
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
         self.mock_user_expressions_dao.return_value.get.assert_called_once_with(
-            include=[self.expr_id_1, self.expr_id_2]
+            include=[self.expr_id_1, self.expr_id_2], profile="challenge"
         )
 
     def test_get_more_than_in_the_training_list(self):
@@ -197,7 +204,8 @@ class GetNextTests(DailyTrainingRepoTestsHelper):
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
         self.mock_user_expressions_dao.return_value.get.assert_called_once_with(
-            include=[self.expr_id_1, self.expr_id_2, self.expr_id_3]
+            include=[self.expr_id_1, self.expr_id_2, self.expr_id_3],
+            profile="challenge",
         )
 
     def test_get_from_empty_list(self):
@@ -304,7 +312,8 @@ class GetListTests(DailyTrainingRepoTestsHelper):
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
         self.mock_user_expressions_dao.return_value.get.assert_called_once_with(
-            include=[self.expr_id_1, self.expr_id_2, self.expr_id_3]
+            include=[self.expr_id_1, self.expr_id_2, self.expr_id_3],
+            profile="list",
         )
 
     def test_get_list_empty(self):
@@ -405,15 +414,15 @@ class AddTests(DailyTrainingRepoTestsHelper):
 
 class DeleteTests(DailyTrainingRepoTestsHelper):
     def test_delete(self):
-        self.mock_user_expressions_dao.return_value.get.return_value = [
+        self.mock_get_candidates.return_value = [
             self.user_expr_4,
         ]
 
         self.subject.delete(self.expr_id_1)
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
-        self.mock_user_expressions_dao.return_value.get.assert_called_once_with(
-            exclude=[self.expr_id_2, self.expr_id_3], limit=48
+        self.mock_get_candidates.assert_called_once_with(
+            48, [self.expr_id_2, self.expr_id_3]
         )
         expected_daily_training_data = {
             **self.mock_daily_training_data,
@@ -520,7 +529,8 @@ class UpdateExpressionsTests(DailyTrainingRepoTestsHelper):
             [
                 self.user_expr_1,
                 self.user_expr_2,
-            ]
+            ],
+            commit=False,
         )
 
     def test_update_expression_new_position_bigger_than_learn_list_len(self):
@@ -581,7 +591,8 @@ class UpdateExpressionsTests(DailyTrainingRepoTestsHelper):
             [
                 self.user_expr_1,
                 self.user_expr_2,
-            ]
+            ],
+            commit=False,
         )
 
 
@@ -617,6 +628,9 @@ class RefreshTests(DailyTrainingRepoTestsHelper):
             ],
         }
         self.mock_daily_training_dao = Mock(spec=DailyTrainingDAO)
+        self.mock_get_candidates = (
+            self.mock_daily_training_dao.return_value.get_learn_list_candidates
+        )
 
     def test_refresh_when_item_is_removed_due_to_reaching_training_criteria(
         self,
@@ -624,7 +638,7 @@ class RefreshTests(DailyTrainingRepoTestsHelper):
         self.mock_daily_training_dao.return_value.get.return_value = (
             self.mock_daily_training_data
         )
-        self.mock_user_expressions_dao.return_value.get.return_value = [
+        self.mock_get_candidates.return_value = [
             self.user_expr_4,
         ]
         subject = DailyTrainingRepo(
@@ -666,8 +680,8 @@ class RefreshTests(DailyTrainingRepoTestsHelper):
         }
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
-        self.mock_user_expressions_dao.return_value.get.assert_called_once_with(
-            exclude=[self.expr_id_2, self.expr_id_3], limit=1
+        self.mock_get_candidates.assert_called_once_with(
+            1, [self.expr_id_2, self.expr_id_3]
         )
         self.mock_daily_training_dao.return_value.put.assert_called_once_with(
             expected_daily_training_data, commit=True
@@ -687,12 +701,14 @@ class RefreshTests(DailyTrainingRepoTestsHelper):
             daily_training_dao=self.mock_daily_training_dao,
             user_expressions_dao=self.mock_user_expressions_dao,
         )
+        skipped_writes = metrics.get_count(SKIPPED_WRITES_METRIC)
         subject.refresh()
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
-        self.mock_user_expressions_dao.return_value.get.assert_not_called()
-        self.mock_daily_training_dao.return_value.put.assert_called_once_with(
-            mock_daily_training_data, commit=True
+        self.mock_get_candidates.assert_not_called()
+        self.mock_daily_training_dao.return_value.put.assert_not_called()
+        self.assertEqual(
+            skipped_writes + 1, metrics.get_count(SKIPPED_WRITES_METRIC)
         )
 
     def test_refresh_when_item_has_not_enough_knowledge_level_but_enough_practice_count(
@@ -709,19 +725,21 @@ class RefreshTests(DailyTrainingRepoTestsHelper):
             daily_training_dao=self.mock_daily_training_dao,
             user_expressions_dao=self.mock_user_expressions_dao,
         )
+        skipped_writes = metrics.get_count(SKIPPED_WRITES_METRIC)
         subject.refresh()
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
-        self.mock_user_expressions_dao.return_value.get.assert_not_called()
-        self.mock_daily_training_dao.return_value.put.assert_called_once_with(
-            mock_daily_training_data, commit=True
+        self.mock_get_candidates.assert_not_called()
+        self.mock_daily_training_dao.return_value.put.assert_not_called()
+        self.assertEqual(
+            skipped_writes + 1, metrics.get_count(SKIPPED_WRITES_METRIC)
         )
 
     def test_refresh_when_nothing_to_add(self):
         self.mock_daily_training_dao.return_value.get.return_value = (
             self.mock_daily_training_data
         )
-        self.mock_user_expressions_dao.return_value.get.return_value = []
+        self.mock_get_candidates.return_value = []
         subject = DailyTrainingRepo(
             user_id=self.user_id,
             session=self.mock_session,
@@ -754,8 +772,8 @@ class RefreshTests(DailyTrainingRepoTestsHelper):
         }
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
-        self.mock_user_expressions_dao.return_value.get.assert_called_once_with(
-            exclude=[self.expr_id_2, self.expr_id_3], limit=1
+        self.mock_get_candidates.assert_called_once_with(
+            1, [self.expr_id_2, self.expr_id_3]
         )
         self.mock_daily_training_dao.return_value.put.assert_called_once_with(
             expected_daily_training_data, commit=True
@@ -798,7 +816,7 @@ class RefreshTests(DailyTrainingRepoTestsHelper):
         }
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
-        self.mock_user_expressions_dao.return_value.get.assert_not_called()
+        self.mock_get_candidates.assert_not_called()
         self.mock_daily_training_dao.return_value.put.assert_called_once_with(
             expected_daily_training_data, commit=True
         )
@@ -818,7 +836,7 @@ class GetByIDsTests(DailyTrainingRepoTestsHelper):
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
         self.mock_user_expressions_dao.return_value.get.assert_called_once_with(
-            include=[self.expr_id_1, self.expr_id_2]
+            include=[self.expr_id_1, self.expr_id_2], profile="challenge"
         )
 
     def test_get_by_id_not_found_returns_empty_list(self):
@@ -830,7 +848,7 @@ class GetByIDsTests(DailyTrainingRepoTestsHelper):
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
         self.mock_user_expressions_dao.return_value.get.assert_called_once_with(
-            include=[self.expr_id_1]
+            include=[self.expr_id_1], profile="challenge"
         )
 
 
@@ -875,3 +893,54 @@ class IsExpressionInLearnListTests(DailyTrainingRepoTestsHelper):
         self.assertFalse(actual)
 
         self.mock_daily_training_dao.return_value.get.assert_called_once_with()
+
+
+class GetLearnListExpressionIdsTests(DailyTrainingRepoTestsHelper):
+    def test_get_learn_list_expression_ids(self):
+        actual = self.subject.get_learn_list_expression_ids()
+        self.assertEqual(
+            {self.expr_id_1, self.expr_id_2, self.expr_id_3}, actual
+        )
+
+        self.mock_daily_training_dao.return_value.get.assert_called_once_with()
+
+    def test_item_ids_stay_in_sync_after_delete(self):
+        self.mock_get_candidates.return_value = []
+
+        self.subject.delete(self.expr_id_1)
+
+        self.assertFalse(
+            self.subject.is_expression_in_learn_list(self.expr_id_1)
+        )
+        self.assertNotIn(
+            self.expr_id_1, self.subject.get_learn_list_expression_ids()
+        )
+
+    def test_ids_not_changed_by_delete(self):
+        self.mock_get_candidates.return_value = []
+        ids = self.subject.get_learn_list_expression_ids()
+
+        self.subject.delete(self.expr_id_1)
+
+        self.assertIsInstance(ids, set)
+        self.assertEqual({self.expr_id_1, self.expr_id_2, self.expr_id_3}, ids)
+
+
+class UpdateSettingsNotChangedTests(DailyTrainingRepoTestsHelper):
+    def test_update_settings_not_changed_skips_write(self):
+        self.mock_get_candidates.return_value = []
+        settings = {
+            "max_learn_list_size": self.mock_daily_training_data[
+                "learnListSize"
+            ],
+            "knowledge_level_threshold": self.mock_daily_training_data[
+                "knowledgeLevelThreshold"
+            ],
+            "practice_count_threshold": self.mock_daily_training_data[
+                "practiceCountThreshold"
+            ],
+        }
+
+        self.subject.update_settings(settings)
+
+        self.mock_daily_training_dao.return_value.put.assert_not_called()
@@ -18,7 +18,6 @@ class GetTests(BaseRepoTestUtils):
                 "description": "Dialogue 1 description",
                 "properties": {"trainedExpressionsCount": 0},
                 "settings": {"setting": "value"},
-                "dialogues": [{"dialogue": "dialogue 1"}],
                 "expressions": [{"expression": "expression 1"}],
                 "added": "2016-06-22 19:10:26",
                 "updated": "2016-06-22 19:10:25",
@@ -30,7 +29,6 @@ class GetTests(BaseRepoTestUtils):
                 "description": "Dialogue 2 description",
                 "properties": {"trainedExpressionsCount": 1},
                 "settings": {"setting": "value"},
-                "dialogues": [{"dialogue": "dialogue 2"}],
                 "expressions": [{"expression": "expression 2"}],
                 "added": "2016-06-22 19:10:24",
                 "updated": "2016-06-22 19:10:25",
@@ -51,7 +49,7 @@ class GetTests(BaseRepoTestUtils):
         with self.assertRaises(AttributeError):
             actual.user_id
             actual.settings
-            actual.dialogues
+            actual.messages_count
             actual.expressions
             actual.added
             actual.updated
@@ -99,7 +97,6 @@ class CreateDialogueTests(BaseRepoTestUtils):
             "properties": {"trainedExpressionsCount": 0},
             "user_id": self.user_id,
             "settings": {"test": "value"},
-            "dialogues": [],
             "expressions": [],
             "added": "2016-06-22 19:10:26",
             "updated": "2016-06-22 19:10:25",
@@ -123,7 +120,6 @@ class DeleteDialogueTests(BaseRepoTestUtils):
             "description": "Dialogue 1 description",
             "properties": {"trainedExpressionsCount": 0},
             "settings": {"setting": "value"},
-            "dialogues": [{"dialogue": "dialogue 1"}],
             "expressions": [{"expression": "expression 1"}],
             "added": "2016-06-22 19:10:26",
             "updated": "2016-06-22 19:10:25",
@@ -137,3 +133,178 @@ class DeleteDialogueTests(BaseRepoTestUtils):
         self.subject.delete(self.dialogue_id)
 
         self.assertIsNone(self.subject.get(self.dialogue_id))
+
+
+class UpdateDialogueTests(BaseRepoTestUtils):
+    def setUp(self):
+        self._clean_dialogues()
+        self._clean_users()
+
+        self.user_id = self._seed_user()
+        self.dialogue_id = "4d7993aa-d897-4647-994b-e0625c88f349"
+
+        self._seed_dialogues(
+            {
+                "id": self.dialogue_id,
+                "user_id": self.user_id,
+                "title": "Dialogue 1",
+                "description": "Dialogue 1 description",
+                "properties": {"trainedExpressionsCount": 0},
+                "settings": {"setting": "value"},
+                "messages": [{"role": "assistant", "text": "Hi"}],
+                "expressions": [{"expression": "expression 1"}],
+                "added": "2016-06-22 19:10:26",
+                "updated": "2016-06-22 19:10:25",
+            }
+        )
+
+        self.subject = DialogueTrainingRepo(self.user_id)
+
+    def test_update_inserts_new_messages(self):
+        dialogue = self.subject.get(self.dialogue_id)
+        dialogue.add_message("Hello", "user", comment=[])
+        dialogue.add_message("How are you?", "assistant")
+
+        with self._assert_statements_count(2) as statements:
+            self.subject.update(dialogue)
+
+        self.assertIn("UPDATE dialogues SET messages_count", statements[0])
+        self.assertIn("INSERT INTO dialogue_messages", statements[1])
+        self.assertIsNone(dialogue.new_messages)
+        self.assertEqual(
+            [
+                {"id": 1, "role": "assistant", "text": "Hi"},
+                {"id": 2, "role": "user", "text": "Hello", "comment": []},
+                {"id": 3, "role": "assistant", "text": "How are you?"},
+            ],
+            [
+                message.serialize()
+                for message in self.subject.get_messages(self.dialogue_id)
+            ],
+        )
+        self.assertEqual(3, self.subject.get(self.dialogue_id).messages_count)
+
+    def test_update_after_concurrent_turn(self):
+        dialogue = self.subject.get(self.dialogue_id)
+        # the other request stores its statement in the meantime
+        self._execute_sql(
+            f"""
+            UPDATE dialogues SET messages_count = 2
+            WHERE id = '{self.dialogue_id}';
+            INSERT INTO dialogue_messages (dialogue_id, seq, user_id, role, text)
+            VALUES ('{self.dialogue_id}', 2, '{self.user_id}', 'user', 'Hey');
+            """
+        )
+        dialogue.add_message("Hello", "user")
+
+        self.subject.update(dialogue)
+
+        self.assertEqual(
+            [(1, "Hi"), (2, "Hey"), (3, "Hello")],
+            [
+                (message.seq, message.text)
+                for message in self.subject.get_messages(self.dialogue_id)
+            ],
+        )
+        self.assertEqual(3, dialogue.messages_count)
+        self.assertEqual(3, self.subject.get(self.dialogue_id).messages_count)
+
+    def test_update_message(self):
+        dialogue = self.subject.get(self.dialogue_id)
+        message = dialogue.add_message("Hello", "user")
+        self.subject.update(dialogue)
+
+        message.comment = [{"problem": "the problem"}]
+        self.subject.update_message(message)
+
+        self.assertEqual(
+            [(1, "Hi", None), (2, "Hello", [{"problem": "the problem"}])],
+            [
+                (message.seq, message.text, message.comment)
+                for message in self.subject.get_messages(self.dialogue_id)
+            ],
+        )
+
+    def test_create_inserts_messages(self):
+        self._clean_dialogues()
+        dialogue = Dialogue(
+            id=self.dialogue_id,
+            user_id=self.user_id,
+            title="Dialogue 1",
+            properties={"trainedExpressionsCount": 0},
+            settings={"test": "value"},
+            added="2016-06-22 19:10:26",
+            updated="2016-06-22 19:10:25",
+        )
+        dialogue.add_message("Hi", "assistant")
+
+        self.subject.create(dialogue)
+
+        self.assertEqual(
+            [{"id": 1, "role": "assistant", "text": "Hi"}],
+            [
+                message.serialize()
+                for message in self.subject.get_messages(self.dialogue_id)
+            ],
+        )
+
+
+class GetMessagesTests(BaseRepoTestUtils):
+    def setUp(self):
+        self._clean_dialogues()
+        self._clean_users()
+
+        self.user_id = self._seed_user()
+        self.dialogue_id = "4d7993aa-d897-4647-994b-e0625c88f349"
+
+        self._seed_dialogues(
+            {
+                "id": self.dialogue_id,
+                "user_id": self.user_id,
+                "title": "Dialogue 1",
+                "description": "Dialogue 1 description",
+                "properties": {"trainedExpressionsCount": 0},
+                "settings": {"setting": "value"},
+                "messages": [
+                    {"role": "assistant", "text": f"message {i}"}
+                    for i in range(1, 8)
+                ],
+                "expressions": [],
+                "added": "2016-06-22 19:10:26",
+                "updated": "2016-06-22 19:10:25",
+            }
+        )
+
+        self.subject = DialogueTrainingRepo(self.user_id)
+
+    def test_get_messages(self):
+        actual = self.subject.get_messages(self.dialogue_id)
+
+        self.assertEqual(
+            list(range(1, 8)), [message.seq for message in actual]
+        )
+
+    def test_get_last_messages(self):
+        actual = self.subject.get_messages(self.dialogue_id, limit=3)
+
+        self.assertEqual([5, 6, 7], [message.seq for message in actual])
+
+    def test_get_messages_before(self):
+        actual = self.subject.get_messages(self.dialogue_id, before=5, limit=3)
+
+        self.assertEqual([2, 3, 4], [message.seq for message in actual])
+
+    def test_get_messages_after(self):
+        actual = self.subject.get_messages(self.dialogue_id, after=4)
+
+        self.assertEqual([5, 6, 7], [message.seq for message in actual])
+
+    def test_get_messages_of_other_user_dialogue(self):
+        subject = DialogueTrainingRepo("2de2dc8b-ca69-4553-98dc-09e3f2998d12")
+
+        self.assertEqual([], subject.get_messages(self.dialogue_id))
+
+    def test_messages_deleted_with_dialogue(self):
+        self.subject.delete(self.dialogue_id)
+
+        self.assertEqual([], self.subject.get_messages(self.dialogue_id))
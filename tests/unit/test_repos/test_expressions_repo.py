@@ -1,7 +1,22 @@
+from unittest import skipUnless
+
+import psycopg2
+
+from extensions import db
 from tests.unit.test_repos.utils import BaseRepoTestUtils
+from repository import expressions_repo
 from repository.expressions_repo import ExpressionsRepo
 
 
+def is_trgm_installed() -> bool:
+    with psycopg2.connect(**BaseRepoTestUtils()._get_test_db_dsn()) as con:
+        with con.cursor() as cur:
+            cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            installed = cur.fetchone() is not None
+    con.close()
+    return installed
+
+
 class ExpressionsRepoTestHelper(BaseRepoTestUtils):
     def setUp(self):
         self.expr_1 = {
@@ -68,6 +83,91 @@ class SearchTests(ExpressionsRepoTestHelper):
 
         self.assertEqual([], self.subject.search(pattern))
 
+    def test_search_without_words_returns_empty_list(self):
+        self.assertEqual([], self.subject.search(" !? "))
+
+    def test_search_by_prefix(self):
+        actual = self.subject.search("desp")
+
+        self.assertEqual([self.expr_2["id"]], [str(e.id) for e in actual])
+
+    def test_search_in_definition_and_example(self):
+        self.assertEqual(
+            [self.expr_3["id"]],
+            [str(e.id) for e in self.subject.search("year")],
+        )
+        self.assertEqual(
+            [self.expr_2["id"]],
+            [str(e.id) for e in self.subject.search("bottle")],
+        )
+
+    def test_search_expression_match_ranked_first(self):
+        # the newer expression mentions "annual" in the example only
+        self._execute_sql(
+            f"""
+            UPDATE expressions SET example = 'an annual report'
+            WHERE id = '{self.expr_1["id"]}'
+            """
+        )
+
+        actual = self.subject.search("annual")
+
+        self.assertEqual(
+            [self.expr_3["id"], self.expr_1["id"]],
+            [str(e.id) for e in actual],
+        )
+
+    def test_search_limit(self):
+        self._execute_sql(
+            f"""
+            UPDATE expressions SET example = 'an annual report'
+            WHERE id = '{self.expr_1["id"]}'
+            """
+        )
+
+        actual = self.subject.search("annual", limit=1)
+
+        self.assertEqual([self.expr_3["id"]], [str(e.id) for e in actual])
+
+    def test_search_after_expression_updated(self):
+        expression = self.subject.get_by_id(self.expr_2["id"])
+        expression.expression = "hopelessness"
+
+        self.subject.update(expression)
+
+        self.assertEqual(
+            [self.expr_2["id"]],
+            [str(e.id) for e in self.subject.search("hopeless")],
+        )
+
+
+class GetSimilarTests(ExpressionsRepoTestHelper):
+    def setUp(self):
+        super().setUp()
+        # the extension can be installed by a previous test
+        expressions_repo._trgm_installed.clear()
+        self.addCleanup(expressions_repo._trgm_installed.clear)
+
+    @skipUnless(is_trgm_installed(), "pg_trgm is not installed")
+    def test_get_similar_with_typo(self):
+        actual = self.subject.get_similar("Anual")
+
+        self.assertEqual([self.expr_3["id"]], [str(e.id) for e in actual])
+
+    @skipUnless(is_trgm_installed(), "pg_trgm is not installed")
+    def test_get_similar_not_similar(self):
+        self.assertEqual([], self.subject.get_similar("qwerty"))
+
+    def test_get_similar_without_trgm_uses_prefix_search(self):
+        expressions_repo._trgm_installed[db.engine] = False
+
+        actual = self.subject.get_similar("Annu")
+
+        self.assertEqual([self.expr_3["id"]], [str(e.id) for e in actual])
+
+    def test_get_similar_empty_pattern(self):
+        self.assertEqual([], self.subject.get_similar("  "))
+
 
 class GetByIDTests(ExpressionsRepoTestHelper):
     def test_get(self):
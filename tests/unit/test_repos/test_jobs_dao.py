@@ -0,0 +1,129 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from constants import JobStatus
+from dao.jobs_dao import RETRY_DELAY, RUNNING_TIMEOUT, JobsDAO
+from extensions import db
+from models.models import Job
+from tests.unit.test_repos.utils import BaseRepoTestUtils
+
+
+class JobsDAOTests(BaseRepoTestUtils):
+    def setUp(self):
+        self._clean_jobs()
+        self._clean_users()
+
+        self.user_id = self._seed_user()
+        self.subject = JobsDAO()
+
+    def test_enqueue_and_get(self):
+        job = self.subject.enqueue(self.user_id, "test", {"text": "Text"})
+
+        actual = JobsDAO(Session(db.engine)).get(self.user_id, str(job.id))
+
+        self.assertEqual("test", actual.type)
+        self.assertEqual({"text": "Text"}, actual.payload)
+        self.assertEqual(JobStatus.PENDING.value, actual.status)
+        self.assertEqual(0, actual.attempts)
+        self.assertIsNone(actual.result)
+
+    def test_get_of_other_user(self):
+        job = self.subject.enqueue(self.user_id, "test", {})
+
+        self.assertIsNone(
+            self.subject.get("2de2dc8b-ca69-4553-98dc-09e3f2998d12", job.id)
+        )
+
+    def test_get_invalid_id(self):
+        self.assertIsNone(self.subject.get(self.user_id, "not-a-uuid"))
+
+    def test_claim(self):
+        first = self.subject.enqueue(self.user_id, "test", {"n": 1})
+        self.subject.enqueue(self.user_id, "test", {"n": 2})
+
+        actual = self.subject.claim()
+
+        self.assertEqual(first.id, actual.id)
+        self.assertEqual(JobStatus.RUNNING.value, actual.status)
+        self.assertEqual(1, actual.attempts)
+        self.assertEqual({"n": 2}, self.subject.claim().payload)
+        self.assertIsNone(self.subject.claim())
+
+    def test_claim_skips_locked_jobs(self):
+        first = self.subject.enqueue(self.user_id, "test", {"n": 1})
+        second = self.subject.enqueue(self.user_id, "test", {"n": 2})
+        # another worker is taking the first job
+        other_session = Session(db.engine)
+        self.addCleanup(other_session.close)
+        locked = (
+            other_session.query(Job)
+            .filter(Job.id == first.id)
+            .with_for_update()
+            .one()
+        )
+
+        actual = self.subject.claim()
+
+        self.assertEqual(second.id, actual.id)
+        other_session.rollback()
+        self.assertEqual(locked.id, self.subject.claim().id)
+
+    def test_claim_not_due_job(self):
+        job = self.subject.enqueue(self.user_id, "test", {})
+        job.run_after = datetime.utcnow() + timedelta(minutes=1)
+        db.session.commit()
+
+        self.assertIsNone(self.subject.claim())
+
+    def test_claim_abandoned_running_job(self):
+        job = self.subject.enqueue(self.user_id, "test", {})
+        self.subject.claim()
+        self.assertIsNone(self.subject.claim())
+        # the claimed job is detached, it's changed in the db
+        self._execute_sql(
+            f"""
+            UPDATE jobs SET updated = updated - interval
+            '{RUNNING_TIMEOUT.total_seconds() + 1} seconds'
+            """
+        )
+
+        actual = self.subject.claim()
+
+        self.assertEqual(job.id, actual.id)
+        self.assertEqual(2, actual.attempts)
+
+    def test_complete(self):
+        self.subject.enqueue(self.user_id, "test", {})
+        job = self.subject.claim()
+
+        self.subject.complete(job, {"result": "value"})
+
+        actual = JobsDAO(Session(db.engine)).get(self.user_id, str(job.id))
+        self.assertEqual(JobStatus.DONE.value, actual.status)
+        self.assertEqual({"result": "value"}, actual.result)
+
+    def test_fail_is_retried_later(self):
+        self.subject.enqueue(self.user_id, "test", {})
+        job = self.subject.claim()
+
+        self.subject.fail(job, "error", max_attempts=2)
+
+        self.assertEqual(JobStatus.PENDING.value, job.status)
+        self.assertEqual("error", job.error)
+        self.assertAlmostEqual(
+            datetime.utcnow() + RETRY_DELAY,
+            job.run_after,
+            delta=timedelta(seconds=5),
+        )
+        self.assertIsNone(self.subject.claim())
+
+    def test_fail_after_max_attempts(self):
+        self.subject.enqueue(self.user_id, "test", {})
+        job = self.subject.claim()
+        job.attempts = 2
+
+        self.subject.fail(job, "error", max_attempts=2)
+
+        self.assertEqual(JobStatus.FAILED.value, job.status)
+        self.assertIsNone(self.subject.claim())
@@ -0,0 +1,330 @@
+import json
+
+import psycopg2
+from psycopg2.extras import RealDictCursor
+
+from sqlalchemy import inspect
+
+from dao.learn_list_dao import LearnListDAO, SORT_KEY_STEP
+from extensions import db
+from models.models import LearnListItem
+from tests.unit.test_repos.utils import BaseRepoTestUtils
+
+
+class LearnListDAOTestHelper(BaseRepoTestUtils):
+    def setUp(self):
+        self._clean_users()
+        self._clean_expressions()
+
+        self.user_id = "04aa4f4e-a53e-4b6c-96c5-3604e3fcc4ef"
+        self.settings = {
+            "learnListSize": 50,
+            "practiceCountThreshold": 50,
+            "knowledgeLevelThreshold": 0.9,
+        }
+        self.expression_ids = [
+            "4d7993aa-d897-4647-994b-e0625c88f349",
+            "24d96f68-46e1-4fb3-b300-81cd89cea435",
+            "d5c26549-74f7-4930-9c2c-16d10d46e55e",
+            "ee8e74ca-8f1a-4e5b-9a86-54d6c35f4fcd",
+        ]
+
+        self._seed_user(
+            {
+                "id": self.user_id,
+                "first": "First",
+                "last": "Last",
+                "email": "learn_list@test.mail",
+                "role": "self-educated",
+                "password_hash": "c1a4b7e252281a7649d17a0f9f1d5180d5b5b1783dca84e121bbfcadda4ecc12",
+                "properties": json.dumps(
+                    {
+                        "nativeLang": "uk",
+                        "challenges": {"dailyTraining": self.settings},
+                    }
+                ),
+                "added": "2023-04-16 09:10:25",
+                "updated": "2023-04-16 09:10:25",
+                "last_login": "2023-04-16 09:10:25",
+            }
+        )
+        self._seed_db_expression_records(
+            [
+                {
+                    "id": expression_id,
+                    "expression": f"expression {i}",
+                    "definition": "definition",
+                    "translation": '{"uk": "переклад"}',
+                    "example": "example",
+                    "added": "2023-04-16 09:10:25",
+                    "updated": "2023-04-16 09:10:25",
+                }
+                for i, expression_id in enumerate(self.expression_ids)
+            ]
+        )
+        self._seed_user_expressions()
+        self._seed_learn_list_items(self.expression_ids[:3])
+
+        self.subject = LearnListDAO(self.user_id)
+
+    def _seed_user_expressions(self):
+        sql = """
+            INSERT INTO user_expression (
+                user_id, expression_id, added, updated, properties
+            ) VALUES
+        """
+        sql += ",".join(
+            f"""(
+                '{self.user_id}',
+                '{expression_id}',
+                '2023-04-16 09:10:25',
+                '2023-04-16 09:10:25',
+                '{{}}'
+            )"""
+            for expression_id in self.expression_ids
+        )
+        self._execute_sql(sql)
+
+    def _seed_learn_list_items(self, expression_ids):
+        sql = """
+            INSERT INTO learn_list_items (
+                user_id, expression_id, sort_key, position, practice_count
+            ) VALUES
+        """
+        sql += ",".join(
+            f"""(
+                '{self.user_id}',
+                '{expression_id}',
+                {SORT_KEY_STEP * (i + 1)},
+                {i},
+                {i}
+            )"""
+            for i, expression_id in enumerate(expression_ids)
+        )
+        self._execute_sql(sql)
+
+    def _get_db_learn_list_items(self):
+        sql = """
+            SELECT *
+            FROM learn_list_items
+            WHERE user_id=%(user_id)s
+            ORDER BY sort_key
+        """
+        with psycopg2.connect(**self._get_test_db_dsn()) as con:  # type: ignore
+            with con.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(sql, {"user_id": self.user_id})
+                data = cur.fetchall()
+        con.close()
+
+        return data
+
+    def _get_db_user_properties(self):
+        sql = "SELECT properties FROM users WHERE id=%(user_id)s"
+        with psycopg2.connect(**self._get_test_db_dsn()) as con:  # type: ignore
+            with con.cursor() as cur:
+                cur.execute(sql, {"user_id": self.user_id})
+                data = cur.fetchone()
+        con.close()
+
+        return data[0]  # type: ignore
+
+    def _get_item(self, expression_id, position=0, practice_count=0):
+        return {
+            "expressionId": expression_id,
+            "position": position,
+            "practiceCount": practice_count,
+            "knowledgeLevel": 0.0,
+            "lastPracticeTime": None,
+        }
+
+
+class GetTests(LearnListDAOTestHelper):
+    def test_get(self):
+        expected = {
+            **self.settings,
+            "learning_list": [
+                self._get_item(expression_id, i, i)
+                for i, expression_id in enumerate(self.expression_ids[:3])
+            ],
+        }
+
+        self.assertEqual(expected, self.subject.get())
+
+    def test_get_ordered_by_sort_key(self):
+        self._execute_sql(
+            f"""
+            UPDATE learn_list_items SET sort_key = 0
+            WHERE expression_id = '{self.expression_ids[2]}'
+            """
+        )
+
+        actual = self.subject.get()
+
+        self.assertEqual(
+            [
+                self.expression_ids[2],
+                self.expression_ids[0],
+                self.expression_ids[1],
+            ],
+            [item["expressionId"] for item in actual["learning_list"]],
+        )
+
+
+class PutTests(LearnListDAOTestHelper):
+    def test_put_move_item_updates_moved_item_sort_key_only(self):
+        dt_dict = self.subject.get()
+        learn_list = dt_dict["learning_list"]
+        learn_list.append(learn_list.pop(0))
+
+        self.subject.put(dt_dict)
+
+        actual = self._get_db_learn_list_items()
+        self.assertEqual(
+            [
+                self.expression_ids[1],
+                self.expression_ids[2],
+                self.expression_ids[0],
+            ],
+            [str(item["expression_id"]) for item in actual],
+        )
+        self.assertEqual(
+            [SORT_KEY_STEP * 2, SORT_KEY_STEP * 3, SORT_KEY_STEP * 4],
+            [item["sort_key"] for item in actual],
+        )
+
+    def test_put_insert_item_between_neighbours(self):
+        dt_dict = self.subject.get()
+        dt_dict["learning_list"].insert(
+            1, self._get_item(self.expression_ids[3])
+        )
+
+        self.subject.put(dt_dict)
+
+        actual = self._get_db_learn_list_items()
+        self.assertEqual(
+            [
+                self.expression_ids[0],
+                self.expression_ids[3],
+                self.expression_ids[1],
+                self.expression_ids[2],
+            ],
+            [str(item["expression_id"]) for item in actual],
+        )
+        self.assertEqual(SORT_KEY_STEP * 1.5, actual[1]["sort_key"])
+
+    def test_put_removed_item_deleted(self):
+        dt_dict = self.subject.get()
+        dt_dict["learning_list"].pop(1)
+
+        self.subject.put(dt_dict)
+
+        self.assertEqual(
+            [self.expression_ids[0], self.expression_ids[2]],
+            [
+                str(item["expression_id"])
+                for item in self._get_db_learn_list_items()
+            ],
+        )
+
+    def test_put_item_progress(self):
+        dt_dict = self.subject.get()
+        dt_dict["learning_list"][0].update(
+            {
+                "position": 5,
+                "practiceCount": 3,
+                "knowledgeLevel": 0.25,
+                "lastPracticeTime": "2024-01-02 03:04:05",
+            }
+        )
+
+        self.subject.put(dt_dict)
+
+        actual = self._get_db_learn_list_items()[0]
+        self.assertEqual(5, actual["position"])
+        self.assertEqual(3, actual["practice_count"])
+        self.assertEqual(0.25, float(actual["knowledge_level"]))
+        self.assertEqual(
+            "2024-01-02 03:04:05", str(actual["last_practice_time"])
+        )
+
+    def test_put_settings(self):
+        dt_dict = self.subject.get()
+        dt_dict["learnListSize"] = 60
+
+        self.subject.put(dt_dict)
+
+        self.assertEqual(
+            {
+                "nativeLang": "uk",
+                "challenges": {
+                    "dailyTraining": {**self.settings, "learnListSize": 60}
+                },
+            },
+            self._get_db_user_properties(),
+        )
+
+    def test_put_without_get(self):
+        self.subject.put(
+            {
+                **self.settings,
+                "learning_list": [self._get_item(self.expression_ids[3])],
+            }
+        )
+
+        self.assertEqual(
+            [self.expression_ids[3]],
+            [
+                str(item["expression_id"])
+                for item in self._get_db_learn_list_items()
+            ],
+        )
+
+
+class GetLearnListCandidatesTests(LearnListDAOTestHelper):
+    def test_get_learn_list_candidates(self):
+        actual = self.subject.get_learn_list_candidates(5, [])
+
+        self.assertEqual(
+            [self.expression_ids[3]],
+            [str(expr.expression_id) for expr in actual],
+        )
+
+
+class LearnListItemModelTests(LearnListDAOTestHelper):
+    def test_removed_with_user_expression(self):
+        self._execute_sql(
+            f"""
+            DELETE FROM user_expression
+            WHERE expression_id = '{self.expression_ids[0]}'
+            """
+        )
+
+        self.assertEqual(
+            self.expression_ids[1:3],
+            [
+                str(item["expression_id"])
+                for item in self._get_db_learn_list_items()
+            ],
+        )
+
+    def test_foreign_keys_match_db_schema(self):
+        db_foreign_keys = {
+            (
+                tuple(fk["constrained_columns"]),
+                fk["referred_table"],
+                tuple(fk["referred_columns"]),
+                fk["options"].get("ondelete"),
+            )
+            for fk in inspect(db.engine).get_foreign_keys("learn_list_items")
+        }
+        model_foreign_keys = {
+            (
+                tuple(column.name for column in fk.columns),
+                fk.referred_table.name,
+                tuple(element.column.name for element in fk.elements),
+                fk.ondelete,
+            )
+            for fk in LearnListItem.__table__.foreign_key_constraints
+        }
+
+        self.assertEqual(db_foreign_keys, model_foreign_keys)
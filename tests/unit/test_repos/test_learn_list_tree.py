@@ -0,0 +1,132 @@
+import random
+from unittest import TestCase
+
+from repository.learn_list_tree import TreeLearnList
+from repository.training_expressions_repo import (
+    DailyTrainingLearnList,
+    DailyTrainingLearnListItem,
+)
+
+
+def get_items(amount: int) -> list[DailyTrainingLearnListItem]:
+    return [
+        DailyTrainingLearnListItem(
+            expression_id=f"expr_{i}",
+            position=i % 5,
+            practice_count=i,
+            knowledge_level=i / amount,
+            last_practice_time=None,
+        )
+        for i in range(amount)
+    ]
+
+
+class TreeLearnListTests(TestCase):
+    def setUp(self):
+        self.items = get_items(10)
+        self.subject = TreeLearnList(get_items(10))
+
+    def test_init(self):
+        self.assertEqual(10, len(self.subject))
+        self.assertEqual(
+            [item.expression_id for item in self.items],
+            self.subject.get_item_ids(),
+        )
+
+    def test_init_empty(self):
+        subject = TreeLearnList([])
+
+        self.assertEqual(0, len(subject))
+        self.assertEqual([], subject.get_item_ids())
+        self.assertEqual([], subject.get_first_items_ids(3))
+
+    def test_get_first_items_ids(self):
+        self.assertEqual(
+            ["expr_0", "expr_1", "expr_2"],
+            self.subject.get_first_items_ids(3),
+        )
+
+    def test_insert(self):
+        item = DailyTrainingLearnListItem.new_from_expression_id("new")
+        item.position = 3
+
+        self.subject.insert(item)
+
+        self.assertEqual("new", self.subject.get_item_ids()[3])
+        self.assertIn("new", self.subject)
+        self.assertEqual(item, self.subject.get_item_by_id("new"))
+
+    def test_insert_position_bigger_than_list_size(self):
+        item = DailyTrainingLearnListItem.new_from_expression_id("new")
+        item.position = 100
+
+        self.subject.insert(item)
+
+        self.assertEqual("new", self.subject.get_item_ids()[-1])
+        self.assertEqual(10, item.position)
+
+    def test_pop_item_by_id(self):
+        actual = self.subject.pop_item_by_id("expr_4")
+
+        self.assertEqual(self.items[4], actual)
+        self.assertEqual(9, len(self.subject))
+        self.assertNotIn("expr_4", self.subject)
+        self.assertNotIn("expr_4", self.subject.get_item_ids())
+
+    def test_pop_item_by_id_not_found(self):
+        self.assertIsNone(self.subject.pop_item_by_id("not_found"))
+        self.assertEqual(10, len(self.subject))
+
+    def test_pop_items_where(self):
+        actual = self.subject.pop_items_where(
+            lambda item: item.practice_count % 2 == 0
+        )
+
+        self.assertEqual(
+            ["expr_0", "expr_2", "expr_4", "expr_6", "expr_8"],
+            [item.expression_id for item in actual],
+        )
+        self.assertEqual(
+            ["expr_1", "expr_3", "expr_5", "expr_7", "expr_9"],
+            self.subject.get_item_ids(),
+        )
+
+    def test_serialize(self):
+        self.assertEqual(
+            [item.serialize() for item in self.items],
+            self.subject.serialize(),
+        )
+
+    def test_same_as_list_after_random_moves(self):
+        rnd = random.Random(42)
+        subject = TreeLearnList(get_items(200))
+        expected = DailyTrainingLearnList(get_items(200))
+
+        for _ in range(1000):
+            item_id = f"expr_{rnd.randrange(200)}"
+            position = rnd.randrange(-1, 210)
+            for llist in (subject, expected):
+                item = llist.pop_item_by_id(item_id)
+                item.position = position
+                llist.insert(item)
+
+        self.assertEqual(expected.serialize(), subject.serialize())
+        self.assertEqual(
+            expected.get_first_items_ids(20), subject.get_first_items_ids(20)
+        )
+        for item in expected:
+            self.assertIs(item, expected.get_item_by_id(item.expression_id))
+
+    def test_item_ids_set_is_a_copy(self):
+        for llist in (self.subject, DailyTrainingLearnList(get_items(10))):
+            with self.subTest(llist=type(llist).__name__):
+                ids = llist.get_item_ids_set()
+
+                llist.pop_item_by_id("expr_3")
+                llist.pop_items_where(lambda item: item.practice_count > 7)
+
+                self.assertEqual({f"expr_{i}" for i in range(10)}, ids)
+                self.assertEqual(
+                    {f"expr_{i}" for i in (0, 1, 2, 4, 5, 6, 7)},
+                    llist.get_item_ids_set(),
+                )
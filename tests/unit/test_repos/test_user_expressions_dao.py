@@ -1,4 +1,5 @@
 from decimal import Decimal
+from datetime import datetime
 from unittest.mock import patch
 import json
 from copy import deepcopy
@@ -449,6 +450,150 @@ class GetAllTests(UserExpressionsDAOTestHelper):
             self.subject.get(include=["1"], exclude=["2"])
 
 
+class GetLearnListCandidatesTests(UserExpressionsDAOTestHelper):
+    def test_get_learn_list_candidates(self):
+        self._execute_sql(
+            f"""
+            INSERT INTO learn_list_items (user_id, expression_id, sort_key)
+            VALUES ('{self.user_id_1}', '{self.expr_4["id"]}', 1024)
+            """
+        )
+
+        actual = self.subject.get_learn_list_candidates(limit=2)
+
+        self.assertEqual(2, len(actual))
+
+        expected = [
+            [self.us_expr_3, self.expr_3],
+            [self.us_expr_2, self.expr_2],
+        ]
+
+        for actual_us_expr, expected_us_exp in zip(actual, expected):
+            self._deep_assert_user_expression(
+                actual_us_expr,
+                expected_us_exp[0],
+                expected_us_exp[1],
+                self.user_1,
+            )
+
+    def test_get_learn_list_candidates_skips_practiced_expressions(self):
+        actual = UserExpressionsDAO(self.user_id_3).get_learn_list_candidates(
+            limit=5
+        )
+
+        self.assertEqual(
+            [self.expr_3["id"], self.expr_2["id"], self.expr_1["id"]],
+            [str(expr.expression_id) for expr in actual],
+        )
+
+
+class GetPageTests(UserExpressionsDAOTestHelper):
+    def test_get_first_page(self):
+        actual = self.subject.get_page(limit=2)
+
+        self.assertEqual(
+            [self.expr_4["id"], self.expr_3["id"]],
+            [str(expr.expression_id) for expr in actual],
+        )
+        self.assertEqual(
+            self.expr_4["expression"], actual[0].expression.expression
+        )
+
+    def test_get_page_after_key(self):
+        actual = self.subject.get_page(
+            limit=5,
+            after=(datetime(2023, 4, 11, 10, 10, 25), self.expr_3["id"]),
+        )
+
+        self.assertEqual(
+            [self.expr_2["id"], self.expr_1["id"]],
+            [str(expr.expression_id) for expr in actual],
+        )
+
+    def test_get_page_same_added_ordered_by_expression_id(self):
+        self._execute_sql(
+            f"""
+            UPDATE user_expression SET added = '2023-04-11 10:10:25'
+            WHERE user_id = '{self.user_id_1}'
+            AND expression_id = '{self.expr_2["id"]}'
+            """
+        )
+
+        first_page = self.subject.get_page(limit=2)
+        second_page = self.subject.get_page(
+            limit=2,
+            after=(
+                first_page[-1].added,
+                str(first_page[-1].expression_id),
+            ),
+        )
+
+        self.assertEqual(
+            [
+                self.expr_4["id"],
+                self.expr_3["id"],
+                self.expr_2["id"],
+                self.expr_1["id"],
+            ],
+            [str(expr.expression_id) for expr in first_page + second_page],
+        )
+
+
+class LoadProfilesTests(UserExpressionsDAOTestHelper):
+    def setUp(self):
+        super().setUp()
+        # the connection is opened before counting statements
+        self.subject.count()
+
+    def _touch_relationships(self, user_expressions, *relationships):
+        for user_expression in user_expressions:
+            for relationship in relationships:
+                getattr(user_expression.expression, relationship)
+
+    def test_no_profile_loads_relationships_lazily(self):
+        with self._assert_statements_count(5):
+            self._touch_relationships(self.subject.get(), "expression")
+
+    def test_list_profile(self):
+        with self._assert_statements_count(1):
+            self._touch_relationships(
+                self.subject.get(profile="list"), "expression"
+            )
+
+    def test_challenge_profile(self):
+        with self._assert_statements_count(2):
+            self._touch_relationships(
+                self.subject.get(
+                    include=[self.expr_1["id"], self.expr_2["id"]],
+                    profile="challenge",
+                ),
+                "context",
+            )
+
+    def test_detail_profile(self):
+        with self._assert_statements_count(3):
+            self._touch_relationships(
+                [self.subject.get_by_id(self.expr_1["id"], profile="detail")],
+                "tags",
+                "context",
+            )
+
+    def test_trained_expressions_list_profile(self):
+        with self._assert_statements_count(1):
+            self._touch_relationships(
+                UserExpressionsDAO(self.user_id_3).get_trained_expressions(
+                    profile="list"
+                ),
+                "expression",
+            )
+
+    def test_search_list_profile(self):
+        with self._assert_statements_count(1):
+            self._touch_relationships(
+                self.subject.search("annual", profile="list"), "expression"
+            )
+
+
 class GetByIDTests(UserExpressionsDAOTestHelper):
     def test_get_by_id(self):
         actual = self.subject.get_by_id(self.expr_1["id"])
@@ -577,6 +722,32 @@ class SearchTests(UserExpressionsDAOTestHelper):
                 self.user_1,
             )
 
+    def test_search_by_prefix_ranked(self):
+        # the newest user expression mentions "preceding" in the example only
+        self._execute_sql(
+            f"""
+            UPDATE expressions SET example = 'the preceding vote'
+            WHERE id = '{self.expr_4["id"]}'
+            """
+        )
+
+        actual = self.subject.search("preced")
+
+        self.assertEqual(
+            [self.expr_1["id"], self.expr_4["id"]],
+            [str(expr.expression_id) for expr in actual],
+        )
+
+    def test_search_limit(self):
+        actual = self.subject.search("o", limit=2)
+
+        self.assertEqual(2, len(actual))
+
+    def test_search_other_user_expressions_not_found(self):
+        self.assertEqual(
+            [], UserExpressionsDAO(self.user_id_2).search("preceding")
+        )
+
 
 class CountTests(UserExpressionsDAOTestHelper):
     def test_count(self):
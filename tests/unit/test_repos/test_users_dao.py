@@ -82,6 +82,17 @@ class UsersRepoTestsHelper(BaseRepoTestUtils):
             self.last_login, actual.last_login.strftime("%Y-%m-%d %H:%M:%S")  # type: ignore
         )
 
+    def _get_user_by_id(self, user_id: str):
+        sql = "SELECT * FROM users WHERE id=%(user_id)s"
+
+        with psycopg2.connect(**self._get_test_db_dsn()) as con:  # type: ignore
+            with con.cursor(cursor_factory=DictCursor) as cur:
+                cur.execute(sql, {"user_id": user_id})
+                data = cur.fetchone()
+        con.close()
+
+        return data
+
 
 class GetByIdTests(UsersRepoTestsHelper):
     def test_get_by_id(self):
@@ -103,6 +114,32 @@ class GetByEmailTests(UsersRepoTestsHelper):
         self.assertIsNone(UsersDAO().get_by_email("wrong@test.email"))
 
 
+class PutPropertyTests(UsersRepoTestsHelper):
+    def test_put_property(self):
+        user = self.subject.get_by_id(self.user_id)
+        settings = {
+            "learnListSize": 10,
+            "practiceCountThreshold": 20,
+            "knowledgeLevelThreshold": 0.5,
+        }
+
+        with self._assert_statements_count(1) as statements:
+            self.subject.put_property(
+                user, ["challenges", "dailyTraining"], settings
+            )
+            self.subject.session.commit()
+
+        self.assertIn("jsonb_set(users.properties", statements[0])
+        expected = {
+            "nativeLang": "uk",
+            "challenges": {"dailyTraining": settings},
+        }
+        self.assertEqual(expected, user.properties)
+        self.assertEqual(
+            expected, self._get_user_by_id(self.user_id)["properties"]
+        )
+
+
 class PostTests(UsersRepoTestsHelper):
     def test_post_user(self):
         expected_user = {
@@ -164,14 +201,3 @@ class PostTests(UsersRepoTestsHelper):
         self.assertEqual(expected["psw_hash"], actual["password_hash"])
         self.assertEqual(expected["first"], actual["first"])
         self.assertEqual(expected["last"], actual["last"])
-
-    def _get_user_by_id(self, user_id: str):
-        sql = "SELECT * FROM users WHERE id=%(user_id)s"
-
-        with psycopg2.connect(**self._get_test_db_dsn()) as con:  # type: ignore
-            with con.cursor(cursor_factory=DictCursor) as cur:
-                cur.execute(sql, {"user_id": user_id})
-                data = cur.fetchone()
-        con.close()
-
-        return data
@@ -1,3 +1,8 @@
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from extensions import db
 from tests.unit.test_repos.utils import BaseRepoTestUtils
 from repository.writings_repo import WritingsRepo
 from models.models import Writings
@@ -118,3 +123,111 @@ class DeleteTests(BaseRepoTestUtils):
         actual = self.subject.get()
         expected = None
         self.assertEqual(actual, expected)
+
+
+class AddMessageTests(BaseRepoTestUtils):
+    def setUp(self):
+        self._clean_writings()
+        self._clean_users()
+
+        self.user_id = self._seed_user()
+        self.writing = get_writing_dict(self.user_id)
+        self._seed_writings(self.writing)
+
+        self.subject = WritingsRepo(self.user_id)
+
+    def test_new_messages_appended(self):
+        writings = self.subject.get()
+        writings.add_message("New sentence here")
+
+        with self._assert_statements_count(2) as statements:
+            self.subject.add(writings)
+
+        self.assertIn("FOR UPDATE", statements[0])
+        self.assertIn("writings=(writings.writings ||", statements[1])
+        self.assertEqual(
+            [
+                *self.writing["writings"],
+                {"id": 3, "text": "New sentence here"},
+            ],
+            self.subject.get().writings,
+        )
+
+    def test_concurrent_appends(self):
+        writings = self.subject.get()
+        other_session = Session(db.engine)
+        self.addCleanup(other_session.close)
+        other_repo = WritingsRepo(self.user_id)
+        other_repo.session = other_session
+        other_writings = other_repo.get()
+        writings.add_message("New sentence here")
+        other_writings.add_message("Other sentence here")
+
+        self.subject.add(writings, commit=False)
+        # the other request waits till the first one is committed
+        with self.assertRaises(OperationalError):
+            other_session.execute(
+                text("SELECT 1 FROM writings FOR UPDATE NOWAIT")
+            )
+        other_session.rollback()
+        db.session.commit()
+        other_repo.add(other_writings)
+
+        self.assertEqual(
+            [
+                *self.writing["writings"],
+                {"id": 3, "text": "New sentence here"},
+                {"id": 4, "text": "Other sentence here"},
+            ],
+            WritingsRepo(self.user_id).get().writings,
+        )
+
+    def test_message_comment_set_in_place(self):
+        writings = self.subject.get()
+        comment = [
+            {
+                "problem": "New problem",
+                "explanation": "New explanation",
+                "solution": "New solution",
+            }
+        ]
+        # a message added by another request after the writings are loaded
+        self._execute_sql(
+            """
+            UPDATE writings
+            SET writings = writings || '[{"id": 3, "text": "Other"}]'
+            """
+        )
+
+        self.subject.set_message_comment(writings, 2, comment)
+
+        actual = self.subject.get().writings
+        self.assertEqual(self.writing["writings"][0], actual[0])
+        self.assertEqual(
+            {"id": 2, "text": "Another sentence here", "comment": comment},
+            actual[1],
+        )
+        self.assertEqual({"id": 3, "text": "Other"}, actual[2])
+
+    def test_message_comment_set_by_id(self):
+        writings = self.subject.get()
+        comment = [{"problem": "New problem"}]
+        # the first message is removed after the writings are loaded
+        self._execute_sql("UPDATE writings SET writings = writings - 0")
+
+        self.subject.set_message_comment(writings, 2, comment)
+
+        self.assertEqual(
+            [{"id": 2, "text": "Another sentence here", "comment": comment}],
+            self.subject.get().writings,
+        )
+
+    def test_comment_of_removed_message(self):
+        writings = self.subject.get()
+        self._execute_sql("UPDATE writings SET writings = writings - 1")
+
+        self.subject.set_message_comment(writings, 2, [])
+
+        self.assertEqual(
+            [self.writing["writings"][0]], self.subject.get().writings
+        )
@@ -1,10 +1,12 @@
-from typing import List
+from contextlib import contextmanager
+from typing import Iterator, List
 from extensions import db
 import json
 
 
 import psycopg2
 from flask import Flask
+from sqlalchemy import event
 
 
 from unittest import TestCase
@@ -28,6 +30,24 @@ class BaseRepoTestUtils(TestCase):
         with self.APP.app_context():
             super().run(result)
 
+    @contextmanager
+    def _assert_statements_count(self, expected: int) -> Iterator[List[str]]:
+        """Assert the number of SQL statements executed within the block."""
+        statements: List[str] = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(
+                db.engine, "before_cursor_execute", before_cursor_execute
+            )
+
+        self.assertEqual(expected, len(statements), "\n\n".join(statements))
+
     def _get_test_db_dsn(self):
         return {
             "host": self.HOST,
@@ -74,6 +94,10 @@ class BaseRepoTestUtils(TestCase):
         sql = "DELETE FROM writings"
         self._execute_sql(sql)
 
+    def _clean_jobs(self):
+        sql = "DELETE FROM jobs"
+        self._execute_sql(sql)
+
     def _seed_db_expression_records(self, exprs: List[dict]):
         sql = """
             INSERT INTO expressions (
@@ -129,8 +153,8 @@ class BaseRepoTestUtils(TestCase):
                 description,
                 properties,
                 settings,
-                dialogues,
                 expressions,
+                messages_count,
                 added,
                 updated
             ) VALUES (
@@ -140,14 +164,31 @@ class BaseRepoTestUtils(TestCase):
                 '{dialogues["description"]}',
                 '{json.dumps(dialogues["properties"])}',
                 '{json.dumps(dialogues["settings"])}',
-                '{json.dumps(dialogues["dialogues"])}',
                 '{json.dumps(dialogues["expressions"])}',
+                {len(dialogues.get("messages", []))},
                 '{dialogues["added"]}',
                 '{dialogues["updated"]}'
             )
     """
         self._execute_sql(sql)
 
+        for seq, message in enumerate(dialogues.get("messages", []), 1):
+            comment = message.get("comment")
+            self._execute_sql(
+                f"""
+                INSERT INTO dialogue_messages (
+                    dialogue_id, seq, user_id, role, text, comment
+                ) VALUES (
+                    '{dialogues["id"]}',
+                    {seq},
+                    '{dialogues["user_id"]}',
+                    '{message["role"]}',
+                    '{message["text"]}',
+                    {f"'{json.dumps(comment)}'" if comment is not None else "NULL"}
+                )
+                """
+            )
+
     def _seed_writings(self, writings):
         sql = f"""
             INSERT INTO writings (
@@ -254,7 +295,6 @@ class BaseRepoTestUtils(TestCase):
         )
         self.assertEqual(expected["user_id"], str(actual.user_id), "user_id")
         self.assertEqual(expected["settings"], actual.settings, "settings")
-        self.assertEqual(expected["dialogues"], actual.dialogues, "dialogues")
         self.assertEqual(
             expected["expressions"], actual.expressions, "expressions"
         )
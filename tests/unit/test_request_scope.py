@@ -0,0 +1,57 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from flask import Flask
+
+from helpers.request_scope import request_scoped
+from repository.training_expressions_repo import get_request_repo
+
+
+class RequestScopedTests(TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.factory = Mock(side_effect=object)
+
+    def test_created_once_per_request(self):
+        with self.app.test_request_context():
+            first = request_scoped("key", self.factory)
+            second = request_scoped("key", self.factory)
+
+        self.assertIs(first, second)
+        self.factory.assert_called_once_with()
+
+    def test_different_keys(self):
+        with self.app.test_request_context():
+            first = request_scoped("key", self.factory)
+            second = request_scoped("other_key", self.factory)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(2, self.factory.call_count)
+
+    def test_not_shared_between_requests(self):
+        with self.app.test_request_context():
+            first = request_scoped("key", self.factory)
+        with self.app.test_request_context():
+            second = request_scoped("key", self.factory)
+
+        self.assertIsNot(first, second)
+
+    def test_out_of_request(self):
+        first = request_scoped("key", self.factory)
+        second = request_scoped("key", self.factory)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(2, self.factory.call_count)
+
+
+class GetRequestRepoTests(TestCase):
+    @patch("repository.training_expressions_repo.DailyTrainingRepo")
+    def test_repo_shared_within_request(self, mock_repo):
+        app = Flask(__name__)
+
+        with app.test_request_context():
+            first = get_request_repo("user_id")
+            second = get_request_repo("user_id")
+
+        self.assertIs(first, second)
+        mock_repo.assert_called_once_with("user_id")
@@ -0,0 +1,28 @@
+from unittest import TestCase
+
+from helpers.token_helper import estimate_messages_tokens, estimate_tokens
+
+
+class EstimateTokensTests(TestCase):
+    def test_estimate_tokens(self):
+        cases = [
+            ("", 0),
+            ("a", 1),
+            ("four", 1),
+            ("five!", 2),
+            ("x" * 400, 100),
+        ]
+        for text, expected in cases:
+            with self.subTest(text=text):
+                self.assertEqual(expected, estimate_tokens(text))
+
+    def test_estimate_messages_tokens(self):
+        messages = [
+            {"role": "system", "content": "x" * 40},
+            {"role": "user", "content": "x" * 8},
+        ]
+
+        self.assertEqual(10 + 4 + 2 + 4, estimate_messages_tokens(messages))
+
+    def test_estimate_messages_tokens_empty(self):
+        self.assertEqual(0, estimate_messages_tokens([]))
@@ -1,18 +1,24 @@
+from datetime import datetime
 from unittest import TestCase
 from unittest.mock import patch, call
 
+from helpers.search_helper import SEARCH_LIMIT
 from services.user_expression_service import UserExpressionService
 from services.exceptions import (
     UserNotFoundException,
     TagNotFoundException,
+    ExpressionNotFoundException,
     UserExpressionNotFoundException,
     InvalidPostUserExpressionDataException,
+    InvalidPageCursorException,
 )
 from tests.unit.fixtures import get_expression, get_user, get_user_expression
 from tests.unit.fixtures import (
     get_tag,
 )
 
+EXPR_ID = "6c1ee5a9-1d0e-4d1b-8a44-0a7a25b1f0aa"
+
 
 class SearchTests(TestCase):
     def setUp(self):
@@ -29,13 +35,13 @@ class SearchTests(TestCase):
             "services.user_expression_service.DailyTraining"
         )
         mock_daily_training = daily_training_patcher.start()
-        self.mock_is_in_llist = (
-            mock_daily_training.return_value.is_expression_in_learn_list
+        self.mock_llist_ids = (
+            mock_daily_training.return_value.get_learn_list_expression_ids
         )
         self.addCleanup(daily_training_patcher.stop)
 
         dt_repo_patcher = patch(
-            "services.user_expression_service.DailyTrainingRepo"
+            "services.user_expression_service.get_request_repo"
         )
         self.mock_dt_repo = dt_repo_patcher.start()
         self.addCleanup(dt_repo_patcher.stop)
@@ -77,7 +83,7 @@ class SearchTests(TestCase):
                 lpt=last_pract_time_2,
             ),
         ]
-        self.mock_is_in_llist.side_effect = [True, False]
+        self.mock_llist_ids.return_value = {expr_id_1}
 
         actual = self.subject.search("pattern")
         expected = [
@@ -100,7 +106,9 @@ class SearchTests(TestCase):
         ]
 
         self.assertEqual(expected, actual)
-        self.mock_search.assert_called_once_with("pattern")
+        self.mock_search.assert_called_once_with(
+            "pattern", profile="list", limit=SEARCH_LIMIT
+        )
 
     def test_search_nothing_found(self):
         self.mock_search.return_value = []
@@ -108,7 +116,9 @@ class SearchTests(TestCase):
         actual = self.subject.search("pattern")
 
         self.assertEqual([], actual)
-        self.mock_search.assert_called_once_with("pattern")
+        self.mock_search.assert_called_once_with(
+            "pattern", profile="list", limit=SEARCH_LIMIT
+        )
 
 
 class PostTests(TestCase):
@@ -140,7 +150,7 @@ class PostTests(TestCase):
         self.addCleanup(tag_repo_patcher.stop)
 
         dt_repo_patcher = patch(
-            "services.user_expression_service.DailyTrainingRepo"
+            "services.user_expression_service.get_request_repo"
         )
         self.mock_dt_repo = dt_repo_patcher.start()
         self.addCleanup(dt_repo_patcher.stop)
@@ -248,7 +258,7 @@ class GetExpressionByIDTests(TestCase):
         self.addCleanup(user_expr_repo_patcher.stop)
 
         dt_repo_patcher = patch(
-            "services.user_expression_service.DailyTrainingRepo"
+            "services.user_expression_service.get_request_repo"
         )
         self.mock_dt_repo = dt_repo_patcher.start()
         self.addCleanup(dt_repo_patcher.stop)
@@ -288,7 +298,9 @@ class GetExpressionByIDTests(TestCase):
 
         self.assertEqual(expected, actual)
 
-        self.mock_get_us_expr_by_id.assert_called_once_with(expression_id)
+        self.mock_get_us_expr_by_id.assert_called_once_with(
+            expression_id, profile="detail"
+        )
 
     def test_get_user_expression_by_id_not_found_raise_exception(self):
         self.mock_get_us_expr_by_id.return_value = None
@@ -319,8 +331,8 @@ class GetAllTests(TestCase):
         self.mock_refresh_llist = (
             mock_daily_training.return_value.refresh_learning_list
         )
-        self.mock_is_in_llist = (
-            mock_daily_training.return_value.is_expression_in_learn_list
+        self.mock_llist_ids = (
+            mock_daily_training.return_value.get_learn_list_expression_ids
         )
         self.addCleanup(daily_training_patcher.stop)
 
@@ -333,7 +345,7 @@ class GetAllTests(TestCase):
         self.addCleanup(tag_repo_patcher.stop)
 
         dt_repo_patcher = patch(
-            "services.user_expression_service.DailyTrainingRepo"
+            "services.user_expression_service.get_request_repo"
         )
         self.mock_dt_repo = dt_repo_patcher.start()
         self.addCleanup(dt_repo_patcher.stop)
@@ -390,7 +402,7 @@ class GetAllTests(TestCase):
                 lpt=last_pract_time_3,
             ),
         ]
-        self.mock_is_in_llist.side_effect = [True, False, True]
+        self.mock_llist_ids.return_value = {expr_id_1, expr_id_3}
 
         actual = self.subject.get_all()
         expected = [
@@ -422,7 +434,7 @@ class GetAllTests(TestCase):
 
         self.assertEqual(expected, actual)
 
-        self.mock_get.assert_called_once_with()
+        self.mock_get.assert_called_once_with(profile="list")
 
     def test_get_all_no_results(self):
         self.mock_get.return_value = []
@@ -430,7 +442,93 @@ class GetAllTests(TestCase):
         actual = self.subject.get_all()
 
         self.assertEqual([], actual)
-        self.mock_get.assert_called_once_with()
+        self.mock_get.assert_called_once_with(profile="list")
+
+
+class GetPageTests(TestCase):
+    def setUp(self):
+        self.user_id = "test_user_id"
+
+        user_expr_repo_patcher = patch(
+            "services.user_expression_service.UserExpressionsDAO"
+        )
+        self.mock_get_page = (
+            user_expr_repo_patcher.start().return_value.get_page
+        )
+        self.addCleanup(user_expr_repo_patcher.stop)
+
+        daily_training_patcher = patch(
+            "services.user_expression_service.DailyTraining"
+        )
+        mock_daily_training = daily_training_patcher.start()
+        mock_daily_training.return_value.get_learn_list_expression_ids.return_value = (
+            set()
+        )
+        self.addCleanup(daily_training_patcher.stop)
+
+        dt_repo_patcher = patch(
+            "services.user_expression_service.get_request_repo"
+        )
+        dt_repo_patcher.start()
+        self.addCleanup(dt_repo_patcher.stop)
+
+        self.subject = UserExpressionService(self.user_id)
+
+        user = get_user(self.user_id)
+        self.user_expressions = []
+        for i in range(3):
+            user_expression = get_user_expression(
+                user_id=self.user_id,
+                user=user,
+                expression=get_expression(
+                    f"4d7993aa-d897-4647-994b-e0625c88f34{i}", f"expr_{i}"
+                ),
+            )
+            user_expression.added = datetime(2023, 4, 12 - i, 10, 10, 25)
+            self.user_expressions.append(user_expression)
+
+    def test_get_page_with_next_cursor(self):
+        self.mock_get_page.return_value = self.user_expressions
+
+        actual = self.subject.get_page(2)
+
+        self.assertEqual(
+            ["expr_0", "expr_1"],
+            [expr["expression"] for expr in actual["expressions"]],
+        )
+        self.assertIsNotNone(actual["nextCursor"])
+        self.mock_get_page.assert_called_once_with(3, None)
+
+    def test_get_last_page(self):
+        self.mock_get_page.return_value = self.user_expressions
+
+        actual = self.subject.get_page(3)
+
+        self.assertEqual(3, len(actual["expressions"]))
+        self.assertIsNone(actual["nextCursor"])
+
+    def test_get_page_by_cursor(self):
+        self.mock_get_page.return_value = self.user_expressions
+        cursor = self.subject.get_page(2)["nextCursor"]
+        self.mock_get_page.reset_mock()
+
+        self.subject.get_page(2, cursor)
+
+        self.mock_get_page.assert_called_once_with(
+            3,
+            (
+                datetime(2023, 4, 11, 10, 10, 25),
+                "4d7993aa-d897-4647-994b-e0625c88f341",
+            ),
+        )
+
+    def test_get_page_invalid_cursor_raises_exception(self):
+        for cursor in ("not a cursor", "YWJj", "MjAyMy0wNC0xMXxub3QtYW4taWQ="):
+            with self.subTest(cursor=cursor):
+                with self.assertRaises(InvalidPageCursorException):
+                    self.subject.get_page(2, cursor)
+
+        self.mock_get_page.assert_not_called()
 
 
 class CountTests(TestCase):
@@ -445,7 +543,7 @@ class CountTests(TestCase):
         self.addCleanup(user_expr_repo_patcher.stop)
 
         dt_repo_patcher = patch(
-            "services.user_expression_service.DailyTrainingRepo"
+            "services.user_expression_service.get_request_repo"
         )
         self.mock_dt_repo = dt_repo_patcher.start()
         self.addCleanup(dt_repo_patcher.stop)
@@ -461,3 +559,124 @@ class CountTests(TestCase):
         self.assertEqual(expected, actual)
 
         self.mock_count.assert_called_once_with()
+
+
+class SimilarExpressionsTests(TestCase):
+    def setUp(self):
+        self.user_id = "test_user_id"
+
+        user_expr_repo_patcher = patch(
+            "services.user_expression_service.UserExpressionsDAO"
+        )
+        mock_ue_repo = user_expr_repo_patcher.start()
+        self.mock_get = mock_ue_repo.return_value.get
+        self.mock_get_by_id = mock_ue_repo.return_value.get_by_id
+        self.mock_post = mock_ue_repo.return_value.post
+        self.addCleanup(user_expr_repo_patcher.stop)
+
+        expr_repo_patcher = patch(
+            "services.user_expression_service.ExpressionsRepo"
+        )
+        mock_expr_repo = expr_repo_patcher.start()
+        self.mock_get_similar = mock_expr_repo.return_value.get_similar
+        self.mock_get_expr_by_id = mock_expr_repo.return_value.get_by_id
+        self.addCleanup(expr_repo_patcher.stop)
+
+        daily_training_patcher = patch(
+            "services.user_expression_service.DailyTraining"
+        )
+        self.mock_refresh_llist = (
+            daily_training_patcher.start().return_value.refresh_learning_list
+        )
+        self.addCleanup(daily_training_patcher.stop)
+
+        dt_repo_patcher = patch(
+            "services.user_expression_service.get_request_repo"
+        )
+        dt_repo_patcher.start()
+        self.addCleanup(dt_repo_patcher.stop)
+
+        self.subject = UserExpressionService(self.user_id)
+
+    def test_get_similar_expressions(self):
+        user = get_user(self.user_id)
+        expr_1 = get_expression("expr_id_1", "go to school")
+        expr_2 = get_expression("expr_id_2", "go to the school")
+        self.mock_get_similar.return_value = [expr_1, expr_2]
+        self.mock_get.return_value = [
+            get_user_expression(self.user_id, user, expr_2)
+        ]
+
+        actual = self.subject.get_similar_expressions("go to scool")
+
+        self.assertEqual(
+            [
+                {
+                    "expressionId": "expr_id_1",
+                    "expression": "go to school",
+                    "definition": expr_1.definition,
+                    "isAdded": False,
+                },
+                {
+                    "expressionId": "expr_id_2",
+                    "expression": "go to the school",
+                    "definition": expr_2.definition,
+                    "isAdded": True,
+                },
+            ],
+            actual,
+        )
+        self.mock_get_similar.assert_called_once_with("go to scool")
+        self.mock_get.assert_called_once_with(
+            include=["expr_id_1", "expr_id_2"]
+        )
+
+    def test_get_similar_expressions_nothing_found(self):
+        self.mock_get_similar.return_value = []
+
+        self.assertEqual([], self.subject.get_similar_expressions("qwe"))
+        self.mock_get.assert_not_called()
+
+    @patch("services.user_expression_service.get_current_utc_time")
+    def test_add_existing_expression(self, mock_time):
+        mock_time.return_value = "2023-04-12 10:10:25"
+        self.mock_get_by_id.return_value = None
+        self.mock_get_expr_by_id.return_value = get_expression(
+            EXPR_ID, "expression"
+        )
+
+        self.subject.add_existing_expression(EXPR_ID)
+
+        user_expression = self.mock_post.call_args.args[0]
+        self.assertEqual(self.user_id, user_expression.user_id)
+        self.assertEqual(EXPR_ID, user_expression.expression_id)
+        self.assertEqual("2023-04-12 10:10:25", user_expression.added)
+        self.mock_refresh_llist.assert_called_once_with()
+
+    def test_add_existing_expression_already_added(self):
+        self.mock_get_by_id.return_value = get_user_expression(
+            self.user_id,
+            get_user(self.user_id),
+            get_expression(EXPR_ID, "expression"),
+        )
+
+        self.subject.add_existing_expression(EXPR_ID)
+
+        self.mock_post.assert_not_called()
+
+    def test_add_existing_expression_invalid_id_raises_exception(self):
+        with self.assertRaises(ExpressionNotFoundException):
+            self.subject.add_existing_expression("expr_id")
+
+        self.mock_get_by_id.assert_not_called()
+        self.mock_post.assert_not_called()
+        self.mock_refresh_llist.assert_not_called()
+
+    def test_add_existing_expression_not_found_raises_exception(self):
+        self.mock_get_by_id.return_value = None
+        self.mock_get_expr_by_id.return_value = None
+
+        with self.assertRaises(ExpressionNotFoundException):
+            self.subject.add_existing_expression(EXPR_ID)
+
+        self.mock_post.assert_not_called()
@@ -0,0 +1,62 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from helpers import metrics
+from helpers.user_role_cache import (
+    HITS_METRIC,
+    MISSES_METRIC,
+    UserRoleCache,
+)
+
+
+class UserRoleCacheTests(TestCase):
+    def setUp(self):
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
+        self.subject = UserRoleCache(max_size=2, ttl=10)
+
+    def test_get_set(self):
+        self.assertIsNone(self.subject.get("user_1"))
+
+        self.subject.set("user_1", "admin")
+
+        self.assertEqual("admin", self.subject.get("user_1"))
+        self.assertEqual(1, metrics.get_count(HITS_METRIC))
+        self.assertEqual(1, metrics.get_count(MISSES_METRIC))
+
+    @patch("helpers.user_role_cache.time.monotonic")
+    def test_get_expired(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.subject.set("user_1", "admin")
+
+        mock_monotonic.return_value = 110
+
+        self.assertIsNone(self.subject.get("user_1"))
+        self.assertEqual(1, metrics.get_count(MISSES_METRIC))
+
+    def test_least_recently_used_evicted(self):
+        self.subject.set("user_1", "admin")
+        self.subject.set("user_2", "admin")
+        self.subject.get("user_1")
+
+        self.subject.set("user_3", "admin")
+
+        self.assertEqual("admin", self.subject.get("user_1"))
+        self.assertIsNone(self.subject.get("user_2"))
+        self.assertEqual("admin", self.subject.get("user_3"))
+
+    def test_invalidate(self):
+        self.subject.set("user_1", "admin")
+        self.subject.set("user_2", "admin")
+
+        self.subject.invalidate("user_1")
+
+        self.assertIsNone(self.subject.get("user_1"))
+        self.assertEqual("admin", self.subject.get("user_2"))
+
+    def test_clear(self):
+        self.subject.set("user_1", "admin")
+
+        self.subject.clear()
+
+        self.assertIsNone(self.subject.get("user_1"))
@@ -33,7 +33,6 @@ class CreateUsersTests(TestCase):
                     "learnListSize": 50,
                     "practiceCountThreshold": 50,
                     "knowledgeLevelThreshold": 0.9,
-                    "learning_list": [],
                 }
             },
         }
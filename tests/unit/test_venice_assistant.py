@@ -1,11 +1,18 @@
 from unittest import TestCase
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+import asyncio
 import os
 import warnings
 
+from helpers import metrics
+from helpers.token_helper import CHARS_PER_TOKEN, MESSAGE_OVERHEAD_TOKENS
 from services.assistant import (
+    ESCALATED_METRIC,
+    SAVED_LLM_CALLS_METRIC,
+    SUMMARY_CHUNK_TOKENS,
     VeniceAssistant,
     character,
+    dialogue_summary_template,
     general_judgement_template,
     expression_detection_template,
     expression_usage_template,
@@ -123,9 +130,18 @@ class VeniceAssistantTests(TestCase):
         self.mock_do_chat_completion = (
             mock_venice_client.return_value.do_chat_completion
         )
+        self.mock_stream_chat_completion = (
+            mock_venice_client.return_value.stream_chat_completion
+        )
+        self.mock_ado_chat_completion = AsyncMock()
+        mock_venice_client.return_value.ado_chat_completion = (
+            self.mock_ado_chat_completion
+        )
         self.addCleanup(venice_client_patcher.stop)
 
         self.subject = VeniceAssistant()
+        metrics.reset_counters()
+        self.addCleanup(metrics.reset_counters)
 
         self.text = "Hi, let's talk about attic. Are you wheel with it?"
 
@@ -173,6 +189,139 @@ class VeniceAssistantTests(TestCase):
             messages=expected_messages
         )
 
+    def test_acomplete_dialogue(self):
+        dialogue = [{"role": "user", "content": "Hello"}]
+        self.mock_ado_chat_completion.return_value = (
+            self._get_mock_model_response("I am here to assist you.")
+        )
+
+        actual = asyncio.run(self.subject.acomplete_dialogue(dialogue))
+
+        self.assertEqual("I am here to assist you.", actual)
+        self.mock_ado_chat_completion.assert_awaited_once_with(
+            messages=[
+                {"role": "system", "content": character},
+                {"role": "user", "content": "Hello"},
+            ]
+        )
+
+    def test_stream_dialogue(self):
+        dialogue = [{"role": "user", "content": "Hello"}]
+        self.mock_stream_chat_completion.return_value = [
+            {"choices": [{"delta": {"content": "I am "}}]},
+            {"choices": [{"delta": {"content": ""}}]},
+            {"choices": [{"delta": {"content": "here."}}]},
+        ]
+
+        actual = list(self.subject.stream_dialogue(dialogue))
+
+        self.assertEqual(["I am ", "here."], actual)
+        self.mock_stream_chat_completion.assert_called_once_with(
+            messages=[
+                {"role": "system", "content": character},
+                {"role": "user", "content": "Hello"},
+            ]
+        )
+
+    @patch("services.venice_chat_model.VeniceClient")
+    def test_complete_dialogue_temperature(self, mock_venice_client):
+        mock_venice_client.return_value.do_chat_completion.return_value = (
+            self._get_mock_model_response("Hi!")
+        )
+
+        self.subject.complete_dialogue([{"role": "user", "content": "Hi"}])
+
+        self.assertEqual(
+            0.8, mock_venice_client.call_args.kwargs["temperature"]
+        )
+        self.assertEqual(0, self.subject.chat_model.temperature)
+
+    def test_summarize_dialogue(self):
+        dialogue = [
+            {"role": "user", "content": "Hello"},
+            {"role": "assistant", "content": "Hi! How can I help you?"},
+        ]
+        self.mock_do_chat_completion.return_value = (
+            self._get_mock_model_response(" The user greeted Alice. ")
+        )
+
+        actual = self.subject.summarize_dialogue(
+            "They met.", dialogue, max_words=50
+        )
+
+        self.assertEqual("The user greeted Alice.", actual)
+        self.mock_do_chat_completion.assert_called_once_with(
+            messages=[
+                {
+                    "role": "user",
+                    "content": dialogue_summary_template.format(
+                        summary="They met.",
+                        messages="user: Hello\n"
+                        "assistant: Hi! How can I help you?",
+                        max_words=50,
+                    ),
+                }
+            ]
+        )
+
+    def test_summarize_long_dialogue_by_chunks(self):
+        # every message takes a half of a chunk with the overhead
+        text = "a" * (
+            (SUMMARY_CHUNK_TOKENS // 2 - MESSAGE_OVERHEAD_TOKENS)
+            * CHARS_PER_TOKEN
+        )
+        dialogue = [
+            {"role": "user", "content": text},
+            {"role": "assistant", "content": text},
+            {"role": "user", "content": "Bye"},
+        ]
+        self.mock_do_chat_completion.side_effect = [
+            self._get_mock_model_response("First summary"),
+            self._get_mock_model_response("Second summary"),
+        ]
+
+        actual = self.subject.summarize_dialogue(None, dialogue, max_words=50)
+
+        self.assertEqual("Second summary", actual)
+        self.assertEqual(2, self.mock_do_chat_completion.call_count)
+        first_call, second_call = (
+            call.kwargs["messages"][0]["content"]
+            for call in self.mock_do_chat_completion.call_args_list
+        )
+        self.assertEqual(
+            dialogue_summary_template.format(
+                summary="The conversation has just started.",
+                messages=f"user: {text}\nassistant: {text}",
+                max_words=50,
+            ),
+            first_call,
+        )
+        self.assertEqual(
+            dialogue_summary_template.format(
+                summary="First summary", messages="user: Bye", max_words=50
+            ),
+            second_call,
+        )
+
+    def test_summarize_dialogue_cuts_too_long_message(self):
+        self.mock_do_chat_completion.return_value = (
+            self._get_mock_model_response("Summary")
+        )
+
+        self.subject.summarize_dialogue(
+            "They met.",
+            [{"role": "user", "content": "§" * SUMMARY_CHUNK_TOKENS * 10}],
+        )
+
+        self.mock_do_chat_completion.assert_called_once()
+        prompt = self.mock_do_chat_completion.call_args.kwargs["messages"][0][
+            "content"
+        ]
+        self.assertEqual(
+            (SUMMARY_CHUNK_TOKENS - MESSAGE_OVERHEAD_TOKENS) * CHARS_PER_TOKEN,
+            prompt.count("§"),
+        )
+
     def test_get_general_judgement(self):
         self.mock_do_chat_completion.return_value = (
             self._get_mock_model_response(general_judgement_response)
@@ -305,3 +454,188 @@ class VeniceAssistantTests(TestCase):
         self.mock_do_chat_completion.assert_called_once_with(
             messages=expected_messages
         )
+
+    def test_aget_general_judgement(self):
+        self.mock_ado_chat_completion.return_value = (
+            self._get_mock_model_response(general_judgement_response)
+        )
+
+        actual = asyncio.run(self.subject.aget_general_judgement(self.text))
+
+        self.assertEqual(3, len(actual.problems))
+        self.mock_ado_chat_completion.assert_awaited_once_with(
+            messages=[
+                {
+                    "role": "user",
+                    "content": general_judgement_template.format(
+                        text_to_analyze=self.text,
+                        response_format=general_judgement_response_format,
+                    ),
+                },
+            ]
+        )
+
+    def test_adetect_phrases_usage(self):
+        expressions = [
+            {
+                "id": "578d1e4d-2813-45d4-8886-977fc065c750",
+                "expression": "attic",
+            },
+        ]
+        self.mock_ado_chat_completion.return_value = (
+            self._get_mock_model_response(detect_phrases_usage_response)
+        )
+
+        actual = asyncio.run(
+            self.subject.adetect_phrases_usage(self.text, expressions)
+        )
+
+        self.assertEqual(
+            [
+                "578d1e4d-2813-45d4-8886-977fc065c750",
+                "1867002c-6f8f-4ad3-afad-af3b66785d0e",
+            ],
+            actual.expressions,
+        )
+
+    def test_aget_expression_usage_judgement(self):
+        expression = {
+            "id": "1867002c-6f8f-4ad3-afad-af3b66785d0e",
+            "expression": "wheel",
+            "meaning": "a circular object",
+        }
+        self.mock_ado_chat_completion.return_value = (
+            self._get_mock_model_response(expression_usage_judgement_response)
+        )
+
+        actual = asyncio.run(
+            self.subject.aget_expression_usage_judgement(self.text, expression)
+        )
+
+        self.assertEqual("1867002c-6f8f-4ad3-afad-af3b66785d0e", actual.id)
+        self.assertFalse(actual.is_correct)
+        self.mock_ado_chat_completion.assert_awaited_once_with(
+            messages=[
+                {
+                    "role": "user",
+                    "content": expression_usage_template.format(
+                        text=self.text,
+                        expression=expression["expression"],
+                        meaning=expression["meaning"],
+                        response_format=expression_usage_judgement_response_format,
+                    ),
+                },
+            ]
+        )
+
+    def test_judge_expressions_usage(self):
+        expressions = [
+            {"id": "1", "expression": "wheel", "meaning": "a round object"},
+            {"id": "2", "expression": "attic", "meaning": "a room"},
+        ]
+        self.mock_do_chat_completion.return_value = self._get_mock_model_response(
+            """
+            {"expressions": [
+                {"id": "1", "is_correct": false, "comment": "Not a vehicle"},
+                {"id": "7", "is_correct": true, "comment": "Made up"},
+                {"id": "1", "is_correct": false, "comment": "Repeated"}
+            ]}
+            """
+        )
+
+        actual = self.subject.judge_expressions_usage(self.text, expressions)
+
+        self.assertEqual(
+            [{"id": "1", "is_correct": False, "comment": "Repeated"}],
+            [item.model_dump() for item in actual],
+        )
+        prompt = self.mock_do_chat_completion.call_args.kwargs["messages"][0][
+            "content"
+        ]
+        self.assertIn(self.text, prompt)
+        self.assertIn(str(expressions), prompt)
+
+    def test_ajudge_expressions_usage(self):
+        expressions = [
+            {"id": "1", "expression": "wheel", "meaning": "a round object"},
+        ]
+        self.mock_ado_chat_completion.return_value = self._get_mock_model_response(
+            '{"expressions": [{"id": "1", "is_correct": true, "comment": "Ok"}]}'
+        )
+
+        actual = asyncio.run(
+            self.subject.ajudge_expressions_usage(self.text, expressions)
+        )
+
+        self.assertEqual(
+            [{"id": "1", "is_correct": True, "comment": "Ok"}],
+            [item.model_dump() for item in actual],
+        )
+
+    def test_detect_phrases_usage_local_matching(self):
+        self.subject.local_matching = True
+        expressions = [
+            {"id": "1", "expression": "attic"},
+            {"id": "2", "expression": "terrible weather"},
+        ]
+
+        actual = self.subject.detect_phrases_usage(self.text, expressions)
+
+        self.assertEqual({"expressions": ["1"]}, actual.model_dump())
+        self.mock_do_chat_completion.assert_not_called()
+        self.assertEqual(1, metrics.get_count(SAVED_LLM_CALLS_METRIC))
+
+    def test_adetect_phrases_usage_local_matching_ambiguous(self):
+        self.subject.local_matching = True
+        expressions = [
+            {"id": "1", "expression": "attic"},
+            {"id": "2", "expression": "terrible weather"},
+            {"id": "3", "expression": "with wheel"},
+        ]
+        self.mock_ado_chat_completion.return_value = (
+            self._get_mock_model_response('{"expressions": ["3"]}')
+        )
+
+        actual = asyncio.run(
+            self.subject.adetect_phrases_usage(self.text, expressions)
+        )
+
+        self.assertEqual({"expressions": ["1", "3"]}, actual.model_dump())
+        prompt = self.mock_ado_chat_completion.call_args.kwargs["messages"][0][
+            "content"
+        ]
+        self.assertIn(str([expressions[2]]), prompt)
+        self.assertEqual(0, metrics.get_count(SAVED_LLM_CALLS_METRIC))
+        self.assertEqual(1, metrics.get_count(ESCALATED_METRIC))
+
+    def test_judge_expressions_usage_local_matching(self):
+        self.subject.local_matching = True
+        expressions = [
+            {"id": "1", "expression": "terrible weather", "meaning": "rain"},
+        ]
+
+        actual = self.subject.judge_expressions_usage(self.text, expressions)
+
+        self.assertEqual([], actual)
+        self.mock_do_chat_completion.assert_not_called()
+        self.assertEqual(1, metrics.get_count(SAVED_LLM_CALLS_METRIC))
+
+    def test_ajudge_expressions_usage_local_matching(self):
+        self.subject.local_matching = True
+        expressions = [
+            {"id": "1", "expression": "wheel", "meaning": "a round object"},
+            {"id": "2", "expression": "terrible weather", "meaning": "rain"},
+        ]
+        self.mock_ado_chat_completion.return_value = self._get_mock_model_response(
+            '{"expressions": [{"id": "1", "is_correct": true, "comment": "Ok"}]}'
+        )
+
+        actual = asyncio.run(
+            self.subject.ajudge_expressions_usage(self.text, expressions)
+        )
+
+        self.assertEqual(["1"], [item.id for item in actual])
+        prompt = self.mock_ado_chat_completion.call_args.kwargs["messages"][0][
+            "content"
+        ]
+        self.assertIn(str([expressions[0]]), prompt)
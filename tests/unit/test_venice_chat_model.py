@@ -1,5 +1,6 @@
+import asyncio
 from unittest import TestCase
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 from langchain_core.messages import BaseMessage
 from services.venice_chat_model import ChatVeniceAI
 from langchain_core.outputs import ChatResult
@@ -62,6 +63,134 @@ class ChatVeniceAITests(TestCase):
             },
         )
 
+    @patch("services.venice_chat_model.VeniceClient")
+    def test_agenerate(self, mock_venice_client):
+        mock_venice_client.return_value.ado_chat_completion = AsyncMock(
+            return_value={
+                "choices": [{"message": {"content": "response content"}}],
+                "usage": {
+                    "prompt_tokens": 10,
+                    "completion_tokens": 5,
+                    "total_tokens": 15,
+                },
+            }
+        )
+        chat_model = ChatVeniceAI(
+            model="test_model",
+            api_key="test_api_key",
+        )
+
+        messages = [BaseMessage(type="human", content="Hello")]
+        result = asyncio.run(chat_model._agenerate(messages))
+
+        mock_venice_client.return_value.ado_chat_completion.assert_awaited_once_with(
+            messages=[{"role": "user", "content": "Hello"}]
+        )
+        self.assertEqual(
+            result.generations[0].message.content, "response content"
+        )
+        self.assertEqual(
+            result.generations[0].message.usage_metadata["total_tokens"], 15
+        )
+
+    @patch("services.venice_chat_model.VeniceClient")
+    def test_stream(self, mock_venice_client):
+        mock_venice_client.return_value.stream_chat_completion.return_value = [
+            {"choices": [{"delta": {"role": "assistant", "content": ""}}]},
+            {"choices": [{"delta": {"content": "response "}}]},
+            {"choices": [{"delta": {"content": "content"}}]},
+            {
+                "choices": [],
+                "usage": {
+                    "prompt_tokens": 10,
+                    "completion_tokens": 5,
+                    "total_tokens": 15,
+                },
+            },
+        ]
+
+        chat_model = ChatVeniceAI(
+            model="test_model",
+            api_key="test_api_key",
+        )
+
+        chunks = list(
+            chat_model.stream([BaseMessage(type="human", content="Hello")])
+        )
+
+        mock_venice_client.return_value.stream_chat_completion.assert_called_once_with(
+            messages=[{"role": "user", "content": "Hello"}]
+        )
+        self.assertEqual(
+            "response content", "".join(chunk.content for chunk in chunks)
+        )
+        message = sum(chunks[1:], chunks[0])
+        self.assertEqual(
+            {"input_tokens": 10, "output_tokens": 5, "total_tokens": 15},
+            message.usage_metadata,
+        )
+
+    @patch("services.venice_chat_model.VeniceClient")
+    def test_generate_drops_oldest_messages_over_budget(
+        self, mock_venice_client
+    ):
+        mock_venice_client.return_value.do_chat_completion.return_value = {
+            "choices": [{"message": {"content": "response content"}}],
+            "usage": {
+                "prompt_tokens": 10,
+                "completion_tokens": 5,
+                "total_tokens": 15,
+            },
+        }
+        chat_model = ChatVeniceAI(
+            model="test_model",
+            api_key="test_api_key",
+            max_input_tokens=30,
+        )
+
+        chat_model._generate(
+            [
+                BaseMessage(type="system", content="s" * 40),
+                BaseMessage(type="human", content="h" * 40),
+                BaseMessage(type="ai", content="a" * 20),
+                BaseMessage(type="human", content="Hello"),
+            ]
+        )
+
+        mock_venice_client.return_value.do_chat_completion.assert_called_once_with(
+            messages=[
+                {"role": "system", "content": "s" * 40},
+                {"role": "assistant", "content": "a" * 20},
+                {"role": "user", "content": "Hello"},
+            ]
+        )
+
+    def test_fit_input_tokens_keeps_last_message(self):
+        chat_model = ChatVeniceAI(
+            model="test_model",
+            api_key="test_api_key",
+            max_input_tokens=5,
+        )
+        messages = [
+            {"role": "user", "content": "u" * 40},
+            {"role": "assistant", "content": "a" * 40},
+            {"role": "user", "content": "Hello, how are you?"},
+        ]
+
+        with self.assertLogs("services.venice_chat_model", "WARNING"):
+            actual = chat_model._fit_input_tokens(messages)
+
+        self.assertEqual([messages[-1]], actual)
+
+    def test_fit_input_tokens_no_budget(self):
+        chat_model = ChatVeniceAI(
+            model="test_model",
+            api_key="test_api_key",
+        )
+        messages = [{"role": "user", "content": "u" * 40000}]
+
+        self.assertEqual(messages, chat_model._fit_input_tokens(messages))
+
     def test_get_chat_messages(self):
         chat_model = ChatVeniceAI(
             model="test_model",
@@ -96,5 +225,5 @@ class ChatVeniceAITests(TestCase):
         )
         self.assertEqual(
             chat_model._identifying_params,
-            {"model_name": "test_model"},
+            {"model_name": "test_model", "temperature": 0},
         )
@@ -1,9 +1,20 @@
+import asyncio
+import http
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest import TestCase
 from unittest.mock import patch, MagicMock
 
+import httpx
 import requests
-from services.venice_client import VeniceClient, VeniceClientError
-import http
+from services.venice_client import (
+    JitterRetry,
+    VeniceClient,
+    VeniceClientError,
+    create_session,
+    get_session,
+)
 
 
 class VeniceClientTests(TestCase):
@@ -15,7 +26,7 @@ class VeniceClientTests(TestCase):
         )
         self.messages = [{"role": "user", "content": "Hello"}]
 
-        self.patcher = patch("services.venice_client.requests.post")
+        self.patcher = patch.object(self.client.session, "post")
         self.mock_post = self.patcher.start()
         self.addCleanup(self.patcher.stop)
 
@@ -68,3 +79,241 @@ class VeniceClientTests(TestCase):
             context.exception.status_code,
             http.HTTPStatus.INTERNAL_SERVER_ERROR.value,
         )
+
+    def test_stream_chat_completion(self):
+        mock_response = MagicMock()
+        mock_response.ok = True
+        mock_response.iter_lines.return_value = [
+            b'data: {"choices": [{"delta": {"content": "Test"}}]}',
+            b"",
+            b": keep-alive",
+            b'data: {"choices": [{"delta": {"content": " response"}}]}',
+            b"data: [DONE]",
+            b'data: {"choices": [{"delta": {"content": "ignored"}}]}',
+        ]
+        self.mock_post.return_value = mock_response
+
+        result = list(self.client.stream_chat_completion(self.messages))
+
+        self.mock_post.assert_called_once_with(
+            f"{self.client.base_url}/chat/completions",
+            headers=self.client.headers,
+            json={
+                "model": self.client.model,
+                "messages": self.messages,
+                "temperature": self.client.temperature,
+                "stream": True,
+                "stream_options": {"include_usage": True},
+            },
+            timeout=60,
+            stream=True,
+        )
+        self.assertEqual(
+            [
+                {"choices": [{"delta": {"content": "Test"}}]},
+                {"choices": [{"delta": {"content": " response"}}]},
+            ],
+            result,
+        )
+        mock_response.__exit__.assert_called_once()
+
+    def test_stream_chat_completion_http_error(self):
+        mock_response = MagicMock()
+        mock_response.ok = False
+        mock_response.text = "Error message"
+        mock_response.status_code = http.HTTPStatus.BAD_REQUEST.value
+        self.mock_post.return_value = mock_response
+
+        with self.assertRaises(VeniceClientError) as context:
+            list(self.client.stream_chat_completion(self.messages))
+
+        self.assertEqual(
+            context.exception.status_code, http.HTTPStatus.BAD_REQUEST.value
+        )
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    # keep-alive needs HTTP/1.1
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        server = self.server
+        self.rfile.read(int(self.headers["Content-Length"]))
+        server.client_ports.append(self.client_address[1])
+        status = (
+            server.statuses.pop(0)
+            if server.statuses
+            else http.HTTPStatus.OK.value
+        )
+        body = json.dumps({"status": status}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class VeniceClientStubServerTests(TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+        self.server.statuses = []
+        self.server.client_ports = []
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        self.session = create_session(pool_size=2, backoff_factor=0)
+        self.addCleanup(self.session.close)
+        self.client = VeniceClient(
+            model="test-model", api_key="test-api-key", session=self.session
+        )
+        self.client.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        self.messages = [{"role": "user", "content": "Hello"}]
+
+    def test_success(self):
+        result = self.client.do_chat_completion(self.messages)
+
+        self.assertEqual(result, {"status": http.HTTPStatus.OK.value})
+        self.assertEqual(len(self.server.client_ports), 1)
+
+    def test_connection_is_kept_alive(self):
+        for _ in range(3):
+            self.client.do_chat_completion(self.messages)
+
+        self.assertEqual(len(self.server.client_ports), 3)
+        self.assertEqual(len(set(self.server.client_ports)), 1)
+
+    def test_server_error_is_retried(self):
+        self.server.statuses = [
+            http.HTTPStatus.SERVICE_UNAVAILABLE.value,
+            http.HTTPStatus.BAD_GATEWAY.value,
+        ]
+
+        result = self.client.do_chat_completion(self.messages)
+
+        self.assertEqual(result, {"status": http.HTTPStatus.OK.value})
+        self.assertEqual(len(self.server.client_ports), 3)
+
+    def test_too_many_requests_retries_exhausted(self):
+        self.server.statuses = [http.HTTPStatus.TOO_MANY_REQUESTS.value] * 10
+
+        with self.assertRaises(VeniceClientError) as context:
+            self.client.do_chat_completion(self.messages)
+
+        self.assertEqual(
+            context.exception.status_code,
+            http.HTTPStatus.TOO_MANY_REQUESTS.value,
+        )
+        # the first try and 3 retries
+        self.assertEqual(len(self.server.client_ports), 4)
+
+    def test_client_error_is_not_retried(self):
+        self.server.statuses = [http.HTTPStatus.BAD_REQUEST.value]
+
+        with self.assertRaises(VeniceClientError) as context:
+            self.client.do_chat_completion(self.messages)
+
+        self.assertEqual(
+            context.exception.status_code, http.HTTPStatus.BAD_REQUEST.value
+        )
+        self.assertEqual(len(self.server.client_ports), 1)
+
+
+class VeniceClientAsyncStubServerTests(VeniceClientStubServerTests):
+    """The same cases for ado_chat_completion"""
+
+    def setUp(self):
+        super().setUp()
+        self.client.backoff_factor = 0
+        self.client.do_chat_completion = self._do_chat_completion
+
+    def _do_chat_completion(self, messages: list[dict]) -> dict:
+        async def run():
+            async with httpx.AsyncClient() as async_client:
+                self.client.async_client = async_client
+                return await self.client.ado_chat_completion(messages)
+
+        return asyncio.run(run())
+
+    def test_connection_is_kept_alive(self):
+        async def run():
+            async with httpx.AsyncClient() as async_client:
+                self.client.async_client = async_client
+                for _ in range(3):
+                    await self.client.ado_chat_completion(self.messages)
+
+        asyncio.run(run())
+
+        self.assertEqual(len(self.server.client_ports), 3)
+        self.assertEqual(len(set(self.server.client_ports)), 1)
+
+    def test_timeout(self):
+        async def run():
+            async with httpx.AsyncClient() as async_client:
+                self.client.async_client = async_client
+                with patch.object(
+                    async_client, "post", side_effect=httpx.ReadTimeout("")
+                ):
+                    await self.client.ado_chat_completion(self.messages)
+
+        with self.assertRaises(VeniceClientError) as context:
+            asyncio.run(run())
+
+        self.assertEqual(
+            context.exception.status_code,
+            http.HTTPStatus.REQUEST_TIMEOUT.value,
+        )
+
+
+class JitterRetryTests(TestCase):
+    def test_no_backoff_before_first_retry(self):
+        retry = JitterRetry(total=3, backoff_factor=0.5)
+
+        self.assertEqual(retry.get_backoff_time(), 0)
+
+    @patch("services.venice_client.random.uniform")
+    def test_backoff_grows_exponentially(self, mock_uniform):
+        mock_uniform.side_effect = lambda low, high: high
+        retry = JitterRetry(
+            total=5,
+            backoff_factor=0.5,
+            status_forcelist=[503],
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        backoffs = []
+        for _ in range(3):
+            retry = retry.increment(
+                method="POST", url="/", response=MagicMock(status=503)
+            )
+            backoffs.append(retry.get_backoff_time())
+
+        self.assertEqual(backoffs, [0.5, 1.0, 2.0])
+
+    def test_backoff_is_random_within_bounds(self):
+        retry = JitterRetry(total=5, backoff_factor=1)
+        for _ in range(2):
+            retry = retry.increment(
+                method="POST", url="/", response=MagicMock(status=503)
+            )
+
+        backoffs = {retry.get_backoff_time() for _ in range(20)}
+
+        self.assertTrue(all(0 <= backoff <= 2 for backoff in backoffs))
+        self.assertGreater(len(backoffs), 1)
+
+
+class GetSessionTests(TestCase):
+    def test_session_is_shared(self):
+        self.assertIs(get_session(), get_session())
+
+    def test_clients_share_session(self):
+        first = VeniceClient(model="test-model", api_key="test-api-key")
+        second = VeniceClient(model="test-model", api_key="test-api-key")
+
+        self.assertIs(first.session, second.session)
@@ -1,6 +1,6 @@
 import os
 from unittest import TestCase
-from unittest.mock import Mock, patch, call
+from unittest.mock import Mock, create_autospec, patch, call
 
 from exercises.writing_training import WritingTraining
 from models.models import Writings
@@ -9,6 +9,7 @@ from services.assistant import (
     ExpressionUsageResponse,
     GeneralJudgementResponse,
     Problem,
+    VeniceAssistant,
 )
 from tests.unit.fixtures import (
     get_writings,
@@ -26,12 +27,14 @@ class BaseWritingTrainingTest(TestCase):
 
         self.mock_writing_repo = Mock()
         self.mock_user_expression_repo = Mock()
-        self.mock_assistant = Mock()
+        self.mock_assistant = create_autospec(VeniceAssistant)
+        self.mock_jobs_dao = Mock()
         self.subject = WritingTraining(
             self.user_id,
             self.mock_writing_repo,
             self.mock_user_expression_repo,
             self.mock_assistant,
+            jobs_dao=self.mock_jobs_dao,
         )
 
     def tearDown(self):
@@ -156,7 +159,7 @@ class GetWritingsTests(BaseWritingTrainingTest):
 
         self.mock_writing_repo.return_value.get.assert_called_once()
         self.mock_user_expression_repo.return_value.get_trained_expressions.assert_called_once_with(
-            limit=10, excludes=[]
+            limit=10, excludes=[], profile="list"
         )
 
         actual_created_writing = (
@@ -229,14 +232,14 @@ class SubmitWritingTests(BaseWritingTrainingTest):
                 ),
             ]
         )
-        self.mock_assistant.return_value.get_general_judgement.return_value = (
+        self.mock_assistant.return_value.aget_general_judgement.return_value = (
             mock_general_judgement
         )
 
         mock_detected_expression_ids = ExpressionDetectionResponse(
             expressions=["1", "2"]
         )
-        self.mock_assistant.return_value.detect_phrases_usage.return_value = (
+        self.mock_assistant.return_value.adetect_phrases_usage.return_value = (
             mock_detected_expression_ids
         )
 
@@ -248,7 +251,7 @@ class SubmitWritingTests(BaseWritingTrainingTest):
                 id="2", is_correct=True, comment="expression-2 judgement"
             ),
         ]
-        self.mock_assistant.return_value.get_expression_usage_judgement.side_effect = (
+        self.mock_assistant.return_value.aget_expression_usage_judgement.side_effect = (
             mock_expressions_usage_judgement
         )
 
@@ -346,17 +349,17 @@ class SubmitWritingTests(BaseWritingTrainingTest):
         self.assertEqual(expected, actual)
 
         self.mock_writing_repo.return_value.get.assert_called_once()
-        self.mock_assistant.return_value.get_general_judgement.assert_called_once_with(
+        self.mock_assistant.return_value.aget_general_judgement.assert_called_once_with(
             "Some test writings to submit"
         )
-        self.mock_assistant.return_value.detect_phrases_usage.assert_called_once_with(
+        self.mock_assistant.return_value.adetect_phrases_usage.assert_called_once_with(
             "Some test writings to submit",
             [
                 {"id": "1", "expression": "mock_expr_1"},
                 {"id": "2", "expression": "mock_expr_2"},
             ],
         )
-        self.mock_assistant.return_value.get_expression_usage_judgement.assert_has_calls(
+        self.mock_assistant.return_value.aget_expression_usage_judgement.assert_has_calls(
             [
                 call(
                     "Some test writings to submit",
@@ -398,7 +401,7 @@ class SubmitWritingTests(BaseWritingTrainingTest):
         )
 
         self.mock_user_expression_repo.return_value.get_trained_expressions.assert_called_once_with(
-            limit=9, excludes=["1"]
+            limit=9, excludes=["1"], profile="list"
         )
 
         actual_updated_writings = (
@@ -457,3 +460,228 @@ class SubmitWritingTests(BaseWritingTrainingTest):
         self._assert_writings(
             expected_updated_writings, actual_updated_writings
         )
+
+    def test_submit_writing_combined_judgement(self):
+        self.subject.combined_judgement = True
+        self.mock_writing_repo.return_value.get.return_value = get_writings(
+            id_="dbb4797f-bf2c-45ed-b768-e85b9e17b60c",
+            user_id=self.user_id,
+            properties={"maxExpressionsToTrain": 2, "maxWritingsToStore": 10},
+            expressions=[
+                {
+                    "id": "1",
+                    "expression": "mock_expr_1",
+                    "definition": "mock_definition_1",
+                    "status": "not_checked",
+                },
+                {
+                    "id": "2",
+                    "expression": "mock_expr_2",
+                    "definition": "mock_definition_2",
+                    "status": "not_checked",
+                },
+            ],
+        )
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[]
+        )
+        self.mock_assistant.return_value.ajudge_expressions_usage.return_value = [
+            ExpressionUsageResponse(
+                id="2", is_correct=True, comment="expression-2 judgement"
+            ),
+        ]
+        self.mock_user_expression_repo.return_value.get.return_value = []
+        self.mock_user_expression_repo.return_value.get_trained_expressions.return_value = (
+            []
+        )
+
+        actual = self.subject.submit_writing("Some test writings to submit")
+
+        self.assertEqual(["1"], [expr["id"] for expr in actual["expressions"]])
+        self.mock_assistant.return_value.ajudge_expressions_usage.assert_called_once_with(
+            "Some test writings to submit",
+            [
+                {
+                    "id": "1",
+                    "expression": "mock_expr_1",
+                    "meaning": "mock_definition_1",
+                },
+                {
+                    "id": "2",
+                    "expression": "mock_expr_2",
+                    "meaning": "mock_definition_2",
+                },
+            ],
+        )
+        self.mock_assistant.return_value.adetect_phrases_usage.assert_not_called()
+        self.mock_assistant.return_value.aget_expression_usage_judgement.assert_not_called()
+        self.mock_user_expression_repo.return_value.get.assert_called_once_with(
+            include=["2"]
+        )
+
+
+class BackgroundGradingTests(BaseWritingTrainingTest):
+    def setUp(self):
+        super().setUp()
+        self.writings = get_writings(
+            id_="dbb4797f-bf2c-45ed-b768-e85b9e17b60c",
+            user_id=self.user_id,
+            writings=[{"id": 1, "text": "Old writing"}],
+            expressions=[
+                {
+                    "id": "1",
+                    "expression": "mock_expr_1",
+                    "definition": "mock_definition_1",
+                    "status": "not_checked",
+                },
+            ],
+        )
+        self.expressions = [
+            {
+                "id": "1",
+                "expression": "mock_expr_1",
+                "definition": "mock_definition_1",
+            },
+        ]
+        self.mock_writing_repo.return_value.get.return_value = self.writings
+
+    def test_enqueue_writing(self):
+        self.mock_jobs_dao.return_value.enqueue.return_value = Mock(
+            id="b2d6c1c4-5b2a-4f7e-9d43-0c1f6f0e4e2a"
+        )
+
+        actual = self.subject.enqueue_writing("New writing")
+
+        self.assertEqual("b2d6c1c4-5b2a-4f7e-9d43-0c1f6f0e4e2a", actual)
+        self.assertEqual(
+            {"id": 2, "text": "New writing"},
+            self.writings.writings[-1],
+        )
+        self.mock_jobs_dao.return_value.enqueue.assert_called_once_with(
+            self.user_id,
+            "writing_training.grading",
+            {
+                "messageId": 2,
+                "text": "New writing",
+                "expressions": [
+                    {
+                        "id": "1",
+                        "expression": "mock_expr_1",
+                        "definition": "mock_definition_1",
+                    },
+                ],
+            },
+        )
+        self.mock_writing_repo.return_value.add.assert_called_once_with(
+            self.writings, commit=False
+        )
+        self.mock_assistant.return_value.aget_general_judgement.assert_not_called()
+
+    def test_grade_writing(self):
+        self.subject.combined_judgement = True
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[
+                Problem(
+                    problem="problem",
+                    explanation="explanation",
+                    solution="solution",
+                )
+            ]
+        )
+        self.mock_assistant.return_value.ajudge_expressions_usage.return_value = [
+            ExpressionUsageResponse(
+                id="1", is_correct=True, comment="expression-1 judgement"
+            ),
+        ]
+        user_expression = get_user_expression(
+            user_id=self.user_id,
+            user=None,
+            expression=get_expression(
+                expression_id="1",
+                expression="mock_expr_1",
+                definition="mock_definition_1",
+            ),
+            kl=0.5,
+        )
+        self.mock_user_expression_repo.return_value.get.return_value = [
+            user_expression
+        ]
+        self.mock_user_expression_repo.return_value.get_trained_expressions.return_value = (
+            []
+        )
+
+        self.subject.grade_writing(1, "Old writing", self.expressions)
+
+        self.assertEqual([], self.writings.expressions)
+        self.assertEqual(1, user_expression.practice_count)
+        self.mock_user_expression_repo.return_value.put.assert_called_once_with(
+            user_expression, commit=False
+        )
+        self.mock_writing_repo.return_value.add.assert_called_once_with(
+            self.writings, commit=False
+        )
+        self.mock_writing_repo.return_value.set_message_comment.assert_called_once_with(
+            self.writings,
+            1,
+            [
+                {
+                    "problem": "problem",
+                    "explanation": "explanation",
+                    "solution": "solution",
+                }
+            ],
+            commit=False,
+        )
+
+    def test_grade_writing_with_shown_expressions(self):
+        self.mock_assistant.return_value.aget_general_judgement.return_value = GeneralJudgementResponse(
+            problems=[]
+        )
+        self.mock_assistant.return_value.adetect_phrases_usage.return_value = (
+            ExpressionDetectionResponse(expressions=["0"])
+        )
+        self.mock_assistant.return_value.aget_expression_usage_judgement.return_value = ExpressionUsageResponse(
+            id="0", is_correct=False, comment="expression-0 judgement"
+        )
+        self.mock_user_expression_repo.return_value.get.return_value = []
+        self.mock_user_expression_repo.return_value.get_trained_expressions.return_value = (
+            []
+        )
+        # the expression was replaced after the writing was submitted
+        shown_expressions = [
+            {
+                "id": "0",
+                "expression": "mock_expr_0",
+                "definition": "mock_definition_0",
+            },
+        ]
+
+        self.subject.grade_writing(1, "Old writing", shown_expressions)
+
+        self.mock_assistant.return_value.adetect_phrases_usage.assert_called_once_with(
+            "Old writing", [{"id": "0", "expression": "mock_expr_0"}]
+        )
+        self.mock_assistant.return_value.aget_expression_usage_judgement.assert_called_once_with(
+            "Old writing",
+            {
+                "id": "0",
+                "expression": "mock_expr_0",
+                "meaning": "mock_definition_0",
+            },
+        )
+        self.assertEqual("not_checked", self.writings.expressions[0]["status"])
+
+    def test_grade_writing_graded_already(self):
+        self.writings.writings[0]["comment"] = []
+
+        self.subject.grade_writing(1, "Old writing", self.expressions)
+
+        self.mock_user_expression_repo.return_value.put.assert_not_called()
+        self.mock_writing_repo.return_value.add.assert_not_called()
+        self.mock_writing_repo.return_value.set_message_comment.assert_not_called()
+
+    def test_grade_writing_removed(self):
+        self.subject.grade_writing(2, "Removed writing", self.expressions)
+
+        self.mock_writing_repo.return_value.add.assert_not_called()
+        self.mock_writing_repo.return_value.set_message_comment.assert_not_called()
@@ -0,0 +1,46 @@
+# Run "python worker.py" from ll-manager dir,
+# any number of workers can run at the same time
+
+import signal
+import threading
+
+from main import app
+from exercises import daily_writing, writing_training
+from repository.training_expressions_repo import DailyTrainingRepo
+from services.assistant import VeniceAssistant
+from services.job_worker import JobHandler, JobWorker
+
+
+def get_handlers() -> dict[str, JobHandler]:
+    return {
+        writing_training.GRADING_JOB: lambda job: (
+            writing_training.WritingTraining(str(job.user_id)).grade_writing(
+                job.payload["messageId"],
+                job.payload["text"],
+                job.payload["expressions"],
+            )
+        ),
+        daily_writing.GRADING_JOB: lambda job: (
+            daily_writing.DailyWriting(
+                str(job.user_id), DailyTrainingRepo, VeniceAssistant
+            ).grade_writing(
+                job.payload["text"],
+                job.payload["expressionsIds"],
+                job.payload["expressions"],
+            )
+        ),
+    }
+
+
+def main():
+    stop = threading.Event()
+    # the running job is finished before the worker stops
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    with app.app_context():
+        JobWorker(get_handlers()).run(stop)
+
+
+if __name__ == "__main__":
+    main()